@@ -0,0 +1,32 @@
+"""Admin interface for the background jobs."""
+
+from django.contrib import admin
+
+from base.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "state",
+        "progress",
+        "attempts",
+        "user",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("state", "name")
+    search_fields = ("name", "dedup_key")
+    readonly_fields = (
+        "progress",
+        "progress_message",
+        "result",
+        "error",
+        "attempts",
+        "worker",
+        "started_at",
+        "finished_at",
+        "created_at",
+        "updated_at",
+    )
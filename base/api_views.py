@@ -3,12 +3,17 @@
 import datetime
 from collections import defaultdict
 
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views import View
 from moneyed import Money
 
+from base.cache import cache_stats
+from base.models import Job
+from base.request_metrics import slowest_routes
 from finance.models.investment_account import (
     InvestmentAccount,
     InvestmentAccountCash,
@@ -18,6 +23,7 @@ from finance.models.saving_account import SavingAccount, SavingAccountValue
 from glad.settings import DEFAULT_CURRENCY
 from property.models import Property
 from property.models.scpi import SCPIInvestment
+from property.services.timeline import PropertyValueTimeline
 
 
 def _resolve_default_currency(
@@ -58,13 +64,19 @@ def _get_currency_totals() -> dict:
         investment_accounts, lambda a: a.current_value
     )
 
-    properties = Property.objects.filter(is_active=True)
-    properties_net_by_currency = _sum_by_currency(properties, lambda p: p.net_value)
-    properties_gross_by_currency = _sum_by_currency(properties, lambda p: p.gross_value)
+    properties = Property.objects.filter(is_active=True).with_valuation()
+    properties_net_by_currency = _sum_by_currency(
+        properties, lambda p: p.net_value_from_annotations()
+    )
+    properties_gross_by_currency = _sum_by_currency(
+        properties, lambda p: p.get_value_from_annotations()
+    )
 
     # SCPI investments — use estimated value (accounts for dismemberment)
     today = datetime.date.today()
-    scpi_investments = SCPIInvestment.objects.select_related("scpi").all()
+    scpi_investments = SCPIInvestment.objects.select_related("scpi").prefetch_related(
+        "scpi__share_prices"
+    )
     scpi_by_currency = _sum_by_currency(
         scpi_investments, lambda inv: inv.get_estimated_value(today)
     )
@@ -171,7 +183,7 @@ class NetWorthApiView(View):
             for prop in properties:
                 if prop.currency == dc and prop.buying_date <= thirty_days_ago.date():
                     try:
-                        old_property += prop.net_value
+                        old_property += prop.net_value_from_annotations()
                     except Exception:
                         pass
 
@@ -224,11 +236,9 @@ class PatrimonyChartApiView(View):
         now = datetime.datetime.now()
         months_range = int(request.GET.get("range", 2)) * 12
         months = []
+        month_dates = []
         investments_series = []
         savings_series = []
-        properties_net_series = []
-        properties_loans_series = []
-        scpi_series = []
 
         for i in range(months_range, -1, -1):
             year = now.year
@@ -238,6 +248,7 @@ class PatrimonyChartApiView(View):
                 year -= 1
             month_date = datetime.datetime(year, month, 1)
             months.append(month_date.strftime("%b %Y"))
+            month_dates.append(month_date.date())
 
             # Savings
             month_saving_accounts = list(saving_accounts)
@@ -281,43 +292,31 @@ class PatrimonyChartApiView(View):
                     except Exception:
                         pass
 
-            # Properties
-            month_properties = [
-                p for p in properties if p.buying_date <= month_date.date()
-            ]
-            month_property_net_total = 0.0
-            month_property_gross_total = 0.0
-            for prop in month_properties:
-                if prop.currency == dc:
-                    try:
-                        net_val = prop.net_value_at_date(month_date.date())
-                        if net_val:
-                            month_property_net_total += float(net_val.amount)
-                        gross_val = prop.get_value(max_date=month_date)
-                        if gross_val:
-                            month_property_gross_total += float(gross_val.amount)
-                    except Exception:
-                        pass
-
-            # SCPI — use estimated value at the month date
-            month_scpi_total = 0.0
-            for inv in scpi_investments:
-                if inv.currency == dc:
-                    try:
-                        val = inv.get_estimated_value(month_date.date())
-                        if val:
-                            month_scpi_total += float(val.amount)
-                    except Exception:
-                        pass
-
             investments_series.append(month_investment_total)
             savings_series.append(month_saving_total)
-            properties_net_series.append(month_property_net_total)
-            # loans = gross - net (negative equity portion)
-            properties_loans_series.append(
-                month_property_gross_total - month_property_net_total
-            )
-            scpi_series.append(month_scpi_total)
+
+        # SCPI — estimated values of each investment over all the months at once
+        scpi_series = [0.0] * len(month_dates)
+        for inv in scpi_investments:
+            if inv.currency != dc:
+                continue
+            try:
+                values = inv.get_estimated_values(month_dates)
+            except Exception:
+                continue
+            for index, value in enumerate(values):
+                scpi_series[index] += float(value.amount)
+
+        # Properties — one timeline pass over all valuations and loan schedules
+        properties_gross, properties_net = PropertyValueTimeline(
+            [prop for prop in properties if prop.currency == dc]
+        ).series(month_dates)
+        properties_net_series = [float(value) for value in properties_net]
+        # loans = gross - net (negative equity portion)
+        properties_loans_series = [
+            float(gross - net)
+            for gross, net in zip(properties_gross, properties_net, strict=True)
+        ]
 
         return JsonResponse(
             {
@@ -411,3 +410,69 @@ class AlertsApiView(View):
                 )
 
         return JsonResponse({"alerts": alerts})
+
+
+@method_decorator(login_required, name="dispatch")
+class JobStatusApiView(View):
+    """Return the state and progress of a background job, for polling.
+
+    Users see their own jobs; staff see every job.
+    """
+
+    def get(self, request, pk):
+        jobs = Job.objects.all()
+        if not request.user.is_staff:
+            jobs = jobs.filter(user=request.user)
+        job = get_object_or_404(jobs, pk=pk)
+        return JsonResponse(
+            {
+                "id": job.pk,
+                "name": job.name,
+                "state": job.state,
+                "progress": job.progress,
+                "message": job.progress_message,
+                "finished": job.is_finished,
+                "attempts": job.attempts,
+                "result": job.result if job.state == Job.State.SUCCEEDED else None,
+                "error": job.error.strip().splitlines()[-1]
+                if job.state == Job.State.FAILED and job.error
+                else "",
+            }
+        )
+
+
+@method_decorator(login_required, name="dispatch")
+class CacheStatsApiView(View):
+    """Return the cache hits and misses by namespace of this process (staff only)."""
+
+    def get(self, request):
+        if not request.user.is_staff:
+            return JsonResponse({"error": "Forbidden"}, status=403)
+        return JsonResponse(
+            {
+                "backend": settings.CACHES["default"]["BACKEND"],
+                "namespaces": cache_stats(),
+            }
+        )
+
+
+@method_decorator(login_required, name="dispatch")
+class RequestMetricsApiView(View):
+    """Return the slowest routes of this process, by average duration (staff only).
+
+    ``?limit=`` sets the number of routes (10 by default, 100 at most).
+    """
+
+    def get(self, request):
+        if not request.user.is_staff:
+            return JsonResponse({"error": "Forbidden"}, status=403)
+        try:
+            limit = min(max(int(request.GET.get("limit", 10)), 1), 100)
+        except ValueError:
+            return JsonResponse({"error": "Invalid parameters"}, status=400)
+        return JsonResponse(
+            {
+                "enabled": settings.REQUEST_METRICS,
+                "routes": slowest_routes(limit),
+            }
+        )
@@ -1,6 +1,7 @@
 """Base application configuration for the Django project."""
 
 from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class BaseConfig(AppConfig):
@@ -8,3 +9,7 @@ class BaseConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "base"
+
+    def ready(self):
+        """Register the background job handlers of every app (their ``jobs`` module)."""
+        autodiscover_modules("jobs")
@@ -0,0 +1,230 @@
+"""
+Application cache: namespaced, versioned keys over Django's cache.
+
+Every entry belongs to a namespace (``"property.panel"``, ``"scpi.dividends"``
+...) and its key holds two versions:
+
+- the version of the data it was computed from, e.g. ``Property.data_version``
+  (bumped by signals on every write): an entry of older data is never read
+  again, it just expires;
+- the version of its namespace, bumped by ``bump_namespace()`` to drop every
+  entry of the namespace at once (e.g. when its computation changes).
+
+``cached()`` wraps a service function, ``get_or_set()`` caches one value and
+``get_many()`` / ``set_many()`` work in bulk.  Hits and misses are counted
+per namespace in each process (``cache_stats()``).
+
+The backend is set by ``CACHE_BACKEND`` (see ``glad.settings``).
+"""
+
+import functools
+import hashlib
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from django.core.cache import cache
+
+DEFAULT_TIMEOUT = 24 * 60 * 60
+
+_MISSING = object()
+
+
+# ── Keys ──────────────────────────────────────────────────────────────────────
+
+
+def _namespace_version_key(namespace: str) -> str:
+    return f"{namespace}:version"
+
+
+def namespace_version(namespace: str) -> int:
+    """Return the current version of *namespace*.
+
+    A namespace starts at the current time in nanoseconds, not at 1: if its
+    version is evicted from the cache, the new one is still greater than any
+    earlier one, so the entries of the old versions are never read again.
+    """
+    key = _namespace_version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key, 0)
+    return version
+
+
+def bump_namespace(namespace: str) -> int:
+    """Drop every entry of *namespace*; return its new version."""
+    key = _namespace_version_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def _key_parts(parts: Any) -> tuple:
+    if isinstance(parts, str | bytes) or not isinstance(parts, Iterable):
+        return (parts,)
+    return tuple(parts)
+
+
+def make_key(
+    namespace: str,
+    parts: Any,
+    version: Hashable | None = None,
+    *,
+    namespace_ver: int | None = None,
+) -> str:
+    """Return the cache key of *parts* in *namespace* for the data *version*.
+
+    *parts* (a value or an iterable of values) are hashed, so the key stays
+    short and valid on every backend whatever they hold.
+    """
+    if namespace_ver is None:
+        namespace_ver = namespace_version(namespace)
+    raw = "|".join(str(part) for part in _key_parts(parts))
+    digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    data_ver = "" if version is None else version
+    return f"{namespace}:{namespace_ver}:v{data_ver}:{digest}"
+
+
+# ── Hit / miss counters ───────────────────────────────────────────────────────
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float | None:
+        total = self.hits + self.misses
+        return round(self.hits / total, 4) if total else None
+
+
+_stats: dict[str, CacheStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _count(namespace: str, hits: int = 0, misses: int = 0) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(namespace, CacheStats())
+        stats.hits += hits
+        stats.misses += misses
+
+
+def cache_stats() -> dict[str, dict]:
+    """Return the hits, misses and hit ratio of every namespace in this process."""
+    with _stats_lock:
+        return {
+            namespace: {**asdict(stats), "hit_ratio": stats.hit_ratio}
+            for namespace, stats in sorted(_stats.items())
+        }
+
+
+def reset_cache_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+# ── Reads and writes ──────────────────────────────────────────────────────────
+
+
+def get_or_set[T](
+    namespace: str,
+    parts: Any,
+    build: Callable[[], T],
+    timeout: int | None = DEFAULT_TIMEOUT,
+    version: Hashable | None = None,
+) -> T:
+    """Return the entry of *parts*, calling *build* and caching its result on a miss.
+
+    ``None`` results are cached too.  *build* must return picklable data.
+    """
+    key = make_key(namespace, parts, version)
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        _count(namespace, hits=1)
+        return value
+    _count(namespace, misses=1)
+    value = build()
+    cache.set(key, value, timeout)
+    return value
+
+
+def get_many(
+    namespace: str, keys: Iterable[Any], version: Hashable | None = None
+) -> dict[Any, Any]:
+    """Return the cached entries among *keys* (each a value or a tuple of parts)."""
+    keys = list(keys)
+    namespace_ver = namespace_version(namespace)
+    cache_keys = {
+        make_key(namespace, key, version, namespace_ver=namespace_ver): key
+        for key in keys
+    }
+    found = cache.get_many(list(cache_keys))
+    _count(namespace, hits=len(found), misses=len(keys) - len(found))
+    return {cache_keys[cache_key]: value for cache_key, value in found.items()}
+
+
+def set_many(
+    namespace: str,
+    values: Mapping[Any, Any],
+    timeout: int | None = DEFAULT_TIMEOUT,
+    version: Hashable | None = None,
+) -> None:
+    """Cache every entry of *values*, keyed like ``get_many()``."""
+    namespace_ver = namespace_version(namespace)
+    cache.set_many(
+        {
+            make_key(namespace, key, version, namespace_ver=namespace_ver): value
+            for key, value in values.items()
+        },
+        timeout,
+    )
+
+
+def cached[**P, R](
+    key_fn: Callable[P, Any],
+    ttl: int | None = DEFAULT_TIMEOUT,
+    version_fn: Callable[P, Hashable] | None = None,
+    *,
+    namespace: str | None = None,
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Cache the results of the decorated function.
+
+    *key_fn* and *version_fn* get the arguments of the call: the first
+    returns what identifies the result (a value or a tuple), the second the
+    version of the data it is computed from.  The namespace defaults to the
+    dotted path of the function.  The wrapper also has ``cache_key(*args)``,
+    ``invalidate()`` (bumps the namespace) and ``uncached`` (the function).
+    """
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        name = namespace or f"{func.__module__}.{func.__qualname__}"
+
+        def cache_key(*args: P.args, **kwargs: P.kwargs) -> str:
+            version = version_fn(*args, **kwargs) if version_fn else None
+            return make_key(name, key_fn(*args, **kwargs), version)
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            version = version_fn(*args, **kwargs) if version_fn else None
+            return get_or_set(
+                name,
+                key_fn(*args, **kwargs),
+                lambda: func(*args, **kwargs),
+                ttl,
+                version,
+            )
+
+        wrapper.namespace = name  # type: ignore[attr-defined]
+        wrapper.cache_key = cache_key  # type: ignore[attr-defined]
+        wrapper.invalidate = lambda: bump_namespace(name)  # type: ignore[attr-defined]
+        wrapper.uncached = func  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -0,0 +1,301 @@
+"""
+Background jobs backed by the database: no broker, just the ``Job`` table.
+
+Handlers are plain functions registered under a name with ``@register()``,
+in a ``jobs`` module of an app (those modules are imported when the apps are
+ready).  A handler gets the ``Job``, reads its ``payload``, may report its
+progress with ``job.set_progress()`` and returns a JSON-serializable result.
+While it runs, the worker marks the job alive every ``HEARTBEAT_INTERVAL``, so
+a long handler is never taken for a lost one.
+
+``enqueue()`` adds a job; ``manage.py run_worker`` claims the due jobs one at
+a time and runs them (see ``work()``).  On PostgreSQL a job is claimed with
+``SELECT ... FOR UPDATE SKIP LOCKED``, so several workers never wait on each
+other; SQLite has no row locks but serializes the writes, so a job is claimed
+there by a conditional update only one worker can win.
+"""
+
+import datetime
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from django.db import (
+    IntegrityError,
+    close_old_connections,
+    connections,
+    router,
+    transaction,
+)
+from django.db.models import F
+from django.utils import timezone
+
+from base.models import Job
+
+logger = logging.getLogger(__name__)
+
+# Delay before the first retry of a failed job, doubled after every attempt
+RETRY_DELAY = datetime.timedelta(seconds=30)
+# A running job not marked alive for this long is taken as lost with its worker
+STALE_AFTER = datetime.timedelta(hours=1)
+# Delay between two heartbeats of a running job
+HEARTBEAT_INTERVAL = datetime.timedelta(minutes=5)
+
+JobHandler = Callable[[Job], Any]
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def register(name: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the decorated function as the handler of the jobs named *name*."""
+
+    def decorator(handler: JobHandler) -> JobHandler:
+        if _handlers.get(name, handler) is not handler:
+            raise ValueError(f"A job handler is already registered as {name!r}.")
+        _handlers[name] = handler
+        return handler
+
+    return decorator
+
+
+def enqueue(
+    name: str,
+    payload: dict | None = None,
+    *,
+    dedup_key: str = "",
+    user=None,
+    max_attempts: int = 3,
+    run_after: datetime.datetime | None = None,
+) -> Job:
+    """Add a job to the queue and return it.
+
+    With a *dedup_key*, the pending or running job holding the same key is
+    returned instead, if any: a refresh requested twice runs once.
+    """
+    if name not in _handlers:
+        raise ValueError(f"No job handler is registered as {name!r}.")
+    active = Job.objects.filter(dedup_key=dedup_key, state__in=Job.ACTIVE_STATES)
+    if dedup_key and (existing := active.first()) is not None:
+        return existing
+    try:
+        with transaction.atomic():
+            return Job.objects.create(
+                name=name,
+                payload=payload or {},
+                dedup_key=dedup_key,
+                user=user,
+                max_attempts=max_attempts,
+                run_after=run_after or timezone.now(),
+            )
+    except IntegrityError:
+        # Another request enqueued the same key meanwhile: return its job
+        existing = active.first() if dedup_key else None
+        if existing is None:
+            raise
+        return existing
+
+
+def _mark_running(pk: int, worker: str, now: datetime.datetime) -> bool:
+    """Move the job *pk* from pending to running; return False if it was not pending."""
+    return bool(
+        Job.objects.filter(pk=pk, state=Job.State.PENDING).update(
+            state=Job.State.RUNNING,
+            worker=worker,
+            attempts=F("attempts") + 1,
+            started_at=now,
+            finished_at=None,
+            updated_at=now,
+        )
+    )
+
+
+def claim_job(worker: str) -> Job | None:
+    """Claim the oldest due pending job for *worker*; return None if there is none."""
+    now = timezone.now()
+    due = Job.objects.filter(state=Job.State.PENDING, run_after__lte=now).order_by(
+        "run_after", "pk"
+    )
+    connection = connections[router.db_for_write(Job)]
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=connection.alias):
+            pk = (
+                due.select_for_update(skip_locked=True)
+                .values_list("pk", flat=True)
+                .first()
+            )
+            if pk is None:
+                return None
+            _mark_running(pk, worker, now)
+        return Job.objects.get(pk=pk)
+
+    # No row locks: the conditional update is the claim, a lost race moves on
+    for pk in due.values_list("pk", flat=True)[:10]:
+        if _mark_running(pk, worker, now):
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def _touch(job: Job) -> None:
+    """Mark the running *job* alive."""
+    Job.objects.filter(pk=job.pk, state=Job.State.RUNNING).update(
+        updated_at=timezone.now()
+    )
+
+
+@contextmanager
+def _heartbeat(job: Job) -> Iterator[None]:
+    """Mark *job* alive every ``HEARTBEAT_INTERVAL`` from a thread, while in the block."""
+    stop = threading.Event()
+
+    def beat() -> None:
+        beaten = False
+        while not stop.wait(HEARTBEAT_INTERVAL.total_seconds()):
+            beaten = True
+            try:
+                _touch(job)
+            except Exception:
+                logger.warning("Heartbeat of job %s failed", job.pk, exc_info=True)
+        if beaten:
+            connections.close_all()  # the connections opened by this thread
+
+    thread = threading.Thread(target=beat, name=f"job-{job.pk}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _record_failure(job: Job) -> None:
+    """Record the exception being handled as the error of *job*, and retry it."""
+    job.error = traceback.format_exc()
+    if job.attempts < job.max_attempts:
+        delay = RETRY_DELAY * 2 ** (job.attempts - 1)
+        job.state = Job.State.PENDING
+        job.run_after = timezone.now() + delay
+        logger.warning(
+            "Job %s (%s) failed, attempt %s/%s; retry in %s",
+            job.pk,
+            job.name,
+            job.attempts,
+            job.max_attempts,
+            delay,
+        )
+    else:
+        job.state = Job.State.FAILED
+        job.finished_at = timezone.now()
+        logger.exception("Job %s (%s) failed", job.pk, job.name)
+    try:
+        job.save(
+            update_fields=["state", "error", "run_after", "finished_at", "updated_at"]
+        )
+    except Exception:
+        # The stale check gives the job back once its heartbeat has stopped
+        logger.exception("Could not record the failure of job %s", job.pk)
+
+
+def run_job(job: Job) -> Job:
+    """Run a claimed job and record its result, or its error and next attempt.
+
+    A result that cannot be saved (e.g. not JSON-serializable) fails the
+    attempt like an error of the handler; the worker keeps running.
+    """
+    handler = _handlers.get(job.name)
+    if handler is None:
+        job.state = Job.State.FAILED
+        job.error = f"No job handler is registered as {job.name!r}."
+        job.finished_at = timezone.now()
+        job.save(update_fields=["state", "error", "finished_at", "updated_at"])
+        logger.error("Job %s failed: %s", job.pk, job.error)
+        return job
+
+    try:
+        with _heartbeat(job):
+            result = handler(job)
+        job.state = Job.State.SUCCEEDED
+        job.result = result
+        job.progress = 100
+        job.error = ""
+        job.finished_at = timezone.now()
+        # A savepoint, so a failed save leaves the connection usable
+        with transaction.atomic():
+            job.save(
+                update_fields=[
+                    "state",
+                    "result",
+                    "progress",
+                    "error",
+                    "finished_at",
+                    "updated_at",
+                ]
+            )
+    except Exception:
+        job.result = None
+        job.finished_at = None
+        _record_failure(job)
+        return job
+
+    logger.info("Job %s (%s) succeeded", job.pk, job.name)
+    return job
+
+
+def requeue_stale_jobs(older_than: datetime.timedelta = STALE_AFTER) -> int:
+    """Give back the running jobs whose worker died; return how many there were.
+
+    A job is stale when it has not been marked alive (by the heartbeat of its
+    worker, or its progress) for *older_than*: it goes back to the queue, or
+    fails if it has no attempt left.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(state=Job.State.RUNNING, updated_at__lt=now - older_than)
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        state=Job.State.FAILED,
+        error="The worker running the job stopped.",
+        finished_at=now,
+        updated_at=now,
+    )
+    requeued = stale.update(
+        state=Job.State.PENDING, run_after=now, worker="", updated_at=now
+    )
+    return failed + requeued
+
+
+def default_worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def work(
+    worker: str | None = None,
+    *,
+    once: bool = False,
+    poll_interval: float = 5.0,
+    max_jobs: int | None = None,
+) -> int:
+    """Claim and run jobs until stopped; return the number of jobs run.
+
+    With *once*, stop when no job is due; with *max_jobs*, after that many.
+    The database connection is checked between jobs (outside a transaction),
+    so a long-lived worker survives a database restart.
+    """
+    worker = worker or default_worker_name()
+    requeue_stale_jobs()
+    done = 0
+    while max_jobs is None or done < max_jobs:
+        if not transaction.get_connection().in_atomic_block:
+            close_old_connections()
+        job = claim_job(worker)
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        done += 1
+    return done
@@ -0,0 +1,48 @@
+"""Run the background jobs of the ``Job`` queue."""
+
+from django.core.management.base import BaseCommand
+
+from base.jobs import default_worker_name, work
+
+
+class Command(BaseCommand):
+    help = "Claim and run the queued background jobs until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs that are due, then exit.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5.0,
+            help="Seconds to wait when no job is due (default: 5).",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=None,
+            help="Exit after running this many jobs.",
+        )
+        parser.add_argument(
+            "--name",
+            default="",
+            help="Name of the worker, recorded on its jobs (default: host:pid).",
+        )
+
+    def handle(self, *args, **options):
+        worker = options["name"] or default_worker_name()
+        self.stdout.write(f"Worker {worker} started.")
+        try:
+            done = work(
+                worker,
+                once=options["once"],
+                poll_interval=options["sleep"],
+                max_jobs=options["max_jobs"],
+            )
+        except KeyboardInterrupt:
+            self.stdout.write(f"Worker {worker} interrupted.")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker} ran {done} job(s)."))
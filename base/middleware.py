@@ -0,0 +1,63 @@
+"""Middleware for the base app."""
+
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from base.request_metrics import QueryRecorder, RequestMetrics, record
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTimingMiddleware:
+    """Measure the database queries and the duration of every request.
+
+    Opt-in with the ``REQUEST_METRICS`` setting: when it is off, Django drops
+    the middleware at startup, so it costs nothing.  When on, each response
+    gets a ``Server-Timing`` header (shown by the browser dev tools), each
+    request a structured log line, and repeated (N+1) queries a warning; the
+    metrics are summed by route for the slowest routes endpoint.  The
+    duration of a streamed response stops when its streaming starts.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        metrics = RequestMetrics(
+            method=request.method,
+            route=f"/{match.route}" if match else "<unresolved>",
+            status=response.status_code,
+            duration_ms=duration * 1000,
+            db_ms=recorder.duration * 1000,
+            queries=recorder.count,
+            repeated=recorder.repeated(),
+        )
+        record(metrics)
+        response["Server-Timing"] = metrics.server_timing()
+        logger.info("request_metrics %s", json.dumps(metrics.log_record()))
+        for signature, count in metrics.repeated.items():
+            logger.warning(
+                "Query run %s times by %s %s: %s",
+                count,
+                metrics.method,
+                metrics.route,
+                signature[:300],
+            )
+        return response
@@ -1,6 +1,10 @@
 """General models for the application."""
 
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
 
 class BaseModel(models.Model):
@@ -14,3 +18,103 @@ class BaseModel(models.Model):
         """Meta options for the base model."""
 
         abstract = True
+
+
+class Job(BaseModel):
+    """A unit of background work, run by ``manage.py run_worker``.
+
+    Jobs are enqueued with ``base.jobs.enqueue()`` under the name of a
+    registered handler, with a JSON payload.  A worker claims the oldest due
+    job, runs its handler and records the progress, the result or the error;
+    a failed job is retried with a growing delay until ``max_attempts``.
+    """
+
+    class State(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        RUNNING = "running", _("Running")
+        SUCCEEDED = "succeeded", _("Succeeded")
+        FAILED = "failed", _("Failed")
+
+    ACTIVE_STATES = (State.PENDING, State.RUNNING)
+
+    class Meta:
+        verbose_name = _("Job")
+        verbose_name_plural = _("Jobs")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["state", "run_after"]),
+        ]
+        constraints = [
+            # One pending or running job per de-duplication key
+            models.UniqueConstraint(
+                fields=["dedup_key"],
+                condition=models.Q(state__in=["pending", "running"])
+                & ~models.Q(dedup_key=""),
+                name="unique_active_job_dedup_key",
+            ),
+        ]
+
+    name = models.CharField(max_length=100, verbose_name=_("Name"))
+    payload = models.JSONField(
+        default=dict, blank=True, encoder=DjangoJSONEncoder, verbose_name=_("Payload")
+    )
+    state = models.CharField(
+        max_length=10,
+        choices=State.choices,
+        default=State.PENDING,
+        verbose_name=_("State"),
+    )
+    dedup_key = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_("De-duplication key"),
+        help_text=_(
+            "A job is not enqueued while another one with the same key is "
+            "pending or running."
+        ),
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+        verbose_name=_("User"),
+    )
+    progress = models.PositiveSmallIntegerField(
+        default=0, verbose_name=_("Progress (%)")
+    )
+    progress_message = models.CharField(
+        max_length=255, blank=True, verbose_name=_("Progress message")
+    )
+    result = models.JSONField(
+        null=True, blank=True, encoder=DjangoJSONEncoder, verbose_name=_("Result")
+    )
+    error = models.TextField(blank=True, verbose_name=_("Error"))
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_("Attempts"))
+    max_attempts = models.PositiveSmallIntegerField(
+        default=3, verbose_name=_("Maximum attempts")
+    )
+    run_after = models.DateTimeField(default=timezone.now, verbose_name=_("Run after"))
+    worker = models.CharField(max_length=100, blank=True, verbose_name=_("Worker"))
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Started"))
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("Finished")
+    )
+
+    def __str__(self) -> str:
+        return f"{self.name} #{self.pk} ({self.get_state_display()})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.state in (self.State.SUCCEEDED, self.State.FAILED)
+
+    def set_progress(self, progress: int, message: str = "") -> None:
+        """Record the progress of the running job (0–100), for the polling endpoint."""
+        self.progress = max(0, min(100, int(progress)))
+        self.progress_message = message[:255]
+        type(self).objects.filter(pk=self.pk).update(
+            progress=self.progress,
+            progress_message=self.progress_message,
+            updated_at=timezone.now(),
+        )
@@ -0,0 +1,151 @@
+"""
+Database queries and timings of the requests, aggregated by route.
+
+``QueryRecorder`` wraps the query execution of the database connections
+(``connection.execute_wrapper()``) during a request: it counts the queries,
+their time and their signatures, the SQL with its parameters as
+placeholders.  A signature run ``N_PLUS_ONE_THRESHOLD`` times or more in a
+request is the shape of an N+1 query: one query per row of a previous one.
+
+The metrics of every request are summed by route in the process, for the
+slowest routes endpoint (see ``slowest_routes()``).
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+# Report a query signature run this many times or more in one request
+N_PLUS_ONE_THRESHOLD = 3
+
+# "IN (%s, %s, %s)" lists vary with the number of values, not the query
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+
+
+def query_signature(sql: str) -> str:
+    """Return the signature of a query: its SQL, with ``IN`` lists collapsed."""
+    return _IN_LIST.sub("IN (...)", sql)
+
+
+class QueryRecorder:
+    """Execute wrapper of the connections recording the queries and their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.signatures: Counter[str] = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.signatures[query_signature(sql)] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> dict[str, int]:
+        """Return the signatures run *threshold* times or more, with their count."""
+        return {
+            signature: count
+            for signature, count in self.signatures.most_common()
+            if count >= threshold
+        }
+
+
+@dataclass
+class RequestMetrics:
+    """Queries and timings of one request."""
+
+    method: str
+    route: str
+    status: int
+    duration_ms: float
+    db_ms: float
+    queries: int
+    repeated: dict[str, int] = field(default_factory=dict)
+
+    def server_timing(self) -> str:
+        """Return the value of the ``Server-Timing`` header."""
+        metrics = [
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"',
+            f"app;dur={self.duration_ms:.1f}",
+        ]
+        if self.repeated:
+            metrics.append(f'nplusone;desc="{len(self.repeated)} repeated queries"')
+        return ", ".join(metrics)
+
+    def log_record(self) -> dict:
+        """Return the metrics as a flat dict, for a structured log line."""
+        return {
+            "method": self.method,
+            "route": self.route,
+            "status": self.status,
+            "duration_ms": round(self.duration_ms, 1),
+            "db_ms": round(self.db_ms, 1),
+            "queries": self.queries,
+            "repeated_queries": sum(self.repeated.values()),
+        }
+
+
+@dataclass
+class RouteStats:
+    """Metrics of the requests of one route, summed."""
+
+    requests: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    total_db_ms: float = 0.0
+    total_queries: int = 0
+    max_queries: int = 0
+    n_plus_one: int = 0
+
+    def add(self, metrics: RequestMetrics) -> None:
+        self.requests += 1
+        self.total_ms += metrics.duration_ms
+        self.max_ms = max(self.max_ms, metrics.duration_ms)
+        self.total_db_ms += metrics.db_ms
+        self.total_queries += metrics.queries
+        self.max_queries = max(self.max_queries, metrics.queries)
+        self.n_plus_one += bool(metrics.repeated)
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.requests if self.requests else 0.0
+
+
+_routes: dict[tuple[str, str], RouteStats] = {}
+_routes_lock = threading.Lock()
+
+
+def record(metrics: RequestMetrics) -> None:
+    """Add the metrics of a request to the stats of its route."""
+    with _routes_lock:
+        _routes.setdefault((metrics.method, metrics.route), RouteStats()).add(metrics)
+
+
+def slowest_routes(limit: int = 10) -> list[dict]:
+    """Return the *limit* routes with the longest average duration, in this process."""
+    with _routes_lock:
+        ranked = sorted(_routes.items(), key=lambda item: item[1].avg_ms, reverse=True)
+        return [
+            {
+                "method": method,
+                "route": route,
+                "requests": stats.requests,
+                "avg_ms": round(stats.avg_ms, 1),
+                "max_ms": round(stats.max_ms, 1),
+                "avg_db_ms": round(stats.total_db_ms / stats.requests, 1),
+                "avg_queries": round(stats.total_queries / stats.requests, 1),
+                "max_queries": stats.max_queries,
+                "n_plus_one_requests": stats.n_plus_one,
+            }
+            for (method, route), stats in ranked[:limit]
+        ]
+
+
+def reset_route_stats() -> None:
+    with _routes_lock:
+        _routes.clear()
@@ -16,7 +16,8 @@ from finance.models.investment_account import (
 )
 from finance.models.saving_account import SavingAccount, SavingAccountValue
 from property.models import Property
-from property.models.scpi import SCPI, SCPIInvestment
+from property.models.scpi import SCPI, SCPIInvestment, SCPISharePrice
+from property.utils import add_months_safe
 
 
 def get_json(client, url):
@@ -921,3 +922,23 @@ def test_alerts_investment_no_decline(admin_client, investment_account_type):
     data = response.json()
     inv_alerts = [a for a in data["alerts"] if "Stable" in a["account"]]
     assert len(inv_alerts) == 0
+
+
+@pytest.mark.django_db
+def test_patrimony_chart_scpi_matches_the_monthly_values(admin_client):
+    investment = _make_scpi_investment()
+    SCPISharePrice.objects.create(
+        scpi=investment.scpi,
+        date=datetime.date.today() - datetime.timedelta(days=200),
+        subscription_value=Money(120, "EUR"),
+    )
+
+    data = get_json(admin_client, reverse("api_patrimony_chart")).json()
+
+    first = datetime.date.today().replace(day=1)
+    months = [
+        add_months_safe(first, -back) for back in range(len(data["months"]) - 1, -1, -1)
+    ]
+    assert data["scpi"] == [
+        float(investment.get_estimated_value(month).amount) for month in months
+    ]
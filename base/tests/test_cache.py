@@ -0,0 +1,148 @@
+"""Tests for base/cache.py — namespaced, versioned cache helpers."""
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from base.cache import (
+    bump_namespace,
+    cache_stats,
+    cached,
+    get_many,
+    get_or_set,
+    make_key,
+    namespace_version,
+    reset_cache_stats,
+    set_many,
+)
+
+
+@pytest.fixture(autouse=True)
+def stats():
+    reset_cache_stats()
+    yield
+    reset_cache_stats()
+
+
+class TestKeys:
+    def test_key_follows_parts_and_versions(self):
+        key = make_key("test.ns", ("a", 1), version=3)
+
+        assert make_key("test.ns", ("a", 1), version=3) == key
+        assert make_key("test.ns", ("a", 2), version=3) != key
+        assert make_key("test.ns", ("a", 1), version=4) != key
+        assert make_key("test.other", ("a", 1), version=3) != key
+        assert make_key("test.ns", "a") == make_key("test.ns", ("a",))
+
+    def test_keys_stay_short_whatever_the_parts(self):
+        key = make_key("test.ns", ["x" * 1000, "with spaces"], version=1)
+
+        assert len(key) < 100
+        assert " " not in key
+
+    def test_bumping_a_namespace_changes_its_keys(self):
+        key = make_key("test.ns", "a")
+
+        assert bump_namespace("test.ns") == namespace_version("test.ns")
+        assert make_key("test.ns", "a") != key
+
+    def test_a_lost_namespace_version_never_goes_back(self):
+        version = namespace_version("test.ns")
+        cache.clear()
+
+        assert namespace_version("test.ns") > version
+
+
+class TestGetOrSet:
+    def test_builds_on_a_miss_only(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"n": len(calls)}
+
+        assert get_or_set("test.ns", "a", build, version=1) == {"n": 1}
+        assert get_or_set("test.ns", "a", build, version=1) == {"n": 1}
+        assert get_or_set("test.ns", "a", build, version=2) == {"n": 2}
+        assert cache_stats()["test.ns"] == {"hits": 1, "misses": 2, "hit_ratio": 0.3333}
+
+    def test_none_results_are_cached(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+
+        get_or_set("test.ns", "none", build)
+        get_or_set("test.ns", "none", build)
+
+        assert len(calls) == 1
+
+
+class TestBulk:
+    def test_get_many_returns_what_set_many_stored(self):
+        set_many("test.bulk", {1: "one", (2, "b"): "two"}, version=7)
+
+        found = get_many("test.bulk", [1, (2, "b"), 3], version=7)
+
+        assert found == {1: "one", (2, "b"): "two"}
+        assert get_many("test.bulk", [1], version=8) == {}
+        assert cache_stats()["test.bulk"] == {
+            "hits": 2,
+            "misses": 2,
+            "hit_ratio": 0.5,
+        }
+
+
+class TestCachedDecorator:
+    def test_caches_by_key_and_version(self):
+        calls = []
+
+        @cached(
+            key_fn=lambda item, scale=1: (item["id"], scale),
+            version_fn=lambda item, scale=1: item["version"],
+            namespace="test.decorated",
+        )
+        def compute(item, scale=1):
+            calls.append(item["id"])
+            return item["id"] * scale
+
+        item = {"id": 4, "version": 1}
+        assert compute(item) == 4
+        assert compute(item) == 4
+        assert compute(item, scale=2) == 8
+        item["version"] = 2
+        assert compute(item) == 4
+
+        assert calls == [4, 4, 4]
+        assert cache.get(compute.cache_key(item)) == 4
+
+    def test_invalidate_drops_every_entry(self):
+        calls = []
+
+        @cached(key_fn=lambda value: value)
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        double(1)
+        double.invalidate()
+        double(1)
+
+        assert calls == [1, 1]
+        assert double.uncached(3) == 6
+        assert double.namespace.endswith("double")
+
+
+@pytest.mark.django_db
+class TestCacheStatsApi:
+    def test_staff_only(self, client, user, admin_user):
+        get_or_set("test.ns", "a", lambda: 1)
+        url = reverse("api_cache_stats")
+
+        client.force_login(user)
+        assert client.get(url).status_code == 403
+        client.force_login(admin_user)
+        data = client.get(url).json()
+
+        assert data["backend"].endswith("LocMemCache")
+        assert data["namespaces"]["test.ns"]["misses"] == 1
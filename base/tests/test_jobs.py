@@ -0,0 +1,258 @@
+"""Tests for base/jobs.py — the database-backed job queue and its worker."""
+
+import datetime
+import threading
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from django.utils import timezone
+from moneyed import Money
+
+from base import jobs
+from base.models import Job
+from property.models import SCPI, SCPIDividend, SCPIInvestment
+from property.services.scpi_dividends import dividend_analytics_cache_key
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    """Register test handlers for the duration of a test."""
+    calls = []
+
+    def echo(job):
+        calls.append(job.pk)
+        job.set_progress(50, "halfway")
+        return {"echo": job.payload.get("value"), "amount": Decimal("1.50")}
+
+    def broken(job):
+        calls.append(job.pk)
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(jobs._handlers, "test.echo", echo)
+    monkeypatch.setitem(jobs._handlers, "test.broken", broken)
+    return calls
+
+
+@pytest.mark.django_db
+class TestEnqueue:
+    def test_unknown_handlers_are_refused(self):
+        with pytest.raises(ValueError):
+            jobs.enqueue("test.missing")
+
+    def test_dedup_key_returns_the_active_job(self, handlers):
+        first = jobs.enqueue("test.echo", {"value": 1}, dedup_key="refresh")
+        second = jobs.enqueue("test.echo", {"value": 2}, dedup_key="refresh")
+
+        assert second.pk == first.pk
+        assert Job.objects.count() == 1
+
+    def test_dedup_key_is_free_again_once_the_job_ran(self, handlers):
+        first = jobs.enqueue("test.echo", dedup_key="refresh")
+        jobs.run_job(jobs.claim_job("w1"))
+
+        second = jobs.enqueue("test.echo", dedup_key="refresh")
+
+        assert second.pk != first.pk
+
+    def test_the_database_refuses_a_second_active_job_per_key(self, handlers):
+        jobs.enqueue("test.echo", dedup_key="refresh")
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            Job.objects.create(name="test.echo", dedup_key="refresh")
+
+
+@pytest.mark.django_db
+class TestClaimAndRun:
+    def test_claims_the_oldest_due_job_once(self, handlers):
+        later = jobs.enqueue(
+            "test.echo", run_after=timezone.now() + datetime.timedelta(hours=1)
+        )
+        first = jobs.enqueue("test.echo")
+        second = jobs.enqueue("test.echo")
+
+        claimed = [jobs.claim_job("w1"), jobs.claim_job("w2"), jobs.claim_job("w3")]
+
+        assert [job.pk if job else None for job in claimed] == [
+            first.pk,
+            second.pk,
+            None,
+        ]
+        assert claimed[0].state == Job.State.RUNNING
+        assert claimed[0].attempts == 1
+        assert claimed[0].worker == "w1"
+        assert Job.objects.get(pk=later.pk).state == Job.State.PENDING
+
+    def test_success_records_the_result_and_progress(self, handlers):
+        job = jobs.enqueue("test.echo", {"value": "hello"})
+
+        jobs.run_job(jobs.claim_job("w1"))
+
+        job.refresh_from_db()
+        assert job.state == Job.State.SUCCEEDED
+        assert job.result == {"echo": "hello", "amount": "1.50"}
+        assert job.progress == 100
+        assert job.progress_message == "halfway"
+        assert job.finished_at is not None
+
+    def test_failures_are_retried_with_a_growing_delay(self, handlers):
+        job = jobs.enqueue("test.broken", max_attempts=2)
+
+        before = timezone.now()
+        jobs.run_job(jobs.claim_job("w1"))
+        job.refresh_from_db()
+
+        assert job.state == Job.State.PENDING
+        assert job.run_after >= before + jobs.RETRY_DELAY
+        assert "RuntimeError: boom" in job.error
+        # Not due yet
+        assert jobs.claim_job("w1") is None
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        jobs.run_job(jobs.claim_job("w1"))
+        job.refresh_from_db()
+
+        assert job.state == Job.State.FAILED
+        assert job.attempts == 2
+        assert len(handlers) == 2
+
+    def test_an_unserializable_result_fails_the_job(self, monkeypatch):
+        monkeypatch.setitem(jobs._handlers, "test.opaque", lambda job: object())
+        job = jobs.enqueue("test.opaque", max_attempts=1)
+
+        jobs.run_job(jobs.claim_job("w1"))
+
+        job.refresh_from_db()
+        assert job.state == Job.State.FAILED
+        assert job.result is None
+        assert "TypeError" in job.error
+
+    def test_a_long_handler_is_kept_alive(self, monkeypatch):
+        touched = threading.Event()
+        monkeypatch.setattr(jobs, "_touch", lambda job: touched.set())
+        monkeypatch.setattr(
+            jobs, "HEARTBEAT_INTERVAL", datetime.timedelta(milliseconds=10)
+        )
+        monkeypatch.setitem(
+            jobs._handlers, "test.slow", lambda job: touched.wait(timeout=5)
+        )
+        job = jobs.enqueue("test.slow")
+
+        jobs.run_job(jobs.claim_job("w1"))
+
+        job.refresh_from_db()
+        assert job.state == Job.State.SUCCEEDED
+        assert job.result is True
+
+    def test_a_job_without_handler_fails_at_once(self):
+        job = Job.objects.create(name="test.unregistered", max_attempts=5)
+
+        jobs.run_job(jobs.claim_job("w1"))
+
+        job.refresh_from_db()
+        assert job.state == Job.State.FAILED
+        assert job.attempts == 1
+
+    def test_stale_running_jobs_go_back_to_the_queue(self, handlers):
+        job = jobs.enqueue("test.echo", max_attempts=2)
+        exhausted = jobs.enqueue("test.echo", max_attempts=1)
+        jobs.claim_job("dead")
+        jobs.claim_job("dead")
+        Job.objects.update(updated_at=timezone.now() - datetime.timedelta(hours=2))
+
+        assert jobs.requeue_stale_jobs() == 2
+
+        job.refresh_from_db()
+        exhausted.refresh_from_db()
+        assert job.state == Job.State.PENDING
+        assert exhausted.state == Job.State.FAILED
+
+
+@pytest.mark.django_db
+class TestWorker:
+    def test_run_worker_once_runs_the_due_jobs(self, handlers):
+        jobs.enqueue("test.echo")
+        jobs.enqueue("test.broken", max_attempts=1)
+        out = StringIO()
+
+        call_command("run_worker", "--once", "--name", "test-worker", stdout=out)
+
+        assert "ran 2 job(s)" in out.getvalue()
+        assert sorted(Job.objects.values_list("state", flat=True)) == [
+            Job.State.FAILED,
+            Job.State.SUCCEEDED,
+        ]
+
+    def test_max_jobs_stops_the_worker(self, handlers):
+        for _ in range(3):
+            jobs.enqueue("test.echo")
+
+        assert jobs.work("w1", once=True, max_jobs=2) == 2
+        assert Job.objects.filter(state=Job.State.PENDING).count() == 1
+
+
+@pytest.mark.django_db
+class TestJobStatusApi:
+    def test_returns_the_progress_of_own_jobs(self, client, user, handlers):
+        job = jobs.enqueue("test.echo", {"value": 3}, user=user)
+        client.force_login(user)
+        url = reverse("api_job_status", kwargs={"pk": job.pk})
+
+        pending = client.get(url).json()
+        jobs.run_job(jobs.claim_job("w1"))
+        done = client.get(url).json()
+
+        assert pending["state"] == "pending"
+        assert pending["finished"] is False
+        assert done["state"] == "succeeded"
+        assert done["progress"] == 100
+        assert done["result"]["echo"] == 3
+
+    def test_failed_jobs_report_the_last_error_line(self, client, user, handlers):
+        job = jobs.enqueue("test.broken", user=user, max_attempts=1)
+        jobs.run_job(jobs.claim_job("w1"))
+        client.force_login(user)
+
+        data = client.get(reverse("api_job_status", kwargs={"pk": job.pk})).json()
+
+        assert data["finished"] is True
+        assert data["error"] == "RuntimeError: boom"
+
+    def test_jobs_of_others_are_hidden(self, client, user, admin_user, handlers):
+        job = jobs.enqueue("test.echo", user=admin_user)
+        url = reverse("api_job_status", kwargs={"pk": job.pk})
+
+        client.force_login(user)
+        assert client.get(url).status_code == 404
+        client.force_login(admin_user)
+        assert client.get(url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_refresh_scpi_dividends_warms_the_fund_caches():
+    fund = SCPI.objects.create(name="Queued SCPI")
+    SCPIInvestment.objects.create(
+        scpi=fund,
+        subscription_date=datetime.date(2021, 1, 15),
+        shares_count=Decimal("10"),
+        unit_purchase_price=Money(Decimal("200.00"), "EUR"),
+    )
+    SCPIDividend.objects.create(
+        scpi=fund,
+        payment_date=datetime.date(2021, 6, 30),
+        net_amount=Money(Decimal("40.00"), "EUR"),
+    )
+    job = jobs.enqueue("property.refresh_scpi_dividends", {"fund_ids": [fund.pk]})
+
+    jobs.work("w1", once=True)
+
+    job.refresh_from_db()
+    fund.refresh_from_db()
+    assert job.result == {"funds": 1}
+    assert job.progress_message == "Queued SCPI"
+    key = dividend_analytics_cache_key(fund, datetime.date.today())
+    assert cache.get(key)["total"] == Decimal("40.00")
@@ -0,0 +1,134 @@
+"""Tests for base/middleware.py and base/request_metrics.py."""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from django.urls import resolve, reverse
+
+from base.middleware import QueryTimingMiddleware
+from base.request_metrics import (
+    QueryRecorder,
+    query_signature,
+    reset_route_stats,
+    slowest_routes,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def routes():
+    reset_route_stats()
+    yield
+    reset_route_stats()
+
+
+@pytest.fixture
+def metrics_on(settings):
+    settings.REQUEST_METRICS = True
+
+
+def _request(path="/api/alerts/"):
+    request = RequestFactory().get(path)
+    request.resolver_match = resolve(path)
+    return request
+
+
+def test_signature_collapses_in_lists():
+    assert query_signature('SELECT 1 FROM "t" WHERE "id" IN (%s, %s, %s)') == (
+        query_signature('SELECT 1 FROM "t" WHERE "id" IN (%s)')
+    )
+
+
+def test_disabled_middleware_is_not_used(settings):
+    settings.REQUEST_METRICS = False
+
+    with pytest.raises(MiddlewareNotUsed):
+        QueryTimingMiddleware(lambda request: HttpResponse())
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("metrics_on")
+class TestQueryTimingMiddleware:
+    def test_counts_the_queries_and_flags_the_repeated_ones(self, caplog):
+        def view(request):
+            User.objects.count()
+            for pk in range(4):
+                User.objects.filter(pk=pk).exists()
+            return HttpResponse()
+
+        with caplog.at_level("INFO", logger="base.middleware"):
+            response = QueryTimingMiddleware(view)(_request())
+
+        timing = response["Server-Timing"]
+        assert 'desc="5 queries"' in timing
+        assert "app;dur=" in timing
+        assert 'nplusone;desc="1 repeated queries"' in timing
+        assert any('"queries": 5' in message for message in caplog.messages)
+        assert any("Query run 4 times" in message for message in caplog.messages)
+
+    def test_sums_the_requests_by_route(self):
+        def view(request):
+            User.objects.exists()
+            return HttpResponse()
+
+        middleware = QueryTimingMiddleware(view)
+        middleware(_request())
+        middleware(_request())
+        middleware(_request("/api/net-worth/"))
+
+        routes = {route["route"]: route for route in slowest_routes()}
+        assert routes["/api/alerts/"]["requests"] == 2
+        assert routes["/api/alerts/"]["avg_queries"] == 1
+        assert routes["/api/alerts/"]["n_plus_one_requests"] == 0
+        assert routes["/api/net-worth/"]["requests"] == 1
+
+    def test_recorder_keeps_counting_when_a_query_fails(self):
+        recorder = QueryRecorder()
+
+        def failing(sql, params, many, context):
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            recorder(failing, "SELECT %s", (1,), False, {})
+
+        assert recorder.count == 1
+
+    def test_header_on_real_responses(self, user):
+        client = Client()
+        client.force_login(user)
+
+        response = client.get(reverse("api_alerts"))
+
+        assert "db;dur=" in response["Server-Timing"]
+        assert slowest_routes(1)[0]["route"] == "/api/alerts/"
+
+
+@pytest.mark.django_db
+class TestRequestMetricsApi:
+    def test_staff_only(self, client, user, admin_user):
+        url = reverse("api_request_metrics")
+
+        client.force_login(user)
+        assert client.get(url).status_code == 403
+        client.force_login(admin_user)
+        assert client.get(url, {"limit": "x"}).status_code == 400
+        data = client.get(url, {"limit": 5}).json()
+
+        assert data == {"enabled": False, "routes": []}
+
+    def test_lists_the_slowest_routes_first(self, settings, admin_user):
+        settings.REQUEST_METRICS = True
+        client = Client()
+        client.force_login(admin_user)
+        client.get(reverse("api_alerts"))
+        client.get(reverse("api_net_worth"))
+
+        routes = client.get(reverse("api_request_metrics"), {"limit": 2}).json()[
+            "routes"
+        ]
+
+        assert len(routes) == 2
+        assert routes[0]["avg_ms"] >= routes[1]["avg_ms"]
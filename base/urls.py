@@ -19,4 +19,19 @@ urlpatterns = [
         name="api_recent_operations",
     ),
     path("api/alerts/", api_views.AlertsApiView.as_view(), name="api_alerts"),
+    path(
+        "api/cache-stats/",
+        api_views.CacheStatsApiView.as_view(),
+        name="api_cache_stats",
+    ),
+    path(
+        "api/request-metrics/",
+        api_views.RequestMetricsApiView.as_view(),
+        name="api_request_metrics",
+    ),
+    path(
+        "api/jobs/<int:pk>/",
+        api_views.JobStatusApiView.as_view(),
+        name="api_job_status",
+    ),
 ]
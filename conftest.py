@@ -13,6 +13,7 @@ from tests.conftest import (  # noqa: F401
     TEST_USER,
     admin_client,
     admin_user,
+    clear_cache,
     client,
     user,
     user_client,
@@ -16,6 +16,7 @@ from pathlib import Path
 from urllib.parse import urlparse
 
 from django.contrib.messages import constants as messages
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.translation import gettext_lazy as _
 from dotenv import load_dotenv
 
@@ -97,6 +98,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "base.middleware.QueryTimingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -108,6 +110,10 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Queries and timings of every request: Server-Timing header, log lines and
+# slowest routes endpoint (see base.middleware.QueryTimingMiddleware)
+REQUEST_METRICS = os.getenv("REQUEST_METRICS", "False").lower() == "true"
+
 ROOT_URLCONF = "glad.urls"
 
 TEMPLATES = [
@@ -164,6 +170,32 @@ else:
         }
     }
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# CACHE_BACKEND selects the backend, CACHE_LOCATION overrides its location:
+# the database backend needs `python manage.py createcachetable`.
+
+_CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "glad"),
+    "file": (
+        "django.core.cache.backends.filebased.FileBasedCache",
+        str(BASE_DIR / "data" / "cache"),
+    ),
+    "db": ("django.core.cache.backends.db.DatabaseCache", "glad_cache"),
+}
+_cache_backend = os.getenv("CACHE_BACKEND", "locmem").lower()
+if _cache_backend not in _CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"CACHE_BACKEND must be one of {', '.join(_CACHE_BACKENDS)}, "
+        f"not {_cache_backend!r}."
+    )
+CACHES = {
+    "default": {
+        "BACKEND": _CACHE_BACKENDS[_cache_backend][0],
+        "LOCATION": os.getenv("CACHE_LOCATION") or _CACHE_BACKENDS[_cache_backend][1],
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -7,6 +7,8 @@ from property.models import (
     AmortizationAsset,
     AmortizationSetup,
     Lease,
+    LedgerCategorizationRule,
+    LmnpYearClosing,
     ManagementMandate,
     Property,
     PropertyLedgerEntry,
@@ -164,6 +166,22 @@ class PropertyLedgerEntryAdmin(admin.ModelAdmin):
     readonly_fields = ("created_at", "updated_at")
 
 
+@admin.register(LedgerCategorizationRule)
+class LedgerCategorizationRuleAdmin(admin.ModelAdmin):
+    list_display = (
+        "pattern",
+        "match_field",
+        "is_regex",
+        "management_category",
+        "flow_type",
+        "property",
+        "priority",
+    )
+    list_filter = ("match_field", "management_category", "flow_type")
+    search_fields = ("pattern", "property__name")
+    readonly_fields = ("created_at", "updated_at")
+
+
 @admin.register(Lease)
 class LeaseAdmin(admin.ModelAdmin):
     list_display = (
@@ -214,6 +232,14 @@ class AmortizationSetupAdmin(admin.ModelAdmin):
     search_fields = ("property__name",)
 
 
+@admin.register(LmnpYearClosing)
+class LmnpYearClosingAdmin(admin.ModelAdmin):
+    list_display = ("property", "year", "deferred_amortization", "created_at")
+    list_filter = ("year",)
+    search_fields = ("property__name",)
+    readonly_fields = ("input_hash", "created_at", "updated_at")
+
+
 # ── SCPI ──────────────────────────────────────────────────────────────────────
 
 
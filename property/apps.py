@@ -8,3 +8,7 @@ class PropertyConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "property"
+
+    def ready(self):
+        """Import signals when the app is ready."""
+        import property.signals  # noqa: F401
@@ -650,6 +650,12 @@ class PropertyReportFilterForm(forms.Form):
         ),
         input_formats=["%Y-%m-%d"],
     )
+    granularity = forms.ChoiceField(
+        required=False,
+        label=_("Columns"),
+        choices=[("month", _("By month")), ("year", _("By year"))],
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -0,0 +1,26 @@
+"""Background jobs of the property app (see ``base.jobs``)."""
+
+import datetime
+
+from base.jobs import register
+
+
+@register("property.refresh_scpi_dividends")
+def refresh_scpi_dividends(job) -> dict:
+    """Recompute the cached dividend figures of the SCPI funds.
+
+    The payload may narrow the funds with ``fund_ids``; the figures are
+    cached for today, so the fund pages read them without computing.
+    """
+    from property.models import SCPI
+    from property.services.scpi_dividends import cached_dividend_analytics
+
+    funds = SCPI.objects.order_by("pk")
+    if job.payload.get("fund_ids"):
+        funds = funds.filter(pk__in=job.payload["fund_ids"])
+    funds = list(funds)
+    today = datetime.date.today()
+    for index, fund in enumerate(funds, start=1):
+        cached_dividend_analytics(fund, today)
+        job.set_progress(index * 100 // len(funds), fund.name)
+    return {"funds": len(funds)}
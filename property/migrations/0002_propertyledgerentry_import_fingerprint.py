@@ -0,0 +1,75 @@
+# Generated by Django 6.0.6 on 2026-10-19 12:18
+
+import hashlib
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def build_import_fingerprint(property_id, entry_date, signed_amount, description):
+    """Frozen copy of ``property.utils.build_import_fingerprint``."""
+    normalized = " ".join((description or "").casefold().split())
+    key = "|".join(
+        (
+            str(property_id),
+            entry_date.isoformat(),
+            str(Decimal(signed_amount).quantize(Decimal("0.01"))),
+            normalized,
+        )
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def backfill_import_fingerprints(apps, schema_editor):
+    """Fingerprint the existing one-time entries so re-imports detect them."""
+    PropertyLedgerEntry = apps.get_model("property", "PropertyLedgerEntry")
+    rows = PropertyLedgerEntry.objects.filter(recurrence_type="none").values_list(
+        "pk", "property_id", "entry_date", "flow_type", "amount", "description"
+    )
+    batch = []
+    for pk, property_id, entry_date, flow_type, amount, description in rows.iterator(
+        chunk_size=1000
+    ):
+        signed_amount = amount if flow_type == "income" else -amount
+        batch.append(
+            PropertyLedgerEntry(
+                pk=pk,
+                import_fingerprint=build_import_fingerprint(
+                    property_id, entry_date, signed_amount, description
+                ),
+            )
+        )
+        if len(batch) >= 1000:
+            PropertyLedgerEntry.objects.bulk_update(batch, ["import_fingerprint"])
+            batch = []
+    if batch:
+        PropertyLedgerEntry.objects.bulk_update(batch, ["import_fingerprint"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("property", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertyledgerentry",
+            name="import_fingerprint",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Hash of the property, date, signed amount and description of the imported statement line, used to detect duplicate imports.",
+                max_length=64,
+                verbose_name="Import fingerprint",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="propertyledgerentry",
+            index=models.Index(
+                fields=["property", "import_fingerprint"],
+                name="property_pr_propert_c7a4d3_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_import_fingerprints, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 6.0.6 on 2026-10-19 12:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("property", "0002_propertyledgerentry_import_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LedgerCategorizationRule",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "match_field",
+                    models.CharField(
+                        choices=[
+                            ("description", "Description"),
+                            ("third_party", "Third party"),
+                        ],
+                        default="description",
+                        max_length=20,
+                        verbose_name="Matched field",
+                    ),
+                ),
+                (
+                    "pattern",
+                    models.CharField(
+                        help_text="Case-insensitive keyword, or regular expression if enabled.",
+                        max_length=200,
+                        verbose_name="Pattern",
+                    ),
+                ),
+                (
+                    "is_regex",
+                    models.BooleanField(
+                        default=False, verbose_name="Regular expression"
+                    ),
+                ),
+                (
+                    "management_category",
+                    models.CharField(
+                        choices=[
+                            ("rent_collected", "Rent collected"),
+                            ("charges_collected", "Charges collected"),
+                            ("other_income", "Other income"),
+                            ("deposit_in", "Deposit received"),
+                            ("manager_reversal", "Manager reversal"),
+                            ("management_fees", "Management fees"),
+                            ("letting_fees", "Letting fees"),
+                            ("other_general_fees", "Other general fees"),
+                            ("coownership", "Co-ownership fees"),
+                            ("maintenance", "Routine maintenance"),
+                            ("works", "Works"),
+                            ("furnitures", "Furnitures"),
+                            ("insurance", "Insurance"),
+                            ("property_tax", "Property tax"),
+                            ("cfe", "CFE"),
+                            ("misc_deductible", "Miscellaneous deductible"),
+                            ("loan_interest", "Loan interest"),
+                            ("loan_insurance", "Loan insurance"),
+                            ("rental_guarantee", "Rental guarantee"),
+                            ("loan_repayment", "Loan capital repayment"),
+                            ("deposit_out", "Deposit returned"),
+                            ("non_deductible", "Other non-deductible"),
+                            ("alur_works_fund", "ALUR works fund"),
+                        ],
+                        max_length=30,
+                        verbose_name="Category",
+                    ),
+                ),
+                (
+                    "flow_type",
+                    models.CharField(
+                        blank=True,
+                        choices=[("income", "Income"), ("expense", "Expense")],
+                        help_text="Leave empty to match both incomes and expenses.",
+                        max_length=10,
+                        verbose_name="Flow type",
+                    ),
+                ),
+                ("priority", models.IntegerField(default=0, verbose_name="Priority")),
+                (
+                    "lease",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="categorization_rules",
+                        to="property.lease",
+                        verbose_name="Lease",
+                    ),
+                ),
+                (
+                    "property",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Leave empty to apply the rule to every property.",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="categorization_rules",
+                        to="property.property",
+                        verbose_name="Property",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "categorization rule",
+                "verbose_name_plural": "categorization rules",
+                "ordering": ["-priority", "pk"],
+            },
+        ),
+    ]
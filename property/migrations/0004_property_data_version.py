@@ -0,0 +1,22 @@
+# Generated by Django 6.0.6 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("property", "0003_ledgercategorizationrule"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="data_version",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Incremented on every change of the values, ledger, loans, leases or assets of the property.",
+                verbose_name="Data version",
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.0.6 on 2026-10-19 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("property", "0004_property_data_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LmnpYearClosing",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("year", models.PositiveIntegerField(verbose_name="Fiscal year")),
+                (
+                    "deferred_amortization",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Art. 39C deferred amortization balance at the end of the year.",
+                        max_digits=12,
+                        verbose_name="Deferred amortization",
+                    ),
+                ),
+                (
+                    "deficits",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Remaining fiscal deficits by origin year (art. 156 CGI).",
+                        verbose_name="Deficits carried forward",
+                    ),
+                ),
+                (
+                    "totals",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Declared totals"
+                    ),
+                ),
+                (
+                    "input_hash",
+                    models.CharField(max_length=64, verbose_name="Input data hash"),
+                ),
+                (
+                    "property",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lmnp_closings",
+                        to="property.property",
+                        verbose_name="Property",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "LMNP year closing",
+                "verbose_name_plural": "LMNP year closings",
+                "ordering": ["property", "-year"],
+                "unique_together": {("property", "year")},
+            },
+        ),
+    ]
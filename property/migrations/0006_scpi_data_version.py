@@ -0,0 +1,22 @@
+# Generated by Django 6.0.6 on 2026-10-19 13:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("property", "0005_lmnpyearclosing"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scpi",
+            name="data_version",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Incremented on every change of the share prices, investments or dividends of the fund.",
+                verbose_name="Data version",
+            ),
+        ),
+    ]
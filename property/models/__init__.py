@@ -8,8 +8,10 @@ from property.models.asset import (
     PropertyLoanAmortizationEntry,
     PropertyValue,
 )
+from property.models.fiscal import LmnpYearClosing
 from property.models.lease import Lease
 from property.models.ledger import (
+    LedgerCategorizationRule,
     ManagementCategory,
     PropertyLedgerEntry,
     PropertyLedgerEntryException,
@@ -25,6 +27,8 @@ __all__ = [
     "PropertyLoanAmortizationEntry",
     "PropertyValue",
     "Lease",
+    "LedgerCategorizationRule",
+    "LmnpYearClosing",
     "ManagementCategory",
     "ManagementMandate",
     "PropertyLedgerEntry",
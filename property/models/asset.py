@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import Coalesce, Greatest
 from django.utils.translation import gettext_lazy as _
 from djmoney.models.fields import MoneyField
 from moneyed import Money
@@ -147,8 +148,6 @@ class PropertyLoan(BaseModel):
         If an amortization table has been imported, it takes priority.
         Otherwise falls back to auto-calculation from loan parameters.
         """
-        from property.utils import build_loan_amortization_balance
-
         if as_of_date is None:
             as_of_date = datetime.date.today()
 
@@ -169,7 +168,19 @@ class PropertyLoan(BaseModel):
                 max(Decimal("0"), entry.remaining_balance_amount.amount), currency
             )
 
-        # Fallback: auto-calculate from loan parameters
+        return self.remaining_balance_from_params(as_of_date)
+
+    def remaining_balance_from_params(
+        self, as_of_date: datetime.date | None = None
+    ) -> Money:
+        """Auto-calculate the remaining balance from the loan parameters only."""
+        from property.utils import build_loan_amortization_balance
+
+        if as_of_date is None:
+            as_of_date = datetime.date.today()
+
+        currency = str(self.original_amount.currency)
+
         if self.start_date is None:
             return Money(self.original_amount.amount, currency)
         if as_of_date < self.start_date:
@@ -254,6 +265,102 @@ class PropertyLoanAmortizationEntry(BaseModel):
         return f"{self.loan} — {self.date}: {self.remaining_balance_amount}"
 
 
+class PropertyQuerySet(models.QuerySet):
+    """Queryset adding bulk valuation and loan annotations, and data version bumps."""
+
+    def with_valuation(self, as_of: datetime.date | None = None):
+        """Annotate each property with its valuation and loan statistics at *as_of*.
+
+        - ``valuation_amount`` / ``valuation_currency``: latest PropertyValue
+          dated on or before *as_of* (None when there is none).
+        - ``loans_count``, ``loans_original_total`` and ``loans_last_end_date``.
+        - ``scheduled_loans_remaining``: remaining balance of the loans that have
+          an amortization table, read from the table.
+        - ``unscheduled_loans``: prefetched list of the loans without a table,
+          whose balance must be computed from their parameters.
+
+        The ``*_from_annotations()`` helpers of Property read these values
+        without any further query.
+        """
+        if as_of is None:
+            as_of = datetime.date.today()
+
+        latest_value = PropertyValue.objects.filter(
+            property=models.OuterRef("pk"), valuation_date__lte=as_of
+        ).order_by("-valuation_date")
+        loans = PropertyLoan.objects.filter(property=models.OuterRef("pk")).order_by()
+        entries = PropertyLoanAmortizationEntry.objects.filter(
+            loan=models.OuterRef("pk")
+        )
+        scheduled_balances = (
+            loans.filter(models.Exists(entries))
+            .annotate(
+                balance=Greatest(
+                    Coalesce(
+                        models.Subquery(
+                            entries.filter(date__lte=as_of)
+                            .order_by("-date")
+                            .values("remaining_balance_amount")[:1]
+                        ),
+                        models.F("original_amount"),
+                    ),
+                    models.Value(Decimal("0")),
+                    output_field=models.DecimalField(max_digits=12, decimal_places=2),
+                )
+            )
+            .values("property")
+            .annotate(total=models.Sum("balance"))
+            .values("total")
+        )
+        return self.annotate(
+            valuation_as_of=models.Value(as_of, output_field=models.DateField()),
+            valuation_amount=models.Subquery(latest_value.values("value")[:1]),
+            valuation_currency=models.Subquery(
+                latest_value.values("value_currency")[:1]
+            ),
+            loans_count=Coalesce(
+                models.Subquery(
+                    loans.values("property")
+                    .annotate(count=models.Count("pk"))
+                    .values("count")
+                ),
+                0,
+            ),
+            loans_original_total=models.Subquery(
+                loans.values("property")
+                .annotate(total=models.Sum("original_amount"))
+                .values("total")
+            ),
+            loans_last_end_date=models.Subquery(
+                loans.values("property")
+                .annotate(last=models.Max("end_date"))
+                .values("last")
+            ),
+            scheduled_loans_remaining=models.Subquery(scheduled_balances),
+        ).prefetch_related(
+            models.Prefetch(
+                "loans",
+                queryset=PropertyLoan.objects.exclude(
+                    models.Exists(
+                        PropertyLoanAmortizationEntry.objects.filter(
+                            loan=models.OuterRef("pk")
+                        )
+                    )
+                ),
+                to_attr="unscheduled_loans",
+            )
+        )
+
+    def bump_data_version(self) -> int:
+        """Increment the data version of the properties; return how many changed.
+
+        Called whenever data shown on a property page changes, so that the
+        cached panels of the property are recomputed (see
+        ``property.services.panel_cache``).
+        """
+        return self.update(data_version=models.F("data_version") + 1)
+
+
 class Property(BaseModel):
     """Model representing a property."""
 
@@ -261,6 +368,8 @@ class Property(BaseModel):
     leases: models.Manager["Lease"]
     loans: models.Manager["PropertyLoan"]
 
+    objects = PropertyQuerySet.as_manager()
+
     HOUSE = "HO"
     APARTMENT = "AP"
     CONDO = "CO"
@@ -379,6 +488,15 @@ class Property(BaseModel):
         verbose_name=_("Tax regime"),
         help_text=_("Tax regime applicable to this property (e.g. LMNP réel)."),
     )
+    data_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Data version"),
+        help_text=_(
+            "Incremented on every change of the values, ledger, loans, leases or "
+            "assets of the property."
+        ),
+    )
 
     def __str__(self) -> str:
         return str(self.name)
@@ -478,6 +596,37 @@ class Property(BaseModel):
         net_amount = max(Decimal("0"), gross.amount - remaining.amount)
         return Money(net_amount, str(self.currency))
 
+    def get_value_from_annotations(self) -> Money:
+        """Return ``get_value()`` at the ``with_valuation()`` date, without a query."""
+        amount = self.valuation_amount  # ty: ignore[unresolved-attribute]
+        if amount is None:
+            return Money(self.buying_value.amount, str(self.currency))
+        return Money(
+            amount,
+            self.valuation_currency or str(self.currency),  # ty: ignore[unresolved-attribute]
+        )
+
+    def total_remaining_loans_from_annotations(self) -> Money:
+        """Return ``total_remaining_loans_at_date()`` from ``with_valuation()`` data.
+
+        Loans with an amortization table come from the annotated SQL sum; only
+        the loans without one are computed in Python from their parameters.
+        """
+        total = self.scheduled_loans_remaining or Decimal("0")  # ty: ignore[unresolved-attribute]
+        for loan in self.unscheduled_loans:  # ty: ignore[unresolved-attribute]
+            total += loan.remaining_balance_from_params(
+                self.valuation_as_of  # ty: ignore[unresolved-attribute]
+            ).amount
+        return Money(total, str(self.currency))
+
+    def net_value_from_annotations(self) -> Money:
+        """Return ``net_value_at_date()`` from ``with_valuation()`` data."""
+        gross = self.get_value_from_annotations()
+        remaining = self.total_remaining_loans_from_annotations()
+        return Money(
+            max(Decimal("0"), gross.amount - remaining.amount), str(self.currency)
+        )
+
     @property
     def buying_value_gross(self) -> Money:
         """Total acquisition cost: purchase price plus all ancillary fees."""
@@ -804,39 +953,46 @@ class AmortizationAsset(BaseModel):
         """
         return Money(self.value_total.amount, str(self.value_total.currency))
 
-    def get_annual_amortization(self, year: int) -> Decimal:
-        """Return the linear amortization dotation for a given fiscal year.
+    def amortization_years(self) -> range:
+        """Return the fiscal years with a dotation (empty for non-depreciable assets).
 
-        Applies day-based prorata temporis in the first and last years.
-        Returns ``Decimal("0")`` outside the asset's useful life or for non-depreciable assets.
+        A useful life starting after January 1st spans one more calendar year,
+        the prorata of the first year being completed in the last one.
         """
         if (
             not self.beginning_date
             or not self.duration_years
             or not self.is_depreciable
         ):
-            return Decimal("0")
-
+            return range(0)
         start_year = self.beginning_date.year
-        has_partial_first_year = not (
-            self.beginning_date.month == 1 and self.beginning_date.day == 1
-        )
-        end_year = (
-            start_year + self.duration_years + (1 if has_partial_first_year else 0)
-        )
+        end_year = start_year + self.duration_years
+        if self._has_partial_first_year():
+            end_year += 1
+        return range(start_year, end_year)
+
+    def _has_partial_first_year(self) -> bool:
+        return not (self.beginning_date.month == 1 and self.beginning_date.day == 1)
+
+    def get_annual_amortization(self, year: int) -> Decimal:
+        """Return the linear amortization dotation for a given fiscal year.
 
-        if year < start_year or year >= end_year:
+        Applies day-based prorata temporis in the first and last years.
+        Returns ``Decimal("0")`` outside the asset's useful life or for non-depreciable assets.
+        """
+        years = self.amortization_years()
+        if year not in years:
             return Decimal("0")
 
         annual = self.depreciable_base().amount / Decimal(self.duration_years)
 
-        if has_partial_first_year:
-            days_first = (datetime.date(start_year, 12, 31) - self.beginning_date).days
-            if year == start_year:
+        if self._has_partial_first_year():
+            days_first = (datetime.date(years[0], 12, 31) - self.beginning_date).days
+            if year == years[0]:
                 return (annual * Decimal(days_first) / Decimal("365")).quantize(
                     Decimal("0.01")
                 )
-            if year == end_year - 1:
+            if year == years[-1]:
                 return (annual * Decimal(365 - days_first) / Decimal("365")).quantize(
                     Decimal("0.01")
                 )
@@ -844,13 +1000,24 @@ class AmortizationAsset(BaseModel):
         return annual.quantize(Decimal("0.01"))
 
     def cumulative_amortization(self, up_to_year: int) -> Decimal:
-        """Return the sum of all annual amortizations from acquisition year to *up_to_year* (inclusive)."""
-        if not self.beginning_date:
+        """Return the sum of all annual amortizations from acquisition year to *up_to_year* (inclusive).
+
+        Computed in closed form: every year but the prorata first and last ones
+        has the same rounded dotation.
+        """
+        years = self.amortization_years()
+        if not years or up_to_year < years[0]:
             return Decimal("0")
-        return sum(
-            (
-                self.get_annual_amortization(y)
-                for y in range(self.beginning_date.year, up_to_year + 1)
-            ),
-            Decimal("0"),
-        )
+
+        total = Decimal("0")
+        full_years = years
+        if self._has_partial_first_year():
+            total += self.get_annual_amortization(years[0])
+            if up_to_year >= years[-1]:
+                total += self.get_annual_amortization(years[-1])
+            full_years = years[1:-1]
+        full_count = len(full_years[: max(0, up_to_year - full_years.start + 1)])
+        if full_count:
+            annual = self.depreciable_base().amount / Decimal(self.duration_years)
+            total += annual.quantize(Decimal("0.01")) * full_count
+        return total
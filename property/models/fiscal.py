@@ -0,0 +1,65 @@
+"""Model for closed LMNP fiscal years: LmnpYearClosing."""
+
+from decimal import Decimal
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from base.models import BaseModel
+
+
+class LmnpYearClosing(BaseModel):
+    """
+    Figures of a closed (declared) LMNP fiscal year of a property.
+
+    A closing stores what the year carries forward — the art. 39C deferred
+    amortization balance and the art. 156 deficits by origin year — so that
+    later years resume from it instead of replaying the history since the
+    acquisition (see ``LmnpTimeline``).  ``totals`` keeps the main 2033-B
+    figures as declared.
+
+    ``input_hash`` fingerprints the data of the closed year and of every
+    earlier year.  When it no longer matches, the data was edited after the
+    closing: the closing is flagged as stale and ignored until the year is
+    closed again.
+    """
+
+    class Meta:
+        verbose_name = _("LMNP year closing")
+        verbose_name_plural = _("LMNP year closings")
+        ordering = ["property", "-year"]
+        unique_together = [("property", "year")]
+
+    property = models.ForeignKey(
+        "property.Property",
+        on_delete=models.CASCADE,
+        related_name="lmnp_closings",
+        verbose_name=_("Property"),
+    )
+    year = models.PositiveIntegerField(verbose_name=_("Fiscal year"))
+    deferred_amortization = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        verbose_name=_("Deferred amortization"),
+        help_text=_("Art. 39C deferred amortization balance at the end of the year."),
+    )
+    deficits = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_("Deficits carried forward"),
+        help_text=_("Remaining fiscal deficits by origin year (art. 156 CGI)."),
+    )
+    totals = models.JSONField(
+        default=dict, blank=True, verbose_name=_("Declared totals")
+    )
+    input_hash = models.CharField(max_length=64, verbose_name=_("Input data hash"))
+
+    def __str__(self) -> str:
+        return f"{self.property} — {self.year}"
+
+    def deficit_history(self) -> dict[int, Decimal]:
+        """Return the stored deficits as ``get_fiscal_deficit_history()`` does."""
+        return {
+            int(origin_year): Decimal(amount)
+            for origin_year, amount in self.deficits.items()
+        }
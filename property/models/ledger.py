@@ -2,6 +2,7 @@
 
 import datetime
 import enum
+import re
 from typing import ClassVar
 
 from django.core.exceptions import ValidationError
@@ -10,7 +11,7 @@ from django.utils.translation import gettext_lazy as _
 from djmoney.models.fields import MoneyField
 
 from base.models import BaseModel
-from property.utils import generate_recurring_occurrences
+from property.utils import build_import_fingerprint, generate_recurring_occurrences
 
 
 class ManagementCategory(str, enum.Enum):
@@ -217,6 +218,21 @@ class ManagementCategory(str, enum.Enum):
 ManagementCategory.choices = [(m.value, m._label_) for m in ManagementCategory]
 
 
+class PropertyLedgerEntryQuerySet(models.QuerySet):
+    """Queryset of ledger entries."""
+
+    def not_capitalized(self):
+        """Exclude the entries capitalized as an amortization asset.
+
+        Filters with a ``NOT EXISTS`` on the asset link table, served by its
+        index on the ledger entry column, instead of joining the assets.
+        """
+        links = self.model.capitalized_as.through.objects.filter(
+            propertyledgerentry_id=models.OuterRef("pk")
+        )
+        return self.filter(~models.Exists(links))
+
+
 class PropertyLedgerEntry(BaseModel):
     """
     Unified financial flow for a property.
@@ -260,6 +276,8 @@ class PropertyLedgerEntry(BaseModel):
     YEARLY = RecurrenceType.YEARLY
     RECURRENCE_TYPE_CHOICES = RecurrenceType.choices
 
+    objects = PropertyLedgerEntryQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("ledger entry")
         verbose_name_plural = _("ledger entries")
@@ -268,6 +286,7 @@ class PropertyLedgerEntry(BaseModel):
             models.Index(fields=["property", "entry_date"]),
             models.Index(fields=["property", "management_category"]),
             models.Index(fields=["flow_type", "entry_date"]),
+            models.Index(fields=["property", "import_fingerprint"]),
         ]
 
     property = models.ForeignKey(
@@ -334,6 +353,17 @@ class PropertyLedgerEntry(BaseModel):
         verbose_name=_("Recurrence end date"),
         help_text=_("End date for recurring entries (leave empty for indefinite)."),
     )
+    import_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name=_("Import fingerprint"),
+        help_text=_(
+            "Hash of the property, date, signed amount and description of the "
+            "imported statement line, used to detect duplicate imports."
+        ),
+    )
 
     def __str__(self) -> str:
         name = f"{self.get_management_category_display()} — {self.amount} — {self.entry_date}"
@@ -371,6 +401,24 @@ class PropertyLedgerEntry(BaseModel):
                     % {"cat": self.management_category}
                 )
 
+    def compute_import_fingerprint(self) -> str:
+        """Return the statement line hash of a one-time entry, ``""`` otherwise."""
+        if self.recurrence_type != self.NONE or not self.entry_date or not self.amount:
+            return ""
+        amount = self.amount.amount
+        signed_amount = amount if self.flow_type == self.FlowType.INCOME else -amount
+        return build_import_fingerprint(
+            self.property_id, self.entry_date, signed_amount, self.description
+        )
+
+    def save(self, *args, **kwargs) -> None:
+        """Keep the import fingerprint in line with the entry."""
+        self.import_fingerprint = self.compute_import_fingerprint()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "import_fingerprint"}
+        super().save(*args, **kwargs)
+
     def get_management_category_display(self) -> str:
         return str(
             dict(ManagementCategory.choices).get(
@@ -477,3 +525,119 @@ class PropertyLedgerEntryException(BaseModel):
     def __str__(self) -> str:
         prefix = "Deleted" if self.is_deleted else "Override"
         return f"{prefix}: {self.parent_entry} @ {self.occurrence_date}"
+
+
+# Inline global flags such as "(?i)", and unescaped numbered backreferences
+_GLOBAL_FLAGS_RE = re.compile(r"\(\?[aiLmsux]+\)")
+_NUMBERED_BACKREFERENCE_RE = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]")
+
+
+class LedgerCategorizationRule(BaseModel):
+    """
+    Categorizes imported ledger rows whose description or third party matches a pattern.
+
+    Rules without a property apply to every property.  Among the rules
+    matching a row, the highest priority wins (then the oldest).
+    """
+
+    class MatchField(models.TextChoices):
+        DESCRIPTION = "description", _("Description")
+        THIRD_PARTY = "third_party", _("Third party")
+
+    class Meta:
+        verbose_name = _("categorization rule")
+        verbose_name_plural = _("categorization rules")
+        ordering = ["-priority", "pk"]
+
+    property = models.ForeignKey(
+        "property.Property",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="categorization_rules",
+        verbose_name=_("Property"),
+        help_text=_("Leave empty to apply the rule to every property."),
+    )
+    match_field = models.CharField(
+        max_length=20,
+        choices=MatchField.choices,
+        default=MatchField.DESCRIPTION,
+        verbose_name=_("Matched field"),
+    )
+    pattern = models.CharField(
+        max_length=200,
+        verbose_name=_("Pattern"),
+        help_text=_("Case-insensitive keyword, or regular expression if enabled."),
+    )
+    is_regex = models.BooleanField(default=False, verbose_name=_("Regular expression"))
+    management_category = models.CharField(
+        max_length=30,
+        choices=ManagementCategory.choices,
+        verbose_name=_("Category"),
+    )
+    flow_type = models.CharField(
+        max_length=10,
+        choices=PropertyLedgerEntry.FlowType.choices,
+        blank=True,
+        verbose_name=_("Flow type"),
+        help_text=_("Leave empty to match both incomes and expenses."),
+    )
+    lease = models.ForeignKey(
+        "property.Lease",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="categorization_rules",
+        verbose_name=_("Lease"),
+    )
+    priority = models.IntegerField(default=0, verbose_name=_("Priority"))
+
+    def __str__(self) -> str:
+        return f"{self.pattern} → {self.management_category}"
+
+    def clean(self) -> None:
+        super().clean()
+        if self.is_regex:
+            try:
+                re.compile(self.pattern)
+            except re.error as exc:
+                raise ValidationError(
+                    {"pattern": _("Invalid regular expression: %(err)s") % {"err": exc}}
+                ) from exc
+            # The rules are combined into one expression when matched: flags
+            # only apply at its start and group numbers shift.
+            if _GLOBAL_FLAGS_RE.search(self.pattern):
+                raise ValidationError(
+                    {
+                        "pattern": _(
+                            "Inline flags such as (?i) are not supported: "
+                            "matching is already case-insensitive."
+                        )
+                    }
+                )
+            if _NUMBERED_BACKREFERENCE_RE.search(self.pattern):
+                raise ValidationError(
+                    {
+                        "pattern": _(
+                            "Numbered backreferences such as \\1 are not "
+                            "supported, use a named group (?P=name) instead."
+                        )
+                    }
+                )
+        is_income_category = (
+            self.management_category in PropertyLedgerEntry._INCOME_CATEGORIES
+        )
+        if self.flow_type and is_income_category != (
+            self.flow_type == PropertyLedgerEntry.FlowType.INCOME
+        ):
+            raise ValidationError(
+                {
+                    "management_category": _(
+                        "This category does not match the selected flow type."
+                    )
+                }
+            )
+        if self.lease_id and self.lease.property_id != self.property_id:
+            raise ValidationError(
+                {"lease": _("The lease must belong to the property of the rule.")}
+            )
@@ -1,7 +1,10 @@
 """Models for SCPI (Société Civile de Placement Immobilier) management."""
 
+import bisect
 import datetime
+from collections.abc import Iterable, Sequence
 from decimal import Decimal
+from operator import attrgetter
 from typing import TYPE_CHECKING
 
 from django.core.exceptions import ValidationError
@@ -17,6 +20,17 @@ if TYPE_CHECKING:
     pass
 
 
+class SCPIQuerySet(models.QuerySet):
+    def bump_data_version(self) -> int:
+        """Increment the data version of the funds; return how many changed.
+
+        Called whenever the share prices, investments or dividends of a fund
+        change, so that its cached figures are recomputed (see
+        ``property.services.scpi_dividends``).
+        """
+        return self.update(data_version=models.F("data_version") + 1)
+
+
 class SCPI(BaseModel):
     """A SCPI fund (the investment vehicle).
 
@@ -34,6 +48,8 @@ class SCPI(BaseModel):
         QUARTERLY = "quarterly", _("Quarterly")
         ANNUAL = "annual", _("Annual")
 
+    objects = SCPIQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("SCPI")
         verbose_name_plural = _("SCPI")
@@ -78,19 +94,51 @@ class SCPI(BaseModel):
         verbose_name=_("Dividend recurrence"),
         help_text=_("How often dividends are paid: monthly, quarterly, or annually."),
     )
+    data_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Data version"),
+        help_text=_(
+            "Incremented on every change of the share prices, investments or "
+            "dividends of the fund."
+        ),
+    )
 
     def __str__(self) -> str:
         return str(self.name)
 
+    def _share_prices_prefetched(self) -> bool:
+        return "share_prices" in getattr(self, "_prefetched_objects_cache", {})
+
+    def price_curve(self) -> "SCPISharePriceCurve":
+        """Return the share price curve of the fund.
+
+        Built from the prefetched share prices when they are (and then kept
+        for the next calls), otherwise from one query.
+        """
+        if not self._share_prices_prefetched():
+            return SCPISharePriceCurve(self.share_prices.all())
+        curve = getattr(self, "_price_curve", None)
+        if curve is None:
+            curve = self._price_curve = SCPISharePriceCurve(self.share_prices.all())
+        return curve
+
     def get_share_price(
-        self, as_of_date: datetime.date | None = None
+        self,
+        as_of_date: datetime.date | None = None,
+        curve: "SCPISharePriceCurve | None" = None,
     ) -> "SCPISharePrice | None":
         """Return the most recent SCPISharePrice on or before as_of_date.
 
-        Returns None if no share price has been recorded yet.
+        Looked up in ``curve`` when given, or in the prefetched share prices;
+        otherwise queried.  Returns None if no share price has been recorded yet.
         """
         if as_of_date is None:
             as_of_date = datetime.date.today()
+        if curve is None and self._share_prices_prefetched():
+            curve = self.price_curve()
+        if curve is not None:
+            return curve.at(as_of_date)
         return self.share_prices.filter(date__lte=as_of_date).order_by("-date").first()
 
     @property
@@ -109,34 +157,28 @@ class SCPI(BaseModel):
 
     def get_total_dividends_received(self) -> "Money":
         """Return the total net dividends received across all recorded payments."""
-        total = sum(
-            (d.net_amount.amount for d in self.dividends.all()),
-            Decimal("0"),
-        )
-        currency = "EUR"
-        div = self.dividends.first()
-        if div and hasattr(div.net_amount, "currency"):
-            currency = str(div.net_amount.currency)
-        return Money(total, currency)
+        return self._sum_dividends(self.dividends.all())
 
     def get_dividends_received_in_period(
         self, start_date: "datetime.date", end_date: "datetime.date"
     ) -> "Money":
         """Return the total net dividends received in a specific date range."""
-        total = sum(
-            (
-                d.net_amount.amount
-                for d in self.dividends.filter(
-                    payment_date__range=(start_date, end_date)
-                )
-            ),
-            Decimal("0"),
+        return self._sum_dividends(
+            self.dividends.filter(payment_date__range=(start_date, end_date))
         )
-        currency = "EUR"
-        div = self.dividends.first()
-        if div and hasattr(div.net_amount, "currency"):
-            currency = str(div.net_amount.currency)
-        return Money(total, currency)
+
+    def _sum_dividends(self, dividends) -> Money:
+        """Sum the net amount of ``dividends`` in SQL.
+
+        The currency is the one of the latest dividend of the fund (EUR when
+        there is none).
+        """
+        total = dividends.order_by().aggregate(total=models.Sum("net_amount"))["total"]
+        currency = (
+            self.dividends.values_list("net_amount_currency", flat=True).first()
+            or "EUR"
+        )
+        return Money(total or Decimal("0"), currency)
 
 
 class SCPISharePrice(BaseModel):
@@ -181,6 +223,24 @@ class SCPISharePrice(BaseModel):
         return f"{self.scpi} — {self.date}"
 
 
+class SCPISharePriceCurve:
+    """Share prices of one fund sorted by date, looked up by bisection.
+
+    Built once per fund (see ``SCPI.price_curve()``) and passed to the
+    ``SCPIInvestment`` valuation methods, so valuing every investment of a
+    fund at any number of dates needs no further query.
+    """
+
+    def __init__(self, prices: Iterable[SCPISharePrice]):
+        self.prices = sorted(prices, key=attrgetter("date"))
+        self.dates = [price.date for price in self.prices]
+
+    def at(self, as_of_date: datetime.date) -> SCPISharePrice | None:
+        """Return the most recent price on or before as_of_date, if any."""
+        index = bisect.bisect_right(self.dates, as_of_date)
+        return self.prices[index - 1] if index else None
+
+
 class SCPIInvestment(BaseModel):
     """Shares held by the user in a given SCPI fund.
 
@@ -306,6 +366,60 @@ class SCPIInvestment(BaseModel):
         ):
             raise ValidationError(_("Bare ownership ratio must be between 0 and 100."))
 
+    # ── Dividend entitlement ───────────────────────────────────────────────────
+
+    def receives_dividends(self, payment_date: datetime.date) -> bool:
+        """Return whether a dividend paid on payment_date is owed to these shares.
+
+        Shares earn dividends from their enjoyment date (their subscription
+        date when unset) until they are sold.  During a dismemberment the
+        dividends go to the usufruct; the bare owner receives them once the
+        dismemberment has ended.  ``dividend_entitlement_q()`` is the same
+        rule in SQL.
+        """
+        if (self.enjoyment_date or self.subscription_date) > payment_date:
+            return False
+        if self.sold_date and self.sold_date < payment_date:
+            return False
+        end = self.dismemberment_end_date
+        if self.ownership_type == self.OwnershipType.BARE:
+            return end is not None and payment_date >= end
+        if self.ownership_type == self.OwnershipType.USUFRUCT:
+            return end is None or payment_date < end
+        return True
+
+    @classmethod
+    def dividend_entitlement_q(cls, payment_date, prefix: str = "") -> models.Q:
+        """Return the ``receives_dividends()`` filter for a payment date.
+
+        ``payment_date`` may be a date or an expression (``F``, ``OuterRef``);
+        ``prefix`` reaches the investments through a relation, e.g.
+        ``"scpi__investments__"``.
+        """
+
+        def q(**lookups) -> models.Q:
+            return models.Q(**{prefix + key: value for key, value in lookups.items()})
+
+        started = q(enjoyment_date__lte=payment_date) | (
+            q(enjoyment_date__isnull=True) & q(subscription_date__lte=payment_date)
+        )
+        not_sold = q(sold_date__isnull=True) | q(sold_date__gte=payment_date)
+        owner = (
+            q(ownership_type=cls.OwnershipType.FULL)
+            | (
+                q(ownership_type=cls.OwnershipType.BARE)
+                & q(dismemberment_end_date__lte=payment_date)
+            )
+            | (
+                q(ownership_type=cls.OwnershipType.USUFRUCT)
+                & (
+                    q(dismemberment_end_date__isnull=True)
+                    | q(dismemberment_end_date__gt=payment_date)
+                )
+            )
+        )
+        return started & not_sold & owner
+
     # ── Financial calculations ─────────────────────────────────────────────────
 
     @property
@@ -343,25 +457,35 @@ class SCPIInvestment(BaseModel):
         """Return the total amount invested (what the user paid, entry fees already included)."""
         return self.get_purchase_value()
 
-    def _get_subscription_value_at(self, as_of_date: datetime.date) -> Money | None:
+    def _get_subscription_value_at(
+        self, as_of_date: datetime.date, curve: SCPISharePriceCurve | None = None
+    ) -> Money | None:
         """Return the subscription value per share at as_of_date."""
-        price = self.scpi.get_share_price(as_of_date)
+        price = self.scpi.get_share_price(as_of_date, curve)
         return price.subscription_value if price else None
 
-    def _get_withdrawal_value_at(self, as_of_date: datetime.date) -> Money | None:
+    def _get_withdrawal_value_at(
+        self, as_of_date: datetime.date, curve: SCPISharePriceCurve | None = None
+    ) -> Money | None:
         """Return the withdrawal value per share at as_of_date.
 
         Falls back to the subscription value when no withdrawal price is set.
         """
-        price = self.scpi.get_share_price(as_of_date)
+        price = self.scpi.get_share_price(as_of_date, curve)
         if price is None:
             return None
         return price.withdrawal_value or price.subscription_value
 
-    def get_current_full_value(self, as_of_date: datetime.date | None = None) -> Money:
+    def get_current_full_value(
+        self,
+        as_of_date: datetime.date | None = None,
+        curve: SCPISharePriceCurve | None = None,
+    ) -> Money:
         """Return the gross value of all shares at as_of_date: shares × subscription price.
 
         Uses the purchase price as fallback when no share price history is available.
+        Like the other valuation methods, it takes the fund's ``curve`` to look
+        the share price up without a query.
         """
         if as_of_date is None:
             as_of_date = datetime.date.today()
@@ -370,7 +494,7 @@ class SCPIInvestment(BaseModel):
                 0,
                 self.currency,
             )
-        sub_value = self._get_subscription_value_at(as_of_date)
+        sub_value = self._get_subscription_value_at(as_of_date, curve)
         if sub_value is None:
             return self.get_purchase_value(as_of_date)
         return Money(
@@ -378,7 +502,11 @@ class SCPIInvestment(BaseModel):
             self.currency,
         )
 
-    def get_estimated_value(self, as_of_date: datetime.date | None = None) -> Money:
+    def get_estimated_value(
+        self,
+        as_of_date: datetime.date | None = None,
+        curve: SCPISharePriceCurve | None = None,
+    ) -> Money:
         """Return the estimated value accounting for the ownership type.
 
         - Full ownership: same as get_current_full_value.
@@ -397,51 +525,94 @@ class SCPIInvestment(BaseModel):
         if as_of_date is None:
             as_of_date = datetime.date.today()
 
-        full_value = self.get_current_full_value(as_of_date)
-
-        if self.ownership_type == self.OwnershipType.FULL:
+        full_value = self.get_current_full_value(as_of_date, curve)
+        ratios = self._ownership_ratios([as_of_date])
+        if ratios is None:
             return full_value
+        return Money(
+            (full_value.amount * ratios[0] / Decimal("100")).quantize(Decimal("0.01")),
+            self.currency,
+        )
 
-        if self.ownership_type in (
+    def _ownership_ratios(self, dates: Sequence[datetime.date]) -> list[Decimal] | None:
+        """Return the percentage of the full value owned at each of ``dates``.
+
+        None for full ownership, or when the dismemberment fields are missing:
+        the full value is used then.
+        """
+        if self.ownership_type not in (
             self.OwnershipType.BARE,
             self.OwnershipType.USUFRUCT,
         ):
-            if (
-                self.dismemberment_start_date is None
-                or self.dismemberment_end_date is None
-                or self.bare_ownership_ratio is None
-            ):
-                return full_value
-
-            bare_ratio = self.bare_ownership_ratio
-            start = self.dismemberment_start_date
-            end = self.dismemberment_end_date
-            total_days = (end - start).days
-
-            if total_days <= 0:
-                # Degenerate case: treat as fully reconstituted
-                ratio = Decimal("100")
-            elif as_of_date >= end:
-                ratio = Decimal("100")
-            else:
-                elapsed = max(0, (as_of_date - start).days)
-                ratio = bare_ratio + (Decimal("100") - bare_ratio) * Decimal(
-                    elapsed
-                ) / Decimal(total_days)
+            return None
+        if (
+            self.dismemberment_start_date is None
+            or self.dismemberment_end_date is None
+            or self.bare_ownership_ratio is None
+        ):
+            return None
 
-            if self.ownership_type == self.OwnershipType.USUFRUCT:
-                # Usufruct pct = 100 - bare pct
-                ratio = Decimal("100") - ratio
+        bare_ratio = self.bare_ownership_ratio
+        start = self.dismemberment_start_date
+        end = self.dismemberment_end_date
+        total_days = (end - start).days
 
-            return Money(
-                (full_value.amount * ratio / Decimal("100")).quantize(Decimal("0.01")),
-                self.currency,
-            )
-
-        return full_value  # pragma: no cover
+        if total_days <= 0:
+            # Degenerate case: treat as fully reconstituted
+            ratios = [Decimal("100")] * len(dates)
+        else:
+            span = Decimal("100") - bare_ratio
+            total = Decimal(total_days)
+            ratios = [
+                Decimal("100")
+                if as_of >= end
+                else bare_ratio + span * Decimal(max(0, (as_of - start).days)) / total
+                for as_of in dates
+            ]
+
+        if self.ownership_type == self.OwnershipType.USUFRUCT:
+            # Usufruct pct = 100 - bare pct
+            ratios = [Decimal("100") - ratio for ratio in ratios]
+        return ratios
+
+    def get_estimated_values(
+        self,
+        dates: Sequence[datetime.date],
+        curve: SCPISharePriceCurve | None = None,
+    ) -> list[Money]:
+        """Return ``get_estimated_value()`` at each of the ascending ``dates``.
+
+        The share prices are scanned along with the dates and the
+        dismemberment ratio is computed over the whole grid, with the same
+        rounding: constant work per date and no query once the fund's
+        ``curve`` is given (or its share prices prefetched).
+        """
+        if curve is None:
+            curve = self.scpi.price_curve()
+        ratios = self._ownership_ratios(dates)
+        prices = curve.prices
+        cursor = -1
+        values = []
+        for index, as_of in enumerate(dates):
+            while cursor + 1 < len(prices) and prices[cursor + 1].date <= as_of:
+                cursor += 1
+            if self.sold_date and as_of > self.sold_date:
+                full = Decimal("0")
+            elif cursor < 0:
+                full = self.get_purchase_value(as_of).amount
+            else:
+                full = (
+                    self.shares_count * prices[cursor].subscription_value.amount
+                ).quantize(Decimal("0.01"))
+            if ratios is not None:
+                full = (full * ratios[index] / Decimal("100")).quantize(Decimal("0.01"))
+            values.append(Money(full, self.currency))
+        return values
 
     def get_estimated_resale_value(
-        self, as_of_date: datetime.date | None = None
+        self,
+        as_of_date: datetime.date | None = None,
+        curve: SCPISharePriceCurve | None = None,
     ) -> Money:
         """Return the estimated net resale proceeds.
 
@@ -456,7 +627,7 @@ class SCPIInvestment(BaseModel):
         if as_of_date is None:
             as_of_date = datetime.date.today()
 
-        withdrawal = self._get_withdrawal_value_at(as_of_date)
+        withdrawal = self._get_withdrawal_value_at(as_of_date, curve)
         if withdrawal is None:
             gross = self.get_purchase_value()
         else:
@@ -476,11 +647,15 @@ class SCPIInvestment(BaseModel):
         entry_fees = self.get_entry_fees()
         return Money(gross.amount - entry_fees.amount, self.currency)
 
-    def get_exit_fees(self, as_of_date: datetime.date | None = None) -> Money:
+    def get_exit_fees(
+        self,
+        as_of_date: datetime.date | None = None,
+        curve: SCPISharePriceCurve | None = None,
+    ) -> Money:
         """Return the exit fees that would be deducted at resale."""
         if as_of_date is None:
             as_of_date = datetime.date.today()
-        withdrawal = self._get_withdrawal_value_at(as_of_date)
+        withdrawal = self._get_withdrawal_value_at(as_of_date, curve)
         if withdrawal is None:
             gross = self.get_purchase_value()
         else:
@@ -496,7 +671,11 @@ class SCPIInvestment(BaseModel):
             self.currency,
         )
 
-    def get_capital_gain(self, as_of_date: datetime.date | None = None) -> Money:
+    def get_capital_gain(
+        self,
+        as_of_date: datetime.date | None = None,
+        curve: SCPISharePriceCurve | None = None,
+    ) -> Money:
         """Return the latent capital gain: estimated resale value − total invested.
 
         A negative value indicates a latent loss.
@@ -504,7 +683,7 @@ class SCPIInvestment(BaseModel):
         if as_of_date is None:
             as_of_date = datetime.date.today()
         return Money(
-            self.get_estimated_resale_value(as_of_date).amount
+            self.get_estimated_resale_value(as_of_date, curve).amount
             - self.get_total_invested().amount,
             self.currency,
         )
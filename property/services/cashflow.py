@@ -3,7 +3,7 @@
 import datetime
 from decimal import Decimal
 
-from django.db.models import Sum
+from django.db.models import Exists, OuterRef, Q, Sum
 
 
 def get_annual_cashflow(property_id: int, year: int) -> dict:
@@ -62,8 +62,13 @@ def build_balance_sheet(
     - occupancy_rate: Decimal  (0–100)
     - gross_yield_annual: Decimal | None  (annualised income / property value × 100)
     """
-    from property.models import PropertyLedgerEntry, PropertyLoan
+    from property.models import (
+        PropertyLedgerEntry,
+        PropertyLoan,
+        PropertyLoanAmortizationEntry,
+    )
     from property.utils import (
+        build_loan_insurance_map_for_range,
         build_loan_maps_from_loan_obj,
         iter_month_starts,
         month_end,
@@ -75,9 +80,25 @@ def build_balance_sheet(
     end_of_range = month_end(date_to)
 
     # ── Ledger entries in range ───────────────────────────────────────────────
-    entries_qs = PropertyLedgerEntry.objects.filter(
-        property=property_obj
-    ).prefetch_related("exceptions")
+    # Only fetch entries that can have an occurrence in the range: one-shot
+    # entries dated inside it, and recurring entries started before its end
+    # whose recurrence has not ended before its start.
+    entries_qs = (
+        PropertyLedgerEntry.objects.filter(
+            property=property_obj, entry_date__lte=end_of_range
+        )
+        .filter(
+            Q(recurrence_type=PropertyLedgerEntry.NONE, entry_date__gte=date_from)
+            | (
+                ~Q(recurrence_type=PropertyLedgerEntry.NONE)
+                & (
+                    Q(recurrence_end_date__isnull=True)
+                    | Q(recurrence_end_date__gte=date_from)
+                )
+            )
+        )
+        .prefetch_related("exceptions")
+    )
 
     # Aggregate occurrences by management_category within the date range
     income_by_cat: dict[str, dict] = {}
@@ -105,43 +126,42 @@ def build_balance_sheet(
                 expense_by_cat[cat]["amount"] += amount
 
     # ── Loan costs in range ───────────────────────────────────────────────────
-    from property.models import PropertyLoanAmortizationEntry
-
-    loans_qs = PropertyLoan.objects.filter(property=property_obj)
+    loans_qs = PropertyLoan.objects.filter(property=property_obj).annotate(
+        has_schedule=Exists(
+            PropertyLoanAmortizationEntry.objects.filter(loan=OuterRef("pk"))
+        )
+    )
     total_loan_interest = Decimal("0")
     total_loan_principal = Decimal("0")
     total_loan_insurance = Decimal("0")
 
+    # Interest and principal of all imported/generated schedules in one query.
+    schedule_totals = PropertyLoanAmortizationEntry.objects.filter(
+        loan__property=property_obj,
+        date__gte=date_from,
+        date__lte=end_of_range,
+    ).aggregate(interest=Sum("interest"), capital=Sum("capital"))
+    total_loan_interest += schedule_totals["interest"] or Decimal("0")
+    total_loan_principal += schedule_totals["capital"] or Decimal("0")
+
     for loan in loans_qs:
         insurance_amount = (
             loan.insurance.amount if loan.insurance is not None else Decimal("0")
         )
 
-        # When amortization entries exist, use them for interest and principal.
-        amort_entries = list(
-            PropertyLoanAmortizationEntry.objects.filter(loan=loan).order_by("date")
-        )
-        if amort_entries:
-            for entry in amort_entries:
-                if entry.date < date_from or entry.date > end_of_range:
-                    continue
-                total_loan_interest += entry.interest.amount
-                total_loan_principal += entry.capital.amount
+        if loan.has_schedule:
             # Insurance still derived from loan params (not in amortization entries).
-            if insurance_amount > Decimal("0") and loan.start_date and loan.end_date:
-                _, _, insurance_map = build_loan_maps_from_loan_obj(
-                    loan, insurance_amount
-                )
-                for month in iter_month_starts(start_month, end_month):
-                    key = (month.year, month.month)
-                    total_loan_insurance += insurance_map.get(key, Decimal("0"))
+            insurance_map = build_loan_insurance_map_for_range(
+                loan, insurance_amount, start_month, end_month
+            )
+            total_loan_insurance += sum(insurance_map.values(), Decimal("0"))
             continue
 
         # Fallback: compute from loan parameters when no amortization entries.
         if loan.monthly_payment is None:
             continue
         interest_map, principal_map, insurance_map = build_loan_maps_from_loan_obj(
-            loan, insurance_amount
+            loan, insurance_amount, until=end_month
         )
 
         for month in iter_month_starts(start_month, end_month):
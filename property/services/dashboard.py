@@ -0,0 +1,132 @@
+"""Dashboard card service: builds the data of the property cards in bulk."""
+
+import datetime
+from decimal import Decimal
+
+from django.db.models import Prefetch, Q, QuerySet
+
+from property.services.cashflow import build_balance_sheet
+from property.utils import month_end, month_start
+
+
+def _active_properties_for_cards(
+    properties: QuerySet | None, today: datetime.date
+) -> QuerySet:
+    """Return active properties with everything a card needs loaded in bulk."""
+    from property.models import Lease, Property
+
+    if properties is None:
+        properties = Property.objects.all()
+
+    active_leases = Lease.objects.filter(start_date__lte=today).filter(
+        Q(end_date__isnull=True) | Q(end_date__gte=today)
+    )
+    return (
+        properties.filter(is_active=True)
+        .with_valuation(today)
+        .prefetch_related(
+            Prefetch("leases", queryset=active_leases, to_attr="card_active_leases")
+        )
+        .order_by("-is_favorite", "name")
+    )
+
+
+def build_property_card(prop, today: datetime.date | None = None) -> dict:
+    """Return the JSON-ready data of one dashboard card.
+
+    *prop* must come from ``_active_properties_for_cards()`` so that the
+    valuation and loan annotations of ``Property.objects.with_valuation()`` and
+    the active leases are already loaded: each loan balance is then computed
+    exactly once.
+    """
+    if today is None:
+        today = datetime.date.today()
+    currency = prop.currency
+
+    # Last calendar month date range
+    first_of_this_month = today.replace(day=1)
+    last_month_end = first_of_this_month - datetime.timedelta(days=1)
+    date_from = month_start(last_month_end)
+    date_to = month_end(last_month_end)
+    cashflow = build_balance_sheet(prop, date_from, date_to)
+
+    gross_value = prop.get_value_from_annotations()
+    total_remaining = prop.total_remaining_loans_from_annotations().amount
+    total_original = prop.loans_original_total or Decimal("0")
+    total_paid = total_original - total_remaining
+
+    if not prop.loans_count:
+        loan_progress_percent = 100.0
+    elif not total_original:
+        loan_progress_percent = 0.0
+    else:
+        loan_progress_percent = float((total_paid / total_original) * 100)
+
+    net_value = max(Decimal("0"), gross_value.amount - total_remaining)
+
+    cost = prop.buying_value_gross.amount
+    appreciation_percent = (
+        float(((gross_value.amount - cost) / cost) * 100) if cost else 0.0
+    )
+
+    loan_end_date = (
+        prop.loans_last_end_date.isoformat() if prop.loans_last_end_date else None
+    )
+
+    lease = prop.card_active_leases[0] if prop.card_active_leases else None
+    lease_data = None
+    if lease:
+        lease_data = {
+            "rent_amount": float(lease.rent_amount.amount),
+            "charges_amount": float(lease.charges_amount.amount),
+            "total_rent": float(lease.total_rent().amount),
+            "currency": str(lease.rent_amount.currency),
+            "tenant_name": lease.name,
+        }
+
+    return {
+        "pk": prop.pk,
+        "name": prop.name,
+        "address": prop.address or "",
+        "property_type": prop.property_type,
+        "property_type_display": dict(prop.PROPERTY_CHOICES).get(
+            prop.property_type, prop.property_type
+        ),
+        "icon": prop.icon,
+        "currency": currency,
+        "gross_value": float(gross_value.amount),
+        "net_value": float(net_value),
+        "buying_value_gross": float(cost),
+        "appreciation_percent": round(appreciation_percent, 2),
+        "floor_area": float(prop.floor_area) if prop.floor_area else None,
+        "number_of_rooms": prop.number_of_rooms,
+        "loan_progress_percent": round(loan_progress_percent, 1),
+        "total_remaining_loans": float(total_remaining),
+        "loan_end_date": loan_end_date,
+        "cashflow_last_month": {
+            "income": float(cashflow["total_income"]),
+            "expenses": float(cashflow["total_expenses"]),
+            "net": float(cashflow["net_cashflow"]),
+            "occupancy_rate": float(cashflow["occupancy_rate"]),
+        },
+        "active_lease": lease_data,
+        "is_favorite": prop.is_favorite,
+    }
+
+
+def build_property_cards(
+    properties: QuerySet | None = None,
+    today: datetime.date | None = None,
+) -> list[dict]:
+    """Return the dashboard card data of every active property in *properties*.
+
+    Valuations, loans, amortization balances and leases are loaded with a
+    fixed number of queries whatever the number of properties; only the
+    last-month balance sheet still runs per property.
+    """
+    if today is None:
+        today = datetime.date.today()
+    return [
+        build_property_card(prop, today)
+        for prop in _active_properties_for_cards(properties, today)
+    ]
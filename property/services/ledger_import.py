@@ -0,0 +1,398 @@
+"""Ledger CSV import service: row parsing, categorization and duplicate detection."""
+
+import logging
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from django.db.models import Count, Q
+from django.utils.translation import gettext as _
+from moneyed import Money
+
+from property.utils import (
+    detect_date_format,
+    detect_decimal_separator,
+    parse_csv_amount,
+    parse_csv_date,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rules match labels case-insensitively, across line breaks
+_FLAGS = re.IGNORECASE | re.DOTALL
+
+DUPLICATES_SKIP = "skip"
+DUPLICATES_FLAG = "flag"
+
+_FINGERPRINT_BATCH_SIZE = 500
+
+_DIGITS = re.compile(r"\d+")
+
+
+def normalize_label(text: str) -> str:
+    """Return *text* case-folded, digits masked and whitespace collapsed.
+
+    Bank labels of the same payee differ only by dates and references
+    (``CB LEROY MERLIN 12/03``), so they share one normalized label.
+    """
+    return " ".join(_DIGITS.sub("#", (text or "").casefold()).split())
+
+
+@dataclass(frozen=True)
+class CategoryMatch:
+    """Category (and optional lease) a row is assigned to."""
+
+    management_category: str
+    lease_id: int | None = None
+
+
+class CategorizationMatcher:
+    """Assigns a category to imported rows from rules and past entries.
+
+    Explicit ``LedgerCategorizationRule`` patterns are compiled into one
+    alternation per (matched field, flow type): a single ``finditer`` pass
+    over a label reports the highest priority rule matching anywhere in it.
+    Labels that no rule matches are looked up in a dict of the normalized
+    labels of the property's previous entries, keeping their most frequent
+    category.
+    """
+
+    def __init__(self, rules, history: dict[tuple[str, str], CategoryMatch]):
+        from property.models import LedgerCategorizationRule, PropertyLedgerEntry
+
+        self._rules = list(rules)
+        self._history = history
+        self._compiled: dict[tuple[str, str], list[tuple[re.Pattern, int | None]]] = {}
+        self._fields = [
+            LedgerCategorizationRule.MatchField.DESCRIPTION,
+            LedgerCategorizationRule.MatchField.THIRD_PARTY,
+        ]
+        self._income_categories = PropertyLedgerEntry._INCOME_CATEGORIES
+        self._income = PropertyLedgerEntry.FlowType.INCOME
+
+    def _patterns_for(
+        self, match_field: str, flow_type: str
+    ) -> list[tuple[re.Pattern, int | None]]:
+        """Return the patterns of the rules applying to a field and flow type.
+
+        Usually a single alternation, whose branches each end with an empty
+        group named after the rank of their rule; the alternation sits in a
+        lookahead so ``finditer`` tries it at every position, where the first
+        (highest priority) branch matching wins.  Rules that cannot be
+        combined (e.g. saved before their pattern was validated) fall back to
+        one pattern per rule, paired with its rank and in priority order.
+        """
+        key = (match_field, flow_type)
+        if key not in self._compiled:
+            is_income = flow_type == self._income
+            patterns = []
+            for rank, rule in enumerate(self._rules):
+                if rule.match_field != match_field or rule.flow_type not in (
+                    "",
+                    flow_type,
+                ):
+                    continue
+                if (rule.management_category in self._income_categories) != is_income:
+                    continue
+                pattern = rule.pattern if rule.is_regex else re.escape(rule.pattern)
+                try:
+                    patterns.append((re.compile(pattern, _FLAGS), rank))
+                except re.error:
+                    _LOGGER.warning("Skipping invalid categorization rule %s", rule.pk)
+            if patterns:
+                branches = "|".join(
+                    f"(?:{compiled.pattern})(?P<r{rank}>)"
+                    for compiled, rank in patterns
+                )
+                try:
+                    patterns = [(re.compile(f"(?=(?:{branches}))", _FLAGS), None)]
+                except re.error:
+                    _LOGGER.warning(
+                        "Categorization rules cannot be combined, matching them "
+                        "one by one"
+                    )
+            self._compiled[key] = patterns
+        return self._compiled[key]
+
+    def match(
+        self, flow_type: str, description: str, third_party: str = ""
+    ) -> CategoryMatch | None:
+        """Return the category of a row, or ``None`` when nothing matches."""
+        best_rank = None
+        for match_field, label in zip(
+            self._fields, (description, third_party), strict=True
+        ):
+            patterns = self._patterns_for(match_field, flow_type) if label else []
+            for compiled, rank in patterns:
+                if rank is not None:
+                    if best_rank is not None and best_rank < rank:
+                        break
+                    if compiled.search(label):
+                        best_rank = rank
+                        break
+                    continue
+                for found in compiled.finditer(label):
+                    rank = int(found.lastgroup[1:])
+                    if best_rank is None or rank < best_rank:
+                        best_rank = rank
+                    if rank == 0:
+                        break
+        if best_rank is not None:
+            rule = self._rules[best_rank]
+            return CategoryMatch(rule.management_category, rule.lease_id)
+
+        for label in (description, third_party):
+            learned = self._history.get((normalize_label(label), flow_type))
+            if label and learned is not None:
+                return learned
+        return None
+
+
+def build_categorization_matcher(property_obj) -> CategorizationMatcher:
+    """Compile the rules of *property_obj* and learn from its past entries."""
+    from property.models import LedgerCategorizationRule, PropertyLedgerEntry
+
+    rules = LedgerCategorizationRule.objects.filter(
+        Q(property=property_obj) | Q(property__isnull=True)
+    ).order_by("-priority", "pk")
+
+    votes: dict[tuple[str, str], Counter] = defaultdict(Counter)
+    for label_field in ("description", "third_party"):
+        rows = (
+            PropertyLedgerEntry.objects.filter(property=property_obj)
+            .exclude(**{label_field: ""})
+            .values_list(label_field, "flow_type", "management_category", "lease_id")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        for label, flow_type, category, lease_id, count in rows:
+            votes[(normalize_label(label), flow_type)][
+                CategoryMatch(category, lease_id)
+            ] += count
+    history = {key: counter.most_common(1)[0][0] for key, counter in votes.items()}
+    return CategorizationMatcher(rules, history)
+
+
+@dataclass(frozen=True)
+class UncategorizedRow:
+    """Valid CSV row that neither its ``category`` column nor a rule categorized."""
+
+    row_index: int
+    description: str
+    flow_type: str
+
+    @property
+    def mapping_key(self) -> tuple[str, str]:
+        """Key a manual category is chosen for: normalized label and flow type."""
+        return (normalize_label(self.description), self.flow_type)
+
+
+@dataclass
+class ParsedLedgerCSV:
+    """Unsaved ledger entries of a CSV file, with the rows that were rejected.
+
+    ``entries`` and ``errors`` hold ``(row number, entry)`` and
+    ``(row number, reason)`` pairs; row 1 is the header.  ``uncategorized``
+    rows are neither entries nor errors: they wait for a manual category.
+    """
+
+    entries: list[tuple[int, object]] = field(default_factory=list)
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    uncategorized: list[UncategorizedRow] = field(default_factory=list)
+
+    def uncategorized_groups(self) -> list[dict]:
+        """Group the uncategorized rows by mapping key, most frequent first."""
+        groups: dict[tuple[str, str], dict] = {}
+        for row in self.uncategorized:
+            group = groups.setdefault(
+                row.mapping_key,
+                {
+                    "key": row.mapping_key,
+                    "label": row.description,
+                    "flow_type": row.flow_type,
+                    "rows": [],
+                },
+            )
+            group["rows"].append(row.row_index)
+        return sorted(groups.values(), key=lambda g: (-len(g["rows"]), g["rows"][0]))
+
+
+def parse_ledger_csv(
+    property_obj,
+    header: list[str],
+    rows: list[list[str]],
+    *,
+    matcher: CategorizationMatcher | None = None,
+    category_overrides: dict[tuple[str, str], str] | None = None,
+) -> ParsedLedgerCSV:
+    """Parse CSV *rows* into unsaved ``PropertyLedgerEntry`` objects of *property_obj*.
+
+    The date format and decimal separator of the file are detected once from a
+    sample; each entry carries its ``import_fingerprint``.
+
+    A row without a ``category`` value takes the category chosen for its
+    ``UncategorizedRow.mapping_key`` in *category_overrides*, else the one
+    *matcher* finds; rows left without a category are reported in
+    ``uncategorized``.
+    """
+    from property.models import PropertyLedgerEntry
+
+    valid_categories = {c.value for c in PropertyLedgerEntry.ManagementCategory}
+    income_categories = {c.value for c in PropertyLedgerEntry._INCOME_CATEGORIES}
+    result = ParsedLedgerCSV()
+
+    def _col(row, name):
+        idx = header.index(name)
+        return row[idx].strip() if idx < len(row) else ""
+
+    # Detect the file conventions once instead of guessing them on every row
+    date_format = detect_date_format(_col(row, "date") for row in rows)
+    decimal_separator = detect_decimal_separator(_col(row, "amount") for row in rows)
+    ref_period_format = (
+        detect_date_format(_col(row, "reference_period") for row in rows)
+        if "reference_period" in header
+        else None
+    )
+
+    for row_index, row in enumerate(rows, start=2):  # row 1 is header
+        try:
+            raw_date = _col(row, "date")
+            raw_amount = _col(row, "amount")
+            raw_category = _col(row, "category") if "category" in header else ""
+            description = _col(row, "description")
+            third_party = _col(row, "third_party") if "third_party" in header else ""
+            notes = _col(row, "notes") if "notes" in header else ""
+            raw_ref_period = (
+                _col(row, "reference_period") if "reference_period" in header else ""
+            )
+
+            # Parse date
+            parsed_date = parse_csv_date(raw_date, date_format)
+            if not parsed_date:
+                result.errors.append(
+                    (row_index, _("Invalid date: %(val)s") % {"val": raw_date})
+                )
+                continue
+
+            # Parse amount (supports both 1200.50 and European 1.200,50)
+            amount_val = parse_csv_amount(raw_amount, decimal_separator)
+            if amount_val is None:
+                result.errors.append(
+                    (row_index, _("Invalid amount: %(val)s") % {"val": raw_amount})
+                )
+                continue
+
+            if amount_val == 0:
+                result.errors.append((row_index, _("Amount must not be zero.")))
+                continue
+
+            # Derive flow_type from sign
+            flow_type = (
+                PropertyLedgerEntry.FlowType.INCOME
+                if amount_val > 0
+                else PropertyLedgerEntry.FlowType.EXPENSE
+            )
+
+            lease_id = None
+            if not raw_category:
+                key = (normalize_label(description), flow_type)
+                if category_overrides and category_overrides.get(key):
+                    raw_category = category_overrides[key]
+                elif matcher is not None and (
+                    found := matcher.match(flow_type, description, third_party)
+                ):
+                    raw_category, lease_id = found.management_category, found.lease_id
+                else:
+                    result.uncategorized.append(
+                        UncategorizedRow(row_index, description, flow_type)
+                    )
+                    continue
+
+            # Validate category
+            if raw_category not in valid_categories:
+                result.errors.append(
+                    (row_index, _("Unknown category: %(val)s") % {"val": raw_category})
+                )
+                continue
+
+            # Enforce category ↔ flow_type coherence
+            if (
+                raw_category in income_categories
+                and flow_type != PropertyLedgerEntry.FlowType.INCOME
+            ):
+                result.errors.append(
+                    (
+                        row_index,
+                        _("Category %(cat)s requires a positive amount.")
+                        % {"cat": raw_category},
+                    )
+                )
+                continue
+            if (
+                raw_category not in income_categories
+                and flow_type != PropertyLedgerEntry.FlowType.EXPENSE
+            ):
+                result.errors.append(
+                    (
+                        row_index,
+                        _("Category %(cat)s requires a negative amount.")
+                        % {"cat": raw_category},
+                    )
+                )
+                continue
+
+            # Optional reference_period
+            ref_period = None
+            if raw_ref_period:
+                ref_period = parse_csv_date(raw_ref_period, ref_period_format)
+
+            entry = PropertyLedgerEntry(
+                property=property_obj,
+                flow_type=flow_type,
+                management_category=raw_category,
+                amount=Money(abs(amount_val), property_obj.currency),
+                entry_date=parsed_date,
+                description=description,
+                third_party=third_party,
+                lease_id=lease_id,
+                notes=notes,
+                reference_period=ref_period,
+            )
+            # Entries are bulk created, without going through save()
+            entry.import_fingerprint = entry.compute_import_fingerprint()
+            result.entries.append((row_index, entry))
+        except Exception as exc:
+            _LOGGER.exception("CSV import error on row %d", row_index)
+            result.errors.append((row_index, str(exc)))
+    return result
+
+
+def find_duplicate_rows(property_obj, entries: list[tuple[int, object]]) -> set[int]:
+    """Return the row numbers of *entries* already present in the ledger.
+
+    Fingerprints are looked up with one ``IN`` query per batch.  Matching is a
+    multiset: a statement holding two identical lines against a ledger holding
+    one of them reports a single duplicate.
+    """
+    from property.models import PropertyLedgerEntry
+
+    duplicates = set()
+    existing: Counter[str] = Counter()
+    looked_up: set[str] = set()
+    for offset in range(0, len(entries), _FINGERPRINT_BATCH_SIZE):
+        batch = entries[offset : offset + _FINGERPRINT_BATCH_SIZE]
+        new_fingerprints = {
+            entry.import_fingerprint for _row, entry in batch
+        } - looked_up
+        if new_fingerprints:
+            existing.update(
+                PropertyLedgerEntry.objects.filter(
+                    property=property_obj, import_fingerprint__in=new_fingerprints
+                ).values_list("import_fingerprint", flat=True)
+            )
+            looked_up |= new_fingerprints
+        for row_index, entry in batch:
+            if existing[entry.import_fingerprint]:
+                existing[entry.import_fingerprint] -= 1
+                duplicates.add(row_index)
+    return duplicates
@@ -0,0 +1,201 @@
+"""
+LMNP fiscal year closings.
+
+Closing a fiscal year stores what it carries forward (``LmnpYearClosing``) so
+that the computations of later years resume from it.  Each closing holds a
+hash of the data the closed years were computed from; an edit of that data
+after the closing changes the hash and flags the closing as stale.
+"""
+
+import datetime
+import hashlib
+from collections.abc import Iterable
+
+from django.db.models import Exists, OuterRef
+
+from property.services.tax_lmnp import LmnpTimeline
+
+# 2033-B figures kept with each closing
+CLOSING_TOTALS = (
+    "recettes",
+    "charges_exploitation",
+    "charges_financieres",
+    "amortization_total",
+    "amortization_deductible",
+    "amortization_deferred",
+    "taxable_result",
+    "cerfa_310",
+    "cerfa_318",
+)
+
+
+def lmnp_input_hash(property_id: int, year: int) -> str:
+    """
+    Return a fingerprint of the data the LMNP figures up to ``year`` depend on.
+
+    It covers the property buying date, the ledger entries and occurrence
+    exceptions dated up to the end of ``year`` (with whether they are
+    capitalized), the amortization assets started by then and the loan
+    schedule interest up to then.  Changes dated after ``year`` leave it as is.
+    """
+    return lmnp_input_hashes({property_id: [year]})[property_id, year]
+
+
+def lmnp_input_hashes(
+    years_by_property: dict[int, Iterable[int]],
+) -> dict[tuple[int, int], str]:
+    """
+    Return ``lmnp_input_hash()`` of every (property, year) pair at once.
+
+    The data of all the properties is read with one query per table, up to
+    the latest year asked for, then hashed year by year in memory.
+    """
+    from property.models import (
+        AmortizationAsset,
+        Property,
+        PropertyLedgerEntry,
+        PropertyLedgerEntryException,
+        PropertyLoanAmortizationEntry,
+    )
+
+    years_by_property = {
+        property_id: list(years)
+        for property_id, years in years_by_property.items()
+        if years
+    }
+    if not years_by_property:
+        return {}
+    property_ids = list(years_by_property)
+    range_end = datetime.date(max(map(max, years_by_property.values())), 12, 31)
+
+    capitalized = AmortizationAsset.source_transactions.through.objects.filter(
+        propertyledgerentry_id=OuterRef("pk")
+    )
+    entries = (
+        PropertyLedgerEntry.objects.filter(
+            property_id__in=property_ids, entry_date__lte=range_end
+        )
+        .annotate(is_capitalized=Exists(capitalized))
+        .order_by("pk")
+        .values_list(
+            "property_id",
+            "entry_date",
+            "pk",
+            "flow_type",
+            "management_category",
+            "amount",
+            "amount_currency",
+            "entry_date",
+            "recurrence_type",
+            "recurrence_end_date",
+            "is_capitalized",
+        )
+    )
+    exceptions = (
+        PropertyLedgerEntryException.objects.filter(
+            parent_entry__property_id__in=property_ids,
+            occurrence_date__lte=range_end,
+        )
+        .order_by("parent_entry_id", "occurrence_date", "pk")
+        .values_list(
+            "parent_entry__property_id",
+            "occurrence_date",
+            "parent_entry_id",
+            "occurrence_date",
+            "is_deleted",
+            "amount_override",
+            "amount_override_currency",
+        )
+    )
+    assets = (
+        AmortizationAsset.objects.filter(
+            property_id__in=property_ids, beginning_date__lte=range_end
+        )
+        .order_by("pk")
+        .values_list(
+            "property_id",
+            "beginning_date",
+            "pk",
+            "beginning_date",
+            "value_total",
+            "value_total_currency",
+            "duration_years",
+            "cerfa_category",
+            "is_initial_component",
+        )
+    )
+    schedule = (
+        PropertyLoanAmortizationEntry.objects.filter(
+            loan__property_id__in=property_ids, date__lte=range_end
+        )
+        .order_by("loan_id", "date")
+        .values_list(
+            "loan__property_id",
+            "date",
+            "loan_id",
+            "date",
+            "interest",
+            "interest_currency",
+        )
+    )
+
+    # Rows of each property as (date, row) in hashing order
+    rows: dict[int, list[tuple[datetime.date, tuple]]] = {
+        property_id: [] for property_id in property_ids
+    }
+    for name, queryset in (
+        ("entry", entries),
+        ("exception", exceptions),
+        ("asset", assets),
+        ("schedule", schedule),
+    ):
+        for property_id, date, *fields in queryset:
+            rows[property_id].append((date, (name, *fields)))
+    buying_dates = dict(
+        Property.objects.filter(pk__in=property_ids).values_list("pk", "buying_date")
+    )
+
+    hashes = {}
+    for property_id, years in years_by_property.items():
+        for year in years:
+            year_end = datetime.date(year, 12, 31)
+            digest = hashlib.sha256()
+            digest.update(repr(buying_dates.get(property_id)).encode())
+            for date, row in rows[property_id]:
+                if date > year_end:
+                    continue
+                if row[0] == "entry":
+                    # Only the part of the recurrence up to the closed year matters
+                    *head, end_date, is_capitalized = row
+                    end_date = min(end_date or year_end, year_end)
+                    row = (*head, end_date, is_capitalized)
+                digest.update(repr(row).encode())
+            hashes[property_id, year] = digest.hexdigest()
+    return hashes
+
+
+def close_fiscal_year(property_id: int, year: int):
+    """
+    Close the LMNP fiscal ``year`` of a property and return its closing.
+
+    Closing the same year again replaces its figures and hash, which is how a
+    stale closing is refreshed after a retroactive edit.
+    """
+    from property.models import LmnpYearClosing
+
+    timeline = LmnpTimeline(property_id)
+    summary = timeline.summary(year)
+    closing, _ = LmnpYearClosing.objects.update_or_create(
+        property_id=property_id,
+        year=year,
+        defaults={
+            "deferred_amortization": timeline.deferred_balance(year),
+            "deficits": {
+                str(origin_year): str(amount)
+                for origin_year, amount in timeline.deficit_history(year).items()
+            },
+            "totals": {key: str(summary[key]) for key in CLOSING_TOTALS},
+            "input_hash": lmnp_input_hash(property_id, year),
+        },
+    )
+    return closing
@@ -0,0 +1,71 @@
+"""Render cache of the property detail page panels.
+
+The figures of a panel (cash flow series, projections, loan charts,
+amortization schedule...) only change when the data of the property does.
+Every write to that data bumps ``Property.data_version`` (see
+``property.signals``), so the figures are cached under a key holding the
+version: a repeat visit costs the property lookup the view does anyway, and a
+stale entry is never read again, it just expires.
+"""
+
+import datetime
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from django.utils import translation
+
+from base.cache import get_or_set, make_key
+
+PANEL_CACHE_NAMESPACE = "property.panel"
+PANEL_CACHE_TIMEOUT = 24 * 60 * 60
+# Bump when the shape of the cached figures changes: entries left by a previous
+# release in a persistent backend (file, database) are then never read.
+PANEL_CACHE_FORMAT = 2
+
+
+def _panel_key_parts(property_obj, panel: str, params: Iterable) -> tuple:
+    updated_at = property_obj.updated_at.isoformat() if property_obj.updated_at else ""
+    return (
+        PANEL_CACHE_FORMAT,
+        property_obj.pk,
+        panel,
+        updated_at,
+        datetime.date.today().isoformat(),
+        translation.get_language() or "",
+        *(str(param) for param in params),
+    )
+
+
+def panel_cache_key(property_obj, panel: str, params: Iterable = ()) -> str:
+    """Return the cache key of *panel* for the current data of *property_obj*.
+
+    Besides the data version and the format of the cached figures, the key
+    holds the last save of the property itself, today's date (figures are
+    computed up to today), the active language (labels are translated) and the
+    request *params* of the panel.
+    """
+    return make_key(
+        PANEL_CACHE_NAMESPACE,
+        _panel_key_parts(property_obj, panel, params),
+        property_obj.data_version,
+    )
+
+
+def cached_panel_data(
+    property_obj,
+    panel: str,
+    build: Callable[[], Any],
+    params: Iterable = (),
+) -> Any:
+    """Return the figures of *panel*, calling *build* on a cache miss.
+
+    *build* must return picklable data: plain values, dicts, lists and model
+    instances, but no forms nor querysets.
+    """
+    return get_or_set(
+        PANEL_CACHE_NAMESPACE,
+        _panel_key_parts(property_obj, panel, params),
+        build,
+        PANEL_CACHE_TIMEOUT,
+        property_obj.data_version,
+    )
@@ -0,0 +1,263 @@
+"""Long-term projections of a property: debt path and value/rent/vacancy scenarios."""
+
+import bisect
+import datetime
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import accumulate
+
+from property.services.timeline import LoanBalanceCurve
+from property.utils import (
+    add_years_safe,
+    build_loan_maps_from_loan_obj,
+    month_start,
+)
+
+PROJECTION_YEARS = 20
+
+# Default axes of the sensitivity grid (annual rates, as fractions).
+DEFAULT_VALUE_RATES = tuple(Decimal(r) / 100 for r in range(-2, 8))
+DEFAULT_RENT_RATES = tuple(Decimal(r) / 200 for r in range(-2, 8))
+DEFAULT_VACANCY_RATES = tuple(Decimal(r) / 100 for r in range(0, 25, 5))
+
+MonthlyMap = dict[tuple[int, int], Decimal]
+
+
+def loan_costs_by_month(loans) -> tuple[MonthlyMap, MonthlyMap, MonthlyMap]:
+    """Return the monthly interest, principal and insurance paid on *loans*.
+
+    The amortization table of a loan is used when it has one (insurance, which
+    it does not hold, is then derived from the loan parameters); otherwise the
+    whole schedule is simulated from the loan parameters.
+    """
+    from property.models import PropertyLoanAmortizationEntry
+
+    interest_by_month: MonthlyMap = {}
+    principal_by_month: MonthlyMap = {}
+    insurance_by_month: MonthlyMap = {}
+
+    def add(target: MonthlyMap, source: MonthlyMap) -> None:
+        for key, value in source.items():
+            target[key] = target.get(key, Decimal("0")) + value
+
+    for loan in loans:
+        insurance_amount = (
+            loan.insurance.amount if loan.insurance is not None else Decimal("0")
+        )
+        amort_entries = list(
+            PropertyLoanAmortizationEntry.objects.filter(loan=loan).order_by("date")
+        )
+        if amort_entries:
+            for entry in amort_entries:
+                key = (entry.date.year, entry.date.month)
+                interest_by_month[key] = (
+                    interest_by_month.get(key, Decimal("0")) + entry.interest.amount
+                )
+                principal_by_month[key] = (
+                    principal_by_month.get(key, Decimal("0")) + entry.capital.amount
+                )
+            if insurance_amount > Decimal("0") and loan.start_date and loan.end_date:
+                _, _, insurance_map = build_loan_maps_from_loan_obj(
+                    loan, insurance_amount
+                )
+                add(insurance_by_month, insurance_map)
+            continue
+
+        if loan.monthly_payment is None:
+            continue
+        interest_map, principal_map, insurance_map = build_loan_maps_from_loan_obj(
+            loan, insurance_amount
+        )
+        add(interest_by_month, interest_map)
+        add(principal_by_month, principal_map)
+        add(insurance_by_month, insurance_map)
+
+    return interest_by_month, principal_by_month, insurance_by_month
+
+
+@dataclass
+class ProjectionBaseline:
+    """Figures of a property the projections start from.
+
+    ``year_dates[k]`` ends projection year ``k + 1``; ``debt[k]`` is the
+    remaining loan balance at that date and ``debt_service[k]`` the loan
+    payments (interest, principal and insurance) made during that year.
+    ``annual_rent`` and ``annual_expenses`` are the ledger income and expenses
+    of the last twelve months.
+    """
+
+    start: datetime.date
+    current_value: Decimal
+    currency: str
+    annual_rent: Decimal
+    annual_expenses: Decimal
+    year_dates: list[datetime.date]
+    debt: list[Decimal]
+    debt_service: list[Decimal]
+
+
+def build_projection_baseline(
+    property_obj, years: int = PROJECTION_YEARS, today: datetime.date | None = None
+) -> ProjectionBaseline:
+    """Load everything the projections of *property_obj* need, once.
+
+    The loan balances of all the projection years come from one pass over each
+    loan schedule instead of one ``total_remaining_loans_at_date()`` per year.
+    """
+    from property.models import (
+        PropertyLedgerEntry,
+        PropertyLoan,
+        PropertyLoanAmortizationEntry,
+    )
+
+    today = today or datetime.date.today()
+    year_dates = [add_years_safe(today, k) for k in range(1, years + 1)]
+    loans = list(PropertyLoan.objects.filter(property=property_obj))
+
+    schedules: dict[int, list[tuple[datetime.date, Decimal]]] = {}
+    for loan_id, date, balance in (
+        PropertyLoanAmortizationEntry.objects.filter(loan__in=loans)
+        .order_by("date")
+        .values_list("loan_id", "date", "remaining_balance_amount")
+    ):
+        schedules.setdefault(loan_id, []).append((date, balance))
+    curves = [LoanBalanceCurve(loan, schedules.get(loan.pk, [])) for loan in loans]
+    debt = [
+        sum((curve.at(as_of) for curve in curves), Decimal("0")) for as_of in year_dates
+    ]
+
+    # Loan payments of each projection year: months after the start month of
+    # the year, up to and including its end month.
+    interest, principal, insurance = loan_costs_by_month(loans)
+    boundaries = [month_start(today), *(month_start(d) for d in year_dates)]
+    debt_service = [Decimal("0")] * years
+    for costs in (interest, principal, insurance):
+        for (year, month), amount in costs.items():
+            index = bisect.bisect_left(boundaries, datetime.date(year, month, 1)) - 1
+            if 0 <= index < years:
+                debt_service[index] += amount
+
+    # Income and expenses of the last twelve months
+    window_start = add_years_safe(today, -1)
+    totals = {
+        PropertyLedgerEntry.FlowType.INCOME: Decimal("0"),
+        PropertyLedgerEntry.FlowType.EXPENSE: Decimal("0"),
+    }
+    entries = PropertyLedgerEntry.objects.filter(
+        property=property_obj, entry_date__lte=today
+    ).prefetch_related("exceptions")
+    for entry in entries:
+        for occurrence in entry.generate_occurrences(end_date=today):
+            if occurrence["date"] > window_start:
+                totals[entry.flow_type] += occurrence["amount"].amount
+
+    current_value = property_obj.get_value()
+    return ProjectionBaseline(
+        start=today,
+        current_value=current_value.amount,
+        currency=str(current_value.currency),
+        annual_rent=totals[PropertyLedgerEntry.FlowType.INCOME],
+        annual_expenses=totals[PropertyLedgerEntry.FlowType.EXPENSE],
+        year_dates=year_dates,
+        debt=debt,
+        debt_service=debt_service,
+    )
+
+
+def build_sensitivity_grid(
+    baseline: ProjectionBaseline,
+    value_rates=DEFAULT_VALUE_RATES,
+    rent_rates=DEFAULT_RENT_RATES,
+    vacancy_rates=DEFAULT_VACANCY_RATES,
+) -> dict:
+    """Return the projected figures of every value growth × rent growth × vacancy.
+
+    Over the horizon of *baseline*, year ``k`` has a cash flow of
+    ``rent × (1 + rent_rate)^(k-1) × (1 - vacancy) - costs[k]`` where the
+    costs are the current expenses plus the loan payments of the year.  Per
+    rent rate the growth factors, their prefix sums and the running minimum of
+    ``costs / (rent × growth)`` are computed once; each cell is then O(1) for
+    the cumulative cash flow and a bisection for the first positive year.
+
+    Rates are returned as percentages.  ``tables`` holds one table per
+    vacancy rate, with one row per value growth rate and one cell per rent
+    growth rate (``rent_growth_pct``); a cell holds the ``net_equity`` (value
+    minus debt at the horizon), the ``cumulative_cashflow`` and the
+    ``positive_year`` (calendar year of the first positive cash flow, ``None``
+    when it stays negative over the horizon).
+    """
+    years = len(baseline.year_dates)
+    rent = float(baseline.annual_rent)
+    costs = [
+        float(baseline.annual_expenses) + float(service)
+        for service in baseline.debt_service
+    ]
+    total_costs = sum(costs)
+    final_debt = float(baseline.debt[-1]) if years else 0.0
+    calendar_years = [date.year for date in baseline.year_dates]
+
+    equities = [
+        float(baseline.current_value) * (1 + float(rate)) ** years - final_debt
+        for rate in value_rates
+    ]
+
+    by_rent = []
+    for rate in rent_rates:
+        growth = [(1 + float(rate)) ** k for k in range(years)]
+        total_growth = sum(growth)
+        if rent > 0:
+            # Year k is positive when occupancy > costs[k] / (rent × growth[k]);
+            # the negated running minimum of that threshold is sorted.
+            thresholds = accumulate(
+                (cost / (rent * g) for cost, g in zip(costs, growth, strict=True)),
+                min,
+            )
+            negated = [-threshold for threshold in thresholds]
+        else:
+            negated = None
+        by_rent.append((total_growth, negated))
+
+    no_rent_positive = next(
+        (calendar_years[k] for k, cost in enumerate(costs) if cost < 0), None
+    )
+    tables = []
+    for vacancy in vacancy_rates:
+        occupancy = 1 - float(vacancy)
+        # Cash flows do not depend on the value growth: one row serves them all.
+        cashflow_row = []
+        for total_growth, negated in by_rent:
+            if negated is None:
+                positive_year = no_rent_positive
+            else:
+                index = bisect.bisect_right(negated, -occupancy)
+                positive_year = calendar_years[index] if index < years else None
+            cashflow_row.append(
+                (round(rent * occupancy * total_growth - total_costs, 2), positive_year)
+            )
+        tables.append(
+            {
+                "vacancy_pct": float(vacancy) * 100,
+                "rows": [
+                    {
+                        "value_growth_pct": float(rate) * 100,
+                        "cells": [
+                            {
+                                "net_equity": round(equity, 2),
+                                "cumulative_cashflow": cumulative,
+                                "positive_year": positive_year,
+                            }
+                            for cumulative, positive_year in cashflow_row
+                        ],
+                    }
+                    for rate, equity in zip(value_rates, equities, strict=True)
+                ],
+            }
+        )
+
+    return {
+        "years": years,
+        "horizon": baseline.year_dates[-1] if years else baseline.start,
+        "currency": baseline.currency,
+        "rent_growth_pct": [float(rate) * 100 for rate in rent_rates],
+        "tables": tables,
+    }
@@ -1,12 +1,23 @@
 """Income & expenses report service for properties."""
 
 import datetime
+import heapq
+from collections.abc import Iterator
 from dataclasses import dataclass
 from decimal import Decimal
+from operator import attrgetter
 
 from django.db.models import Q, Sum
+from django.db.models.functions import TruncMonth, TruncYear
 from moneyed import Money
 
+from property.utils import month_end, month_start
+
+# Pivot column granularities
+MONTH = "month"
+YEAR = "year"
+GRANULARITIES = (MONTH, YEAR)
+
 
 @dataclass
 class _OccurrenceEntry:
@@ -20,10 +31,117 @@ class _OccurrenceEntry:
     description: str
 
 
+def _report_querysets(
+    property_ids: list[int],
+    start_date: datetime.date | None,
+    end_date: datetime.date | None,
+    **filters,
+):
+    """Return the non-recurring and the recurring entries of the report.
+
+    Non-recurring entries are those dated within [start_date, end_date];
+    recurring entries are those that overlap the range: their start date is
+    on or before end_date and their recurrence end date (if set) on or after
+    start_date.  ``filters`` narrow both querysets (e.g. to one category).
+    """
+    from property.models import PropertyLedgerEntry
+
+    base_filter = {"property_id__in": property_ids, "amount_currency": "EUR", **filters}
+
+    non_recurring_qs = PropertyLedgerEntry.objects.filter(
+        **base_filter,
+        recurrence_type=PropertyLedgerEntry.RecurrenceType.NONE,
+    )
+    if start_date:
+        non_recurring_qs = non_recurring_qs.filter(entry_date__gte=start_date)
+    if end_date:
+        non_recurring_qs = non_recurring_qs.filter(entry_date__lte=end_date)
+
+    recurring_qs = PropertyLedgerEntry.objects.filter(**base_filter).exclude(
+        recurrence_type=PropertyLedgerEntry.RecurrenceType.NONE
+    )
+    if end_date:
+        recurring_qs = recurring_qs.filter(entry_date__lte=end_date)
+    if start_date:
+        recurring_qs = recurring_qs.filter(
+            Q(recurrence_end_date__gte=start_date) | Q(recurrence_end_date__isnull=True)
+        )
+    return non_recurring_qs, recurring_qs
+
+
+def _entry_occurrences(
+    entry,
+    start_date: datetime.date | None,
+    end_date: datetime.date | None,
+) -> Iterator[_OccurrenceEntry]:
+    """Yield the occurrences of one recurring entry within [start_date, end_date]."""
+    for occ in entry.generate_occurrences(end_date=end_date):
+        occ_date: datetime.date = occ["date"]
+        if start_date and occ_date < start_date:
+            continue
+        if end_date and occ_date > end_date:
+            continue
+        yield _OccurrenceEntry(
+            entry_date=occ_date,
+            property=entry.property,
+            flow_type=entry.flow_type,
+            management_category=entry.management_category,
+            amount=occ["amount"],
+            description=occ.get("description_override") or entry.description,
+        )
+
+
+def iter_occurrences(
+    recurring_qs,
+    start_date: datetime.date | None,
+    end_date: datetime.date | None,
+) -> Iterator[_OccurrenceEntry]:
+    """Yield the occurrences of the recurring entries within [start_date, end_date].
+
+    Entries are read in chunks with their exceptions; the occurrences are
+    generated one entry at a time and never collected.
+    """
+    entries = (
+        recurring_qs.select_related("property")
+        .prefetch_related("exceptions")
+        .order_by("pk")
+        .iterator(chunk_size=500)
+    )
+    for entry in entries:
+        yield from _entry_occurrences(entry, start_date, end_date)
+
+
+def period_start(date: datetime.date, granularity: str) -> datetime.date:
+    """Return the first day of the pivot column holding ``date``."""
+    if granularity == YEAR:
+        return datetime.date(date.year, 1, 1)
+    return month_start(date)
+
+
+def period_end(start: datetime.date, granularity: str) -> datetime.date:
+    """Return the last day of the pivot column starting on ``start``."""
+    if granularity == YEAR:
+        return datetime.date(start.year, 12, 31)
+    return month_end(start)
+
+
+def _period_columns(
+    first: datetime.date, last: datetime.date, granularity: str
+) -> list[datetime.date]:
+    """Return the start of every pivot column from ``first`` to ``last``."""
+    columns = []
+    current = period_start(first, granularity)
+    while current <= last:
+        columns.append(current)
+        current = period_end(current, granularity) + datetime.timedelta(days=1)
+    return columns
+
+
 def get_income_expense_report(
     property_ids: list[int],
     start_date: datetime.date | None,
     end_date: datetime.date | None,
+    granularity: str = MONTH,
 ) -> dict:
     """
     Compute income and expense totals for a set of properties over a date range.
@@ -32,6 +150,12 @@ def get_income_expense_report(
     within [start_date, end_date] are counted, even when the entry's start date
     is before start_date.
 
+    The totals are pivoted by property and category (rows) and by month or
+    year (columns, see ``granularity``).  Non-recurring entries are summed by
+    one grouped query; recurring occurrences are added in one pass over
+    ``iter_occurrences()``.  No entry is kept: the entries of a cell are
+    loaded on demand with ``get_report_entries()``.
+
     Returns:
         {
             "total_income": Decimal,
@@ -46,94 +170,80 @@ def get_income_expense_report(
                 },
                 ...
             ],
-            "entries": list,  # sorted by entry_date
+            "pivot": {
+                "granularity": "month" | "year",
+                "columns": [datetime.date, ...],  # first day of each column
+                "properties": [
+                    {
+                        "property": Property,
+                        "rows": [
+                            {
+                                category, label, flow_type, total,
+                                "cells": [{"period": date, "amount": Decimal}, ...],
+                            },
+                            ...
+                        ],
+                        "net_cells": [Decimal, ...],
+                        "net": Decimal,
+                    },
+                    ...
+                ],
+            },
         }
     """
-    from property.models import PropertyLedgerEntry
-
-    base_filter = {"property_id__in": property_ids, "amount_currency": "EUR"}
+    from property.models import Property, PropertyLedgerEntry
 
-    # ── Non-recurring entries within the date range ────────────────────────
-    non_recurring_qs = PropertyLedgerEntry.objects.filter(
-        **base_filter,
-        recurrence_type=PropertyLedgerEntry.RecurrenceType.NONE,
+    if granularity not in GRANULARITIES:
+        granularity = MONTH
+    non_recurring_qs, recurring_qs = _report_querysets(
+        property_ids, start_date, end_date
     )
-    if start_date:
-        non_recurring_qs = non_recurring_qs.filter(entry_date__gte=start_date)
-    if end_date:
-        non_recurring_qs = non_recurring_qs.filter(entry_date__lte=end_date)
 
-    # ── Recurring entries that overlap the date range ──────────────────────
-    # An entry overlaps when its start_date <= end_date AND its recurrence
-    # end_date (if set) >= start_date.
-    recurring_qs = PropertyLedgerEntry.objects.filter(**base_filter).exclude(
-        recurrence_type=PropertyLedgerEntry.RecurrenceType.NONE
-    )
-    if end_date:
-        recurring_qs = recurring_qs.filter(entry_date__lte=end_date)
-    if start_date:
-        recurring_qs = recurring_qs.filter(
-            Q(recurrence_end_date__gte=start_date) | Q(recurrence_end_date__isnull=True)
-        )
+    # (property_id, category, flow_type) → period start → total
+    cells: dict[tuple[int, str, str], dict[datetime.date, Decimal]] = {}
 
-    # Expand recurring entries into individual occurrences within [start, end]
-    expanded_occurrences: list[_OccurrenceEntry] = []
-    for entry in recurring_qs.select_related("property").prefetch_related("exceptions"):
-        occurrences = entry.generate_occurrences(end_date=end_date)
-        for occ in occurrences:
-            occ_date: datetime.date = occ["date"]
-            if start_date and occ_date < start_date:
-                continue
-            if end_date and occ_date > end_date:
-                continue
-            expanded_occurrences.append(
-                _OccurrenceEntry(
-                    entry_date=occ_date,
-                    property=entry.property,
-                    flow_type=entry.flow_type,
-                    management_category=entry.management_category,
-                    amount=occ["amount"],
-                    description=occ.get("description_override") or entry.description,
-                )
-            )
+    def add(key: tuple[int, str, str], period: datetime.date, amount: Decimal) -> None:
+        by_period = cells.setdefault(key, {})
+        by_period[period] = by_period.get(period, Decimal("0")) + amount
 
-    # ── Aggregate totals ───────────────────────────────────────────────────
-    income_total: Decimal = non_recurring_qs.filter(
-        flow_type=PropertyLedgerEntry.FlowType.INCOME
-    ).aggregate(total=Sum("amount"))["total"] or Decimal("0")
-    expenses_total: Decimal = non_recurring_qs.filter(
-        flow_type=PropertyLedgerEntry.FlowType.EXPENSE
-    ).aggregate(total=Sum("amount"))["total"] or Decimal("0")
-    for occ in expanded_occurrences:
-        if occ.flow_type == PropertyLedgerEntry.FlowType.INCOME:
-            income_total += occ.amount.amount
-        else:
-            expenses_total += occ.amount.amount
+    # ── Non-recurring entries: one grouped query ───────────────────────────
+    trunc = TruncYear if granularity == YEAR else TruncMonth
+    for row in (
+        non_recurring_qs.annotate(period=trunc("entry_date"))
+        .values("property_id", "management_category", "flow_type", "period")
+        .annotate(total=Sum("amount"))
+        .order_by()
+    ):
+        key = (row["property_id"], row["management_category"], row["flow_type"])
+        add(key, row["period"], row["total"] or Decimal("0"))
+
+    # ── Recurring entries: one pass over the occurrences ──────────────────
+    for occ in iter_occurrences(recurring_qs, start_date, end_date):
+        key = (occ.property.pk, occ.management_category, occ.flow_type)
+        add(key, period_start(occ.entry_date, granularity), occ.amount.amount)
 
-    # ── Category breakdown ─────────────────────────────────────────────────
+    # ── Columns: the requested range, or the range of the data ─────────────
+    periods = {period for by_period in cells.values() for period in by_period}
+    first = start_date or min(periods, default=None)
+    last = end_date or max(periods, default=None)
+    columns = _period_columns(first, last, granularity) if first and last else []
+
+    # ── Totals and category breakdown ──────────────────────────────────────
     category_label_map = {
         choice[0]: choice[1]
         for choice in PropertyLedgerEntry.ManagementCategory.choices
     }
-
-    # Seed with DB-aggregated non-recurring data
+    income_total = Decimal("0")
+    expenses_total = Decimal("0")
     category_totals: dict[tuple[str, str], Decimal] = {}
-    for row in (
-        non_recurring_qs.values("management_category", "flow_type")
-        .annotate(total=Sum("amount"))
-        .order_by("flow_type", "management_category")
-    ):
-        key = (row["management_category"], row["flow_type"])
-        category_totals[key] = (category_totals.get(key) or Decimal("0")) + (
-            row["total"] or Decimal("0")
-        )
-
-    # Add recurring occurrences
-    for occ in expanded_occurrences:
-        key = (occ.management_category, occ.flow_type)
-        category_totals[key] = (
-            category_totals.get(key) or Decimal("0")
-        ) + occ.amount.amount
+    for (_, category, flow_type), by_period in cells.items():
+        total = sum(by_period.values(), Decimal("0"))
+        if flow_type == PropertyLedgerEntry.FlowType.INCOME:
+            income_total += total
+        else:
+            expenses_total += total
+        key = (category, flow_type)
+        category_totals[key] = category_totals.get(key, Decimal("0")) + total
 
     category_rows: list[dict] = [
         {
@@ -147,19 +257,122 @@ def get_income_expense_report(
         )
     ]
 
-    # ── Combined entries list (sorted by date) ─────────────────────────────
-    non_recurring_list = list(
-        non_recurring_qs.select_related("property").order_by("entry_date")
-    )
-    all_entries = sorted(
-        non_recurring_list + expanded_occurrences,
-        key=lambda e: e.entry_date,
-    )
+    # ── Pivot rows: per property, income then expense categories ───────────
+    by_property: dict[int, list] = {}
+    for (property_id, category, flow_type), by_period in sorted(
+        cells.items(), key=lambda x: (x[0][2], x[0][1])
+    ):
+        by_property.setdefault(property_id, []).append((category, flow_type, by_period))
+    properties = Property.objects.in_bulk(list(by_property))
+    pivot_properties = []
+    for property_id in sorted(properties, key=lambda pk: properties[pk].name):
+        rows = []
+        net_cells = [Decimal("0")] * len(columns)
+        for category, flow_type, by_period in by_property[property_id]:
+            sign = 1 if flow_type == PropertyLedgerEntry.FlowType.INCOME else -1
+            row_cells = [
+                {"period": column, "amount": by_period.get(column, Decimal("0"))}
+                for column in columns
+            ]
+            for index, cell in enumerate(row_cells):
+                net_cells[index] += sign * cell["amount"]
+            rows.append(
+                {
+                    "category": category,
+                    "label": str(category_label_map.get(category, category)),
+                    "flow_type": flow_type,
+                    "cells": row_cells,
+                    "total": sum((cell["amount"] for cell in row_cells), Decimal("0")),
+                }
+            )
+        pivot_properties.append(
+            {
+                "property": properties[property_id],
+                "rows": rows,
+                "net_cells": net_cells,
+                "net": sum(net_cells, Decimal("0")),
+            }
+        )
 
     return {
         "total_income": income_total,
         "total_expenses": expenses_total,
         "net": income_total - expenses_total,
         "by_category": category_rows,
-        "entries": all_entries,
+        "pivot": {
+            "granularity": granularity,
+            "columns": columns,
+            "properties": pivot_properties,
+        },
     }
+
+
+def iter_report_entries(
+    property_ids: list[int],
+    start_date: datetime.date | None,
+    end_date: datetime.date | None,
+    **filters,
+) -> Iterator:
+    """
+    Yield the entries behind report figures, in date order.
+
+    Non-recurring ledger entries within [start_date, end_date] and
+    ``_OccurrenceEntry`` occurrences of the recurring ones; ``filters``
+    narrow them, e.g. ``management_category`` and ``flow_type`` for one pivot
+    cell.  The non-recurring entries are streamed from the database in date
+    order and merged with one lazy occurrence stream per recurring entry:
+    only the recurring entries themselves are held in memory.
+    """
+    non_recurring_qs, recurring_qs = _report_querysets(
+        property_ids, start_date, end_date, **filters
+    )
+    streams = [
+        non_recurring_qs.select_related("property")
+        .order_by("entry_date", "pk")
+        .iterator(chunk_size=2000),
+        *(
+            _entry_occurrences(entry, start_date, end_date)
+            for entry in recurring_qs.select_related("property")
+            .prefetch_related("exceptions")
+            .order_by("pk")
+        ),
+    ]
+    return heapq.merge(*streams, key=attrgetter("entry_date"))
+
+
+def get_report_entries(
+    property_ids: list[int],
+    start_date: datetime.date | None,
+    end_date: datetime.date | None,
+    **filters,
+) -> list:
+    """Return ``iter_report_entries()`` as a list, for the entries of a pivot cell."""
+    return list(iter_report_entries(property_ids, start_date, end_date, **filters))
+
+
+REPORT_EXPORT_HEADER = (
+    "date",
+    "property",
+    "flow_type",
+    "management_category",
+    "amount",
+    "description",
+)
+
+
+def iter_report_export_rows(
+    property_ids: list[int],
+    start_date: datetime.date | None,
+    end_date: datetime.date | None,
+) -> Iterator[tuple]:
+    """Yield the header then one row per report entry, for the CSV/XLSX exports."""
+    yield REPORT_EXPORT_HEADER
+    for entry in iter_report_entries(property_ids, start_date, end_date):
+        yield (
+            entry.entry_date,
+            entry.property.name,
+            entry.flow_type,
+            entry.management_category,
+            entry.amount.amount,
+            entry.description or "",
+        )
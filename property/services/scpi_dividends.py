@@ -0,0 +1,184 @@
+"""
+Dividends of SCPI funds allocated to the investments, and distribution rates.
+
+A dividend is recorded per fund; it is owed to the investments entitled to
+it on its payment date (see ``SCPIInvestment.receives_dividends()``), pro
+rata to their shares.  The allocation and the yearly totals are aggregated in
+SQL, and the figures of a fund are cached under its data version: every write
+to its share prices, investments or dividends bumps ``SCPI.data_version``
+(see ``property.signals``), so a stale entry is never read again.
+"""
+
+import datetime
+from collections.abc import Iterable
+from decimal import Decimal
+
+from django.db.models import F, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, ExtractYear
+
+from base.cache import cached
+
+SCPI_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def allocate_dividends(fund_ids: Iterable[int]) -> dict[tuple[int, int], Decimal]:
+    """
+    Return the net dividends owed to each investment, by (investment id, year).
+
+    One query: every dividend is joined to the entitled investments of its
+    fund, and each gets ``net amount × its shares / entitled shares``, summed
+    by investment and year.  Dividends no investment is entitled to (e.g. all
+    the shares are held in bare ownership) are left out.
+    """
+    from property.models import SCPIDividend, SCPIInvestment
+
+    entitled_shares = (
+        SCPIInvestment.objects.filter(
+            SCPIInvestment.dividend_entitlement_q(OuterRef("payment_date")),
+            scpi=OuterRef("scpi"),
+        )
+        .order_by()
+        .values("scpi")
+        .annotate(total=Sum("shares_count"))
+        .values("total")
+    )
+    rows = (
+        SCPIDividend.objects.filter(
+            SCPIInvestment.dividend_entitlement_q(
+                F("payment_date"), prefix="scpi__investments__"
+            ),
+            scpi_id__in=list(fund_ids),
+        )
+        .annotate(year=ExtractYear("payment_date"))
+        .values("scpi__investments", "year")
+        .annotate(
+            # The division is done in floating point (SQLite divides integral
+            # decimals as integers); each amount is rounded to the cent.
+            amount=Sum(
+                F("net_amount")
+                * F("scpi__investments__shares_count")
+                / Cast(Subquery(entitled_shares), FloatField()),
+                output_field=FloatField(),
+            )
+        )
+        .order_by()
+    )
+    return {
+        (row["scpi__investments"], row["year"]): Decimal(str(row["amount"])).quantize(
+            Decimal("0.01")
+        )
+        for row in rows
+    }
+
+
+def _rate(amount: Decimal, invested: Decimal) -> Decimal | None:
+    if invested <= 0:
+        return None
+    return (amount / invested * Decimal("100")).quantize(Decimal("0.01"))
+
+
+def get_dividend_analytics(fund, today: datetime.date | None = None) -> dict:
+    """
+    Return the dividends of a fund by year and by investment.
+
+    The distribution rate of a year is the net dividends / the capital
+    invested, in %: per investment, what it was allocated over its total
+    invested; for the fund, the dividends of the year over the capital of the
+    investments entitled to some of them.
+
+    Returns:
+        {
+            "currency": str,            # of the latest dividend (EUR if none)
+            "total": Decimal,           # all the dividends of the fund
+            "trailing_year": Decimal,   # paid from today - 365 days to today
+            "years": [
+                {
+                    "year": int,
+                    "dividends": Decimal,    # paid to the fund
+                    "allocated": Decimal,    # owed to the investments
+                    "invested": Decimal,     # capital of those investments
+                    "rate": Decimal | None,  # distribution rate, in %
+                },
+                ...
+            ],
+            "investments": {
+                investment_pk: {
+                    "total": Decimal,
+                    "years": {year: {"amount": Decimal, "rate": Decimal | None}},
+                },
+                ...
+            },
+        }
+    """
+    if today is None:
+        today = datetime.date.today()
+    dividends = fund.dividends.order_by()
+    by_year = {
+        row["year"]: row["total"]
+        for row in dividends.annotate(year=ExtractYear("payment_date"))
+        .values("year")
+        .annotate(total=Sum("net_amount"))
+    }
+    trailing_year = dividends.filter(
+        payment_date__range=(today - datetime.timedelta(days=365), today)
+    ).aggregate(total=Sum("net_amount"))["total"]
+    currency = (
+        fund.dividends.values_list("net_amount_currency", flat=True).first() or "EUR"
+    )
+
+    allocation = allocate_dividends([fund.pk])
+    invested = {
+        inv.pk: inv.get_total_invested().amount.quantize(Decimal("0.01"))
+        for inv in fund.investments.all()
+    }
+    investments: dict[int, dict] = {}
+    allocated_by_year: dict[int, Decimal] = {}
+    invested_by_year: dict[int, Decimal] = {}
+    for (investment_pk, year), amount in sorted(allocation.items()):
+        capital = invested.get(investment_pk, Decimal("0"))
+        item = investments.setdefault(
+            investment_pk, {"total": Decimal("0"), "years": {}}
+        )
+        item["total"] += amount
+        item["years"][year] = {"amount": amount, "rate": _rate(amount, capital)}
+        allocated_by_year[year] = allocated_by_year.get(year, Decimal("0")) + amount
+        invested_by_year[year] = invested_by_year.get(year, Decimal("0")) + capital
+
+    return {
+        "currency": currency,
+        "total": sum(by_year.values(), Decimal("0")),
+        "trailing_year": trailing_year or Decimal("0"),
+        "years": [
+            {
+                "year": year,
+                "dividends": total,
+                "allocated": allocated_by_year.get(year, Decimal("0")),
+                "invested": invested_by_year.get(year, Decimal("0")),
+                "rate": _rate(total, invested_by_year.get(year, Decimal("0"))),
+            }
+            for year, total in sorted(by_year.items())
+        ],
+        "investments": investments,
+    }
+
+
+@cached(
+    # Besides the data version, the key holds the last save of the fund itself
+    # and today (the trailing year depends on it)
+    key_fn=lambda fund, today: (fund.pk, fund.updated_at, today),
+    ttl=SCPI_CACHE_TIMEOUT,
+    version_fn=lambda fund, today: fund.data_version,
+    namespace="scpi.dividends",
+)
+def _cached_analytics(fund, today: datetime.date) -> dict:
+    return get_dividend_analytics(fund, today)
+
+
+def dividend_analytics_cache_key(fund, today: datetime.date) -> str:
+    """Return the cache key of the dividend analytics of *fund* for its current data."""
+    return _cached_analytics.cache_key(fund, today)
+
+
+def cached_dividend_analytics(fund, today: datetime.date | None = None) -> dict:
+    """Return ``get_dividend_analytics()`` of *fund*, from the cache when fresh."""
+    return _cached_analytics(fund, today or datetime.date.today())
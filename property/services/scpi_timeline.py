@@ -0,0 +1,169 @@
+"""Monthly valuation and yield series of SCPI funds, built in one pass."""
+
+import bisect
+import datetime
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import Decimal
+from operator import attrgetter
+
+from property.utils import add_months_safe, add_years_safe
+
+
+def month_grid(first: datetime.date, last: datetime.date) -> list[datetime.date]:
+    """Return one date per month from the month of ``first`` up to ``last``.
+
+    The dates fall on the day of month of ``last`` (clamped to short months),
+    so a point twelve steps back is exactly one year earlier, and the grids
+    of two ranges ending on the same day line up.
+    """
+    months = (last.year - first.year) * 12 + last.month - first.month
+    return [add_months_safe(last, -back) for back in range(months, -1, -1)]
+
+
+@dataclass
+class SCPISeries:
+    """Values of one SCPI fund (or a portfolio of funds) over a grid of dates.
+
+    ``invested`` is the capital of the shares held at each date,
+    ``estimated_value`` and ``resale_value`` follow
+    ``SCPIInvestment.get_estimated_value()`` / ``get_estimated_resale_value()``
+    and ``trailing_dividends`` sums the dividends paid over the year ending at
+    each date.
+    """
+
+    dates: list[datetime.date]
+    invested: list[Decimal]
+    estimated_value: list[Decimal]
+    resale_value: list[Decimal]
+    trailing_dividends: list[Decimal]
+
+    @classmethod
+    def empty(cls, dates: list[datetime.date]) -> "SCPISeries":
+        zeros = [Decimal("0")] * len(dates)
+        return cls(list(dates), list(zeros), list(zeros), list(zeros), list(zeros))
+
+    def add(self, other: "SCPISeries") -> None:
+        """Add ``other`` to this series; its grid must end this one's."""
+        offset = len(self.dates) - len(other.dates)
+        if offset < 0 or self.dates[offset:] != other.dates:
+            raise ValueError("The series grids do not line up.")
+        for name in (
+            "invested",
+            "estimated_value",
+            "resale_value",
+            "trailing_dividends",
+        ):
+            values = getattr(self, name)
+            for index, value in enumerate(getattr(other, name), start=offset):
+                values[index] += value
+
+    def trailing_yield(self) -> list[Decimal]:
+        """Return the dividends of the trailing year / invested capital, in %."""
+        return [
+            (dividends / invested * Decimal("100")).quantize(Decimal("0.01"))
+            if invested > 0
+            else Decimal("0")
+            for dividends, invested in zip(
+                self.trailing_dividends, self.invested, strict=True
+            )
+        ]
+
+    def growth(self, points: int = 12) -> Decimal:
+        """Return the resale value created over the last ``points`` dates.
+
+        The capital subscribed in the meantime is deducted, so a new
+        subscription counts for its own gain only.  Before the first date the
+        series is taken as zero.
+        """
+        if not self.dates:
+            return Decimal("0")
+        before = len(self.dates) - 1 - points
+        resale_before = self.resale_value[before] if before >= 0 else Decimal("0")
+        invested_before = self.invested[before] if before >= 0 else Decimal("0")
+        return (self.resale_value[-1] - resale_before) - (
+            self.invested[-1] - invested_before
+        )
+
+
+class SCPIValueTimeline:
+    """Monthly value, resale value and distribution yield of SCPI funds.
+
+    Each investment is valued over the dates it is held in one batch (see
+    ``SCPIInvestment.get_estimated_values()``) and the dividends, sorted by
+    date, are merge-scanned against the ascending dates with a one-year
+    sliding window; share prices come from the fund's price curve.  Pass
+    funds with their ``share_prices``, ``investments`` and ``dividends``
+    prefetched to read each table once.
+    """
+
+    def __init__(self, funds: Iterable):
+        self.funds = list(funds)
+
+    def fund_series(
+        self,
+        fund,
+        dates: list[datetime.date],
+        currency: str | None = None,
+    ) -> SCPISeries:
+        """Return the series of one fund; with ``currency``, of its holdings in it."""
+        series = SCPISeries.empty(dates)
+        curve = fund.price_curve()
+        investments = [
+            inv
+            for inv in fund.investments.all()
+            if currency is None or inv.currency == currency
+        ]
+        dividends = sorted(
+            (
+                div
+                for div in fund.dividends.all()
+                if currency is None or str(div.net_amount.currency) == currency
+            ),
+            key=attrgetter("payment_date"),
+        )
+
+        # Each investment counts from its subscription to its sale, if any
+        for inv in investments:
+            first = bisect.bisect_left(dates, inv.subscription_date)
+            last = bisect.bisect_right(dates, inv.sold_date) if inv.sold_date else None
+            held_dates = dates[first:last]
+            invested = inv.get_total_invested().amount
+            values = inv.get_estimated_values(held_dates, curve)
+            for index, as_of, value in zip(
+                range(first, first + len(held_dates)), held_dates, values, strict=True
+            ):
+                series.invested[index] += invested
+                series.estimated_value[index] += value.amount
+                series.resale_value[index] += inv.get_estimated_resale_value(
+                    as_of, curve
+                ).amount
+
+        # Dividends paid in (date - 1 year, date], with a sliding window
+        paid_until = paid_since = 0
+        trailing = Decimal("0")
+        for index, as_of in enumerate(dates):
+            year_before = add_years_safe(as_of, -1)
+            while (
+                paid_until < len(dividends)
+                and dividends[paid_until].payment_date <= as_of
+            ):
+                trailing += dividends[paid_until].net_amount.amount
+                paid_until += 1
+            while (
+                paid_since < paid_until
+                and dividends[paid_since].payment_date <= year_before
+            ):
+                trailing -= dividends[paid_since].net_amount.amount
+                paid_since += 1
+            series.trailing_dividends[index] = trailing
+        return series
+
+    def series(
+        self, dates: list[datetime.date], currency: str | None = None
+    ) -> SCPISeries:
+        """Return the series of all the funds; with ``currency``, of the holdings in it."""
+        total = SCPISeries.empty(dates)
+        for fund in self.funds:
+            total.add(self.fund_series(fund, dates, currency))
+        return total
@@ -36,6 +36,7 @@ le calcul de la plus-value lors de la revente du bien (art. 150 VB bis du CGI).
 
 import datetime
 from decimal import Decimal
+from itertools import accumulate
 
 from django.db.models import Q, Sum
 from django.utils.functional import Promise
@@ -113,16 +114,26 @@ def get_lmnp_summary(property_id: int, year: int) -> dict:
       - cerfa_318: réintégration amortissements excédentaires (art. 39-4 CGI):
             abs(cerfa_310) when cerfa_310 < 0, else amortization_total
     """
-    raw = _get_lmnp_summary_raw(property_id, year)
+    return LmnpTimeline(property_id).summary(year)
+
+
+def _build_lmnp_summary(
+    year: int,
+    by_category: dict[str, Decimal],
+    amortization_total: Decimal,
+    deferred_prior: Decimal,
+) -> dict:
+    """
+    Build the ``get_lmnp_summary()`` dict of ``year`` from its category totals,
+    its amortization dotation and the art. 39C deferral carried from ``year - 1``.
+    """
+    raw = _split_category_totals(by_category)
     recettes = raw["recettes"]
     charges = raw["charges"]
     charges_exploitation = raw["charges_exploitation"]
     charges_financieres = raw["charges_financieres"]
     result_before_amort = recettes - charges
 
-    # Re-compute by_category and by_line for external consumers
-    by_category = _get_category_totals_for_year(property_id, year)
-
     by_line: dict[str, Decimal] = {}
     for cat, total in by_category.items():
         try:
@@ -138,9 +149,7 @@ def get_lmnp_summary(property_id: int, year: int) -> dict:
     if cfe_total > Decimal("0"):
         by_line["243"] = cfe_total
 
-    # Art. 39C: compute deferred balance from prior years
-    deferred_prior = get_deferred_amortization_balance(property_id, year - 1)
-    amortization_total = get_total_amortization(property_id, year)
+    # Art. 39C: use the deferred balance carried from prior years
     available_amort = amortization_total + deferred_prior
 
     if result_before_amort <= Decimal("0"):
@@ -208,50 +217,7 @@ def get_fiscal_deficit_history(property_id: int, year: int) -> dict[int, Decimal
     Returns:
         dict mapping origin_year → remaining_deficit_amount (> 0).
     """
-    from property.models import AmortizationAsset, Property
-
-    # Determine start year from first asset or property buying_date
-    qs = AmortizationAsset.objects.filter(property_id=property_id).order_by(
-        "beginning_date"
-    )
-    if qs.exists():
-        first_year = qs.first().beginning_date.year  # ty: ignore[unresolved-attribute]
-    else:
-        try:
-            prop = Property.objects.get(pk=property_id)
-            first_year = prop.buying_date.year if prop.buying_date else year
-        except Property.DoesNotExist:
-            return {}
-
-    if year < first_year:
-        return {}
-
-    deficits: dict[int, Decimal] = {}
-
-    for y in range(first_year, year + 1):
-        # Remove expired deficits (older than 10 years: oy < y - 10 means expired)
-        # A deficit from year oy is reportable in years oy+1 to oy+10 inclusive.
-        cutoff = y - 10
-        deficits = {oy: d for oy, d in deficits.items() if oy >= cutoff}
-
-        # Get fiscal result before deficit imputation (after art. 39C amort deferral)
-        summary = get_lmnp_summary(property_id, y)
-        fiscal_result = summary["taxable_result"]
-
-        if fiscal_result < Decimal("0"):
-            deficits[y] = abs(fiscal_result)
-        elif fiscal_result > Decimal("0"):
-            # Apply oldest deficits first
-            profit_remaining = fiscal_result
-            for deficit_year in sorted(deficits.keys()):
-                if profit_remaining <= Decimal("0"):
-                    break
-                use = min(deficits[deficit_year], profit_remaining)
-                deficits[deficit_year] -= use
-                profit_remaining -= use
-            deficits = {oy: d for oy, d in deficits.items() if d > Decimal("0")}
-
-    return deficits
+    return LmnpTimeline(property_id).deficit_history(year)
 
 
 def get_fiscal_deficit_carryforward(property_id: int, year: int) -> Decimal:
@@ -262,6 +228,77 @@ def get_fiscal_deficit_carryforward(property_id: int, year: int) -> Decimal:
 # ─── Amortization helpers ────────────────────────────────────────────────────
 
 
+class AmortizationMatrix:
+    """
+    Dotation of every asset of a property for every year, computed once.
+
+    The rows hold the dotation of each asset for each year from the first
+    acquisition to the end of the last useful life; cumulative amortizations
+    are their prefix sums.  Every lookup is then O(1), where summing
+    ``get_annual_amortization()`` per asset and per year is quadratic in
+    years × assets.  Years outside the span have no dotation and keep the
+    cumulative amortization of the nearest end.
+    """
+
+    def __init__(self, assets):
+        self.assets = list(assets)
+        spans = [asset.amortization_years() for asset in self.assets]
+        self.first_year = min((span.start for span in spans if span), default=None)
+        self.last_year = max((span.stop - 1 for span in spans if span), default=None)
+        years = self.years()
+        self._dotations: dict[int, list[Decimal]] = {}
+        self._cumulative: dict[int, list[Decimal]] = {}
+        for asset in self.assets:
+            row = [asset.get_annual_amortization(year) for year in years]
+            self._dotations[asset.pk] = row
+            self._cumulative[asset.pk] = list(accumulate(row, initial=Decimal("0")))[1:]
+        self._totals = [
+            sum((row[index] for row in self._dotations.values()), Decimal("0"))
+            for index in range(len(years))
+        ]
+        self._cumulative_totals = list(accumulate(self._totals, initial=Decimal("0")))[
+            1:
+        ]
+
+    def years(self) -> range:
+        """Return the years with a dotation of at least one asset."""
+        if self.first_year is None:
+            return range(0)
+        return range(self.first_year, self.last_year + 1)
+
+    def _index(self, year: int) -> int | None:
+        """Return the column of ``year``, None when it has no dotation."""
+        if self.first_year is None or not self.first_year <= year <= self.last_year:
+            return None
+        return year - self.first_year
+
+    def _cumulative_index(self, year: int) -> int | None:
+        """Return the column holding the cumulative amortization up to ``year``."""
+        if self.first_year is None or year < self.first_year:
+            return None
+        return min(year, self.last_year) - self.first_year
+
+    def dotation(self, asset, year: int) -> Decimal:
+        """Return the dotation of ``asset`` in ``year``."""
+        index = self._index(year)
+        return Decimal("0") if index is None else self._dotations[asset.pk][index]
+
+    def cumulative(self, asset, year: int) -> Decimal:
+        """Return ``asset.cumulative_amortization(year)``."""
+        index = self._cumulative_index(year)
+        return Decimal("0") if index is None else self._cumulative[asset.pk][index]
+
+    def total(self, year: int) -> Decimal:
+        """Return the dotation of all the assets in ``year``."""
+        index = self._index(year)
+        return Decimal("0") if index is None else self._totals[index]
+
+    def cumulative_total(self, year: int) -> Decimal:
+        """Return the cumulative amortization of all the assets up to ``year``."""
+        index = self._cumulative_index(year)
+        return Decimal("0") if index is None else self._cumulative_totals[index]
+
+
 def get_amortization_table(property_id: int, year: int) -> list[dict]:
     """
     Return the amortization table for all AmortizationAsset items of a property
@@ -287,6 +324,7 @@ def get_amortization_table(property_id: int, year: int) -> list[dict]:
         .prefetch_related("source_transactions")
         .order_by("-is_initial_component", "beginning_date")
     )
+    amortization = AmortizationMatrix(assets)
 
     try:
         setup = AmortizationSetup.objects.get(property_id=property_id)
@@ -295,10 +333,10 @@ def get_amortization_table(property_id: int, year: int) -> list[dict]:
         setup_total = None
 
     table = []
-    for asset in assets:
+    for asset in amortization.assets:
         base = asset.depreciable_base()
-        dotation = asset.get_annual_amortization(year)
-        cumul = asset.cumulative_amortization(year)
+        dotation = amortization.dotation(asset, year)
+        cumul = amortization.cumulative(asset, year)
         global_pct = None
         if setup_total and setup_total > Decimal("0"):
             global_pct = (
@@ -379,6 +417,7 @@ def get_amortization_schedule(property_id: int) -> dict:
             "end_year": None,
         }
 
+    amortization = AmortizationMatrix(depreciable_assets)
     first_year = min(a.beginning_date.year for a in depreciable_assets)
     last_year = max(
         a.beginning_date.year + a.duration_years - 1 for a in depreciable_assets
@@ -389,22 +428,19 @@ def get_amortization_schedule(property_id: int) -> dict:
         (a.depreciable_base().amount for a in depreciable_assets), Decimal("0")
     )
 
-    # Pre-compute per-asset dotations for each year to avoid repeated queries
     # Only depreciable assets are included in the chart series
     asset_yearly: list[dict] = []
     for asset in depreciable_assets:
         yearly = {
-            year: asset.get_annual_amortization(year)
+            year: amortization.dotation(asset, year)
             for year in range(first_year, last_year + 1)
         }
         asset_yearly.append({"label": asset.label, "pk": asset.pk, "yearly": yearly})
 
     rows = []
     for year in range(first_year, last_year + 1):
-        dotation = sum((ay["yearly"][year] for ay in asset_yearly), Decimal("0"))
-        cumul = sum(
-            (a.cumulative_amortization(year) for a in depreciable_assets), Decimal("0")
-        )
+        dotation = amortization.total(year)
+        cumul = amortization.cumulative_total(year)
         pct = (
             (cumul / total_base * Decimal("100")).quantize(Decimal("0.1"))
             if total_base > Decimal("0")
@@ -434,11 +470,7 @@ def get_amortization_schedule(property_id: int) -> dict:
         for ay in asset_yearly
     ]
 
-    amortized_to_date = sum(
-        (a.cumulative_amortization(today_year) for a in depreciable_assets),
-        Decimal("0"),
-    )
-    amortized_to_date = min(amortized_to_date, total_base)
+    amortized_to_date = min(amortization.cumulative_total(today_year), total_base)
     remaining = max(Decimal("0"), total_base - amortized_to_date)
 
     return {
@@ -453,8 +485,10 @@ def get_amortization_schedule(property_id: int) -> dict:
 
 def get_total_amortization(property_id: int, year: int) -> Decimal:
     """Return the total amortization dotation for a property in a given year."""
-    table = get_amortization_table(property_id, year)
-    return sum((row["annual_dotation"] for row in table), Decimal("0"))
+    from property.models import AmortizationAsset
+
+    assets = AmortizationAsset.objects.filter(property_id=property_id)
+    return AmortizationMatrix(assets).total(year)
 
 
 def get_deferred_amortization_balance(property_id: int, year: int) -> Decimal:
@@ -467,34 +501,7 @@ def get_deferred_amortization_balance(property_id: int, year: int) -> Decimal:
     This function iterates from the first acquisition year of any asset up to
     `year`, applying the art. 39C rule each year to derive the carryforward.
     """
-    from property.models import AmortizationAsset
-
-    earliest_qs = AmortizationAsset.objects.filter(property_id=property_id).order_by(
-        "beginning_date"
-    )
-    if not earliest_qs.exists():
-        return Decimal("0")
-
-    first_year = earliest_qs.first().beginning_date.year  # ty: ignore[unresolved-attribute]
-    if year < first_year:
-        return Decimal("0")
-
-    deferred_balance = Decimal("0")
-
-    for y in range(first_year, year + 1):
-        summary = _get_lmnp_summary_raw(property_id, y)
-        result_before_amort = summary["recettes"] - summary["charges"]
-        total_dotation = get_total_amortization(property_id, y)
-        available_amort = total_dotation + deferred_balance
-
-        if result_before_amort <= Decimal("0"):
-            # Operating deficit: cannot deduct any amortization
-            deferred_balance += total_dotation
-        else:
-            deductible = min(available_amort, result_before_amort)
-            deferred_balance = available_amort - deductible
-
-    return max(Decimal("0"), deferred_balance)
+    return LmnpTimeline(property_id).deferred_balance(year)
 
 
 def _get_category_totals_for_year(property_id: int, year: int) -> dict[str, Decimal]:
@@ -510,76 +517,112 @@ def _get_category_totals_for_year(property_id: int, year: int) -> dict[str, Deci
     the year, the interest column of the loan amortization table is used instead
     (summed over all loans that have amortization entries for that year).
     """
-    from property.models import (
-        PropertyLedgerEntry,
-        PropertyLoan,
-        PropertyLoanAmortizationEntry,
-    )
+    return _get_category_totals([property_id], [year])[property_id][year]
 
-    year_start = datetime.date(year, 1, 1)
-    year_end = datetime.date(year, 12, 31)
-    base_filter = {"property_id": property_id, "amount_currency": "EUR"}
 
-    # ── Non-recurring: entry_date within the year ──────────────────────────
+def _get_category_totals(
+    property_ids: list[int], years: list[int]
+) -> dict[int, dict[int, dict[str, Decimal]]]:
+    """
+    Return ``_get_category_totals_for_year()`` for every property and year at once.
+
+    The result maps property id → year → category → total.  Non-recurring
+    entries and the loan interest fallback are summed with one query each,
+    grouped by property and year; recurring entries are loaded once (with
+    their exceptions) and their occurrences spread over the years.  The
+    number of queries depends neither on the years nor on the loans.
+    """
+    from django.db.models.functions import ExtractYear
+
+    from property.models import PropertyLedgerEntry, PropertyLoanAmortizationEntry
+
+    totals: dict[int, dict[int, dict[str, Decimal]]] = {
+        property_id: {year: {} for year in years} for property_id in property_ids
+    }
+    if not property_ids or not years:
+        return totals
+
+    range_start = datetime.date(min(years), 1, 1)
+    range_end = datetime.date(max(years), 12, 31)
+    base_filter = {"property_id__in": property_ids, "amount_currency": "EUR"}
+
+    # ── Non-recurring: entry_date within the years ─────────────────────────
     non_recurring_qs = PropertyLedgerEntry.objects.filter(
         **base_filter,
         recurrence_type=PropertyLedgerEntry.RecurrenceType.NONE,
-        entry_date__gte=year_start,
-        entry_date__lte=year_end,
-    ).exclude(capitalized_as__isnull=False)
-
-    by_category: dict[str, Decimal] = {}
-    for row in non_recurring_qs.values("management_category").annotate(
-        total=Sum("amount")
+        entry_date__gte=range_start,
+        entry_date__lte=range_end,
+    ).not_capitalized()
+
+    for row in (
+        non_recurring_qs.annotate(year=ExtractYear("entry_date"))
+        .values("property_id", "year", "management_category")
+        .annotate(total=Sum("amount"))
+        .order_by()
     ):
-        by_category[row["management_category"]] = row["total"] or Decimal("0")
+        by_category = totals[row["property_id"]].get(row["year"])
+        if by_category is not None:
+            by_category[row["management_category"]] = row["total"] or Decimal("0")
 
-    # ── Recurring: entries that overlap the year ───────────────────────────
+    # ── Recurring: entries that overlap the years ──────────────────────────
     recurring_qs = (
         PropertyLedgerEntry.objects.filter(**base_filter)
         .exclude(recurrence_type=PropertyLedgerEntry.RecurrenceType.NONE)
-        .exclude(capitalized_as__isnull=False)
+        .not_capitalized()
         .filter(
-            entry_date__lte=year_end,
+            entry_date__lte=range_end,
         )
         .filter(
-            Q(recurrence_end_date__gte=year_start) | Q(recurrence_end_date__isnull=True)
+            Q(recurrence_end_date__gte=range_start)
+            | Q(recurrence_end_date__isnull=True)
         )
         .prefetch_related("exceptions")
     )
 
     for entry in recurring_qs:
-        occurrences = entry.generate_occurrences(end_date=year_end)
-        for occ in occurrences:
-            if occ["date"] < year_start:
+        by_year = totals[entry.property_id]
+        cat = entry.management_category
+        end_date = entry.recurrence_end_date
+        for occ in entry.generate_occurrences(end_date=range_end):
+            by_category = by_year.get(occ["date"].year)
+            # The entry must overlap the year (a recurrence ending before its
+            # start yields its start date as only occurrence)
+            if by_category is None or (end_date and end_date.year < occ["date"].year):
                 continue
-            cat = entry.management_category
             by_category[cat] = by_category.get(cat, Decimal("0")) + occ["amount"].amount
 
     # ── Fallback: use loan amortization entries for loan_interest ─────────
     # When no manual loan_interest ledger entries exist for the year, sum the
-    # interest column from PropertyLoanAmortizationEntry for all property loans.
+    # interest column from PropertyLoanAmortizationEntry for all property loans,
+    # grouped by property and year in one query.
     loan_interest_key = str(ManagementCategory.LOAN_INTEREST)
-    if not by_category.get(loan_interest_key):
-        loans = PropertyLoan.objects.filter(property_id=property_id)
-        amort_interest_total = Decimal("0")
-        for loan in loans:
-            result = PropertyLoanAmortizationEntry.objects.filter(
-                loan=loan,
-                date__gte=year_start,
-                date__lte=year_end,
-            ).aggregate(total=Sum("interest"))
-            amort_interest_total += result["total"] or Decimal("0")
-        if amort_interest_total > Decimal("0"):
-            by_category[loan_interest_key] = amort_interest_total
-
-    return by_category
+    for row in (
+        PropertyLoanAmortizationEntry.objects.filter(
+            loan__property_id__in=property_ids,
+            date__gte=range_start,
+            date__lte=range_end,
+        )
+        .annotate(year=ExtractYear("date"))
+        .values("loan__property_id", "year")
+        .annotate(total=Sum("interest"))
+        .order_by()
+    ):
+        by_category = totals[row["loan__property_id"]].get(row["year"])
+        if by_category is None or by_category.get(loan_interest_key):
+            continue
+        if row["total"] and row["total"] > Decimal("0"):
+            by_category[loan_interest_key] = row["total"]
+
+    return totals
 
 
 def _get_lmnp_summary_raw(property_id: int, year: int) -> dict:
     """Internal: return recettes and charges from ledger entries (no amortization)."""
-    by_category = _get_category_totals_for_year(property_id, year)
+    return _split_category_totals(_get_category_totals_for_year(property_id, year))
+
 
+def _split_category_totals(by_category: dict[str, Decimal]) -> dict:
+    """Internal: sum category totals into recettes and charges (cerfa sections)."""
     recettes = Decimal("0")
     charges = Decimal("0")
     charges_exploitation = Decimal("0")
@@ -605,13 +648,354 @@ def _get_lmnp_summary_raw(property_id: int, year: int) -> dict:
     }
 
 
+# ─── Single-pass fiscal timeline ──────────────────────────────────────────────
+
+
+class LmnpTimeline:
+    """
+    Year-by-year LMNP figures of one property, computed in one forward pass.
+
+    The art. 39C deferred amortization and the art. 156 deficit carryforward of
+    a year both depend on every earlier year.  Instead of replaying the history
+    for each year asked for, the timeline walks the years once and keeps the
+    balances carried out of each year, together with the category totals and
+    dotation of each year.  Asking for a later year only computes the years
+    not seen yet.
+
+    The walk starts from the latest closed year (``LmnpYearClosing``) whose
+    data is unchanged since its closing, or from the first acquisition year
+    when there is none.
+
+    Build one timeline per property and reuse it for all the figures of a
+    request (see ``get_accounting_data``).  The dicts it returns are shared
+    between calls and must not be modified.
+
+    The keyword arguments preload the data of the property, as
+    ``build_lmnp_timelines()`` does for many properties at once; whatever is
+    not given is queried when first needed.  ``assets`` are ordered by label,
+    ``closings`` by descending year and ``closing_hashes`` holds the current
+    ``lmnp_input_hash()`` of each closed year.
+    """
+
+    def __init__(
+        self,
+        property_id: int,
+        *,
+        assets: list | None = None,
+        buying_date: datetime.date | None = None,
+        category_totals: dict[int, dict[str, Decimal]] | None = None,
+        closings: list | None = None,
+        closing_hashes: dict[int, str] | None = None,
+    ):
+        from property.models import AmortizationAsset
+
+        self.property_id = property_id
+        if assets is None:
+            assets = list(AmortizationAsset.objects.filter(property_id=property_id))
+        self.assets = assets
+        self.amortization = AmortizationMatrix(assets)
+        self._first_asset_year = min(
+            (asset.beginning_date.year for asset in assets), default=None
+        )
+        self._buying_date = buying_date
+        self._category_totals: dict[int, dict[str, Decimal]] = dict(
+            category_totals or {}
+        )
+        self._summaries: dict[int, dict] = {}
+        # Art. 39C deferred balance at the end of each year
+        self._deferred: dict[int, Decimal] = {}
+        # Art. 156 deficits by origin year at the end of each year
+        self._deficits: dict[int, dict[int, Decimal]] = {}
+        self._deficit_start: int | None = None
+        self._closings = closings
+        self._closing_hashes = dict(closing_hashes or {})
+        self._closing_validity: dict[int, bool] = {}
+
+    # ── Per-year inputs ──────────────────────────────────────────────────────
+
+    def category_totals(self, year: int) -> dict[str, Decimal]:
+        """Return the per-management-category totals of ``year``."""
+        if year not in self._category_totals:
+            self._load_category_totals([year])
+        return self._category_totals[year]
+
+    def _load_category_totals(self, years) -> None:
+        """Load the category totals of the ``years`` not known yet, at once."""
+        missing = [year for year in years if year not in self._category_totals]
+        if missing:
+            self._category_totals.update(
+                _get_category_totals([self.property_id], missing)[self.property_id]
+            )
+
+    def amortization_total(self, year: int) -> Decimal:
+        """Return the total amortization dotation of ``year``."""
+        return self.amortization.total(year)
+
+    # ── Closed years ─────────────────────────────────────────────────────────
+
+    def closing_statuses(self) -> list[tuple]:
+        """
+        Return ``(closing, is_valid)`` for each closed year, latest first.
+
+        A closing is valid while the data it was computed from is unchanged.
+        """
+        return [
+            (closing, self._closing_is_valid(closing))
+            for closing in self._get_closings()
+        ]
+
+    def _get_closings(self) -> list:
+        if self._closings is None:
+            from property.models import LmnpYearClosing
+
+            self._closings = list(
+                LmnpYearClosing.objects.filter(property_id=self.property_id).order_by(
+                    "-year"
+                )
+            )
+        return self._closings
+
+    def _closing_is_valid(self, closing) -> bool:
+        if closing.year not in self._closing_validity:
+            if closing.year not in self._closing_hashes:
+                from property.services.lmnp_closing import lmnp_input_hash
+
+                self._closing_hashes[closing.year] = lmnp_input_hash(
+                    self.property_id, closing.year
+                )
+            self._closing_validity[closing.year] = (
+                closing.input_hash == self._closing_hashes[closing.year]
+            )
+        return self._closing_validity[closing.year]
+
+    def _resume_year(self, carried: dict, year: int, first_year: int) -> int:
+        """
+        Return the first year to compute for ``carried[year]`` to be known.
+
+        The balances of the latest valid closing up to ``year`` are loaded
+        first, so the walk never goes back past it.
+        """
+        if year not in carried:
+            for closing in self._get_closings():
+                if closing.year <= year and self._closing_is_valid(closing):
+                    self._deferred.setdefault(
+                        closing.year, closing.deferred_amortization
+                    )
+                    self._deficits.setdefault(closing.year, closing.deficit_history())
+                    break
+        resume = year
+        while resume >= first_year and resume not in carried:
+            resume -= 1
+        return resume + 1
+
+    # ── Carried balances ─────────────────────────────────────────────────────
+
+    def deferred_balance(self, year: int) -> Decimal:
+        """Return the art. 39C deferred amortization balance at the end of ``year``."""
+        first_year = self._first_asset_year
+        if first_year is None or year < first_year:
+            return Decimal("0")
+
+        years = range(self._resume_year(self._deferred, year, first_year), year + 1)
+        self._load_category_totals(years)
+        for y in years:
+            deferred_prior = self._deferred.get(y - 1, Decimal("0"))
+            raw = _split_category_totals(self.category_totals(y))
+            result_before_amort = raw["recettes"] - raw["charges"]
+            total_dotation = self.amortization_total(y)
+            available_amort = total_dotation + deferred_prior
+
+            if result_before_amort <= Decimal("0"):
+                # Operating deficit: cannot deduct any amortization
+                self._deferred[y] = deferred_prior + total_dotation
+            else:
+                deductible = min(available_amort, result_before_amort)
+                self._deferred[y] = available_amort - deductible
+
+        return max(Decimal("0"), self._deferred[year])
+
+    def summary(self, year: int) -> dict:
+        """Return the ``get_lmnp_summary()`` dict of ``year``."""
+        if year not in self._summaries:
+            self._summaries[year] = _build_lmnp_summary(
+                year,
+                self.category_totals(year),
+                self.amortization_total(year),
+                self.deferred_balance(year - 1),
+            )
+        return self._summaries[year]
+
+    def deficit_history(self, year: int) -> dict[int, Decimal]:
+        """Return the remaining fiscal deficits by origin year at the end of ``year``."""
+        if self._deficit_start is None:
+            if self._first_asset_year is not None:
+                self._deficit_start = self._first_asset_year
+            else:
+                from property.models import Property
+
+                buying_date = (
+                    self._buying_date
+                    or Property.objects.filter(pk=self.property_id)
+                    .values_list("buying_date", flat=True)
+                    .first()
+                )
+                if buying_date is None:
+                    return {}
+                self._deficit_start = buying_date.year
+
+        first_year = self._deficit_start
+        if year < first_year:
+            return {}
+
+        years = range(self._resume_year(self._deficits, year, first_year), year + 1)
+        self._load_category_totals(years)
+        for y in years:
+            # Remove expired deficits (older than 10 years: oy < y - 10 means expired)
+            # A deficit from year oy is reportable in years oy+1 to oy+10 inclusive.
+            cutoff = y - 10
+            deficits = {
+                oy: d for oy, d in self._deficits.get(y - 1, {}).items() if oy >= cutoff
+            }
+
+            # Fiscal result before deficit imputation (after art. 39C amort deferral)
+            fiscal_result = self.summary(y)["taxable_result"]
+
+            if fiscal_result < Decimal("0"):
+                deficits[y] = abs(fiscal_result)
+            elif fiscal_result > Decimal("0"):
+                # Apply oldest deficits first
+                profit_remaining = fiscal_result
+                for deficit_year in sorted(deficits.keys()):
+                    if profit_remaining <= Decimal("0"):
+                        break
+                    use = min(deficits[deficit_year], profit_remaining)
+                    deficits[deficit_year] -= use
+                    profit_remaining -= use
+                deficits = {oy: d for oy, d in deficits.items() if d > Decimal("0")}
+            self._deficits[y] = deficits
+
+        return dict(self._deficits[year])
+
+
+def build_lmnp_timelines(properties: list, year: int) -> dict[int, LmnpTimeline]:
+    """
+    Return the ``LmnpTimeline`` of each property, preloaded up to ``year``.
+
+    Assets, closings, closing hashes and category totals of all the
+    properties are loaded with a fixed number of queries, so that computing
+    the figures of every property up to ``year`` issues no further query.
+    """
+    from property.models import AmortizationAsset, LmnpYearClosing
+    from property.services.lmnp_closing import lmnp_input_hashes
+
+    property_ids = [prop.pk for prop in properties]
+    assets: dict[int, list] = {property_id: [] for property_id in property_ids}
+    for asset in AmortizationAsset.objects.filter(
+        property_id__in=property_ids
+    ).order_by("label", "pk"):
+        assets[asset.property_id].append(asset)
+
+    closings: dict[int, list] = {property_id: [] for property_id in property_ids}
+    for closing in LmnpYearClosing.objects.filter(
+        property_id__in=property_ids
+    ).order_by("property_id", "-year"):
+        closings[closing.property_id].append(closing)
+    hashes = lmnp_input_hashes(
+        {
+            property_id: [closing.year for closing in property_closings]
+            for property_id, property_closings in closings.items()
+        }
+    )
+
+    # The years to load start after the latest unchanged closing, or at the
+    # acquisition when there is none.
+    first_years = []
+    for prop in properties:
+        resume = next(
+            (
+                closing.year + 1
+                for closing in closings[prop.pk]
+                if closing.year < year
+                and hashes[prop.pk, closing.year] == closing.input_hash
+            ),
+            None,
+        )
+        if resume is None:
+            resume = min(
+                (asset.beginning_date.year for asset in assets[prop.pk]),
+                default=prop.buying_date.year,
+            )
+        first_years.append(min(resume, year))
+    years = list(range(min(first_years, default=year), year + 1))
+    category_totals = _get_category_totals(property_ids, years)
+
+    return {
+        prop.pk: LmnpTimeline(
+            prop.pk,
+            assets=assets[prop.pk],
+            buying_date=prop.buying_date,
+            category_totals=category_totals[prop.pk],
+            closings=closings[prop.pk],
+            closing_hashes={
+                closing.year: hashes[prop.pk, closing.year]
+                for closing in closings[prop.pk]
+            },
+        )
+        for prop in properties
+    }
+
+
+def _get_loan_balances(
+    property_ids: list[int], as_of: datetime.date
+) -> dict[int, Decimal]:
+    """
+    Return the total remaining loan balance of each property at ``as_of``.
+
+    Same figures as ``PropertyLoan.remaining_balance()``, with the latest
+    amortization table row of every loan fetched in the loans query.
+    """
+    from django.db.models import Exists, OuterRef, Subquery
+
+    from property.models import PropertyLoan, PropertyLoanAmortizationEntry
+
+    schedule = PropertyLoanAmortizationEntry.objects.filter(loan=OuterRef("pk"))
+    loans = PropertyLoan.objects.filter(property_id__in=property_ids).annotate(
+        has_schedule=Exists(schedule),
+        scheduled_balance=Subquery(
+            schedule.filter(date__lte=as_of)
+            .order_by("-date")
+            .values("remaining_balance_amount")[:1]
+        ),
+    )
+
+    balances = {property_id: Decimal("0") for property_id in property_ids}
+    for loan in loans:
+        if not loan.has_schedule:
+            balance = loan.remaining_balance_from_params(as_of).amount
+        elif loan.scheduled_balance is None:
+            balance = loan.original_amount.amount
+        else:
+            balance = max(Decimal("0"), loan.scheduled_balance)
+        balances[loan.property_id] += balance
+    return balances
+
+
 # ─── Multi-property aggregation (liasse fiscale complète) ─────────────────────
 
 
-def get_bilan_data(property_id: int, year: int) -> dict:
+def get_bilan_data(
+    property_id: int,
+    year: int,
+    timeline: LmnpTimeline | None = None,
+    loans_balance: Decimal | None = None,
+) -> dict:
     """
     Return 2033-A Bilan simplifié data for a property at year-end.
 
+    ``get_accounting_data`` passes the ``timeline`` of the property (which
+    holds its assets) and its ``loans_balance`` at year-end, loaded for all
+    the properties at once.
+
     Returns:
       - immobilisations_brutes: sum of all asset value_total (incl. land if setup exists)
       - amortissements_cumules: sum of cumulative amortizations up to year
@@ -622,22 +1006,20 @@ def get_bilan_data(property_id: int, year: int) -> dict:
       - total_capitaux_propres: valeur_nette_comptable - emprunts (balance sheet equity)
       - cout_revient_acquisitions: gross value of assets acquired during the year
     """
-    from property.models import AmortizationAsset, PropertyLoan
-
-    assets = AmortizationAsset.objects.filter(property_id=property_id)
+    timeline = timeline or LmnpTimeline(property_id)
+    assets = timeline.assets
     brut = sum((a.value_total.amount for a in assets), Decimal("0"))
 
     # Land is included as an AmortizationAsset (cerfa_category="terrains").
 
-    cumul = sum((a.cumulative_amortization(year) for a in assets), Decimal("0"))
+    cumul = timeline.amortization.cumulative_total(year)
 
-    year_end = datetime.date(year, 12, 31)
-    loans = PropertyLoan.objects.filter(property_id=property_id)
-    emprunts = sum(
-        (loan.remaining_balance(year_end).amount for loan in loans), Decimal("0")
-    )
+    if loans_balance is None:
+        year_end = datetime.date(year, 12, 31)
+        loans_balance = _get_loan_balances([property_id], year_end)[property_id]
+    emprunts = loans_balance
 
-    summary = get_lmnp_summary(property_id, year)
+    summary = timeline.summary(year)
 
     # On the 2033-A balance sheet the Passif must equal the Actif net.
     # Actif net = immobilisations brutes − amortissements cumulés = brut − cumul
@@ -673,10 +1055,15 @@ def get_bilan_data(property_id: int, year: int) -> dict:
     }
 
 
-def get_immobilisation_movements(property_id: int, year: int) -> dict:
+def get_immobilisation_movements(
+    property_id: int, year: int, amortization: AmortizationMatrix | None = None
+) -> dict:
     """
     Return 2033-C immobilisation movements for a property.
 
+    ``amortization`` is the ``AmortizationMatrix`` of the property assets,
+    ordered by label, when the caller already built it.
+
     Returns a dict with:
       - rows: per-asset movements
       - by_cerfa_category: aggregated by cerfa category (terrains/constructions/
@@ -689,16 +1076,17 @@ def get_immobilisation_movements(property_id: int, year: int) -> dict:
     """
     from property.models import AmortizationAsset
 
-    assets = AmortizationAsset.objects.filter(property_id=property_id).select_related(
-        "property"
-    )
+    if amortization is None:
+        amortization = AmortizationMatrix(
+            AmortizationAsset.objects.filter(property_id=property_id)
+        )
     rows = []
-    for asset in assets:
+    for asset in amortization.assets:
         acq_year = asset.beginning_date.year if asset.beginning_date else year
         value_total = asset.value_total.amount
-        amort_start = asset.cumulative_amortization(year - 1)
-        dotation = asset.get_annual_amortization(year)
-        amort_end = asset.cumulative_amortization(year)
+        amort_start = amortization.cumulative(asset, year - 1)
+        dotation = amortization.dotation(asset, year)
+        amort_end = amortization.cumulative(asset, year)
         rows.append(
             {
                 "label": asset.label,
@@ -777,6 +1165,8 @@ def get_accounting_data(properties: list, year: int) -> dict:
       - form_2033c: 2033-C Immobilisations (per-property)
       - form_2031: 2031 résultat BIC summary
       - form_2042c: 2042-C PRO cases 5NK/5NZ + deficit carryforward (deficit_cases_list)
+      - closings: per property, the closing of ``year`` (or None) and the closed
+            years whose data changed after their closing (``stale_years``)
     """
     # ── 2033-B: aggregate by cerfa line ──────────────────────────────────────
     agg_recettes = Decimal("0")
@@ -796,8 +1186,16 @@ def get_accounting_data(properties: list, year: int) -> dict:
     # Per-property summaries for other forms
     per_prop_summaries: list[dict] = []
 
+    # One fiscal timeline per property, shared by all the forms below.  The
+    # data of all the properties is loaded in bulk: the number of queries does
+    # not grow with the number of properties.
+    timelines = build_lmnp_timelines(properties, year)
+    loans_balances = _get_loan_balances(
+        [prop.pk for prop in properties], datetime.date(year, 12, 31)
+    )
+
     for prop in properties:
-        summary = get_lmnp_summary(prop.pk, year)
+        summary = timelines[prop.pk].summary(year)
         agg_recettes += summary["recettes"]
         agg_charges_exploitation += summary["charges_exploitation"]
         agg_charges_financieres += summary["charges_financieres"]
@@ -847,7 +1245,12 @@ def get_accounting_data(properties: list, year: int) -> dict:
     per_prop_bilan: list[dict] = []
 
     for prop in properties:
-        bilan = get_bilan_data(prop.pk, year)
+        bilan = get_bilan_data(
+            prop.pk,
+            year,
+            timeline=timelines[prop.pk],
+            loans_balance=loans_balances[prop.pk],
+        )
         agg_brut += bilan["immobilisations_brutes"]
         agg_cumul += bilan["amortissements_cumules"]
         agg_emprunts += bilan["emprunts"]
@@ -886,7 +1289,9 @@ def get_accounting_data(properties: list, year: int) -> dict:
     }
     per_prop_immobilisations: list[dict] = []
     for prop in properties:
-        movements = get_immobilisation_movements(prop.pk, year)
+        movements = get_immobilisation_movements(
+            prop.pk, year, amortization=timelines[prop.pk].amortization
+        )
         per_prop_immobilisations.append({"property": prop, "movements": movements})
         for cat in categories_c:
             row = movements["by_cerfa_category"][cat]
@@ -921,7 +1326,7 @@ def get_accounting_data(properties: list, year: int) -> dict:
     # Aggregate deficit carryforward across all properties
     agg_deficit_history: dict[int, Decimal] = {}
     for prop in properties:
-        prop_history = get_fiscal_deficit_history(prop.pk, year)
+        prop_history = timelines[prop.pk].deficit_history(year)
         for origin_year, deficit in prop_history.items():
             agg_deficit_history[origin_year] = (
                 agg_deficit_history.get(origin_year, Decimal("0")) + deficit
@@ -974,12 +1379,29 @@ def get_accounting_data(properties: list, year: int) -> dict:
         "is_benefice": agg_taxable_result >= Decimal("0"),
     }
 
+    # ── Closed years ──────────────────────────────────────────────────────────
+    # Closing of ``year`` per property, and closed years edited since closing
+    closings = []
+    for prop in properties:
+        statuses = timelines[prop.pk].closing_statuses()
+        by_year = {closing.year: closing for closing, _is_valid in statuses}
+        closings.append(
+            {
+                "property": prop,
+                "closing": by_year.get(year),
+                "stale_years": sorted(
+                    closing.year for closing, is_valid in statuses if not is_valid
+                ),
+            }
+        )
+
     return {
         "form_2033b": form_2033b,
         "form_2033a": form_2033a,
         "form_2033c": form_2033c,
         "form_2031": form_2031,
         "form_2042c": form_2042c,
+        "closings": closings,
     }
 
 
@@ -1013,33 +1435,103 @@ _CHECKLIST_FINANCIERES = frozenset(
 )
 
 
-def _count_entries_in_year(property_id: int, year: int, categories: frozenset) -> int:
-    """Count ledger entries (recurring or not) that have amounts in ``year``."""
+def _entries_in_year_q(year: int, prefix: str = "") -> Q:
+    """
+    Return a Q matching the ledger entries (recurring or not) with amounts in ``year``.
+
+    ``prefix`` is the lookup path to the entries, e.g. ``"ledger_entries__"``
+    from a Property queryset.
+    """
     from property.models import PropertyLedgerEntry
 
     year_start = datetime.date(year, 1, 1)
     year_end = datetime.date(year, 12, 31)
+    none = PropertyLedgerEntry.RecurrenceType.NONE
 
     non_recurring_q = Q(
-        recurrence_type=PropertyLedgerEntry.RecurrenceType.NONE,
-        entry_date__gte=year_start,
-        entry_date__lte=year_end,
+        **{
+            f"{prefix}recurrence_type": none,
+            f"{prefix}entry_date__gte": year_start,
+            f"{prefix}entry_date__lte": year_end,
+        }
     )
     recurring_q = (
-        ~Q(recurrence_type=PropertyLedgerEntry.RecurrenceType.NONE)
-        & Q(entry_date__lte=year_end)
-        & (Q(recurrence_end_date__gte=year_start) | Q(recurrence_end_date__isnull=True))
+        ~Q(**{f"{prefix}recurrence_type": none})
+        & Q(**{f"{prefix}entry_date__lte": year_end})
+        & (
+            Q(**{f"{prefix}recurrence_end_date__gte": year_start})
+            | Q(**{f"{prefix}recurrence_end_date__isnull": True})
+        )
     )
+    return non_recurring_q | recurring_q
 
-    return (
-        PropertyLedgerEntry.objects.filter(
-            property_id=property_id,
-            management_category__in=list(categories),
-            amount_currency="EUR",
+
+def _get_checklist_inputs(property_ids: list[int], year: int) -> dict[int, object]:
+    """
+    Return the properties annotated with everything the checklist of ``year`` needs.
+
+    One query: the ledger entries of the year are counted per checklist
+    category group with conditional ``Count`` on a single join, and the
+    amortization setup, assets by cerfa category and loans (active in the
+    year, with amortization table interest in the year) are ``Exists`` and
+    ``Count`` subqueries.
+    """
+    from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery
+    from django.db.models.functions import Coalesce
+
+    from property.models import (
+        AmortizationAsset,
+        AmortizationSetup,
+        Property,
+        PropertyLoan,
+        PropertyLoanAmortizationEntry,
+    )
+
+    year_start = datetime.date(year, 1, 1)
+    year_end = datetime.date(year, 12, 31)
+    in_year = _entries_in_year_q(year, "ledger_entries__") & Q(
+        ledger_entries__amount_currency="EUR"
+    )
+
+    def entries_count(categories: frozenset) -> Count:
+        return Count(
+            "ledger_entries",
+            filter=in_year & Q(ledger_entries__management_category__in=categories),
         )
-        .filter(non_recurring_q | recurring_q)
-        .count()
+
+    assets = AmortizationAsset.objects.filter(property=OuterRef("pk"))
+    active_loans = PropertyLoan.objects.filter(
+        property=OuterRef("pk"), start_date__lte=year_end, end_date__gte=year_start
+    )
+    scheduled_interest = PropertyLoanAmortizationEntry.objects.filter(
+        loan__property=OuterRef("pk"),
+        date__gte=year_start,
+        date__lte=year_end,
+        interest__gt=0,
     )
+    properties = Property.objects.filter(pk__in=property_ids).annotate(
+        revenue_count=entries_count(_CHECKLIST_RECETTES),
+        charges_count=entries_count(_CHECKLIST_CHARGES_EXPLOIT),
+        taxes_count=entries_count(_CHECKLIST_TAXES),
+        financial_count=entries_count(_CHECKLIST_FINANCIERES),
+        has_setup=Exists(AmortizationSetup.objects.filter(property=OuterRef("pk"))),
+        asset_count=Coalesce(
+            Subquery(
+                assets.order_by()
+                .values("property")
+                .annotate(count=Count("pk"))
+                .values("count"),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+        has_terrain_asset=Exists(
+            assets.filter(cerfa_category=AmortizationAsset.CerfaCategory.TERRAINS)
+        ),
+        has_active_loan=Exists(active_loans),
+        has_scheduled_interest=Exists(scheduled_interest),
+    )
+    return {prop.pk: prop for prop in properties}
 
 
 def get_lmnp_checklist(properties: list, year: int) -> dict:
@@ -1061,7 +1553,6 @@ def get_lmnp_checklist(properties: list, year: int) -> dict:
       - "total_issues": total count of warning + missing checks across all properties
       - "overall_status": "ok" | "warning" | "incomplete"
     """
-    from property.models import AmortizationAsset, AmortizationSetup, PropertyLoan
 
     def _check(
         check_id: str,
@@ -1070,6 +1561,7 @@ def get_lmnp_checklist(properties: list, year: int) -> dict:
         form_ref: str,
         required: bool = True,
         loan_active: bool | None = None,
+        scheduled_interest: bool = False,
     ) -> dict:
         """Build a single check result dict."""
         if check_id == "financial_charges":
@@ -1079,6 +1571,10 @@ def get_lmnp_checklist(properties: list, year: int) -> dict:
             elif count > 0:
                 status = "ok"
                 detail = _("%(count)d entry(ies) found.") % {"count": count}
+            elif scheduled_interest:
+                # The 2033-B falls back to the interest of the amortization table
+                status = "ok"
+                detail = _("Interest taken from the loan amortization table.")
             else:
                 status = "warning"
                 detail = _("Loan detected but no financial charge entries found.")
@@ -1105,43 +1601,14 @@ def get_lmnp_checklist(properties: list, year: int) -> dict:
     prop_results = []
     all_checks: list[list[dict]] = []
 
-    for prop in properties:
-        year_start = datetime.date(year, 1, 1)
-        year_end = datetime.date(year, 12, 31)
-
-        # --- Revenues ---
-        revenue_count = _count_entries_in_year(prop.pk, year, _CHECKLIST_RECETTES)
-
-        # --- Operating charges ---
-        charges_count = _count_entries_in_year(
-            prop.pk, year, _CHECKLIST_CHARGES_EXPLOIT
-        )
-
-        # --- Taxes (taxe foncière / CFE) ---
-        taxes_count = _count_entries_in_year(prop.pk, year, _CHECKLIST_TAXES)
+    # All the inputs come from one annotated queryset; the checks run in memory.
+    inputs = _get_checklist_inputs([prop.pk for prop in properties], year)
 
-        # --- Financial charges (only required if a loan is active this year) ---
-        active_loans = list(
-            PropertyLoan.objects.filter(
-                property_id=prop.pk,
-                start_date__lte=year_end,
-                end_date__gte=year_start,
-            )
-        )
-        has_active_loan = bool(active_loans)
-        fin_count = _count_entries_in_year(prop.pk, year, _CHECKLIST_FINANCIERES)
-
-        # --- Amortization setup ---
-        has_setup = AmortizationSetup.objects.filter(property=prop).exists()
-
-        # --- Amortization components ---
-        asset_count = AmortizationAsset.objects.filter(property=prop).count()
-
-        # --- Terrain asset (required for 2033-C) ---
-        has_terrain_asset = AmortizationAsset.objects.filter(
-            property=prop,
-            cerfa_category=AmortizationAsset.CerfaCategory.TERRAINS,
-        ).exists()
+    for prop in properties:
+        data = inputs[prop.pk]
+        has_setup = data.has_setup
+        asset_count = data.asset_count
+        has_terrain_asset = data.has_terrain_asset
 
         # --- Acquisition value ---
         has_buying_value = (
@@ -1152,30 +1619,31 @@ def get_lmnp_checklist(properties: list, year: int) -> dict:
             _check(
                 "revenues",
                 _("Revenue entries"),
-                revenue_count,
+                data.revenue_count,
                 "2033-B",
                 required=True,
             ),
             _check(
                 "charges",
                 _("Operating charge entries"),
-                charges_count,
+                data.charges_count,
                 "2033-B",
                 required=False,
             ),
             _check(
                 "taxes",
                 _("Property tax / CFE entries"),
-                taxes_count,
+                data.taxes_count,
                 "2033-B",
                 required=False,
             ),
             _check(
                 "financial_charges",
                 _("Financial charge entries"),
-                fin_count,
+                data.financial_count,
                 "2033-B",
-                loan_active=has_active_loan,
+                loan_active=data.has_active_loan,
+                scheduled_interest=data.has_scheduled_interest,
             ),
             {
                 "id": "amortization_setup",
@@ -0,0 +1,143 @@
+"""Monthly gross/net value timelines of properties, built in bulk."""
+
+import datetime
+from collections import defaultdict
+from collections.abc import Iterable
+from decimal import Decimal
+
+from property.utils import build_loan_balance_series
+
+
+class LoanBalanceCurve:
+    """Remaining balance of one loan, looked up month after month.
+
+    Mirrors ``PropertyLoan.remaining_balance()``: the amortization table when
+    the loan has one, otherwise a parameter-based simulation run once for the
+    whole loan instead of once per date.
+    """
+
+    def __init__(self, loan, schedule: list[tuple[datetime.date, Decimal]]):
+        self.loan = loan
+        self.original = loan.original_amount.amount
+        self.schedule = schedule
+        self._cursor = -1
+        self._simulated: list[Decimal] | None = None
+        duration = loan.get_duration_months()
+        if not schedule and duration and loan.monthly_payment is not None:
+            self._simulated = build_loan_balance_series(
+                original_amount=self.original,
+                interest_rate=loan.interest_rate,
+                payment_sequence=[loan.monthly_payment.amount] * duration,
+                disbursement_date=loan.start_date,
+                first_payment_date=loan.first_payment_date,
+            )
+
+    def at(self, as_of: datetime.date) -> Decimal:
+        """Return the balance at *as_of*; dates must be queried in ascending order."""
+        if self.schedule:
+            while (
+                self._cursor + 1 < len(self.schedule)
+                and self.schedule[self._cursor + 1][0] <= as_of
+            ):
+                self._cursor += 1
+            if self._cursor < 0:
+                return self.original
+            return max(Decimal("0"), self.schedule[self._cursor][1])
+
+        loan = self.loan
+        if self._simulated is None or as_of < loan.start_date or as_of >= loan.end_date:
+            return loan.remaining_balance_from_params(as_of).amount
+        months_elapsed = min(
+            (as_of.year - loan.start_date.year) * 12
+            + (as_of.month - loan.start_date.month),
+            len(self._simulated) - 1,
+        )
+        return max(Decimal("0"), self._simulated[months_elapsed])
+
+
+class PropertyValueTimeline:
+    """Gross and net value of a set of properties over a grid of dates.
+
+    All valuations, loans and amortization entries are loaded with three
+    queries, then every series is produced by merge-scanning the sorted rows
+    against the (ascending) dates: the cost is linear in dates + rows instead
+    of one valuation query and one amortization replay per property and date.
+
+    Values match ``Property.get_value(max_date=...)`` and
+    ``Property.net_value_at_date()`` for each date.
+    """
+
+    def __init__(self, properties: Iterable):
+        from property.models import (
+            PropertyLoan,
+            PropertyLoanAmortizationEntry,
+            PropertyValue,
+        )
+
+        self.properties = list(properties)
+        property_ids = [prop.pk for prop in self.properties]
+
+        self._values: dict[int, list[tuple[datetime.date, Decimal, str]]] = defaultdict(
+            list
+        )
+        for property_id, valuation_date, amount, currency in (
+            PropertyValue.objects.filter(property_id__in=property_ids)
+            .order_by("valuation_date", "pk")
+            .values_list("property_id", "valuation_date", "value", "value_currency")
+        ):
+            self._values[property_id].append((valuation_date, amount, currency))
+
+        schedules: dict[int, list[tuple[datetime.date, Decimal]]] = defaultdict(list)
+        for loan_id, date, balance in (
+            PropertyLoanAmortizationEntry.objects.filter(
+                loan__property_id__in=property_ids
+            )
+            .order_by("date")
+            .values_list("loan_id", "date", "remaining_balance_amount")
+        ):
+            schedules[loan_id].append((date, balance))
+
+        self._loans: dict[int, list[PropertyLoan]] = defaultdict(list)
+        for loan in PropertyLoan.objects.filter(property_id__in=property_ids):
+            self._loans[loan.property_id].append(loan)
+        self._schedules = schedules
+
+    def series(
+        self,
+        dates: list[datetime.date],
+        currency: str | None = None,
+    ) -> tuple[list[Decimal], list[Decimal]]:
+        """Return the (gross, net) totals of the properties for each date.
+
+        A property counts from its buying date.  When *currency* is given, only
+        gross values and properties (for the net value) in that currency are
+        summed.
+        """
+        gross_totals = [Decimal("0")] * len(dates)
+        net_totals = [Decimal("0")] * len(dates)
+
+        for prop in self.properties:
+            prop_currency = str(prop.currency)
+            values = self._values.get(prop.pk, [])
+            curves = [
+                LoanBalanceCurve(loan, self._schedules.get(loan.pk, []))
+                for loan in self._loans.get(prop.pk, [])
+            ]
+            cursor = -1
+            for index, as_of in enumerate(dates):
+                while cursor + 1 < len(values) and values[cursor + 1][0] <= as_of:
+                    cursor += 1
+                if prop.buying_date > as_of:
+                    continue
+                if cursor >= 0:
+                    gross, gross_currency = values[cursor][1], values[cursor][2]
+                else:
+                    gross, gross_currency = prop.buying_value.amount, prop_currency
+                remaining = sum((curve.at(as_of) for curve in curves), Decimal("0"))
+
+                if currency is None or gross_currency == currency:
+                    gross_totals[index] += gross
+                if currency is None or prop_currency == currency:
+                    net_totals[index] += max(Decimal("0"), gross - remaining)
+
+        return gross_totals, net_totals
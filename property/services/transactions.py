@@ -0,0 +1,284 @@
+"""Transactions table service: server-side paging of the ledger rows of a property."""
+
+import datetime
+import heapq
+import string
+from itertools import islice
+
+from django.db import connection
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Q, Value, When
+from django.db.models.functions import Collate, Concat, Lower, Substr, Trim
+
+from base.cache import get_or_set
+
+ORDERABLE_COLUMNS = ("date", "kind", "category", "amount", "description")
+
+TRANSACTIONS_CACHE_NAMESPACE = "property.transactions"
+
+_KIND_RANKS = {"expense": 0, "income": 1}
+
+
+def _category_ranks() -> dict[str, int]:
+    """Return the position of each management category in label order."""
+    from property.models.ledger import ManagementCategory
+
+    ordered = sorted(ManagementCategory.choices, key=lambda c: str(c[1]).casefold())
+    return {value: rank for rank, (value, _label) in enumerate(ordered)}
+
+
+def _base_description(entry) -> str:
+    descriptions = [entry.description] if entry.description else []
+    if entry.third_party:
+        descriptions.insert(0, entry.third_party)
+    if entry.lease_id and entry.lease.name:
+        descriptions.append(entry.lease.name)
+    return " - ".join(descriptions)
+
+
+def _db_description():
+    """Return the ``_base_description()`` of an entry as a database expression."""
+    separator = Value(" - ")
+    lease_name = Trim(Concat("lease__first_name", Value(" "), "lease__last_name"))
+    parts = [
+        Case(When(third_party__gt="", then=Concat(separator, "third_party"))),
+        Case(When(description__gt="", then=Concat(separator, "description"))),
+        Case(
+            When(
+                Q(lease__isnull=False) & ~Q(lease__last_name="", lease__first_name=""),
+                then=Concat(separator, lease_name),
+            )
+        ),
+    ]
+    # Concat skips NULL parts; drop the leading separator
+    return Substr(Concat(*parts), len(separator.value) + 1)
+
+
+# Descriptions are sorted with their ASCII letters lowercased, by code point:
+# the order SQLite's LOWER() and the "C" collation of PostgreSQL both give, so
+# the sorted one-time rows of the database merge with the recurring rows.
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _description_sort_key(description: str) -> str:
+    return description.translate(_ASCII_LOWER)
+
+
+def _db_description_sort_key():
+    """Return ``_description_sort_key()`` of the entry description, in SQL."""
+    description = _db_description()
+    if connection.vendor == "postgresql":
+        description = Collate(description, "C")
+    return Lower(description)
+
+
+def _count_all_rows(entries) -> int:
+    """Return the number of rows of *entries*, every occurrence up to today."""
+    from property.models import PropertyLedgerEntry
+
+    one_time = entries.filter(recurrence_type=PropertyLedgerEntry.NONE).count()
+    return one_time + sum(
+        len(entry.generate_occurrences())
+        for entry in entries.exclude(
+            recurrence_type=PropertyLedgerEntry.NONE
+        ).prefetch_related("exceptions")
+    )
+
+
+def _build_rows(entry, occurrences: list[dict], date_from, date_to) -> list[dict]:
+    """Return the table rows of *entry* for the occurrences inside the date range."""
+    category_label = entry.get_management_category_display()
+    base_description = _base_description(entry)
+    rows = []
+    for occurrence in occurrences:
+        date = occurrence["date"]
+        if (date_from and date < date_from) or (date_to and date > date_to):
+            continue
+        is_recurring = occurrence["is_recurring"]
+        rows.append(
+            {
+                "kind": entry.flow_type,
+                "date": date.isoformat(),
+                "category": category_label,
+                "category_value": entry.management_category,
+                "amount": float(occurrence["amount"].amount),
+                "description": occurrence.get("description_override")
+                or base_description,
+                "is_recurring": is_recurring,
+                "is_capitalized": entry.is_capitalized,
+                "occurrence_date": date.isoformat() if is_recurring else None,
+                "has_exception": occurrence.get("has_exception", False),
+                "parent_id": entry.pk,
+                "property_id": entry.property_id,
+            }
+        )
+    return rows
+
+
+def _row_matches(row: dict, term: str) -> bool:
+    return term in row["description"].casefold() or term in row["category"].casefold()
+
+
+def query_transactions(
+    property_obj,
+    *,
+    search: str = "",
+    kind: str = "",
+    category: str = "",
+    date_from: datetime.date | None = None,
+    date_to: datetime.date | None = None,
+    order_column: str = "date",
+    descending: bool = True,
+    start: int = 0,
+    length: int | None = 10,
+) -> dict:
+    """Return one page of the expanded ledger transactions of *property_obj*.
+
+    One-time entries, usually the bulk of an imported ledger, are filtered,
+    sorted and sliced by the database; only the recurring entries overlapping
+    the date range are expanded in Python, up to the end of the range (today at
+    the latest, like ``generate_occurrences()``).  Both sorted streams are then
+    merged, so a page only materializes ``start + length`` one-time rows.  The
+    unfiltered row count of a filtered table is cached per data version.
+
+    The rows have the shape the transactions DataTable expects.  Returns a dict
+    with ``records_total`` (rows before filtering), ``records_filtered`` and
+    ``rows``; *length* ``None`` returns every filtered row.
+    """
+    from property.models import AmortizationAsset, PropertyLedgerEntry
+    from property.models.ledger import ManagementCategory
+
+    if order_column not in ORDERABLE_COLUMNS:
+        order_column = "date"
+    today = datetime.date.today()
+    expand_until = min(date_to, today) if date_to else None
+
+    entries = (
+        PropertyLedgerEntry.objects.filter(property=property_obj)
+        .select_related("lease")
+        .annotate(
+            is_capitalized=Exists(
+                AmortizationAsset.objects.filter(source_transactions=OuterRef("pk"))
+            )
+        )
+    )
+    all_entries = entries
+    if kind:
+        entries = entries.filter(flow_type=kind)
+    if category:
+        entries = entries.filter(management_category=category)
+    term = search.strip().casefold()
+    if term:
+        matching_categories = [
+            value
+            for value, label in ManagementCategory.choices
+            if term in str(label).casefold()
+        ]
+        text_match = (
+            Q(description__icontains=term)
+            | Q(third_party__icontains=term)
+            | Q(lease__first_name__icontains=term)
+            | Q(lease__last_name__icontains=term)
+            | Q(management_category__in=matching_categories)
+        )
+        entries = entries.filter(
+            text_match
+            | (
+                ~Q(recurrence_type=PropertyLedgerEntry.NONE)
+                & Q(exceptions__description_override__icontains=term)
+            )
+        ).distinct()
+
+    one_time = entries.filter(recurrence_type=PropertyLedgerEntry.NONE)
+    recurring = entries.exclude(recurrence_type=PropertyLedgerEntry.NONE)
+    if date_from:
+        one_time = one_time.filter(entry_date__gte=date_from)
+        recurring = recurring.filter(
+            Q(recurrence_end_date__isnull=True) | Q(recurrence_end_date__gte=date_from)
+        )
+    if date_to:
+        one_time = one_time.filter(entry_date__lte=date_to)
+        recurring = recurring.filter(entry_date__lte=date_to)
+
+    recurring_rows = []
+    for entry in recurring.prefetch_related("exceptions"):
+        rows = _build_rows(
+            entry, entry.generate_occurrences(end_date=expand_until), date_from, date_to
+        )
+        recurring_rows.extend(
+            row for row in rows if not term or _row_matches(row, term)
+        )
+
+    records_filtered = one_time.count() + len(recurring_rows)
+    if term or kind or category or date_from or date_to:
+        # Every recurring entry is expanded up to today: cached until the
+        # ledger changes, as the filters of the table do.
+        records_total = get_or_set(
+            TRANSACTIONS_CACHE_NAMESPACE,
+            (property_obj.pk, today.isoformat()),
+            lambda: _count_all_rows(all_entries),
+            version=property_obj.data_version,
+        )
+    else:
+        records_total = records_filtered
+    stop = None if length is None else start + length
+
+    category_ranks = _category_ranks()
+    sign = -1 if descending else 1
+    # Strings cannot be negated: descending descriptions are merged in reverse
+    # order, with reversed tie-breakers so that ties stay newest first.
+    reverse = descending and order_column == "description"
+
+    def sort_key(row: dict) -> tuple:
+        date_ordinal = datetime.date.fromisoformat(row["date"]).toordinal()
+        if order_column == "description":
+            ties = (date_ordinal, row["parent_id"])
+            if not reverse:
+                ties = (-date_ordinal, -row["parent_id"])
+            return (_description_sort_key(row["description"]), *ties)
+        if order_column == "kind":
+            primary = _KIND_RANKS.get(row["kind"], len(_KIND_RANKS))
+        elif order_column == "category":
+            primary = category_ranks.get(row["category_value"], len(category_ranks))
+        elif order_column == "amount":
+            primary = row["amount"]
+        else:
+            primary = date_ordinal
+        return (sign * primary, -date_ordinal, -row["parent_id"])
+
+    db_primary = {
+        "date": F("entry_date"),
+        "kind": Case(
+            *(When(flow_type=k, then=Value(r)) for k, r in _KIND_RANKS.items()),
+            default=Value(len(_KIND_RANKS)),
+            output_field=IntegerField(),
+        ),
+        "category": Case(
+            *(
+                When(management_category=c, then=Value(r))
+                for c, r in category_ranks.items()
+            ),
+            default=Value(len(category_ranks)),
+            output_field=IntegerField(),
+        ),
+        "amount": F("amount"),
+        "description": _db_description_sort_key(),
+    }[order_column]
+    one_time = one_time.annotate(sort_primary=db_primary).order_by(
+        "-sort_primary" if descending else "sort_primary", "-entry_date", "-pk"
+    )
+    if stop is not None:
+        one_time = one_time[:stop]
+    one_time_rows = (
+        row
+        for entry in one_time
+        for row in _build_rows(entry, entry.generate_occurrences(), None, None)
+    )
+    recurring_rows.sort(key=sort_key, reverse=reverse)
+    merged = heapq.merge(one_time_rows, recurring_rows, key=sort_key, reverse=reverse)
+    page = list(islice(merged, start, stop))
+
+    return {
+        "records_total": records_total,
+        "records_filtered": records_filtered,
+        "rows": page,
+    }
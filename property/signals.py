@@ -0,0 +1,95 @@
+"""Signals for property models: keep the property and SCPI data versions up to date."""
+
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import (
+    SCPI,
+    AmortizationAsset,
+    AmortizationSetup,
+    Lease,
+    ManagementMandate,
+    Property,
+    PropertyLedgerEntry,
+    PropertyLedgerEntryException,
+    PropertyLoan,
+    PropertyLoanAmortizationEntry,
+    PropertyValue,
+    SCPIDividend,
+    SCPIInvestment,
+    SCPISharePrice,
+)
+
+# Models holding a ``property`` foreign key, and lookups from a property to the
+# rows of the models that only reach it through another model.
+_DIRECT_MODELS = (
+    AmortizationAsset,
+    AmortizationSetup,
+    Lease,
+    ManagementMandate,
+    PropertyLedgerEntry,
+    PropertyLoan,
+    PropertyValue,
+)
+_INDIRECT_LOOKUPS = {
+    PropertyLedgerEntryException: ("ledger_entries", "parent_entry_id"),
+    PropertyLoanAmortizationEntry: ("loans", "loan_id"),
+}
+
+
+def _owner_lookup(instance) -> tuple[str, int]:
+    """Return the ``Property`` lookup matching the property of *instance*."""
+    lookup, attname = _INDIRECT_LOOKUPS.get(type(instance), ("pk", "property_id"))
+    return lookup, getattr(instance, attname)
+
+
+def bump_property_data_version(sender, instance, raw=False, **kwargs):
+    """Bump the data version of the property a saved or deleted row belongs to."""
+    if raw:
+        return
+    origin = kwargs.get("origin")
+    if isinstance(origin, Property) or (
+        isinstance(origin, QuerySet) and origin.model is Property
+    ):
+        return  # the property itself is being deleted
+    lookup, value = _owner_lookup(instance)
+    if origin is not None:
+        # A deletion sends one signal per collected row (a queryset, or the
+        # rows cascading from a loan or an entry): bump each property once.
+        bumped = vars(origin).setdefault("_bumped_data_versions", set())
+        if (lookup, value) in bumped:
+            return
+        bumped.add((lookup, value))
+    Property.objects.filter(**{lookup: value}).bump_data_version()
+
+
+def reset_deletion_bumps(sender, instance, origin=None, **kwargs):
+    """Forget the bumps of a previous deletion started from the same origin."""
+    if origin is not None:
+        vars(origin).pop("_bumped_data_versions", None)
+
+
+for _model in (*_DIRECT_MODELS, *_INDIRECT_LOOKUPS):
+    post_save.connect(bump_property_data_version, sender=_model)
+    pre_delete.connect(reset_deletion_bumps, sender=_model)
+    post_delete.connect(bump_property_data_version, sender=_model)
+
+
+@receiver(m2m_changed, sender=AmortizationAsset.source_transactions.through)
+def bump_on_source_transactions_change(sender, instance, action, **kwargs):
+    """Capitalizing ledger entries changes the cash flow and amortization panels."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        Property.objects.filter(pk=instance.property_id).bump_data_version()
+
+
+def bump_scpi_data_version(sender, instance, raw=False, **kwargs):
+    """Bump the data version of the SCPI fund a saved or deleted row belongs to."""
+    if raw:
+        return
+    SCPI.objects.filter(pk=instance.scpi_id).bump_data_version()
+
+
+for _model in (SCPIDividend, SCPIInvestment, SCPISharePrice):
+    post_save.connect(bump_scpi_data_version, sender=_model)
+    post_delete.connect(bump_scpi_data_version, sender=_model)
@@ -14,6 +14,7 @@ from property.models import (
     PropertyLedgerEntry,
 )
 from property.services.tax_lmnp import (
+    AmortizationMatrix,
     get_accounting_data,
     get_amortization_schedule,
     get_amortization_table,
@@ -200,6 +201,79 @@ class TestCumulativeAmortization:
         d2021 = fittings_asset.get_annual_amortization(2021)
         assert fittings_asset.cumulative_amortization(2021) == d2020 + d2021
 
+    @pytest.mark.parametrize(
+        "beginning_date,duration_years",
+        [
+            (datetime.date(2020, 1, 1), 10),
+            (datetime.date(2020, 7, 1), 12),
+            (datetime.date(2020, 12, 31), 1),
+            (datetime.date(2019, 3, 17), 7),
+        ],
+    )
+    def test_closed_form_matches_the_yearly_sum(
+        self, property_obj, beginning_date, duration_years
+    ):
+        asset = AmortizationAsset.objects.create(
+            property=property_obj,
+            label="Toiture",
+            beginning_date=beginning_date,
+            value_total=Money(Decimal("12345.67"), "EUR"),
+            duration_years=duration_years,
+        )
+
+        for year in range(2015, 2040):
+            yearly_sum = sum(
+                (
+                    asset.get_annual_amortization(y)
+                    for y in range(beginning_date.year, year + 1)
+                ),
+                Decimal("0"),
+            )
+            assert asset.cumulative_amortization(year) == yearly_sum
+
+    def test_land_is_never_amortized(self, property_obj):
+        land = AmortizationAsset.objects.create(
+            property=property_obj,
+            label="Terrain",
+            beginning_date=datetime.date(2020, 1, 1),
+            value_total=Money(30_000, "EUR"),
+            cerfa_category=AmortizationAsset.CerfaCategory.TERRAINS,
+        )
+
+        assert land.amortization_years() == range(0)
+        assert land.cumulative_amortization(2050) == Decimal("0")
+
+
+@pytest.mark.django_db
+class TestAmortizationMatrix:
+    def test_matches_the_asset_methods(self, structure_asset, fittings_asset):
+        matrix = AmortizationMatrix([structure_asset, fittings_asset])
+
+        assert matrix.years() == range(2020, 2095)
+        for year in (2019, 2020, 2021, 2032, 2033, 2094, 2095, 2100):
+            for asset in (structure_asset, fittings_asset):
+                assert matrix.dotation(asset, year) == asset.get_annual_amortization(
+                    year
+                )
+                assert matrix.cumulative(asset, year) == asset.cumulative_amortization(
+                    year
+                )
+            assert matrix.total(year) == (
+                structure_asset.get_annual_amortization(year)
+                + fittings_asset.get_annual_amortization(year)
+            )
+            assert matrix.cumulative_total(year) == (
+                structure_asset.cumulative_amortization(year)
+                + fittings_asset.cumulative_amortization(year)
+            )
+
+    def test_without_depreciable_assets(self):
+        matrix = AmortizationMatrix([])
+
+        assert matrix.years() == range(0)
+        assert matrix.total(2020) == Decimal("0")
+        assert matrix.cumulative_total(2020) == Decimal("0")
+
 
 # ─── AmortizationSetup model tests ───────────────────────────────────────────
 
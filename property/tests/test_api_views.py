@@ -7,7 +7,12 @@ import pytest
 from django.urls import reverse
 from moneyed import Money
 
-from property.models import Property, PropertyLoan, PropertyValue
+from property.models import (
+    Property,
+    PropertyLoan,
+    PropertyLoanAmortizationEntry,
+    PropertyValue,
+)
 from property.models.lease import Lease
 from property.models.ledger import PropertyLedgerEntry
 
@@ -314,6 +319,82 @@ def test_card_api_cashflow_with_entries(admin_client, prop):
     assert cf["net"] == pytest.approx(750.0, rel=1e-2)
 
 
+# ── PropertyDashboardCardsApiView ───────────────────────────────────────────
+
+
+def cards_url():
+    return reverse("property:api_dashboard_cards")
+
+
+@pytest.mark.django_db
+def test_cards_api_requires_login(client, prop):
+    response = client.get(cards_url())
+    assert response.status_code == 302
+    assert "/accounts/login/" in response.url
+
+
+@pytest.mark.django_db
+def test_cards_api_matches_single_card(
+    admin_client, prop, loan, valuation, active_lease
+):
+    PropertyLoanAmortizationEntry.objects.create(
+        loan=loan,
+        date=datetime.date(2020, 2, 1),
+        capital=Money(500, "EUR"),
+        interest=Money(200, "EUR"),
+        remaining_balance_amount=Money(159500, "EUR"),
+    )
+    response = admin_client.get(cards_url())
+    assert response.status_code == 200
+    cards = response.json()["cards"]
+    assert len(cards) == 1
+    assert cards[0] == admin_client.get(card_url(prop.pk)).json()
+    assert cards[0]["total_remaining_loans"] == 159500.0
+    assert cards[0]["net_value"] == 230000.0 - 159500.0
+    assert cards[0]["loan_progress_percent"] == round(500 / 160000 * 100, 1)
+
+
+@pytest.mark.django_db
+def test_cards_api_skips_inactive_and_orders_favorites_first(admin_client, prop):
+    for name, is_active, is_favorite in (
+        ("Sold", False, False),
+        ("Zz favorite", True, True),
+    ):
+        Property.objects.create(
+            name=name,
+            property_type=Property.HOUSE,
+            buying_value=Money(100000, "EUR"),
+            buying_date=datetime.date(2020, 1, 1),
+            is_active=is_active,
+            is_favorite=is_favorite,
+        )
+    cards = admin_client.get(cards_url()).json()["cards"]
+    assert [c["name"] for c in cards] == ["Zz favorite", "Test Flat"]
+
+
+@pytest.mark.django_db
+def test_cards_api_query_count_does_not_grow_with_loans(
+    admin_client, prop, loan, django_assert_max_num_queries
+):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as one_loan:
+        admin_client.get(cards_url())
+    for i in range(3):
+        PropertyLoan.objects.create(
+            property=prop,
+            name=f"Extra {i}",
+            start_date=datetime.date(2021, 1, 1),
+            end_date=datetime.date(2041, 1, 1),
+            original_amount=Money(10000, "EUR"),
+            monthly_payment=Money(60, "EUR"),
+            interest_rate=Decimal("1.0"),
+        )
+    with django_assert_max_num_queries(len(one_loan.captured_queries)):
+        admin_client.get(cards_url())
+
+
 # ── SCPIDashboardCardApiView ────────────────────────────────────────────────
 
 
@@ -370,3 +451,31 @@ def test_scpi_card_api_values(admin_client, scpi_fund):
     assert data["total_invested"] is None
     assert data["gain_pct"] is None
     assert data["net_rentability"] == 0.0
+
+
+@pytest.mark.django_db
+def test_scpi_card_api_reads_the_share_prices_once(admin_client, scpi_fund):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from property.models.scpi import SCPIInvestment, SCPISharePrice
+
+    def price_queries():
+        with CaptureQueriesContext(connection) as queries:
+            admin_client.get(scpi_card_url(scpi_fund.pk))
+        return [q for q in queries if "property_scpishareprice" in q["sql"].lower()]
+
+    SCPISharePrice.objects.create(
+        scpi=scpi_fund,
+        date=datetime.date(2023, 1, 1),
+        subscription_value=Money(1000, "EUR"),
+    )
+    for year in (2021, 2022, 2023):
+        SCPIInvestment.objects.create(
+            scpi=scpi_fund,
+            subscription_date=datetime.date(year, 1, 1),
+            shares_count=Decimal("5"),
+            unit_purchase_price=Money(950, "EUR"),
+        )
+
+    assert len(price_queries()) == 1
@@ -490,6 +490,80 @@ def test_build_balance_sheet_gross_yield():
     assert result["gross_yield_annual"] > Decimal("0")
 
 
+@pytest.mark.django_db
+def test_build_balance_sheet_only_counts_occurrences_in_range():
+    """Entries outside the range are ignored, recurring ones started before count."""
+    prop = _make_property()
+    PropertyLedgerEntry.objects.create(
+        property=prop,
+        flow_type=PropertyLedgerEntry.FlowType.INCOME,
+        management_category=PropertyLedgerEntry.ManagementCategory.RENT_COLLECTED,
+        amount=Money(800, "EUR"),
+        entry_date=datetime.date(2020, 1, 5),
+        recurrence_type=PropertyLedgerEntry.MONTHLY,
+    )
+    PropertyLedgerEntry.objects.create(
+        property=prop,
+        flow_type=PropertyLedgerEntry.FlowType.EXPENSE,
+        management_category=PropertyLedgerEntry.ManagementCategory.INSURANCE,
+        amount=Money(30, "EUR"),
+        entry_date=datetime.date(2020, 1, 5),
+        recurrence_type=PropertyLedgerEntry.MONTHLY,
+        recurrence_end_date=datetime.date(2021, 12, 31),
+    )
+    PropertyLedgerEntry.objects.create(
+        property=prop,
+        flow_type=PropertyLedgerEntry.FlowType.EXPENSE,
+        management_category=PropertyLedgerEntry.ManagementCategory.MAINTENANCE,
+        amount=Money(500, "EUR"),
+        entry_date=datetime.date(2022, 4, 20),
+    )
+
+    result = build_balance_sheet(
+        prop,
+        datetime.date(2022, 3, 1),
+        datetime.date(2022, 3, 31),
+    )
+    assert result["total_income"] == Decimal("800")
+    assert result["total_expenses"] == Decimal("0")
+    assert result["months_with_rent"] == 1
+
+
+@pytest.mark.django_db
+def test_build_balance_sheet_uses_amortization_entries_in_range():
+    """Imported schedule rows are summed for the range; insurance comes from params."""
+    from property.models import PropertyLoanAmortizationEntry
+
+    prop = _make_property()
+    loan = PropertyLoan.objects.create(
+        property=prop,
+        name="Imported Loan",
+        start_date=datetime.date(2020, 1, 1),
+        end_date=datetime.date(2040, 1, 1),
+        original_amount=Money(100000, "EUR"),
+        monthly_payment=Money(500, "EUR"),
+        interest_rate=Decimal("1.5"),
+        insurance=Money(20, "EUR"),
+    )
+    for month in (2, 3, 4):
+        PropertyLoanAmortizationEntry.objects.create(
+            loan=loan,
+            date=datetime.date(2022, month, 5),
+            capital=Money(400, "EUR"),
+            interest=Money(100, "EUR"),
+            remaining_balance_amount=Money(90000, "EUR"),
+        )
+
+    result = build_balance_sheet(
+        prop,
+        datetime.date(2022, 3, 1),
+        datetime.date(2022, 4, 30),
+    )
+    assert result["total_loan_interest"] == Decimal("200")
+    assert result["total_loan_principal"] == Decimal("800")
+    assert result["total_loan_insurance"] == Decimal("40")
+
+
 # ─── detail_views: balance sheet range parsing ────────────────────────────────
 
 
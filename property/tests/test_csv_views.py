@@ -9,7 +9,7 @@ from django.contrib.messages import get_messages
 from django.urls import reverse
 from moneyed import Money
 
-from property.models import Property, PropertyLedgerEntry
+from property.models import LedgerCategorizationRule, Property, PropertyLedgerEntry
 from property.views.csv_views import (
     _SESSION_DATA_KEY,
     _SESSION_HEADER_KEY,
@@ -102,15 +102,65 @@ class TestCSVImportPost:
         ]
         assert session[_SESSION_PROPERTY_KEY] == property_obj.pk
 
+    def test_preview_counts_new_duplicate_and_invalid_rows(
+        self, user_client, property_obj
+    ):
+        PropertyLedgerEntry.objects.create(
+            property=property_obj,
+            flow_type=PropertyLedgerEntry.FlowType.INCOME,
+            management_category="rent_collected",
+            amount=Money(800, "EUR"),
+            entry_date=datetime.date(2024, 1, 15),
+            description="January rent",
+        )
+        csv_file = _make_csv(
+            [
+                ["2024-01-15", "800.00", "rent_collected", "January  RENT"],
+                ["2024-01-20", "-150.50", "maintenance", "Plumber"],
+                ["2024-01-21", "oops", "maintenance", "Broken"],
+            ]
+        )
+        response = user_client.post(
+            self._url(property_obj), {"csv_file": csv_file}, format="multipart"
+        )
+        assert response.context["new_count"] == 1
+        assert response.context["duplicate_count"] == 1
+        assert response.context["invalid_count"] == 1
+
     def test_missing_required_column_shows_error(self, user_client, property_obj):
         csv_file = _make_csv(
-            [["2024-01-15", "800.00", "January rent"]],
-            header=["date", "amount", "description"],  # missing 'category'
+            [["2024-01-15", "800.00", "rent_collected"]],
+            header=["date", "amount", "category"],  # missing 'description'
         )
         response = user_client.post(self._url(property_obj), {"csv_file": csv_file})
         assert response.status_code == 200
         msgs = [str(m) for m in get_messages(response.wsgi_request)]
-        assert any("category" in m for m in msgs)
+        assert any("description" in m for m in msgs)
+
+    def test_preview_lists_uncategorized_rows_for_mapping(
+        self, user_client, property_obj
+    ):
+        LedgerCategorizationRule.objects.create(
+            pattern="plombier",
+            management_category=PropertyLedgerEntry.ManagementCategory.MAINTENANCE,
+        )
+        csv_file = _make_csv(
+            [
+                ["2024-01-15", "-80.00", "Plombier Dupont"],
+                ["2024-01-16", "-12.00", "Frais tenue 01"],
+                ["2024-02-16", "-12.00", "Frais tenue 02"],
+            ],
+            header=["date", "amount", "description"],
+        )
+        response = user_client.post(self._url(property_obj), {"csv_file": csv_file})
+
+        assert response.status_code == 200
+        assert response.context["uncategorized_count"] == 2
+        [group] = response.context["uncategorized_groups"]
+        assert group["key"] == ("frais tenue #", "expense")
+        assert group["rows"] == [3, 4]
+        assert "rent_collected" not in {value for value, _label in group["choices"]}
+        assert b'name="mapping_category_0"' in response.content
 
     def test_empty_csv_shows_error(self, user_client, property_obj):
         csv_file = io.BytesIO(b"date,amount,category,description\n")
@@ -420,7 +470,7 @@ class TestCSVImportConfirm:
     def test_unexpected_exception_during_create_is_caught(
         self, user_client, property_obj
     ):
-        """A generic exception during create is caught and reported as a warning."""
+        """A generic exception while saving is caught and reported as a warning."""
         from unittest.mock import patch
 
         self._seed_session(
@@ -429,7 +479,7 @@ class TestCSVImportConfirm:
             rows=[["2024-01-15", "800.00", "rent_collected", "Test exception"]],
         )
         with patch(
-            "property.views.csv_views.PropertyLedgerEntry.objects.create",
+            "property.views.csv_views.PropertyLedgerEntry.objects.bulk_create",
             side_effect=RuntimeError("unexpected db error"),
         ):
             response = user_client.post(self._url(property_obj))
@@ -437,3 +487,146 @@ class TestCSVImportConfirm:
         msgs = [str(m) for m in get_messages(response.wsgi_request)]
         assert any("could not be imported" in m.lower() for m in msgs)
         assert PropertyLedgerEntry.objects.filter(property=property_obj).count() == 0
+
+    def test_day_first_dates_and_comma_decimals_detected_once(
+        self, user_client, property_obj
+    ):
+        """A French statement is read day-first with comma decimals throughout."""
+        self._seed_session(
+            user_client,
+            property_obj,
+            rows=[
+                ["05/03/2024", "-1.200", "maintenance", "Roof"],
+                ["13/03/2024", "-12,50", "maintenance", "Bulbs"],
+                ["01/04/2024", "800,00", "rent_collected", "Rent"],
+            ],
+        )
+        user_client.post(self._url(property_obj))
+        entries = {
+            e.description: e
+            for e in PropertyLedgerEntry.objects.filter(property=property_obj)
+        }
+        assert entries["Roof"].entry_date == datetime.date(2024, 3, 5)
+        assert entries["Roof"].amount.amount == Decimal("1200")
+        assert entries["Bulbs"].amount.amount == Decimal("12.50")
+        assert entries["Rent"].entry_date == datetime.date(2024, 4, 1)
+
+    def test_irregular_date_falls_back_to_dateparser(self, user_client, property_obj):
+        self._seed_session(
+            user_client,
+            property_obj,
+            rows=[
+                ["2024-01-15", "800.00", "rent_collected", "ISO"],
+                ["20 January 2024", "-150.50", "maintenance", "Text date"],
+            ],
+        )
+        user_client.post(self._url(property_obj))
+        entry = PropertyLedgerEntry.objects.get(
+            property=property_obj, description="Text date"
+        )
+        assert entry.entry_date == datetime.date(2024, 1, 20)
+
+    def test_large_statement_is_bulk_inserted(
+        self, user_client, property_obj, django_assert_max_num_queries
+    ):
+        start = datetime.date(2020, 1, 1)
+        rows = [
+            [
+                (start + datetime.timedelta(days=i % 1500)).strftime("%d/%m/%Y"),
+                f"-{i % 90 + 1},{i % 100:02d}",
+                "maintenance",
+                f"Line {i}",
+            ]
+            for i in range(5000)
+        ]
+        self._seed_session(user_client, property_obj, rows=rows)
+        with django_assert_max_num_queries(40):
+            user_client.post(self._url(property_obj))
+        assert PropertyLedgerEntry.objects.filter(property=property_obj).count() == 5000
+
+    def test_reimporting_overlapping_statement_skips_duplicates(
+        self, user_client, property_obj
+    ):
+        self._seed_session(user_client, property_obj)
+        user_client.post(self._url(property_obj))
+        self._seed_session(
+            user_client,
+            property_obj,
+            rows=[
+                ["2024-01-20", "-150.50", "maintenance", "Plumber"],
+                ["2024-01-25", "-40.00", "maintenance", "Locksmith"],
+            ],
+        )
+        response = user_client.post(self._url(property_obj))
+
+        descriptions = sorted(
+            PropertyLedgerEntry.objects.filter(property=property_obj).values_list(
+                "description", flat=True
+            )
+        )
+        assert descriptions == ["January rent", "Locksmith", "Plumber"]
+        msgs = [str(m) for m in get_messages(response.wsgi_request)]
+        assert any("1 row(s) already imported were skipped" in m for m in msgs)
+
+    def test_flag_mode_imports_and_reports_duplicates(self, user_client, property_obj):
+        self._seed_session(user_client, property_obj)
+        user_client.post(self._url(property_obj))
+        self._seed_session(user_client, property_obj)
+        response = user_client.post(self._url(property_obj), {"duplicates": "flag"})
+
+        assert PropertyLedgerEntry.objects.filter(property=property_obj).count() == 4
+        msgs = [str(m) for m in get_messages(response.wsgi_request)]
+        assert any("may duplicate existing entries: rows 2, 3" in m for m in msgs)
+
+    def test_identical_lines_are_matched_one_for_one(self, user_client, property_obj):
+        """Two identical card payments on the same day are both kept."""
+        row = ["2024-02-01", "-9.90", "maintenance", "Card payment"]
+        self._seed_session(user_client, property_obj, rows=[row])
+        user_client.post(self._url(property_obj))
+        self._seed_session(user_client, property_obj, rows=[row, row])
+        user_client.post(self._url(property_obj))
+
+        assert PropertyLedgerEntry.objects.filter(property=property_obj).count() == 2
+
+    def test_rows_without_category_use_rules_and_manual_mapping(
+        self, user_client, property_obj
+    ):
+        LedgerCategorizationRule.objects.create(
+            property=property_obj,
+            pattern=r"^VIR .*LOYER",
+            is_regex=True,
+            management_category=PropertyLedgerEntry.ManagementCategory.RENT_COLLECTED,
+        )
+        self._seed_session(
+            user_client,
+            property_obj,
+            header=["date", "amount", "description"],
+            rows=[
+                ["2024-01-05", "800.00", "VIR M DOE LOYER JANVIER"],
+                ["2024-01-16", "-12.00", "Frais tenue 01"],
+                ["2024-01-20", "-99.00", "Inconnu"],
+            ],
+        )
+        response = user_client.post(
+            self._url(property_obj),
+            {
+                "mapping_label_0": "frais tenue #",
+                "mapping_flow_0": "expense",
+                "mapping_category_0": "misc_deductible",
+                "mapping_label_1": "inconnu",
+                "mapping_flow_1": "expense",
+                "mapping_category_1": "",
+            },
+        )
+
+        categories = dict(
+            PropertyLedgerEntry.objects.filter(property=property_obj).values_list(
+                "description", "management_category"
+            )
+        )
+        assert categories == {
+            "VIR M DOE LOYER JANVIER": "rent_collected",
+            "Frais tenue 01": "misc_deductible",
+        }
+        msgs = [str(m) for m in get_messages(response.wsgi_request)]
+        assert any("Row 4: No category was chosen" in m for m in msgs)
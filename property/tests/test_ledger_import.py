@@ -0,0 +1,247 @@
+"""Tests for the categorization of imported rows (property/services/ledger_import.py)."""
+
+import datetime
+
+import pytest
+from django.core.exceptions import ValidationError
+from moneyed import Money
+
+from property.models import (
+    Lease,
+    LedgerCategorizationRule,
+    Property,
+    PropertyLedgerEntry,
+)
+from property.services.ledger_import import (
+    CategoryMatch,
+    build_categorization_matcher,
+    normalize_label,
+    parse_ledger_csv,
+)
+
+INCOME = PropertyLedgerEntry.FlowType.INCOME
+EXPENSE = PropertyLedgerEntry.FlowType.EXPENSE
+Category = PropertyLedgerEntry.ManagementCategory
+
+
+@pytest.fixture
+def prop():
+    return Property.objects.create(
+        name="Rules Flat",
+        property_type=Property.APARTMENT,
+        buying_value=Money(150000, "EUR"),
+        buying_date=datetime.date(2020, 1, 1),
+    )
+
+
+def _rule(pattern, category, **kwargs):
+    return LedgerCategorizationRule.objects.create(
+        pattern=pattern, management_category=category, **kwargs
+    )
+
+
+def test_normalize_label_masks_digits_and_case():
+    assert normalize_label("  CB Leroy   Merlin 12/03 ") == "cb leroy merlin #/#"
+    assert normalize_label("cb LEROY merlin 28/11") == "cb leroy merlin #/#"
+    assert normalize_label(None) == ""
+
+
+@pytest.mark.django_db
+class TestCategorizationMatcher:
+    def test_keyword_matches_anywhere_case_insensitively(self, prop):
+        _rule("leroy merlin", Category.MAINTENANCE, property=prop)
+        matcher = build_categorization_matcher(prop)
+
+        assert matcher.match(EXPENSE, "CB LEROY MERLIN 12/03") == CategoryMatch(
+            Category.MAINTENANCE
+        )
+        assert matcher.match(EXPENSE, "Castorama") is None
+
+    def test_keywords_are_not_regular_expressions(self, prop):
+        _rule("a.b", Category.MAINTENANCE, property=prop)
+        matcher = build_categorization_matcher(prop)
+
+        assert matcher.match(EXPENSE, "prlv a.b") is not None
+        assert matcher.match(EXPENSE, "prlv axb") is None
+
+    def test_regex_rule(self, prop):
+        _rule(r"^PRLV .*TAXE\s+FONCIERE", Category.PROPERTY_TAX, is_regex=True)
+        matcher = build_categorization_matcher(prop)
+
+        assert matcher.match(EXPENSE, "prlv dgfip taxe  fonciere 2024") == (
+            CategoryMatch(Category.PROPERTY_TAX)
+        )
+        assert matcher.match(EXPENSE, "remboursement taxe fonciere") is None
+
+    def test_highest_priority_wins_wherever_it_matches(self, prop):
+        _rule("edf", Category.MISC_DEDUCTIBLE, property=prop, priority=1)
+        _rule("syndic", Category.COOWNERSHIP, property=prop, priority=5)
+        matcher = build_categorization_matcher(prop)
+
+        match = matcher.match(EXPENSE, "EDF refacturé par le syndic")
+        assert match.management_category == Category.COOWNERSHIP
+
+    def test_priority_applies_across_matched_fields(self, prop):
+        _rule("virement", Category.OTHER_GENERAL_FEES, property=prop, priority=1)
+        _rule(
+            "foncia",
+            Category.MANAGEMENT_FEES,
+            property=prop,
+            priority=2,
+            match_field=LedgerCategorizationRule.MatchField.THIRD_PARTY,
+        )
+        matcher = build_categorization_matcher(prop)
+
+        match = matcher.match(EXPENSE, "Virement 0042", third_party="FONCIA LYON")
+        assert match.management_category == Category.MANAGEMENT_FEES
+
+    def test_rules_only_apply_to_a_compatible_flow_type(self, prop):
+        lease = Lease.objects.create(
+            property=prop,
+            first_name="Jane",
+            last_name="Doe",
+            start_date=datetime.date(2024, 1, 1),
+            rent_amount=Money(700, "EUR"),
+        )
+        _rule("doe", Category.RENT_COLLECTED, property=prop, lease=lease)
+        _rule("doe", Category.OTHER_GENERAL_FEES, property=prop, flow_type=EXPENSE)
+        matcher = build_categorization_matcher(prop)
+
+        assert matcher.match(INCOME, "VIR JANE DOE") == CategoryMatch(
+            Category.RENT_COLLECTED, lease.pk
+        )
+        assert matcher.match(EXPENSE, "VIR JANE DOE") == CategoryMatch(
+            Category.OTHER_GENERAL_FEES
+        )
+
+    def test_rules_of_other_properties_are_ignored(self, prop):
+        other = Property.objects.create(
+            name="Other",
+            property_type=Property.APARTMENT,
+            buying_value=Money(1, "EUR"),
+            buying_date=datetime.date(2020, 1, 1),
+        )
+        _rule("edf", Category.MISC_DEDUCTIBLE, property=other)
+
+        assert build_categorization_matcher(prop).match(EXPENSE, "EDF") is None
+
+    def test_invalid_regex_is_skipped(self, prop):
+        _rule("(unclosed", Category.MAINTENANCE, is_regex=True, priority=9)
+        _rule("plombier", Category.MAINTENANCE)
+        matcher = build_categorization_matcher(prop)
+
+        assert matcher.match(EXPENSE, "Plombier") is not None
+
+    def test_rules_that_cannot_be_combined_match_one_by_one(self, prop):
+        _rule("(?i)loyer", Category.RENT_COLLECTED, is_regex=True, priority=9)
+        _rule("caf", Category.RENT_COLLECTED, is_regex=True, priority=5)
+        _rule(r"(a)\1", Category.OTHER_INCOME, is_regex=True)
+        matcher = build_categorization_matcher(prop)
+
+        assert matcher.match(INCOME, "VIR CAF LOYER MARS") == CategoryMatch(
+            Category.RENT_COLLECTED
+        )
+        assert matcher.match(INCOME, "caf") == CategoryMatch(Category.RENT_COLLECTED)
+        assert matcher.match(INCOME, "baaa") == CategoryMatch(Category.OTHER_INCOME)
+        assert matcher.match(INCOME, "virement") is None
+
+    def test_history_learns_the_most_frequent_category(self, prop):
+        for category in (
+            Category.MISC_DEDUCTIBLE,
+            Category.MISC_DEDUCTIBLE,
+            Category.INSURANCE,
+        ):
+            PropertyLedgerEntry.objects.create(
+                property=prop,
+                flow_type=EXPENSE,
+                amount=Money(30, "EUR"),
+                entry_date=datetime.date(2024, 1, 5),
+                management_category=category,
+                description="PRLV EDF 0124",
+            )
+        matcher = build_categorization_matcher(prop)
+
+        assert matcher.match(EXPENSE, "prlv edf 0824") == CategoryMatch(
+            Category.MISC_DEDUCTIBLE
+        )
+        assert matcher.match(INCOME, "prlv edf 0824") is None
+
+    def test_rules_take_precedence_over_history(self, prop):
+        PropertyLedgerEntry.objects.create(
+            property=prop,
+            flow_type=EXPENSE,
+            amount=Money(30, "EUR"),
+            entry_date=datetime.date(2024, 1, 5),
+            management_category=Category.OTHER_GENERAL_FEES,
+            description="PRLV EDF",
+        )
+        _rule("edf", Category.MISC_DEDUCTIBLE)
+
+        match = build_categorization_matcher(prop).match(EXPENSE, "PRLV EDF")
+        assert match.management_category == Category.MISC_DEDUCTIBLE
+
+
+@pytest.mark.django_db
+def test_rule_validation(prop):
+    with pytest.raises(ValidationError, match="regular expression"):
+        LedgerCategorizationRule(
+            pattern="(", is_regex=True, management_category=Category.MAINTENANCE
+        ).full_clean()
+    for pattern in ("(?i)loyer", r"(\d+)-\1"):
+        with pytest.raises(ValidationError, match="not supported"):
+            LedgerCategorizationRule(
+                pattern=pattern,
+                is_regex=True,
+                management_category=Category.RENT_COLLECTED,
+            ).full_clean()
+    LedgerCategorizationRule(
+        pattern=r"(?i:loyer)|\\1",
+        is_regex=True,
+        management_category=Category.MAINTENANCE,
+    ).full_clean()
+    with pytest.raises(ValidationError):
+        LedgerCategorizationRule(
+            pattern="loyer",
+            management_category=Category.RENT_COLLECTED,
+            flow_type=EXPENSE,
+        ).full_clean()
+
+
+@pytest.mark.django_db
+def test_parse_resolves_categories_in_order(prop):
+    _rule("edf", Category.MISC_DEDUCTIBLE)
+    header = ["date", "amount", "description", "category", "third_party"]
+    rows = [
+        ["2024-03-01", "-40", "PRLV EDF", "", ""],
+        ["2024-03-02", "-40", "PRLV EDF", "maintenance", ""],
+        ["2024-03-03", "-12", "Frais tenue 03", "", "Banque"],
+        ["2024-03-04", "-12", "Frais tenue 04", "", ""],
+        ["2024-03-05", "-99", "Inconnu", "", ""],
+    ]
+
+    parsed = parse_ledger_csv(
+        prop,
+        header,
+        rows,
+        matcher=build_categorization_matcher(prop),
+        category_overrides={("frais tenue #", EXPENSE): Category.NON_DEDUCTIBLE},
+    )
+
+    categories = {row: entry.management_category for row, entry in parsed.entries}
+    assert categories == {
+        2: Category.MISC_DEDUCTIBLE,
+        3: Category.MAINTENANCE,
+        4: Category.NON_DEDUCTIBLE,
+        5: Category.NON_DEDUCTIBLE,
+    }
+    assert dict(parsed.entries)[4].third_party == "Banque"
+    assert [row.row_index for row in parsed.uncategorized] == [6]
+    assert parsed.uncategorized_groups() == [
+        {
+            "key": ("inconnu", EXPENSE),
+            "label": "Inconnu",
+            "flow_type": EXPENSE,
+            "rows": [6],
+        }
+    ]
+    assert not parsed.errors
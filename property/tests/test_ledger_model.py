@@ -8,6 +8,7 @@ from django.core.exceptions import ValidationError
 from moneyed import Money
 
 from property.models import Lease, Property, PropertyLedgerEntry
+from property.utils import build_import_fingerprint
 
 
 @pytest.fixture
@@ -191,6 +192,37 @@ class TestPropertyLedgerEntryClean:
         entry.clean()  # Should not raise when amount is None
 
 
+@pytest.mark.django_db
+class TestPropertyLedgerEntryImportFingerprint:
+    def test_saved_entries_are_fingerprinted(self, income_entry):
+        assert income_entry.import_fingerprint == build_import_fingerprint(
+            income_entry.property_id,
+            datetime.date(2023, 3, 1),
+            Decimal("1200"),
+            "march  RENT",
+        )
+
+    def test_edits_refresh_the_fingerprint(self, income_entry):
+        before = income_entry.import_fingerprint
+        income_entry.flow_type = PropertyLedgerEntry.FlowType.EXPENSE
+        income_entry.save(update_fields=["flow_type"])
+        income_entry.refresh_from_db()
+
+        assert income_entry.import_fingerprint == build_import_fingerprint(
+            income_entry.property_id,
+            datetime.date(2023, 3, 1),
+            Decimal("-1200"),
+            "March rent",
+        )
+        assert income_entry.import_fingerprint != before
+
+    def test_recurring_entries_have_no_fingerprint(self, income_entry):
+        income_entry.recurrence_type = PropertyLedgerEntry.MONTHLY
+        income_entry.save()
+
+        assert income_entry.import_fingerprint == ""
+
+
 @pytest.mark.django_db
 class TestPropertyLedgerEntryGetManagementCategoryDisplay:
     def test_known_category_returns_label(self, income_entry):
@@ -4,6 +4,8 @@ import datetime
 from decimal import Decimal
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from moneyed import Money
 
 from property.models import (
@@ -11,6 +13,7 @@ from property.models import (
     Property,
     PropertyLedgerEntry,
     PropertyLoan,
+    PropertyLoanAmortizationEntry,
 )
 from property.services.tax_lmnp import get_lmnp_checklist
 
@@ -207,6 +210,25 @@ class TestChecklistFinancialCharges:
         )
         assert check["status"] == "ok"
 
+    def test_ok_when_loan_schedule_has_interest(self, lmnp_property):
+        """The 2033-B uses the amortization table interest when there is no entry."""
+        loan = _add_loan(lmnp_property, year=2024)
+        PropertyLoanAmortizationEntry.objects.create(
+            loan=loan,
+            date=datetime.date(2024, 2, 1),
+            capital=Money(500, "EUR"),
+            interest=Money(180, "EUR"),
+            remaining_balance_amount=Money(149_500, "EUR"),
+        )
+        result = get_lmnp_checklist([lmnp_property], 2024)
+        check = next(
+            c
+            for c in result["properties"][0]["checks"]
+            if c["id"] == "financial_charges"
+        )
+        assert check["status"] == "ok"
+        assert check["count"] == 0
+
     def test_na_when_loan_ended_before_year(self, lmnp_property):
         """Loan ended before the checked year — not active, so N/A."""
         PropertyLoan.objects.create(
@@ -452,6 +474,36 @@ class TestChecklistMultipleProperties:
         result = get_lmnp_checklist([lmnp_property, prop2], 2024)
         assert result["overall_status"] == "incomplete"
 
+    def test_single_query_whatever_the_number_of_properties(
+        self, lmnp_property, amortization_setup
+    ):
+        properties = [lmnp_property]
+        for index in range(4):
+            prop = Property.objects.create(
+                name=f"LMNP {index}",
+                property_type=Property.APARTMENT,
+                buying_value=Money(100_000, "EUR"),
+                buying_date=datetime.date(2022, 1, 1),
+                tax_regime=Property.TaxRegime.LMNP_REEL,
+            )
+            _add_entry(prop, "rent_collected", year=2024)
+            _add_entry(prop, "property_tax", year=2024)
+            _add_loan(prop, year=2023)
+            properties.append(prop)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = get_lmnp_checklist(properties, 2024)
+
+        assert len(queries) == 1
+        first, second = result["properties"][:2]
+        statuses = {c["id"]: c["status"] for c in first["checks"]}
+        assert statuses["amortization_components"] == "ok"
+        assert statuses["terrain_asset"] == "ok"
+        statuses = {c["id"]: c["status"] for c in second["checks"]}
+        assert statuses["revenues"] == statuses["taxes"] == "ok"
+        assert statuses["financial_charges"] == "warning"
+        assert statuses["amortization_setup"] == "missing"
+
     def test_empty_properties_list(self):
         result = get_lmnp_checklist([], 2024)
         assert result["properties"] == []
@@ -0,0 +1,199 @@
+"""Tests for LMNP fiscal year closings (property/services/lmnp_closing.py)."""
+
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from moneyed import Money
+
+from property.models import (
+    AmortizationAsset,
+    LmnpYearClosing,
+    ManagementCategory,
+    Property,
+    PropertyLedgerEntry,
+)
+from property.services.lmnp_closing import close_fiscal_year, lmnp_input_hash
+from property.services.tax_lmnp import (
+    LmnpTimeline,
+    get_accounting_data,
+    get_fiscal_deficit_history,
+    get_lmnp_summary,
+)
+
+
+@pytest.fixture
+def prop():
+    prop = Property.objects.create(
+        name="Closed Flat",
+        property_type=Property.APARTMENT,
+        buying_value=Money(100000, "EUR"),
+        buying_date=datetime.date(2015, 1, 1),
+        tax_regime=Property.TaxRegime.LMNP_REEL,
+    )
+    AmortizationAsset.objects.create(
+        property=prop,
+        label="Structure",
+        beginning_date=datetime.date(2015, 1, 1),
+        value_total=Money(50000, "EUR"),
+        duration_years=25,
+    )
+    for year in range(2015, 2025):
+        _entry(prop, year, PropertyLedgerEntry.FlowType.EXPENSE, 3000)
+        if year >= 2018:
+            _entry(prop, year, PropertyLedgerEntry.FlowType.INCOME, 9000)
+    return prop
+
+
+def _entry(prop, year, flow_type, amount):
+    category = (
+        ManagementCategory.RENT_COLLECTED
+        if flow_type == PropertyLedgerEntry.FlowType.INCOME
+        else ManagementCategory.MANAGEMENT_FEES
+    )
+    return PropertyLedgerEntry.objects.create(
+        property=prop,
+        flow_type=flow_type,
+        management_category=category,
+        amount=Money(Decimal(amount), "EUR"),
+        entry_date=datetime.date(year, 6, 1),
+    )
+
+
+@pytest.mark.django_db
+class TestCloseFiscalYear:
+    def test_stores_the_carried_balances(self, prop):
+        closing = close_fiscal_year(prop.pk, 2018)
+        timeline = LmnpTimeline(prop.pk)
+
+        assert closing.year == 2018
+        assert closing.deferred_amortization == timeline.deferred_balance(2018)
+        assert closing.deficit_history() == timeline.deficit_history(2018)
+        taxable_result = timeline.summary(2018)["taxable_result"]
+        assert Decimal(closing.totals["taxable_result"]) == taxable_result
+        assert closing.input_hash == lmnp_input_hash(prop.pk, 2018)
+
+    def test_closing_again_replaces_the_closing(self, prop):
+        close_fiscal_year(prop.pk, 2018)
+        close_fiscal_year(prop.pk, 2018)
+
+        assert LmnpYearClosing.objects.filter(property=prop).count() == 1
+
+    def test_later_years_are_unchanged_and_skip_the_closed_years(self, prop):
+        expected = get_lmnp_summary(prop.pk, 2024)
+        expected_deficits = get_fiscal_deficit_history(prop.pk, 2024)
+
+        close_fiscal_year(prop.pk, 2021)
+
+        timeline = LmnpTimeline(prop.pk)
+        timeline.deficit_history(2024)
+        # Only the years after the closing are loaded and computed
+        assert min(timeline._category_totals) == 2022
+        assert get_lmnp_summary(prop.pk, 2024) == expected
+        assert get_fiscal_deficit_history(prop.pk, 2024) == expected_deficits
+
+    def test_later_years_resume_from_the_closing(self, prop):
+        closing = close_fiscal_year(prop.pk, 2021)
+        # Declared figures win over a replay as long as the data is unchanged
+        closing.deferred_amortization = Decimal("5000")
+        closing.deficits = {"2020": "700.00"}
+        closing.save()
+
+        timeline = LmnpTimeline(prop.pk)
+
+        assert timeline.summary(2022)["deferred_prior"] == Decimal("5000")
+        assert timeline.deficit_history(2021) == {2020: Decimal("700.00")}
+        # Earlier years are still replayed from the acquisition
+        assert timeline.deferred_balance(2016) == Decimal("4000")
+
+
+@pytest.mark.django_db
+class TestRetroactiveEdits:
+    def test_edit_of_a_closed_year_flags_the_closing(self, prop):
+        closing = close_fiscal_year(prop.pk, 2021)
+        closing.deferred_amortization = Decimal("5000")
+        closing.save()
+
+        _entry(prop, 2019, PropertyLedgerEntry.FlowType.EXPENSE, 100)
+
+        timeline = LmnpTimeline(prop.pk)
+        assert timeline.closing_statuses() == [(closing, False)]
+        # A stale closing is ignored by the computations
+        assert timeline.summary(2022)["deferred_prior"] != Decimal("5000")
+        data = get_accounting_data([prop], 2021)
+        assert data["closings"][0]["stale_years"] == [2021]
+        assert data["closings"][0]["closing"] == closing
+
+    def test_edit_after_the_closed_year_keeps_it_valid(self, prop):
+        close_fiscal_year(prop.pk, 2021)
+
+        entry = _entry(prop, 2023, PropertyLedgerEntry.FlowType.EXPENSE, 100)
+        entry.recurrence_type = PropertyLedgerEntry.MONTHLY
+        entry.save()
+
+        statuses = LmnpTimeline(prop.pk).closing_statuses()
+        assert [is_valid for _, is_valid in statuses] == [True]
+
+    def test_recurrence_ending_inside_the_closed_years_flags_it(self, prop):
+        entry = _entry(prop, 2016, PropertyLedgerEntry.FlowType.EXPENSE, 10)
+        entry.recurrence_type = PropertyLedgerEntry.MONTHLY
+        entry.save()
+        close_fiscal_year(prop.pk, 2021)
+
+        entry.recurrence_end_date = datetime.date(2019, 12, 31)
+        entry.save()
+
+        assert LmnpTimeline(prop.pk).closing_statuses()[0][1] is False
+
+    def test_capitalizing_a_closed_entry_flags_it(self, prop):
+        close_fiscal_year(prop.pk, 2021)
+        asset = AmortizationAsset.objects.create(
+            property=prop,
+            label="Kitchen",
+            beginning_date=datetime.date(2023, 1, 1),
+            value_total=Money(3000, "EUR"),
+            duration_years=10,
+        )
+
+        asset.source_transactions.add(
+            PropertyLedgerEntry.objects.filter(
+                property=prop, entry_date__year=2020
+            ).first()
+        )
+
+        assert LmnpTimeline(prop.pk).closing_statuses()[0][1] is False
+
+
+@pytest.mark.django_db
+class TestCloseYearView:
+    def test_closes_every_lmnp_property(self, user_client, prop):
+        response = user_client.post(
+            reverse("property:lmnp_close_year"), {"year": "2021"}
+        )
+
+        assert response.status_code == 302
+        assert response.url.endswith("?year=2021")
+        assert LmnpYearClosing.objects.filter(property=prop, year=2021).exists()
+
+    def test_unfinished_year_cannot_be_closed(self, user_client, prop):
+        year = datetime.date.today().year
+        user_client.post(reverse("property:lmnp_close_year"), {"year": str(year)})
+
+        assert not LmnpYearClosing.objects.exists()
+
+    def test_get_is_not_allowed(self, user_client, prop):
+        response = user_client.get(reverse("property:lmnp_close_year"))
+
+        assert response.status_code == 405
+
+    def test_accounting_page_shows_stale_closings(self, user_client, prop):
+        close_fiscal_year(prop.pk, 2021)
+        _entry(prop, 2020, PropertyLedgerEntry.FlowType.EXPENSE, 100)
+
+        response = user_client.get(
+            reverse("property:lmnp_accounting"), {"year": "2021"}
+        )
+
+        assert response.context["accounting"]["closings"][0]["stale_years"] == [2021]
+        assert "modifiées après leur clôture" in response.content.decode()
@@ -8,7 +8,13 @@ from django.test import TestCase
 from moneyed import Money
 
 from property.models import Property, PropertyLoan, PropertyLoanAmortizationEntry
-from property.utils import build_loan_amortization_balance, build_loan_monthly_maps
+from property.utils import (
+    build_loan_amortization_balance,
+    build_loan_balance_series,
+    build_loan_insurance_map_for_range,
+    build_loan_maps_from_loan_obj,
+    build_loan_monthly_maps,
+)
 
 # ─── Fixtures ────────────────────────────────────────────────────────────────
 
@@ -338,6 +344,73 @@ class BuildLoanMonthlyMapsTest(TestCase):
         self.assertEqual(len(principal_map), 0)
 
 
+class BuildLoanInsuranceMapForRangeTest(TestCase):
+    def _assert_matches_full_map(self, loan, start, end):
+        insurance = loan.insurance.amount
+        _, _, full_map = build_loan_maps_from_loan_obj(loan, insurance)
+        expected = {
+            key: value
+            for key, value in full_map.items()
+            if (start.year, start.month) <= key <= (end.year, end.month)
+        }
+        self.assertEqual(
+            build_loan_insurance_map_for_range(loan, insurance, start, end),
+            expected,
+        )
+
+    def test_matches_full_map_for_long_loan(self):
+        loan = make_standard_loan(make_property())
+        loan.insurance = Money(Decimal("25"), "EUR")
+        for start, end in [
+            (datetime.date(2019, 6, 1), datetime.date(2020, 3, 1)),
+            (datetime.date(2024, 5, 1), datetime.date(2024, 5, 1)),
+            (datetime.date(2039, 6, 1), datetime.date(2041, 1, 1)),
+        ]:
+            self._assert_matches_full_map(loan, start, end)
+
+    def test_matches_full_map_when_repaid_early(self):
+        loan = make_standard_loan(make_property(), amount=20_000)
+        loan.insurance = Money(Decimal("10"), "EUR")
+        for start, end in [
+            (datetime.date(2021, 1, 1), datetime.date(2021, 12, 1)),
+            (datetime.date(2022, 1, 1), datetime.date(2022, 12, 1)),
+        ]:
+            self._assert_matches_full_map(loan, start, end)
+
+    def test_without_insurance_returns_empty(self):
+        loan = make_standard_loan(make_property())
+        self.assertEqual(
+            build_loan_insurance_map_for_range(
+                loan,
+                Decimal("0"),
+                datetime.date(2024, 1, 1),
+                datetime.date(2024, 12, 1),
+            ),
+            {},
+        )
+
+
+class BuildLoanBalanceSeriesTest(TestCase):
+    def test_matches_balance_after_each_month(self):
+        kwargs = {
+            "original_amount": Decimal("40000"),
+            "interest_rate": Decimal("3.25"),
+            "payment_sequence": [Decimal("2500")] * 24,
+            "disbursement_date": datetime.date(2025, 10, 13),
+            "first_payment_date": datetime.date(2025, 11, 10),
+        }
+        series = build_loan_balance_series(**kwargs)
+        self.assertEqual(len(series), 25)
+        for months_elapsed, balance in enumerate(series):
+            self.assertEqual(
+                balance,
+                build_loan_amortization_balance(
+                    months_elapsed=months_elapsed, **kwargs
+                ),
+            )
+        self.assertEqual(series[-1], Decimal("0"))
+
+
 # ─── Interest rounding ────────────────────────────────────────────────────────
 
 
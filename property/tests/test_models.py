@@ -6,7 +6,12 @@ from decimal import Decimal
 from django.test import TestCase
 from moneyed import Money
 
-from property.models import Property, PropertyValue
+from property.models import (
+    Property,
+    PropertyLoan,
+    PropertyLoanAmortizationEntry,
+    PropertyValue,
+)
 
 
 class PropertyTestCase(TestCase):
@@ -160,3 +165,104 @@ class PropertyValueTestCase(TestCase):
         # Access values through the related name
         property_values = self.property.property_values.all()
         self.assertEqual(property_values.count(), 2)
+
+
+class PropertyWithValuationTestCase(TestCase):
+    """Test cases for Property.objects.with_valuation()."""
+
+    def setUp(self):
+        self.property = Property.objects.create(
+            name="Annotated",
+            property_type=Property.APARTMENT,
+            buying_value=Money(200000, "EUR"),
+            buying_date=datetime.date(2020, 1, 1),
+        )
+        PropertyValue.objects.create(
+            property=self.property,
+            value=Money(210000, "EUR"),
+            valuation_date=datetime.date(2021, 6, 1),
+        )
+        PropertyValue.objects.create(
+            property=self.property,
+            value=Money(240000, "EUR"),
+            valuation_date=datetime.date(2023, 6, 1),
+        )
+        self.scheduled = PropertyLoan.objects.create(
+            property=self.property,
+            name="Scheduled",
+            start_date=datetime.date(2020, 1, 1),
+            end_date=datetime.date(2040, 1, 1),
+            original_amount=Money(100000, "EUR"),
+            monthly_payment=Money(500, "EUR"),
+            interest_rate=Decimal("1.5"),
+        )
+        for date, balance in (
+            (datetime.date(2021, 1, 1), 95000),
+            (datetime.date(2022, 1, 1), 90000),
+        ):
+            PropertyLoanAmortizationEntry.objects.create(
+                loan=self.scheduled,
+                date=date,
+                capital=Money(5000, "EUR"),
+                interest=Money(100, "EUR"),
+                remaining_balance_amount=Money(balance, "EUR"),
+            )
+        PropertyLoan.objects.create(
+            property=self.property,
+            name="Computed",
+            start_date=datetime.date(2020, 1, 1),
+            end_date=datetime.date(2030, 1, 1),
+            original_amount=Money(50000, "EUR"),
+            monthly_payment=Money(450, "EUR"),
+            interest_rate=Decimal("1.0"),
+        )
+
+    def _assert_matches_python(self, as_of):
+        annotated = Property.objects.with_valuation(as_of).get(pk=self.property.pk)
+        self.assertEqual(
+            annotated.get_value_from_annotations(),
+            self.property.get_value(
+                max_date=datetime.datetime.combine(as_of, datetime.time())
+            ),
+        )
+        self.assertEqual(
+            annotated.total_remaining_loans_from_annotations(),
+            self.property.total_remaining_loans_at_date(as_of),
+        )
+        self.assertEqual(
+            annotated.net_value_from_annotations(),
+            self.property.net_value_at_date(as_of),
+        )
+
+    def test_matches_python_computation(self):
+        for as_of in (
+            datetime.date(2020, 6, 1),
+            datetime.date(2021, 6, 1),
+            datetime.date(2024, 1, 1),
+        ):
+            self._assert_matches_python(as_of)
+
+    def test_loan_statistics(self):
+        annotated = Property.objects.with_valuation().get(pk=self.property.pk)
+        self.assertEqual(annotated.loans_count, 2)
+        self.assertEqual(annotated.loans_original_total, Decimal("150000"))
+        self.assertEqual(annotated.loans_last_end_date, datetime.date(2040, 1, 1))
+        self.assertEqual(annotated.scheduled_loans_remaining, Decimal("90000"))
+        self.assertEqual(
+            [loan.name for loan in annotated.unscheduled_loans], ["Computed"]
+        )
+
+    def test_property_without_value_or_loans(self):
+        bare = Property.objects.create(
+            name="Bare",
+            property_type=Property.HOUSE,
+            buying_value=Money(100000, "EUR"),
+            buying_date=datetime.date(2020, 1, 1),
+        )
+        annotated = Property.objects.with_valuation().get(pk=bare.pk)
+        self.assertEqual(annotated.loans_count, 0)
+        self.assertIsNone(annotated.loans_last_end_date)
+        self.assertEqual(annotated.get_value_from_annotations(), Money(100000, "EUR"))
+        self.assertEqual(
+            annotated.total_remaining_loans_from_annotations(), Money(0, "EUR")
+        )
@@ -0,0 +1,280 @@
+"""Tests for the property data version and the detail panels render cache."""
+
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from moneyed import Money
+
+from property.models import (
+    AmortizationAsset,
+    Lease,
+    Property,
+    PropertyLedgerEntry,
+    PropertyLedgerEntryException,
+    PropertyLoan,
+    PropertyLoanAmortizationEntry,
+    PropertyValue,
+)
+from property.services import panel_cache
+from property.services.panel_cache import cached_panel_data, panel_cache_key
+
+
+@pytest.fixture
+def prop():
+    return Property.objects.create(
+        name="Cached Flat",
+        property_type=Property.APARTMENT,
+        buying_value=Money(150000, "EUR"),
+        buying_date=datetime.date(2020, 1, 1),
+        tax_regime=Property.TaxRegime.LMNP_REEL,
+    )
+
+
+def _version(prop) -> int:
+    return Property.objects.values_list("data_version", flat=True).get(pk=prop.pk)
+
+
+def _entry(prop, **kwargs):
+    return PropertyLedgerEntry.objects.create(
+        property=prop,
+        flow_type=PropertyLedgerEntry.FlowType.EXPENSE,
+        amount=Money(120, "EUR"),
+        entry_date=datetime.date(2024, 3, 1),
+        management_category=PropertyLedgerEntry.ManagementCategory.MAINTENANCE,
+        **kwargs,
+    )
+
+
+def _loan(prop):
+    return PropertyLoan.objects.create(
+        property=prop,
+        name="Loan",
+        start_date=datetime.date(2020, 1, 1),
+        end_date=datetime.date(2040, 1, 1),
+        original_amount=Money(100000, "EUR"),
+        monthly_payment=Money(500, "EUR"),
+        interest_rate=Decimal("1.5"),
+    )
+
+
+# ─── Data version ────────────────────────────────────────────────────────────
+
+
+@pytest.mark.django_db
+class TestDataVersion:
+    def test_new_property_starts_at_zero(self, prop):
+        assert _version(prop) == 0
+
+    def test_writes_on_related_rows_bump_the_version(self, prop):
+        PropertyValue.objects.create(
+            property=prop,
+            valuation_date=datetime.date(2024, 1, 1),
+            value=Money(1, "EUR"),
+        )
+        assert _version(prop) == 1
+
+        entry = _entry(prop, recurrence_type=PropertyLedgerEntry.MONTHLY)
+        entry.description = "Plumber"
+        entry.save()
+        assert _version(prop) == 3
+
+        PropertyLedgerEntryException.objects.create(
+            parent_entry=entry, occurrence_date=entry.entry_date, is_deleted=True
+        )
+        assert _version(prop) == 4
+
+        loan = _loan(prop)
+        PropertyLoanAmortizationEntry.objects.create(
+            loan=loan,
+            date=datetime.date(2020, 2, 1),
+            capital=Money(400, "EUR"),
+            interest=Money(100, "EUR"),
+            remaining_balance_amount=Money(99600, "EUR"),
+        )
+        assert _version(prop) == 6
+
+        Lease.objects.create(
+            property=prop,
+            first_name="Jane",
+            last_name="Doe",
+            start_date=datetime.date(2024, 1, 1),
+            rent_amount=Money(700, "EUR"),
+        )
+        assert _version(prop) == 7
+
+        entry.delete()
+        assert _version(prop) > 7
+
+    def test_capitalizing_entries_bumps_the_version(self, prop):
+        asset = AmortizationAsset.objects.create(
+            property=prop,
+            label="Kitchen",
+            beginning_date=datetime.date(2024, 1, 1),
+            value_total=Money(5000, "EUR"),
+            duration_years=10,
+        )
+        entry = _entry(prop)
+        before = _version(prop)
+
+        asset.source_transactions.add(entry)
+
+        assert _version(prop) == before + 1
+
+    def test_queryset_delete_bumps_once_per_property(self, prop):
+        for day in range(1, 6):
+            _entry(prop, description=f"Entry {day}")
+        before = _version(prop)
+
+        with CaptureQueriesContext(connection) as queries:
+            PropertyLedgerEntry.objects.filter(property=prop).delete()
+
+        updates = [q for q in queries if q["sql"].startswith("UPDATE")]
+        assert len(updates) == 1
+        assert _version(prop) == before + 1
+
+    def test_deleting_a_loan_bumps_once(self, prop):
+        loan = _loan(prop)
+        for month in range(2, 8):
+            PropertyLoanAmortizationEntry.objects.create(
+                loan=loan,
+                date=datetime.date(2020, month, 1),
+                capital=Money(400, "EUR"),
+                interest=Money(100, "EUR"),
+                remaining_balance_amount=Money(99600, "EUR"),
+            )
+        entries = PropertyLoanAmortizationEntry.objects.filter(loan=loan)
+        entries.delete()
+        PropertyLoanAmortizationEntry.objects.create(
+            loan=loan,
+            date=datetime.date(2021, 1, 1),
+            capital=Money(400, "EUR"),
+            interest=Money(100, "EUR"),
+            remaining_balance_amount=Money(99200, "EUR"),
+        )
+        before = _version(prop)
+
+        entries.delete()  # same queryset object: bumps again
+        assert _version(prop) == before + 1
+
+        with CaptureQueriesContext(connection) as queries:
+            loan.delete()
+        updates = [q for q in queries if q["sql"].startswith("UPDATE")]
+        assert len(updates) <= 2
+
+    def test_other_properties_are_left_alone(self, prop):
+        other = Property.objects.create(
+            name="Other",
+            property_type=Property.APARTMENT,
+            buying_value=Money(1, "EUR"),
+            buying_date=datetime.date(2020, 1, 1),
+        )
+        _entry(prop)
+        assert _version(other) == 0
+
+    def test_deleting_the_property_cascades_without_bumps(self, prop):
+        PropertyValue.objects.create(
+            property=prop,
+            valuation_date=datetime.date(2024, 1, 1),
+            value=Money(1, "EUR"),
+        )
+        _loan(prop)
+
+        prop.delete()
+
+        assert not Property.objects.filter(name="Cached Flat").exists()
+
+
+# ─── Panel cache ─────────────────────────────────────────────────────────────
+
+
+@pytest.mark.django_db
+class TestPanelCache:
+    def test_key_follows_version_and_params(self, prop):
+        key = panel_cache_key(prop, "projection", ["0.02"])
+
+        assert panel_cache_key(prop, "projection", ["0.02"]) == key
+        assert panel_cache_key(prop, "projection", ["0.03"]) != key
+        assert panel_cache_key(prop, "loans", ["0.02"]) != key
+        prop.data_version += 1
+        assert panel_cache_key(prop, "projection", ["0.02"]) != key
+
+    def test_key_follows_the_format_of_the_figures(self, prop, monkeypatch):
+        key = panel_cache_key(prop, "projection")
+
+        monkeypatch.setattr(panel_cache, "PANEL_CACHE_FORMAT", 3)
+
+        assert panel_cache_key(prop, "projection") != key
+
+    def test_build_runs_once_per_version(self, prop):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"n": len(calls)}
+
+        assert cached_panel_data(prop, "cashflow", build) == {"n": 1}
+        assert cached_panel_data(prop, "cashflow", build) == {"n": 1}
+
+        _entry(prop)
+        prop.refresh_from_db()
+        assert cached_panel_data(prop, "cashflow", build) == {"n": 2}
+
+    @pytest.mark.parametrize(
+        "panel", ["cashflow", "projection", "balance", "loans", "amortization"]
+    )
+    def test_repeat_visit_skips_the_computations(self, user_client, prop, panel):
+        _loan(prop)
+        _entry(prop, recurrence_type=PropertyLedgerEntry.MONTHLY)
+        url = reverse(f"property:panel_{panel}", args=[prop.pk])
+
+        with CaptureQueriesContext(connection) as cold:
+            first = user_client.get(url)
+        with CaptureQueriesContext(connection) as warm:
+            second = user_client.get(url)
+
+        assert first.status_code == second.status_code == 200
+        assert len(warm) < len(cold)
+
+    def test_projection_reflects_a_new_valuation(self, user_client, prop):
+        url = reverse("property:panel_projection", args=[prop.pk])
+        user_client.get(url)
+
+        PropertyValue.objects.create(
+            property=prop,
+            valuation_date=datetime.date.today(),
+            value=Money(180000, "EUR"),
+        )
+        response = user_client.get(url)
+
+        assert response.context["projection_points"][0]["projected_value"].amount > (
+            Decimal("180000")
+        )
+
+    def test_detail_summary_reflects_a_new_loan(self, user_client, prop):
+        url = reverse("property:detail", args=[prop.pk])
+        assert user_client.get(url).context["capital_repaid"].amount == 0
+
+        _loan(prop)
+
+        assert user_client.get(url).context["capital_repaid"].amount > 0
+
+    def test_csv_import_bumps_the_version(self, user_client, prop):
+        from property.views.csv_views import (
+            _SESSION_DATA_KEY,
+            _SESSION_HEADER_KEY,
+            _SESSION_PROPERTY_KEY,
+        )
+
+        session = user_client.session
+        session[_SESSION_DATA_KEY] = [["2024-01-15", "-80", "maintenance", "Plumber"]]
+        session[_SESSION_HEADER_KEY] = ["date", "amount", "category", "description"]
+        session[_SESSION_PROPERTY_KEY] = prop.pk
+        session.save()
+
+        user_client.post(reverse("property:csv_import_confirm", args=[prop.pk]))
+
+        assert _version(prop) == 1
@@ -0,0 +1,165 @@
+"""Tests for the projection baseline and sensitivity grid (property/services/projection.py)."""
+
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from moneyed import Money
+
+from property.models import Property, PropertyLedgerEntry, PropertyLoan
+from property.services.projection import (
+    DEFAULT_RENT_RATES,
+    DEFAULT_VACANCY_RATES,
+    DEFAULT_VALUE_RATES,
+    ProjectionBaseline,
+    build_projection_baseline,
+    build_sensitivity_grid,
+)
+
+TODAY = datetime.date(2025, 6, 15)
+
+
+@pytest.fixture
+def prop():
+    return Property.objects.create(
+        name="Projected Flat",
+        property_type=Property.APARTMENT,
+        buying_value=Money(200000, "EUR"),
+        buying_date=datetime.date(2020, 1, 1),
+    )
+
+
+@pytest.fixture
+def loan(prop):
+    return PropertyLoan.objects.create(
+        property=prop,
+        name="Loan",
+        start_date=datetime.date(2020, 1, 1),
+        end_date=datetime.date(2035, 1, 1),
+        original_amount=Money(150000, "EUR"),
+        monthly_payment=Money(950, "EUR"),
+        interest_rate=Decimal("1.2"),
+        insurance=Money(20, "EUR"),
+    )
+
+
+def _baseline(**kwargs):
+    years = 5
+    defaults = {
+        "start": TODAY,
+        "current_value": Decimal("100000"),
+        "currency": "EUR",
+        "annual_rent": Decimal("9000"),
+        "annual_expenses": Decimal("1500"),
+        "year_dates": [TODAY.replace(year=TODAY.year + k) for k in range(1, 6)],
+        "debt": [Decimal(40000 - 8000 * k) for k in range(1, years + 1)],
+        "debt_service": [Decimal("9000")] * 3 + [Decimal("500")] * 2,
+    }
+    defaults.update(kwargs)
+    return ProjectionBaseline(**defaults)
+
+
+def _brute_force(baseline, rent_rate, vacancy):
+    cumulative, positive_year = 0.0, None
+    for k, date in enumerate(baseline.year_dates):
+        cashflow = float(baseline.annual_rent) * (1 + float(rent_rate)) ** k * (
+            1 - float(vacancy)
+        ) - float(baseline.annual_expenses + baseline.debt_service[k])
+        cumulative += cashflow
+        if positive_year is None and cashflow > 0:
+            positive_year = date.year
+    return round(cumulative, 2), positive_year
+
+
+@pytest.mark.django_db
+class TestProjectionBaseline:
+    def test_debt_matches_the_per_date_balance(self, prop, loan):
+        baseline = build_projection_baseline(prop, today=TODAY)
+
+        assert len(baseline.debt) == len(baseline.year_dates) == 20
+        for as_of, debt in zip(baseline.year_dates, baseline.debt, strict=True):
+            assert debt == pytest.approx(
+                prop.total_remaining_loans_at_date(as_of).amount, abs=Decimal("0.01")
+            )
+        assert baseline.debt[-1] == 0
+
+    def test_debt_service_stops_with_the_loan(self, prop, loan):
+        baseline = build_projection_baseline(prop, today=TODAY)
+
+        assert baseline.debt_service[0] == pytest.approx(Decimal("11640"), rel=0.01)
+        assert baseline.debt_service[-1] == 0
+
+    def test_rent_and_expenses_of_the_last_twelve_months(self, prop):
+        PropertyLedgerEntry.objects.create(
+            property=prop,
+            flow_type=PropertyLedgerEntry.FlowType.INCOME,
+            amount=Money(700, "EUR"),
+            entry_date=datetime.date(2023, 1, 1),
+            recurrence_type=PropertyLedgerEntry.MONTHLY,
+            management_category=PropertyLedgerEntry.ManagementCategory.RENT_COLLECTED,
+        )
+        PropertyLedgerEntry.objects.create(
+            property=prop,
+            flow_type=PropertyLedgerEntry.FlowType.EXPENSE,
+            amount=Money(900, "EUR"),
+            entry_date=datetime.date(2025, 3, 1),
+            management_category=PropertyLedgerEntry.ManagementCategory.MAINTENANCE,
+        )
+
+        baseline = build_projection_baseline(prop, today=TODAY)
+
+        assert baseline.annual_rent == Decimal("8400")
+        assert baseline.annual_expenses == Decimal("900")
+
+
+class TestSensitivityGrid:
+    def test_shape_of_the_default_grid(self):
+        grid = build_sensitivity_grid(_baseline())
+
+        assert len(grid["tables"]) == len(DEFAULT_VACANCY_RATES) == 5
+        assert len(grid["rent_growth_pct"]) == len(DEFAULT_RENT_RATES) == 10
+        for table in grid["tables"]:
+            assert len(table["rows"]) == len(DEFAULT_VALUE_RATES) == 10
+            assert all(len(row["cells"]) == 10 for row in table["rows"])
+        assert grid["horizon"] == datetime.date(2030, 6, 15)
+
+    def test_cells_match_a_year_by_year_loop(self):
+        baseline = _baseline()
+        grid = build_sensitivity_grid(baseline)
+
+        for vacancy, table in zip(DEFAULT_VACANCY_RATES, grid["tables"], strict=True):
+            for row in table["rows"]:
+                for rate, cell in zip(DEFAULT_RENT_RATES, row["cells"], strict=True):
+                    cumulative, positive_year = _brute_force(baseline, rate, vacancy)
+                    assert cell["cumulative_cashflow"] == pytest.approx(cumulative)
+                    assert cell["positive_year"] == positive_year
+
+    def test_net_equity_follows_the_value_growth(self):
+        grid = build_sensitivity_grid(
+            _baseline(), value_rates=[Decimal("0"), Decimal("0.1")]
+        )
+
+        rows = grid["tables"][0]["rows"]
+        assert rows[0]["cells"][0]["net_equity"] == 100000 - 0
+        assert rows[1]["cells"][0]["net_equity"] == pytest.approx(100000 * 1.1**5)
+
+    def test_without_rent_the_cash_flow_never_turns_positive(self):
+        grid = build_sensitivity_grid(_baseline(annual_rent=Decimal("0")))
+
+        cells = [
+            cell
+            for table in grid["tables"]
+            for row in table["rows"]
+            for cell in row["cells"]
+        ]
+        assert all(cell["positive_year"] is None for cell in cells)
+
+
+@pytest.mark.django_db
+def test_projection_panel_shows_the_grid(user_client, prop, loan):
+    response = user_client.get(reverse("property:panel_projection", args=[prop.pk]))
+
+    assert response.status_code == 200
+    assert len(response.context["sensitivity"]["tables"]) == 5
+    assert "sensitivity-vacancy-4" in response.content.decode()
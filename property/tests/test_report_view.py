@@ -1,14 +1,25 @@
 """Tests for the income & expenses report view and service."""
 
 import datetime
+import io
+import warnings
+import zipfile
 from decimal import Decimal
 
 import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from moneyed import Money
 
 from property.models import Property, PropertyLedgerEntry, PropertyLedgerEntryException
-from property.services.report import get_income_expense_report
+from property.services.report import (
+    get_income_expense_report,
+    get_report_entries,
+    iter_report_entries,
+)
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -166,13 +177,13 @@ class TestGetIncomeExpenseReport:
         assert result["total_income"] == Decimal("1000")
         assert result["total_expenses"] == Decimal("150")
 
-    def test_entries_queryset_ordered_by_date(self):
-        result = get_income_expense_report(
+    def test_entries_ordered_by_date(self):
+        entries = get_report_entries(
             [self.prop.pk],
             datetime.date(2025, 1, 1),
             datetime.date(2025, 12, 31),
         )
-        dates = [e.entry_date for e in result["entries"]]
+        dates = [e.entry_date for e in entries]
         assert dates == sorted(dates)
 
     def test_recurring_monthly_started_before_range(self):
@@ -261,12 +272,12 @@ class TestGetIncomeExpenseReport:
             recurrence_type=PropertyLedgerEntry.RecurrenceType.MONTHLY,
             recurrence_end_date=datetime.date(2025, 3, 31),
         )
-        result = get_income_expense_report(
+        entries = get_report_entries(
             [self.prop.pk],
             datetime.date(2025, 1, 1),
             datetime.date(2025, 12, 31),
         )
-        dates = [e.entry_date for e in result["entries"]]
+        dates = [e.entry_date for e in entries]
         assert dates == sorted(dates)
         # 3 recurring occurrences (Jan, Feb, Mar) + 2 non-recurring = 5 entries
         assert len(dates) == 5
@@ -408,7 +419,7 @@ class TestReportView:
         assert response.status_code == 200
         assert "text/csv" in response["Content-Type"]
         assert "attachment" in response["Content-Disposition"]
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         assert (
             "date,property,flow_type,management_category,amount,description" in content
         )
@@ -431,13 +442,214 @@ class TestReportView:
                 "format": "csv",
             },
         )
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         assert "2025-07-15" in content
         assert "My House" in content
         assert "expense" in content
         assert "insurance" in content
         assert "200" in content
 
+    def test_csv_export_is_streamed_in_date_order(self, user_client, monkeypatch):
+        prop = _make_property("Stream Flat")
+        _make_recurring_entry(
+            prop,
+            PropertyLedgerEntry.FlowType.INCOME,
+            PropertyLedgerEntry.ManagementCategory.RENT_COLLECTED,
+            Decimal("500"),
+            start_date=datetime.date(2025, 1, 10),
+            recurrence_type=PropertyLedgerEntry.RecurrenceType.MONTHLY,
+            recurrence_end_date=datetime.date(2025, 3, 31),
+        )
+        _make_entry(
+            prop,
+            PropertyLedgerEntry.FlowType.EXPENSE,
+            PropertyLedgerEntry.ManagementCategory.INSURANCE,
+            Decimal("80"),
+            datetime.date(2025, 2, 1),
+        )
+
+        def fail(*args, **kwargs):
+            raise AssertionError("the export must not compute the report")
+
+        monkeypatch.setattr(
+            "property.views.fiscal_views.get_income_expense_report", fail
+        )
+        response = user_client.get(
+            reverse("property:report"),
+            {"start_date": "2025-01-01", "end_date": "2025-12-31", "format": "csv"},
+        )
+
+        assert response.streaming
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert [line.split(",")[0] for line in lines[1:]] == [
+            "2025-01-10",
+            "2025-02-01",
+            "2025-02-10",
+            "2025-03-10",
+        ]
+
+    @pytest.mark.parametrize("export_format", ["csv", "xlsx"])
+    def test_export_streams_under_asgi(self, user, export_format):
+        prop = _make_property("Async Flat")
+        _make_entry(
+            prop,
+            PropertyLedgerEntry.FlowType.INCOME,
+            PropertyLedgerEntry.ManagementCategory.RENT_COLLECTED,
+            Decimal("640"),
+            datetime.date(2025, 6, 1),
+        )
+        client = AsyncClient()
+        client.force_login(user)
+
+        async def download():
+            response = await client.get(
+                reverse("property:report"),
+                {
+                    "start_date": "2025-01-01",
+                    "end_date": "2025-12-31",
+                    "format": export_format,
+                },
+            )
+            assert response.is_async
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        with warnings.catch_warnings():
+            warnings.filterwarnings(
+                "error", message=".*must consume synchronous iterators"
+            )
+            content = async_to_sync(download)()
+
+        if export_format == "csv":
+            assert b"Async Flat" in content
+        else:
+            with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                assert b"Async Flat" in archive.read("xl/worksheets/sheet1.xml")
+
+    def test_xlsx_export(self, user_client):
+        prop = _make_property("Sheet & Flat")
+        _make_entry(
+            prop,
+            PropertyLedgerEntry.FlowType.INCOME,
+            PropertyLedgerEntry.ManagementCategory.RENT_COLLECTED,
+            Decimal("750.50"),
+            datetime.date(2025, 6, 1),
+        )
+        response = user_client.get(
+            reverse("property:report"),
+            {"start_date": "2025-01-01", "end_date": "2025-12-31", "format": "xlsx"},
+        )
+
+        assert response.streaming
+        assert "spreadsheetml" in response["Content-Type"]
+        assert (
+            'filename="income_expenses_report.xlsx"'
+            in (response["Content-Disposition"])
+        )
+        content = b"".join(response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            assert archive.testzip() is None
+            sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+        assert '<t xml:space="preserve">management_category</t>' in sheet
+        # 2025-06-01 as an Excel date serial, with the date style
+        assert '<c s="1"><v>45809</v></c>' in sheet
+        assert "Sheet &amp; Flat" in sheet
+        assert "<v>750.50</v>" in sheet
+
+    def test_pivot_cell_drill_down(self, user_client):
+        prop = _make_property("Drill Flat")
+        _make_recurring_entry(
+            prop,
+            PropertyLedgerEntry.FlowType.INCOME,
+            PropertyLedgerEntry.ManagementCategory.RENT_COLLECTED,
+            Decimal("640"),
+            start_date=datetime.date(2024, 11, 5),
+            recurrence_type=PropertyLedgerEntry.RecurrenceType.MONTHLY,
+        )
+        _make_entry(
+            prop,
+            PropertyLedgerEntry.FlowType.INCOME,
+            PropertyLedgerEntry.ManagementCategory.RENT_COLLECTED,
+            Decimal("35"),
+            datetime.date(2025, 2, 20),
+        )
+
+        response = user_client.get(
+            reverse("property:report_cell_entries"),
+            {
+                "property": prop.pk,
+                "category": "rent_collected",
+                "flow_type": "income",
+                "period": "2025-02-01",
+                "granularity": "month",
+                "start_date": "2025-01-01",
+                "end_date": "2025-12-31",
+            },
+        )
+
+        assert response.status_code == 200
+        dates = [entry.entry_date for entry in response.context["entries"]]
+        assert dates == [datetime.date(2025, 2, 5), datetime.date(2025, 2, 20)]
+        assert response.context["total"] == Decimal("675")
+
+    def test_pivot_cell_with_an_open_range(self, user_client):
+        prop = _make_property("Open Flat")
+        _make_entry(
+            prop,
+            PropertyLedgerEntry.FlowType.EXPENSE,
+            PropertyLedgerEntry.ManagementCategory.INSURANCE,
+            Decimal("90"),
+            datetime.date(2025, 4, 2),
+        )
+
+        response = user_client.get(
+            reverse("property:report_cell_entries"),
+            {
+                "property": prop.pk,
+                "category": "insurance",
+                "flow_type": "expense",
+                "period": "2025-01-01",
+                "granularity": "year",
+                "start_date": "2025-03-01",
+                "end_date": "",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.context["total"] == Decimal("90")
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"period": "02/2025"},
+            {"period": "2025-02-01", "property": "abc"},
+            {"period": "2025-02-01", "granularity": "week"},
+            {"period": "2025-02-01", "end_date": "31/12/2025"},
+        ],
+    )
+    def test_pivot_cell_invalid_parameters(self, user_client, params):
+        prop = _make_property()
+        response = user_client.get(
+            reverse("property:report_cell_entries"), {"property": prop.pk, **params}
+        )
+        assert response.status_code == 400
+
+    def test_report_page_shows_the_pivot(self, user_client):
+        prop = _make_property("Pivot Flat")
+        _make_entry(
+            prop,
+            PropertyLedgerEntry.FlowType.EXPENSE,
+            PropertyLedgerEntry.ManagementCategory.INSURANCE,
+            Decimal("90"),
+            datetime.date(2025, 4, 2),
+        )
+        response = user_client.get(
+            reverse("property:report"),
+            {"start_date": "2025-01-01", "end_date": "2025-12-31"},
+        )
+        content = response.content.decode()
+        assert 'data-period="2025-04-01"' in content
+        assert "Pivot Flat" in content
+
     def test_redirect_unauthenticated(self, client):
         response = client.get(reverse("property:report"))
         assert response.status_code == 302
@@ -445,3 +657,98 @@ class TestReportView:
             "/accounts/login/" in response["Location"]
             or "login" in response["Location"]
         )
+
+
+@pytest.mark.django_db
+class TestReportPivot:
+    def setup_method(self):
+        self.flat = _make_property("B Flat")
+        self.house = _make_property("A House")
+        _make_recurring_entry(
+            self.flat,
+            PropertyLedgerEntry.FlowType.INCOME,
+            PropertyLedgerEntry.ManagementCategory.RENT_COLLECTED,
+            Decimal("700"),
+            start_date=datetime.date(2024, 6, 10),
+            recurrence_type=PropertyLedgerEntry.RecurrenceType.MONTHLY,
+        )
+        _make_entry(
+            self.flat,
+            PropertyLedgerEntry.FlowType.EXPENSE,
+            PropertyLedgerEntry.ManagementCategory.INSURANCE,
+            Decimal("120"),
+            datetime.date(2025, 2, 14),
+        )
+        _make_entry(
+            self.house,
+            PropertyLedgerEntry.FlowType.INCOME,
+            PropertyLedgerEntry.ManagementCategory.RENT_COLLECTED,
+            Decimal("1500"),
+            datetime.date(2025, 3, 1),
+        )
+
+    def _report(self, **kwargs):
+        return get_income_expense_report(
+            [self.flat.pk, self.house.pk],
+            datetime.date(2025, 1, 1),
+            datetime.date(2025, 3, 31),
+            **kwargs,
+        )
+
+    def test_monthly_columns_and_rows(self):
+        pivot = self._report()["pivot"]
+
+        assert pivot["columns"] == [
+            datetime.date(2025, 1, 1),
+            datetime.date(2025, 2, 1),
+            datetime.date(2025, 3, 1),
+        ]
+        house, flat = pivot["properties"]
+        assert house["property"] == self.house
+        assert [row["category"] for row in flat["rows"]] == [
+            "insurance",
+            "rent_collected",
+        ]
+        rent = flat["rows"][1]
+        assert [cell["amount"] for cell in rent["cells"]] == [Decimal("700")] * 3
+        assert flat["net_cells"] == [Decimal("700"), Decimal("580"), Decimal("700")]
+        assert house["net"] == Decimal("1500")
+
+    def test_yearly_columns(self):
+        pivot = self._report(granularity="year")["pivot"]
+
+        assert pivot["columns"] == [datetime.date(2025, 1, 1)]
+        flat = pivot["properties"][1]
+        assert flat["rows"][1]["total"] == Decimal("2100")
+
+    def test_pivot_matches_the_totals(self):
+        report = self._report()
+
+        net = sum(group["net"] for group in report["pivot"]["properties"])
+        assert net == report["net"] == Decimal("3480")
+
+    def test_report_entries_are_merged_in_date_order(self):
+        entries = iter_report_entries(
+            [self.flat.pk, self.house.pk],
+            datetime.date(2025, 1, 1),
+            datetime.date(2025, 3, 31),
+        )
+
+        dates = [entry.entry_date for entry in entries]
+        assert dates == sorted(dates)
+        assert len(dates) == len(
+            get_report_entries(
+                [self.flat.pk, self.house.pk],
+                datetime.date(2025, 1, 1),
+                datetime.date(2025, 3, 31),
+            )
+        )
+
+    def test_entries_are_not_loaded(self):
+        # One grouped query, the recurring entries, their exceptions and the
+        # properties: no query per entry.
+        with CaptureQueriesContext(connection) as queries:
+            report = self._report()
+
+        assert "entries" not in report
+        assert len(queries) == 4
@@ -0,0 +1,232 @@
+"""Tests for property/services/scpi_dividends.py (allocation and distribution rates)."""
+
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from moneyed import Money
+
+from property.models import SCPI, SCPIDividend, SCPIInvestment, SCPISharePrice
+from property.services.scpi_dividends import (
+    allocate_dividends,
+    cached_dividend_analytics,
+    get_dividend_analytics,
+)
+
+
+@pytest.fixture
+def fund():
+    fund = SCPI.objects.create(name="Dividend SCPI")
+    SCPISharePrice.objects.create(
+        scpi=fund,
+        date=datetime.date(2021, 1, 1),
+        subscription_value=Money(Decimal("200.00"), "EUR"),
+    )
+    return fund
+
+
+def _investment(fund, **kwargs):
+    defaults = {
+        "subscription_date": datetime.date(2021, 1, 15),
+        "shares_count": Decimal("10"),
+        "unit_purchase_price": Money(Decimal("200.00"), "EUR"),
+    }
+    return SCPIInvestment.objects.create(scpi=fund, **{**defaults, **kwargs})
+
+
+def _dividend(fund, date, amount):
+    return SCPIDividend.objects.create(
+        scpi=fund, payment_date=date, net_amount=Money(Decimal(amount), "EUR")
+    )
+
+
+def _version(fund) -> int:
+    return SCPI.objects.values_list("data_version", flat=True).get(pk=fund.pk)
+
+
+@pytest.mark.django_db
+class TestReceivesDividends:
+    def test_enjoyment_date_delays_the_first_dividend(self, fund):
+        inv = _investment(fund, enjoyment_date=datetime.date(2021, 6, 1))
+
+        assert not inv.receives_dividends(datetime.date(2021, 5, 31))
+        assert inv.receives_dividends(datetime.date(2021, 6, 1))
+
+    def test_sold_shares_stop_receiving(self, fund):
+        inv = _investment(fund, sold_date=datetime.date(2022, 3, 1))
+
+        assert inv.receives_dividends(datetime.date(2022, 3, 1))
+        assert not inv.receives_dividends(datetime.date(2022, 3, 2))
+
+    def test_dismemberment_splits_the_dividends_at_its_end(self, fund):
+        start, end = datetime.date(2021, 1, 15), datetime.date(2026, 1, 15)
+        bare = _investment(
+            fund,
+            ownership_type=SCPIInvestment.OwnershipType.BARE,
+            dismemberment_start_date=start,
+            dismemberment_end_date=end,
+            bare_ownership_ratio=Decimal("70"),
+        )
+        usufruct = _investment(
+            fund,
+            ownership_type=SCPIInvestment.OwnershipType.USUFRUCT,
+            dismemberment_start_date=start,
+            dismemberment_end_date=end,
+            bare_ownership_ratio=Decimal("70"),
+        )
+
+        before, after = datetime.date(2025, 12, 31), datetime.date(2026, 1, 15)
+        assert (bare.receives_dividends(before), bare.receives_dividends(after)) == (
+            False,
+            True,
+        )
+        assert (
+            usufruct.receives_dividends(before),
+            usufruct.receives_dividends(after),
+        ) == (True, False)
+
+
+@pytest.mark.django_db
+class TestAllocateDividends:
+    def test_matches_the_pro_rata_of_the_entitled_shares(self, fund):
+        investments = [
+            _investment(fund, shares_count=Decimal("10")),
+            _investment(
+                fund,
+                shares_count=Decimal("20"),
+                subscription_date=datetime.date(2021, 4, 1),
+                sold_date=datetime.date(2022, 6, 30),
+            ),
+            _investment(
+                fund,
+                shares_count=Decimal("15"),
+                subscription_date=datetime.date(2021, 2, 1),
+                ownership_type=SCPIInvestment.OwnershipType.BARE,
+                dismemberment_start_date=datetime.date(2021, 2, 1),
+                dismemberment_end_date=datetime.date(2022, 2, 1),
+                bare_ownership_ratio=Decimal("80"),
+            ),
+        ]
+        dividends = [
+            _dividend(fund, datetime.date(2021, 3, 31), "100.00"),
+            _dividend(fund, datetime.date(2021, 6, 30), "300.00"),
+            _dividend(fund, datetime.date(2022, 3, 31), "450.00"),
+            _dividend(fund, datetime.date(2022, 9, 30), "125.00"),
+        ]
+
+        expected: dict[tuple[int, int], Decimal] = {}
+        for div in dividends:
+            entitled = [
+                inv for inv in investments if inv.receives_dividends(div.payment_date)
+            ]
+            shares = sum(inv.shares_count for inv in entitled)
+            for inv in entitled:
+                key = (inv.pk, div.payment_date.year)
+                expected[key] = expected.get(key, Decimal("0")) + (
+                    div.net_amount.amount * inv.shares_count / shares
+                )
+
+        allocation = allocate_dividends([fund.pk])
+
+        assert allocation == {
+            key: amount.quantize(Decimal("0.01")) for key, amount in expected.items()
+        }
+        # 2021: 100 + 300 × 10/30; 2022: 450 × 10/45 + 125 × 10/25
+        assert allocation[(investments[0].pk, 2021)] == Decimal("200.00")
+        assert allocation[(investments[0].pk, 2022)] == Decimal("150.00")
+        # The bare owner only receives once the dismemberment has ended
+        assert (investments[2].pk, 2021) not in allocation
+
+    def test_leaves_out_the_dividends_nobody_is_entitled_to(self, fund):
+        _investment(fund, sold_date=datetime.date(2021, 12, 31))
+        _dividend(fund, datetime.date(2022, 3, 31), "100.00")
+
+        assert allocate_dividends([fund.pk]) == {}
+
+    def test_one_query_for_several_funds(self, fund):
+        other = SCPI.objects.create(name="Other SCPI")
+        _investment(fund)
+        _investment(other)
+        _dividend(fund, datetime.date(2021, 6, 30), "50.00")
+        _dividend(other, datetime.date(2021, 6, 30), "70.00")
+
+        with CaptureQueriesContext(connection) as queries:
+            allocation = allocate_dividends([fund.pk, other.pk])
+
+        assert len(queries) == 1
+        assert sorted(allocation.values()) == [Decimal("50.00"), Decimal("70.00")]
+
+
+@pytest.mark.django_db
+class TestDividendAnalytics:
+    def test_distribution_rate_by_year(self, fund):
+        first = _investment(fund, shares_count=Decimal("10"))  # 2 000 €
+        second = _investment(
+            fund,
+            shares_count=Decimal("30"),  # 6 000 €
+            subscription_date=datetime.date(2022, 1, 10),
+        )
+        _dividend(fund, datetime.date(2021, 12, 31), "90.00")
+        _dividend(fund, datetime.date(2022, 12, 31), "360.00")
+
+        data = get_dividend_analytics(fund, today=datetime.date(2023, 6, 30))
+
+        assert data["currency"] == "EUR"
+        assert data["total"] == Decimal("450.00")
+        assert data["trailing_year"] == Decimal("360.00")
+        assert [(y["year"], y["invested"], y["rate"]) for y in data["years"]] == [
+            (2021, Decimal("2000.00"), Decimal("4.50")),
+            (2022, Decimal("8000.00"), Decimal("4.50")),
+        ]
+        assert data["investments"][first.pk]["total"] == Decimal("180.00")
+        assert data["investments"][second.pk]["years"][2022] == {
+            "amount": Decimal("270.00"),
+            "rate": Decimal("4.50"),
+        }
+
+    def test_writes_bump_the_fund_data_version(self, fund):
+        version = _version(fund)
+        inv = _investment(fund)
+        div = _dividend(fund, datetime.date(2021, 6, 30), "50.00")
+        div.delete()
+        inv.delete()
+
+        assert _version(fund) == version + 4
+
+    def test_cache_is_read_until_the_data_changes(self, fund):
+        today = datetime.date(2023, 6, 30)
+        _investment(fund)
+        _dividend(fund, datetime.date(2022, 6, 30), "50.00")
+        fund.refresh_from_db()
+        cached_dividend_analytics(fund, today)
+
+        with CaptureQueriesContext(connection) as queries:
+            data = cached_dividend_analytics(fund, today)
+
+        assert len(queries) == 0
+        assert data["total"] == Decimal("50.00")
+
+        _dividend(fund, datetime.date(2023, 3, 31), "70.00")
+        fund.refresh_from_db()
+        assert cached_dividend_analytics(fund, today)["total"] == Decimal("120.00")
+
+
+@pytest.mark.django_db
+class TestFundDetailDividends:
+    def test_shows_the_rates_and_the_allocated_dividends(self, user_client, fund):
+        inv = _investment(fund)
+        _dividend(fund, datetime.date(2021, 6, 30), "80.00")
+
+        response = user_client.get(
+            reverse("property:scpi_fund_detail", kwargs={"scpi_pk": fund.pk})
+        )
+
+        assert response.status_code == 200
+        assert response.context["dividend_years"][0]["rate"] == Decimal("4.00")
+        (row,) = response.context["investment_rows"]
+        assert row["obj"].pk == inv.pk
+        assert row["dividends"] == Money(Decimal("80.00"), "EUR")
+        assert b"dividend-years-table" in response.content
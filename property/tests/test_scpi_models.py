@@ -5,9 +5,17 @@ from decimal import Decimal
 
 import pytest
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from moneyed import Money
 
-from property.models.scpi import SCPI, SCPIDividend, SCPIInvestment, SCPISharePrice
+from property.models.scpi import (
+    SCPI,
+    SCPIDividend,
+    SCPIInvestment,
+    SCPISharePrice,
+    SCPISharePriceCurve,
+)
 
 # ── Fixtures ──────────────────────────────────────────────────────────────────
 
@@ -142,6 +150,133 @@ class TestSCPISharePrice:
         assert "2024-03-01" in str(price)
 
 
+@pytest.mark.django_db
+class TestSCPISharePriceCurve:
+    @pytest.fixture
+    def prices(self, scpi):
+        for date, value in (
+            (datetime.date(2024, 7, 1), "1100.00"),
+            (datetime.date(2023, 1, 1), "1000.00"),
+            (datetime.date(2024, 1, 1), "1050.00"),
+        ):
+            SCPISharePrice.objects.create(
+                scpi=scpi, date=date, subscription_value=Money(Decimal(value), "EUR")
+            )
+        return scpi
+
+    @pytest.mark.parametrize(
+        "as_of",
+        [
+            datetime.date(2022, 12, 31),
+            datetime.date(2023, 1, 1),
+            datetime.date(2023, 12, 31),
+            datetime.date(2024, 1, 1),
+            datetime.date(2024, 6, 30),
+            datetime.date(2030, 1, 1),
+        ],
+    )
+    def test_matches_the_queried_price(self, prices, as_of):
+        curve = SCPISharePriceCurve(prices.share_prices.all())
+
+        assert curve.at(as_of) == prices.get_share_price(as_of)
+
+    def test_prefetched_fund_looks_prices_up_without_query(self, prices):
+        fund = SCPI.objects.prefetch_related("share_prices").get(pk=prices.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            price = fund.get_share_price(datetime.date(2024, 3, 1))
+            assert fund.price_curve() is fund.price_curve()
+
+        assert price.subscription_value == Money(Decimal("1050.00"), "EUR")
+        assert len(queries) == 0
+
+    def test_valuations_accept_the_curve(self, prices):
+        investment = SCPIInvestment.objects.create(
+            scpi=prices,
+            subscription_date=datetime.date(2023, 1, 1),
+            shares_count=Decimal("10.0000"),
+            unit_purchase_price=Money(Decimal("1000.00"), "EUR"),
+        )
+        curve = prices.price_curve()
+        dates = [datetime.date(2023, 6, 1), datetime.date(2024, 8, 1)]
+        expected = [
+            (
+                investment.get_estimated_value(date),
+                investment.get_estimated_resale_value(date),
+                investment.get_exit_fees(date),
+                investment.get_capital_gain(date),
+            )
+            for date in dates
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            values = [
+                (
+                    investment.get_estimated_value(date, curve),
+                    investment.get_estimated_resale_value(date, curve),
+                    investment.get_exit_fees(date, curve),
+                    investment.get_capital_gain(date, curve),
+                )
+                for date in dates
+            ]
+
+        assert values == expected
+        assert len(queries) == 0
+
+
+@pytest.mark.django_db
+class TestSCPIInvestmentEstimatedValues:
+    DATES = [
+        datetime.date(2019, 6, 1),
+        datetime.date(2020, 1, 1),
+        datetime.date(2023, 12, 31),
+        datetime.date(2024, 1, 1),
+        datetime.date(2026, 7, 15),
+        datetime.date(2030, 1, 1),
+        datetime.date(2031, 5, 1),
+    ]
+
+    @pytest.mark.parametrize(
+        "name", ["investment_full", "investment_bare", "investment_usufruct"]
+    )
+    def test_match_the_per_date_values(self, request, name):
+        investment = request.getfixturevalue(name)
+        investment.sold_date = datetime.date(2030, 6, 30)
+
+        values = investment.get_estimated_values(self.DATES)
+
+        assert values == [investment.get_estimated_value(d) for d in self.DATES]
+        assert [str(v.amount) for v in values] == [
+            str(investment.get_estimated_value(d).amount) for d in self.DATES
+        ]
+
+    def test_without_share_price_uses_the_purchase_value(self, scpi):
+        investment = SCPIInvestment.objects.create(
+            scpi=scpi,
+            subscription_date=datetime.date(2022, 1, 1),
+            shares_count=Decimal("3"),
+            unit_purchase_price=Money(Decimal("333.33"), "EUR"),
+            ownership_type=SCPIInvestment.OwnershipType.USUFRUCT,
+            dismemberment_start_date=datetime.date(2022, 1, 1),
+            dismemberment_end_date=datetime.date(2027, 1, 1),
+            bare_ownership_ratio=Decimal("72.50"),
+        )
+
+        values = investment.get_estimated_values(self.DATES)
+
+        assert values == [investment.get_estimated_value(d) for d in self.DATES]
+
+    def test_no_query_with_the_curve(self, investment_bare):
+        curve = investment_bare.scpi.price_curve()
+        dates = [datetime.date(2020 + n // 12, n % 12 + 1, 1) for n in range(120)]
+
+        with CaptureQueriesContext(connection) as queries:
+            values = investment_bare.get_estimated_values(dates, curve)
+
+        assert len(values) == 120
+        assert len(queries) == 0
+
+
 # ── SCPIInvestment — purchase / fees ──────────────────────────────────────────
 
 
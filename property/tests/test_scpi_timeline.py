@@ -0,0 +1,179 @@
+"""Tests for property/services/scpi_timeline.py (SCPIValueTimeline)."""
+
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from moneyed import Money
+
+from property.models import SCPI, SCPIDividend, SCPIInvestment, SCPISharePrice
+from property.services.scpi_timeline import SCPISeries, SCPIValueTimeline, month_grid
+
+
+@pytest.fixture
+def fund():
+    fund = SCPI.objects.create(
+        name="Grid SCPI", entry_fee_rate=Decimal("8"), exit_fee_rate=Decimal("2")
+    )
+    for date, subscription, withdrawal in (
+        (datetime.date(2021, 1, 1), "200.00", "184.00"),
+        (datetime.date(2022, 7, 1), "210.00", None),
+        (datetime.date(2023, 4, 1), "190.00", "175.00"),
+    ):
+        SCPISharePrice.objects.create(
+            scpi=fund,
+            date=date,
+            subscription_value=Money(Decimal(subscription), "EUR"),
+            withdrawal_value=Money(Decimal(withdrawal), "EUR") if withdrawal else None,
+        )
+    SCPIInvestment.objects.create(
+        scpi=fund,
+        subscription_date=datetime.date(2021, 2, 15),
+        shares_count=Decimal("50"),
+        unit_purchase_price=Money(Decimal("200.00"), "EUR"),
+    )
+    SCPIInvestment.objects.create(
+        scpi=fund,
+        subscription_date=datetime.date(2022, 9, 20),
+        shares_count=Decimal("30"),
+        unit_purchase_price=Money(Decimal("136.50"), "EUR"),
+        ownership_type=SCPIInvestment.OwnershipType.BARE,
+        dismemberment_start_date=datetime.date(2022, 9, 20),
+        dismemberment_end_date=datetime.date(2032, 9, 20),
+        bare_ownership_ratio=Decimal("65.00"),
+    )
+    SCPIInvestment.objects.create(
+        scpi=fund,
+        subscription_date=datetime.date(2021, 6, 1),
+        shares_count=Decimal("10"),
+        unit_purchase_price=Money(Decimal("200.00"), "EUR"),
+        sold_date=datetime.date(2023, 1, 31),
+    )
+    for date in (
+        datetime.date(2021, 6, 30),
+        datetime.date(2022, 3, 31),
+        datetime.date(2022, 9, 30),
+        datetime.date(2023, 3, 31),
+    ):
+        SCPIDividend.objects.create(
+            scpi=fund, payment_date=date, net_amount=Money(Decimal("100.00"), "EUR")
+        )
+    return SCPI.objects.prefetch_related(
+        "share_prices", "investments", "dividends"
+    ).get(pk=fund.pk)
+
+
+def test_month_grid_ends_on_the_last_date():
+    grid = month_grid(datetime.date(2023, 11, 20), datetime.date(2024, 3, 31))
+
+    assert grid == [
+        datetime.date(2023, 11, 30),
+        datetime.date(2023, 12, 31),
+        datetime.date(2024, 1, 31),
+        datetime.date(2024, 2, 29),
+        datetime.date(2024, 3, 31),
+    ]
+    assert month_grid(datetime.date(2024, 4, 1), datetime.date(2024, 3, 31)) == []
+
+
+@pytest.mark.django_db
+class TestSCPIValueTimeline:
+    def test_matches_the_per_date_valuations(self, fund):
+        dates = month_grid(datetime.date(2021, 1, 1), datetime.date(2024, 6, 15))
+
+        series = SCPIValueTimeline([fund]).fund_series(fund, dates)
+
+        investments = list(SCPIInvestment.objects.filter(scpi=fund))
+        for index, as_of in enumerate(dates):
+            held = [
+                inv
+                for inv in investments
+                if inv.subscription_date <= as_of
+                and not (inv.sold_date and inv.sold_date < as_of)
+            ]
+            assert series.estimated_value[index] == sum(
+                (inv.get_estimated_value(as_of).amount for inv in held), Decimal("0")
+            )
+            assert series.resale_value[index] == sum(
+                (inv.get_estimated_resale_value(as_of).amount for inv in held),
+                Decimal("0"),
+            )
+            assert series.invested[index] == sum(
+                (inv.get_total_invested().amount for inv in held), Decimal("0")
+            )
+
+    def test_trailing_dividends_cover_one_year(self, fund):
+        dates = [
+            datetime.date(2021, 6, 29),
+            datetime.date(2021, 6, 30),
+            datetime.date(2022, 6, 30),
+            datetime.date(2023, 3, 31),
+            datetime.date(2024, 3, 31),
+        ]
+
+        series = SCPIValueTimeline([fund]).fund_series(fund, dates)
+
+        assert series.trailing_dividends == [
+            Decimal("0"),
+            Decimal("100.00"),
+            Decimal("100.00"),
+            # The dividend paid exactly one year before is out of the window
+            Decimal("200.00"),
+            Decimal("0"),
+        ]
+        # 200 / (50 × 200 + 30 × 136.50) → 1.42 %
+        assert series.trailing_yield()[3] == Decimal("1.42")
+
+    def test_prefetched_funds_need_no_query(self, fund):
+        dates = month_grid(datetime.date(2021, 1, 1), datetime.date(2024, 6, 15))
+
+        with CaptureQueriesContext(connection) as queries:
+            SCPIValueTimeline([fund]).series(dates)
+
+        assert len(queries) == 0
+
+    def test_growth_deducts_the_capital_subscribed(self, fund):
+        dates = month_grid(datetime.date(2021, 9, 1), datetime.date(2022, 9, 30))
+
+        series = SCPIValueTimeline([fund]).fund_series(fund, dates)
+
+        # The bare ownership subscribed meanwhile counts for its own gain only
+        assert series.growth(12) == (
+            series.resale_value[-1]
+            - series.resale_value[0]
+            - (series.invested[-1] - series.invested[0])
+        )
+        assert series.invested[-1] - series.invested[0] == Decimal("4095.00")
+
+    def test_series_only_add_on_aligned_grids(self):
+        grid = month_grid(datetime.date(2024, 1, 1), datetime.date(2024, 6, 15))
+        total = SCPISeries.empty(grid)
+
+        total.add(SCPISeries.empty(grid[2:]))
+        with pytest.raises(ValueError):
+            total.add(SCPISeries.empty(grid[:3]))
+
+
+@pytest.mark.django_db
+class TestSCPIEvolutionViews:
+    def test_list_shows_the_portfolio_evolution(self, user_client, fund):
+        response = user_client.get(reverse("property:scpi_list"))
+
+        assert response.status_code == 200
+        assert response.context["portfolio_chart"] != "null"
+        assert b"scpi-portfolio-chart" in response.content
+
+    def test_fund_detail_growth_comes_from_the_series(self, user_client, fund):
+        response = user_client.get(
+            reverse("property:scpi_fund_detail", kwargs={"scpi_pk": fund.pk})
+        )
+
+        series = response.context["series"]
+        invested = response.context["total_invested"].amount
+        assert series.dates[-1] == datetime.date.today()
+        assert response.context["last_12mo_growth_pct"] == (
+            series.growth(12) / invested * Decimal("100")
+        ).quantize(Decimal("0.01"))
@@ -4,6 +4,8 @@ import datetime
 from decimal import Decimal
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from moneyed import Money
 
 from property.models import (
@@ -15,8 +17,11 @@ from property.models import (
     PropertyLoanAmortizationEntry,
 )
 from property.services.tax_lmnp import (
+    LmnpTimeline,
+    get_accounting_data,
     get_amortization_schedule,
     get_bilan_data,
+    get_deferred_amortization_balance,
     get_fiscal_deficit_history,
     get_lmnp_summary,
 )
@@ -717,3 +722,249 @@ class TestAmortizationEntryFallbackForLoanInterest:
         summary = get_lmnp_summary(prop.pk, 2022)
         assert summary["charges_financieres"] == Decimal("437.50")
         assert summary["charges"] == Decimal("437.50")
+
+    def test_query_count_does_not_depend_on_loans_or_years(self):
+        """Ledger and amortization interest totals take at most four queries."""
+        from property.services.tax_lmnp import _get_category_totals
+
+        prop = self._make_property("Many Loans Prop")
+        PropertyLedgerEntry.objects.create(
+            property=prop,
+            flow_type=PropertyLedgerEntry.FlowType.INCOME,
+            management_category=PropertyLedgerEntry.ManagementCategory.RENT_COLLECTED,
+            amount=Money(Decimal("800"), "EUR"),
+            entry_date=datetime.date(2020, 1, 1),
+            recurrence_type=PropertyLedgerEntry.RecurrenceType.MONTHLY,
+        )
+        for _index in range(4):
+            loan = self._make_loan(prop)
+            for year in (2021, 2022, 2023):
+                PropertyLoanAmortizationEntry.objects.create(
+                    loan=loan,
+                    date=datetime.date(year, 3, 1),
+                    capital=Money(Decimal("500"), "EUR"),
+                    interest=Money(Decimal("100"), "EUR"),
+                    remaining_balance_amount=Money(Decimal("140000"), "EUR"),
+                )
+
+        # Non-recurring, recurring (+ their exceptions) and loan interest
+        with CaptureQueriesContext(connection) as queries:
+            totals = _get_category_totals([prop.pk], [2021, 2022, 2023])
+        assert len(queries) == 4
+
+        for year in (2021, 2022, 2023):
+            assert totals[prop.pk][year]["loan_interest"] == Decimal("400")
+            assert totals[prop.pk][year]["rent_collected"] == Decimal("9600")
+
+    def test_capitalized_entries_are_excluded(self):
+        from property.services.tax_lmnp import _get_category_totals_for_year
+
+        prop = self._make_property("Capitalized Prop")
+        kitchen = PropertyLedgerEntry.objects.create(
+            property=prop,
+            flow_type=PropertyLedgerEntry.FlowType.EXPENSE,
+            management_category=PropertyLedgerEntry.ManagementCategory.MAINTENANCE,
+            amount=Money(Decimal("5000"), "EUR"),
+            entry_date=datetime.date(2022, 4, 1),
+        )
+        PropertyLedgerEntry.objects.create(
+            property=prop,
+            flow_type=PropertyLedgerEntry.FlowType.EXPENSE,
+            management_category=PropertyLedgerEntry.ManagementCategory.MAINTENANCE,
+            amount=Money(Decimal("300"), "EUR"),
+            entry_date=datetime.date(2022, 5, 1),
+        )
+        asset = AmortizationAsset.objects.create(
+            property=prop,
+            label="Kitchen",
+            beginning_date=datetime.date(2022, 4, 1),
+            value_total=Money(5000, "EUR"),
+            duration_years=10,
+        )
+        asset.source_transactions.add(kitchen)
+
+        totals = _get_category_totals_for_year(prop.pk, 2022)
+        assert totals["maintenance"] == Decimal("300")
+
+
+@pytest.mark.django_db
+class TestLmnpTimeline:
+    """The single-pass timeline carries the art. 39C and art. 156 balances."""
+
+    def _make_history(self):
+        prop = Property.objects.create(
+            name="Timeline Prop",
+            property_type=Property.APARTMENT,
+            buying_value=Money(100000, "EUR"),
+            buying_date=datetime.date(2015, 1, 1),
+        )
+        AmortizationAsset.objects.create(
+            property=prop,
+            label="Structure",
+            beginning_date=datetime.date(2015, 1, 1),
+            value_total=Money(50000, "EUR"),
+            duration_years=25,
+        )
+        # 2015-2016: deficits, 2017 onwards: rent covers the charges
+        for year, flow_type, category, amount in (
+            (2015, "expense", ManagementCategory.MANAGEMENT_FEES, 3000),
+            (2016, "expense", ManagementCategory.MANAGEMENT_FEES, 1500),
+            (2017, "income", ManagementCategory.RENT_COLLECTED, 4000),
+            (2018, "income", ManagementCategory.RENT_COLLECTED, 4000),
+            (2019, "income", ManagementCategory.RENT_COLLECTED, 4000),
+        ):
+            PropertyLedgerEntry.objects.create(
+                property=prop,
+                flow_type=flow_type,
+                management_category=category,
+                amount=Money(Decimal(amount), "EUR"),
+                entry_date=datetime.date(year, 6, 1),
+            )
+        return prop
+
+    def test_deferred_amortization_is_used_once_profitable(self):
+        prop = self._make_history()
+        timeline = LmnpTimeline(prop.pk)
+
+        # 2000 € dotation per year, fully deferred in the deficit years
+        assert timeline.deferred_balance(2014) == Decimal("0")
+        assert timeline.deferred_balance(2016) == Decimal("4000")
+        assert timeline.summary(2017)["deferred_prior"] == Decimal("4000")
+        assert timeline.summary(2017)["amortization_deductible"] == Decimal("4000")
+        assert timeline.deferred_balance(2017) == Decimal("2000")
+        assert timeline.deferred_balance(2018) == Decimal("0")
+
+    def test_deficits_are_carried_and_imputed_oldest_first(self):
+        prop = self._make_history()
+        timeline = LmnpTimeline(prop.pk)
+
+        assert timeline.deficit_history(2016) == {
+            2015: Decimal("3000"),
+            2016: Decimal("1500"),
+        }
+        # 2017 and 2018 have no taxable profit: amortization absorbs the rent
+        assert timeline.deficit_history(2018) == timeline.deficit_history(2016)
+        # 2019: 4000 rent - 2000 dotation = 2000 profit imputed on 2015 first
+        assert timeline.deficit_history(2019) == {
+            2015: Decimal("1000"),
+            2016: Decimal("1500"),
+        }
+        # Deficits expire after ten years
+        assert timeline.deficit_history(2026) == {2016: Decimal("1500")}
+        assert timeline.deficit_history(2027) == {}
+
+    def test_matches_the_module_functions(self):
+        prop = self._make_history()
+        timeline = LmnpTimeline(prop.pk)
+
+        for year in range(2014, 2021):
+            assert timeline.summary(year) == get_lmnp_summary(prop.pk, year)
+            assert timeline.deficit_history(year) == get_fiscal_deficit_history(
+                prop.pk, year
+            )
+            assert timeline.deferred_balance(year) == get_deferred_amortization_balance(
+                prop.pk, year
+            )
+
+    def test_each_year_is_computed_once(self):
+        prop = self._make_history()
+        timeline = LmnpTimeline(prop.pk)
+        timeline.deficit_history(2030)
+
+        with CaptureQueriesContext(connection) as queries:
+            for year in range(2015, 2031):
+                timeline.summary(year)
+                timeline.deficit_history(year)
+
+        assert len(queries) == 0
+
+    def test_query_count_grows_linearly_with_the_years(self):
+        prop = self._make_history()
+
+        with CaptureQueriesContext(connection) as ten_years:
+            get_fiscal_deficit_history(prop.pk, 2024)
+        with CaptureQueriesContext(connection) as twenty_years:
+            get_fiscal_deficit_history(prop.pk, 2034)
+
+        # Replaying the history for each year would roughly quadruple it
+        assert len(twenty_years) < 2.5 * len(ten_years)
+
+
+@pytest.mark.django_db
+class TestAccountingDataBulkLoading:
+    """The liasse of several properties is loaded with grouped queries."""
+
+    def _make_property(self, index):
+        prop = Property.objects.create(
+            name=f"Bulk Prop {index}",
+            property_type=Property.APARTMENT,
+            buying_value=Money(100000, "EUR"),
+            buying_date=datetime.date(2018, 1, 1),
+            tax_regime=Property.TaxRegime.LMNP_REEL,
+        )
+        AmortizationAsset.objects.create(
+            property=prop,
+            label="Structure",
+            beginning_date=datetime.date(2018, 1, 1),
+            value_total=Money(60000, "EUR"),
+            duration_years=30,
+        )
+        PropertyLedgerEntry.objects.create(
+            property=prop,
+            flow_type="income",
+            management_category=ManagementCategory.RENT_COLLECTED,
+            amount=Money(Decimal(500 + index), "EUR"),
+            entry_date=datetime.date(2018, 1, 1),
+            recurrence_type=PropertyLedgerEntry.MONTHLY,
+        )
+        PropertyLedgerEntry.objects.create(
+            property=prop,
+            flow_type="expense",
+            management_category=ManagementCategory.MANAGEMENT_FEES,
+            amount=Money(Decimal(2500 * index), "EUR"),
+            entry_date=datetime.date(2019, 3, 1),
+        )
+        loan = PropertyLoan.objects.create(
+            property=prop,
+            name="Loan",
+            start_date=datetime.date(2018, 1, 1),
+            end_date=datetime.date(2038, 1, 1),
+            original_amount=Money(80000, "EUR"),
+            monthly_payment=Money(400, "EUR"),
+            interest_rate=Decimal("1.5"),
+        )
+        PropertyLoanAmortizationEntry.objects.create(
+            loan=loan,
+            date=datetime.date(2020, 6, 1),
+            capital=Money(300, "EUR"),
+            interest=Money(100, "EUR"),
+            remaining_balance_amount=Money(70000 - index, "EUR"),
+        )
+        return prop
+
+    def test_query_count_does_not_grow_with_the_properties(self):
+        properties = [self._make_property(index) for index in range(5)]
+
+        with CaptureQueriesContext(connection) as two:
+            get_accounting_data(properties[:2], 2021)
+        with CaptureQueriesContext(connection) as five:
+            get_accounting_data(properties, 2021)
+
+        assert len(five) == len(two)
+
+    def test_matches_the_per_property_functions(self):
+        properties = [self._make_property(index) for index in range(3)]
+
+        data = get_accounting_data(properties, 2021)
+
+        for prop, per_prop in zip(
+            properties, data["form_2033b"]["per_prop"], strict=True
+        ):
+            assert per_prop["summary"] == get_lmnp_summary(prop.pk, 2021)
+        for prop, per_prop in zip(
+            properties, data["form_2033a"]["per_prop"], strict=True
+        ):
+            assert per_prop["bilan"] == get_bilan_data(prop.pk, 2021)
+        assert data["form_2033a"]["per_prop"][1]["bilan"]["emprunts"] == Decimal(
+            "69999"
+        )
@@ -0,0 +1,115 @@
+"""Tests for property/services/timeline.py (PropertyValueTimeline)."""
+
+import datetime
+from decimal import Decimal
+
+import pytest
+from moneyed import Money
+
+from property.models import (
+    Property,
+    PropertyLoan,
+    PropertyLoanAmortizationEntry,
+    PropertyValue,
+)
+from property.services.timeline import PropertyValueTimeline
+from property.utils import iter_month_starts
+
+
+def _make_property(name, buying_date, currency="EUR"):
+    return Property.objects.create(
+        name=name,
+        property_type=Property.APARTMENT,
+        buying_value=Money(150000, currency),
+        buying_date=buying_date,
+    )
+
+
+@pytest.fixture
+def portfolio():
+    first = _make_property("First", datetime.date(2019, 3, 10))
+    PropertyValue.objects.create(
+        property=first,
+        value=Money(160000, "EUR"),
+        valuation_date=datetime.date(2020, 6, 1),
+    )
+    PropertyValue.objects.create(
+        property=first,
+        value=Money(175000, "EUR"),
+        valuation_date=datetime.date(2022, 2, 15),
+    )
+    PropertyLoan.objects.create(
+        property=first,
+        name="Computed",
+        start_date=datetime.date(2019, 3, 10),
+        end_date=datetime.date(2029, 3, 10),
+        original_amount=Money(120000, "EUR"),
+        monthly_payment=Money(1100, "EUR"),
+        interest_rate=Decimal("1.2"),
+        first_payment_date=datetime.date(2019, 4, 25),
+    )
+
+    second = _make_property("Second", datetime.date(2021, 9, 1))
+    scheduled = PropertyLoan.objects.create(
+        property=second,
+        name="Scheduled",
+        start_date=datetime.date(2021, 9, 1),
+        end_date=datetime.date(2023, 9, 1),
+        original_amount=Money(24000, "EUR"),
+        monthly_payment=Money(1000, "EUR"),
+        interest_rate=Decimal("0"),
+    )
+    for month in iter_month_starts(
+        datetime.date(2021, 10, 1), datetime.date(2023, 9, 1)
+    ):
+        index = (month.year - 2021) * 12 + month.month - 9
+        PropertyLoanAmortizationEntry.objects.create(
+            loan=scheduled,
+            date=month.replace(day=5),
+            capital=Money(1000, "EUR"),
+            interest=Money(0, "EUR"),
+            remaining_balance_amount=Money(24000 - 1000 * index, "EUR"),
+        )
+    return [first, second]
+
+
+@pytest.mark.django_db
+def test_series_matches_per_date_computation(portfolio):
+    months = iter_month_starts(datetime.date(2019, 1, 1), datetime.date(2030, 1, 1))
+    gross, net = PropertyValueTimeline(portfolio).series(months)
+
+    for index, month in enumerate(months):
+        owned = [p for p in portfolio if p.buying_date <= month]
+        expected_gross = sum(
+            (
+                p.get_value(
+                    max_date=datetime.datetime.combine(month, datetime.time())
+                ).amount
+                for p in owned
+            ),
+            Decimal("0"),
+        )
+        expected_net = sum(
+            (p.net_value_at_date(month).amount for p in owned), Decimal("0")
+        )
+        assert gross[index] == expected_gross, month
+        assert net[index] == expected_net, month
+
+
+@pytest.mark.django_db
+def test_series_filters_currency(portfolio):
+    _make_property("Abroad", datetime.date(2019, 1, 1), currency="USD")
+    months = [datetime.date(2024, 1, 1)]
+    eur_gross, _ = PropertyValueTimeline(portfolio).series(months)
+    gross, net = PropertyValueTimeline(Property.objects.all()).series(
+        months, currency="EUR"
+    )
+    assert gross == eur_gross
+    assert net[0] < gross[0]
+
+
+@pytest.mark.django_db
+def test_series_query_count_is_constant(portfolio, django_assert_num_queries):
+    months = iter_month_starts(datetime.date(2019, 1, 1), datetime.date(2030, 1, 1))
+    with django_assert_num_queries(3):
+        PropertyValueTimeline(portfolio).series(months)
@@ -0,0 +1,356 @@
+"""Tests for the server-side transactions table (property/services/transactions.py)."""
+
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from moneyed import Money
+
+from property.models import Lease, Property
+from property.models.ledger import PropertyLedgerEntry, PropertyLedgerEntryException
+from property.services.transactions import ORDERABLE_COLUMNS, query_transactions
+
+TODAY = datetime.date.today()
+
+
+def _entry(prop, *, days_ago, amount, flow_type="expense", category=None, **kwargs):
+    if category is None:
+        category = (
+            PropertyLedgerEntry.ManagementCategory.RENT_COLLECTED
+            if flow_type == "income"
+            else PropertyLedgerEntry.ManagementCategory.MAINTENANCE
+        )
+    return PropertyLedgerEntry.objects.create(
+        property=prop,
+        flow_type=flow_type,
+        amount=Money(amount, "EUR"),
+        entry_date=TODAY - datetime.timedelta(days=days_ago),
+        management_category=category,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def prop():
+    return Property.objects.create(
+        name="Ledger Flat",
+        property_type=Property.APARTMENT,
+        buying_value=Money(150000, "EUR"),
+        buying_date=datetime.date(2020, 1, 1),
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def ledger(prop):
+    rent = _entry(
+        prop,
+        days_ago=400,
+        amount=700,
+        flow_type="income",
+        description="Loyer",
+        recurrence_type=PropertyLedgerEntry.MONTHLY,
+    )
+    PropertyLedgerEntryException.objects.create(
+        parent_entry=rent,
+        occurrence_date=rent.generate_occurrences()[2]["date"],
+        is_deleted=True,
+    )
+    PropertyLedgerEntryException.objects.create(
+        parent_entry=rent,
+        occurrence_date=rent.generate_occurrences()[4]["date"],
+        description_override="Loyer partiel",
+        amount_override=Money(350, "EUR"),
+    )
+    _entry(
+        prop,
+        days_ago=200,
+        amount=90,
+        category=PropertyLedgerEntry.ManagementCategory.INSURANCE,
+        third_party="AXA",
+        description="Assurance PNO",
+        recurrence_type=PropertyLedgerEntry.QUARTERLY,
+    )
+    for index in range(30):
+        _entry(
+            prop,
+            days_ago=index * 13,
+            amount=10 + index * 7,
+            description=f"Plombier {index}",
+        )
+    return prop
+
+
+def _all_rows(prop):
+    """Reference expansion: every occurrence of every entry, newest first."""
+    return query_transactions(prop, length=None)["rows"]
+
+
+@pytest.mark.django_db
+def test_default_page_is_newest_first(ledger):
+    result = query_transactions(ledger)
+
+    assert len(result["rows"]) == 10
+    assert result["records_filtered"] == result["records_total"]
+    dates = [row["date"] for row in result["rows"]]
+    assert dates == sorted(dates, reverse=True)
+
+
+@pytest.mark.django_db
+def test_records_total_counts_every_occurrence(ledger):
+    rent = PropertyLedgerEntry.objects.get(property=ledger, description="Loyer")
+    insurance = PropertyLedgerEntry.objects.get(property=ledger, third_party="AXA")
+
+    expected = (
+        30 + len(rent.generate_occurrences()) + len(insurance.generate_occurrences())
+    )
+    result = query_transactions(ledger)
+
+    assert result["records_total"] == expected
+    assert len(_all_rows(ledger)) == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("column", ORDERABLE_COLUMNS)
+@pytest.mark.parametrize("descending", [True, False])
+def test_pages_concatenate_to_the_full_ordering(ledger, column, descending):
+    full = query_transactions(
+        ledger, order_column=column, descending=descending, length=None
+    )["rows"]
+    pages = []
+    for start in range(0, len(full), 7):
+        pages.extend(
+            query_transactions(
+                ledger,
+                order_column=column,
+                descending=descending,
+                start=start,
+                length=7,
+            )["rows"]
+        )
+
+    assert pages == full
+    key = {
+        "date": lambda r: r["date"],
+        "kind": lambda r: r["kind"],
+        "category": lambda r: r["category"].casefold(),
+        "amount": lambda r: r["amount"],
+        "description": lambda r: r["description"].casefold(),
+    }[column]
+    values = [key(row) for row in full]
+    assert values == sorted(values, reverse=descending)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("descending", [True, False])
+def test_descriptions_sort_as_displayed(prop, descending):
+    lease = Lease.objects.create(
+        property=prop,
+        last_name="Martin",
+        start_date=datetime.date(2023, 1, 1),
+        rent_amount=Money(500, "EUR"),
+    )
+    _entry(prop, days_ago=3, amount=10, third_party="Zinc", description="achat")
+    _entry(prop, days_ago=2, amount=10, description="Carrelage")
+    _entry(prop, days_ago=1, amount=10, lease=lease, flow_type="income")
+    _entry(prop, days_ago=5, amount=10, third_party="bricolage")
+    _entry(
+        prop,
+        days_ago=40,
+        amount=10,
+        description="Charges",
+        recurrence_type=PropertyLedgerEntry.MONTHLY,
+    )
+
+    rows = query_transactions(
+        prop, order_column="description", descending=descending, length=None
+    )["rows"]
+    page = query_transactions(
+        prop, order_column="description", descending=descending, start=1, length=3
+    )["rows"]
+
+    descriptions = [row["description"] for row in rows]
+    expected = [
+        "bricolage",
+        "Carrelage",
+        "Charges",
+        "Charges",
+        "Martin",
+        "Zinc - achat",
+    ]
+    assert descriptions == (expected[::-1] if descending else expected)
+    assert page == rows[1:4]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("descending", [True, False])
+def test_accented_descriptions_merge_in_one_order(prop, descending):
+    _entry(prop, days_ago=3, amount=10, description="Étage")
+    _entry(prop, days_ago=2, amount=10, description="électricité")
+    _entry(
+        prop,
+        days_ago=10,
+        amount=10,
+        description="émail",
+        recurrence_type=PropertyLedgerEntry.MONTHLY,
+    )
+
+    rows = query_transactions(
+        prop, order_column="description", descending=descending, length=None
+    )["rows"]
+    pages = [
+        row
+        for start in range(3)
+        for row in query_transactions(
+            prop,
+            order_column="description",
+            descending=descending,
+            start=start,
+            length=1,
+        )["rows"]
+    ]
+
+    # ASCII letters only are lowercased, then compared by code point
+    expected = ["Étage", "électricité", "émail"]
+    assert [row["description"] for row in rows] == (
+        expected[::-1] if descending else expected
+    )
+    assert pages == rows
+
+
+@pytest.mark.django_db
+def test_unfiltered_total_is_cached_until_the_ledger_changes(ledger):
+    total = query_transactions(ledger)["records_total"]
+
+    query_transactions(ledger, search="plombier")
+    with CaptureQueriesContext(connection) as queries:
+        assert query_transactions(ledger, search="plombier")["records_total"] == total
+    _entry(ledger, days_ago=1, amount=5, description="Serrurier")
+    ledger.refresh_from_db()
+
+    assert query_transactions(ledger, kind="income")["records_total"] == total + 1
+    assert len(queries) <= 4
+
+
+@pytest.mark.django_db
+def test_exceptions_are_applied(ledger):
+    rows = [row for row in _all_rows(ledger) if row["kind"] == "income"]
+
+    overridden = [row for row in rows if row["has_exception"]]
+    assert len(overridden) == 1
+    assert overridden[0]["description"] == "Loyer partiel"
+    assert overridden[0]["amount"] == 350.0
+    assert all(row["is_recurring"] for row in rows)
+
+
+@pytest.mark.django_db
+def test_search_matches_text_overrides_and_category_labels(ledger):
+    plumber = query_transactions(ledger, search="plombier 1", length=None)
+    assert {row["description"] for row in plumber["rows"]} == {
+        "Plombier 1",
+        *(f"Plombier {i}" for i in range(10, 20)),
+    }
+    assert plumber["records_filtered"] == 11
+
+    override = query_transactions(ledger, search="partiel", length=None)
+    assert [row["description"] for row in override["rows"]] == ["Loyer partiel"]
+
+    axa = query_transactions(ledger, search="axa", length=None)
+    assert axa["rows"]
+    assert all(row["description"] == "AXA - Assurance PNO" for row in axa["rows"])
+
+    by_label = query_transactions(ledger, search="insurance", length=None)
+    assert by_label["records_filtered"] == axa["records_filtered"]
+
+
+@pytest.mark.django_db
+def test_kind_category_and_date_filters(ledger):
+    full = _all_rows(ledger)
+    date_from = TODAY - datetime.timedelta(days=150)
+    date_to = TODAY - datetime.timedelta(days=30)
+
+    result = query_transactions(
+        ledger, kind="expense", date_from=date_from, date_to=date_to, length=None
+    )
+    expected = [
+        row
+        for row in full
+        if row["kind"] == "expense"
+        and date_from.isoformat() <= row["date"] <= date_to.isoformat()
+    ]
+    assert result["rows"] == expected
+    assert result["records_filtered"] == len(expected)
+    assert result["records_total"] == len(full)
+
+    insurance = query_transactions(
+        ledger,
+        category=PropertyLedgerEntry.ManagementCategory.INSURANCE,
+        length=None,
+    )
+    assert insurance["rows"]
+    assert {row["category_value"] for row in insurance["rows"]} == {"insurance"}
+
+
+@pytest.mark.django_db
+def test_recurring_expansion_stops_at_date_to(prop):
+    _entry(
+        prop,
+        days_ago=3650,
+        amount=50,
+        description="Charges",
+        recurrence_type=PropertyLedgerEntry.MONTHLY,
+    )
+    date_to = TODAY - datetime.timedelta(days=3000)
+
+    result = query_transactions(prop, date_to=date_to, length=None)
+
+    assert result["rows"]
+    assert all(row["date"] <= date_to.isoformat() for row in result["rows"])
+
+
+# ── API ────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.django_db
+def test_transactions_api_requires_login(client, prop):
+    response = client.get(reverse("property:api_transactions", args=[prop.pk]))
+    assert response.status_code == 302
+
+
+@pytest.mark.django_db
+def test_transactions_api_follows_the_datatables_protocol(user_client, ledger):
+    response = user_client.get(
+        reverse("property:api_transactions", args=[ledger.pk]),
+        {
+            "draw": "3",
+            "start": "5",
+            "length": "5",
+            "search[value]": "plombier",
+            "order[0][column]": "3",
+            "order[0][dir]": "asc",
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["draw"] == 3
+    assert data["recordsFiltered"] == 30
+    assert data["recordsTotal"] > 30
+    assert [row["amount"] for row in data["data"]] == [45.0, 52.0, 59.0, 66.0, 73.0]
+
+
+@pytest.mark.django_db
+def test_transactions_api_rejects_invalid_dates(user_client, prop):
+    response = user_client.get(
+        reverse("property:api_transactions", args=[prop.pk]),
+        {"date_from": "not-a-date"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_transactions_api_unknown_property_returns_404(user_client):
+    response = user_client.get(reverse("property:api_transactions", args=[99999]))
+    assert response.status_code == 404
@@ -1,10 +1,14 @@
 """Tests for property utility classes."""
 
 import datetime
+import io
+import zipfile
+from contextlib import aclosing
 from decimal import Decimal
 from typing import cast
 
 import pytest
+from asgiref.sync import async_to_sync
 from moneyed import Money
 
 from property.models import Property
@@ -13,11 +17,19 @@ from property.utils import (
     PropertyRentability,
     add_months_safe,
     add_years_safe,
+    build_import_fingerprint,
     build_loan_monthly_maps,
     calculate_monthly_payment,
+    detect_date_format,
+    detect_decimal_separator,
     generate_recurring_occurrences,
     iter_month_starts,
+    iterate_in_thread,
     month_start,
+    parse_csv_amount,
+    parse_csv_date,
+    stream_csv,
+    stream_xlsx,
 )
 
 
@@ -270,3 +282,111 @@ def test_build_loan_monthly_maps_handles_zero_duration():
     assert interest_map == {}
     assert principal_map == {}
     assert insurance_map == {}
+
+
+def test_detect_date_format_prefers_unambiguous_evidence():
+    assert detect_date_format(["2024-01-15", "2024-02-01"]) == "%Y-%m-%d"
+    assert detect_date_format(["01/02/2024", "25/02/2024"]) == "%d/%m/%Y"
+    assert detect_date_format(["01/02/2024", "02/25/2024"]) == "%m/%d/%Y"
+    assert detect_date_format(["", "not a date"]) is None
+
+
+def test_detect_date_format_ambiguous_sample_follows_dateparser():
+    # dateparser reads 05/03/2024 month-first: keep the historical behaviour
+    assert detect_date_format(["05/03/2024", "06/03/2024"]) == "%m/%d/%Y"
+
+
+def test_parse_csv_date_falls_back_for_irregular_values():
+    assert parse_csv_date("15/01/2024", "%d/%m/%Y") == datetime.date(2024, 1, 15)
+    assert parse_csv_date("15 January 2024", "%d/%m/%Y") == datetime.date(2024, 1, 15)
+    assert parse_csv_date("nonsense", "%d/%m/%Y") is None
+    assert parse_csv_date("", "%d/%m/%Y") is None
+
+
+def test_detect_decimal_separator():
+    assert detect_decimal_separator(["12,50", "1.200,00", "7"]) == ","
+    assert detect_decimal_separator(["12.50", "1,200.00"]) == "."
+    assert detect_decimal_separator(["12", "1200"]) == "."
+
+
+@pytest.mark.parametrize(
+    ("raw", "separator", "expected"),
+    [
+        ("1200.50", ".", Decimal("1200.50")),
+        ("1,200.50", ".", Decimal("1200.50")),
+        ("1,200", ".", Decimal("1200")),
+        ("1.200,50", ",", Decimal("1200.50")),
+        ("1.200", ",", Decimal("1200")),
+        ("-150,5 €", ",", Decimal("-150.5")),
+        # values that do not follow the convention use the per-value heuristic
+        ("1200,50", ".", Decimal("1200.50")),
+        ("1.200,50", ".", Decimal("1200.50")),
+        ("notanumber", ".", None),
+        ("1.2.3", ",", None),
+    ],
+)
+def test_parse_csv_amount(raw, separator, expected):
+    assert parse_csv_amount(raw, separator) == expected
+
+
+def test_build_import_fingerprint_normalizes_description_and_amount():
+    date = datetime.date(2024, 1, 15)
+    reference = build_import_fingerprint(1, date, Decimal("-150.5"), "Plumber  Paris")
+
+    assert build_import_fingerprint(1, date, Decimal("-150.50"), " plumber paris") == (
+        reference
+    )
+    assert build_import_fingerprint(1, date, Decimal("150.50"), "Plumber Paris") != (
+        reference
+    )
+    assert build_import_fingerprint(2, date, Decimal("-150.50"), "Plumber Paris") != (
+        reference
+    )
+
+
+def test_stream_csv_yields_one_line_per_row():
+    lines = list(stream_csv([("date", "amount"), (datetime.date(2025, 3, 1), 12)]))
+
+    assert lines == ["date,amount\r\n", "2025-03-01,12\r\n"]
+
+
+def test_iterate_in_thread_yields_every_chunk_and_closes_the_writer():
+    closed = []
+
+    def writer():
+        try:
+            for index in range(5000):
+                yield f"{index:>30}\n"
+        finally:
+            closed.append(True)
+
+    async def read(limit=None):
+        chunks = []
+        async with aclosing(iterate_in_thread(writer())) as stream:
+            async for chunk in stream:
+                chunks.append(chunk)
+                if len(chunks) == limit:
+                    break
+        return chunks
+
+    assert len(async_to_sync(read)()) == 5000
+    assert async_to_sync(read)(limit=3) == [f"{index:>30}\n" for index in range(3)]
+    assert closed == [True, True]
+
+
+def test_stream_xlsx_flushes_while_the_rows_are_read():
+    def rows():
+        yield ("label", "amount")
+        for index in range(20000):
+            yield (f"row <{index}>\x01", Decimal(index), None)
+
+    chunks = list(stream_xlsx(rows(), sheet_name="Report"))
+
+    # The static parts, at least one chunk of rows, then the end of the archive
+    assert len(chunks) > 2
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.testzip() is None
+        assert 'name="Report"' in archive.read("xl/workbook.xml").decode()
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+    assert sheet.count("<row>") == 20001
+    assert "row &lt;19999&gt;</t>" in sheet
@@ -449,8 +449,8 @@ def test_property_quick_create_normalizes_currency(user_client):
 
 
 @pytest.mark.django_db
-def test_property_detail_transactions_json_context(user_client):
-    """Test that the cashflow panel provides transactions_json for DataTables."""
+def test_property_detail_transactions_api(user_client):
+    """Test that the transactions API serves the DataTables rows of the cashflow panel."""
     property_obj = Property.objects.create(
         name="JSON Test Property",
         property_type=Property.APARTMENT,
@@ -478,11 +478,11 @@ def test_property_detail_transactions_json_context(user_client):
     )
 
     response = user_client.get(
-        reverse("property:panel_cashflow", args=[property_obj.pk])
+        reverse("property:api_transactions", args=[property_obj.pk])
     )
 
     assert response.status_code == 200
-    tx_json = response.context["transactions_json"]
+    tx_json = response.json()["data"]
     assert isinstance(tx_json, list)
     assert len(tx_json) == 2
 
@@ -881,11 +881,11 @@ def _make_lmnp_property():
 
 @pytest.mark.django_db
 def test_panel_cashflow_returns_200(user_client):
-    """Cashflow panel returns 200 with transactions_json in context."""
+    """Cashflow panel returns 200 with the transaction category filter in context."""
     prop = _make_property()
     response = user_client.get(reverse("property:panel_cashflow", args=[prop.pk]))
     assert response.status_code == 200
-    assert "transactions_json" in response.context
+    assert "transaction_categories" in response.context
 
 
 @pytest.mark.django_db
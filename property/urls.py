@@ -100,8 +100,10 @@ urlpatterns = [
     ),
     # Accounting dashboard (all LMNP réel properties)
     path("lmnp_accounting/", views.accounting_lmnp_reel, name="lmnp_accounting"),
+    path("lmnp_accounting/close/", views.close_lmnp_year, name="lmnp_close_year"),
     # Income & expenses report
     path("report/", views.report_view, name="report"),
+    path("report/entries/", views.report_cell_entries, name="report_cell_entries"),
     # Amortization initialization
     path(
         "<int:pk>/amortization/initialize/",
@@ -125,11 +127,21 @@ urlpatterns = [
         name="delete_amortization",
     ),
     # API
+    path(
+        "api/cards/",
+        views.property_dashboard_cards_api,
+        name="api_dashboard_cards",
+    ),
     path(
         "<int:pk>/api/dashboard-card/",
         views.property_dashboard_card_api,
         name="api_dashboard_card",
     ),
+    path(
+        "<int:pk>/api/transactions/",
+        views.property_transactions_api,
+        name="api_transactions",
+    ),
     path(
         "scpi/<int:pk>/api/dashboard-card/",
         views.scpi_dashboard_card_api,
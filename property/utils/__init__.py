@@ -1,5 +1,12 @@
 """Property utils package — re-exports all utilities for backward-compatible imports."""
 
+from property.utils.csv_utils import (
+    build_import_fingerprint,
+    detect_date_format,
+    detect_decimal_separator,
+    parse_csv_amount,
+    parse_csv_date,
+)
 from property.utils.date_utils import (
     add_months_safe,
     add_years_safe,
@@ -7,8 +14,11 @@ from property.utils.date_utils import (
     month_end,
     month_start,
 )
+from property.utils.export_utils import iterate_in_thread, stream_csv, stream_xlsx
 from property.utils.loan_utils import (
     build_loan_amortization_balance,
+    build_loan_balance_series,
+    build_loan_insurance_map_for_range,
     build_loan_maps_from_loan_obj,
     build_loan_monthly_maps,
     calculate_monthly_payment,
@@ -23,9 +33,21 @@ __all__ = [
     "iter_month_starts",
     "month_end",
     "month_start",
+    # CSV parsing
+    "build_import_fingerprint",
+    "detect_date_format",
+    "detect_decimal_separator",
+    "parse_csv_amount",
+    "parse_csv_date",
+    # streamed exports
+    "iterate_in_thread",
+    "stream_csv",
+    "stream_xlsx",
     # loan math
     "calculate_monthly_payment",
     "build_loan_amortization_balance",
+    "build_loan_balance_series",
+    "build_loan_insurance_map_for_range",
     "build_loan_maps_from_loan_obj",
     "build_loan_monthly_maps",
     # recurrence
@@ -0,0 +1,169 @@
+"""Date and amount parsing helpers for CSV imports.
+
+The conventions of a file (date format, decimal separator) are detected once
+from a sample of its values; each row is then parsed with ``strptime`` and a
+plain string replacement.  ``dateparser`` is only used for the rows that do
+not follow the detected format, and to settle day/month ambiguity.
+"""
+
+import datetime
+import hashlib
+import re
+from collections.abc import Iterable
+from decimal import Decimal, InvalidOperation
+
+# Candidate formats, tried in this order when several parse the whole sample.
+_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%m-%d-%Y",
+    "%d-%m-%Y",
+    "%m.%d.%Y",
+    "%d.%m.%Y",
+    "%m/%d/%y",
+    "%d/%m/%y",
+    "%Y%m%d",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+)
+
+CSV_SAMPLE_SIZE = 200
+
+_AMOUNT_CHARS = re.compile(r"[^\d.,-]")
+_DECIMAL_PART = re.compile(r"([.,])\d{1,2}$")
+_AMOUNT_PATTERNS = {
+    ".": re.compile(r"^-?(\d{1,3}(,\d{3})+|\d+)(\.\d+)?$"),
+    ",": re.compile(r"^-?(\d{1,3}(\.\d{3})+|\d+)(,\d+)?$"),
+}
+
+
+def _strptime(value: str, date_format: str) -> datetime.date | None:
+    try:
+        return datetime.datetime.strptime(value, date_format).date()
+    except ValueError:
+        return None
+
+
+def _dateparser_parse(value: str) -> datetime.date | None:
+    import dateparser  # heavy import, only needed for irregular values
+
+    parsed = dateparser.parse(value)
+    return parsed.date() if parsed else None
+
+
+def detect_date_format(values: Iterable[str]) -> str | None:
+    """Return the ``strptime`` format matching most of the sample *values*.
+
+    When a day-first and a month-first format fit equally well (every day of
+    the sample is 12 or less), the choice ``dateparser`` makes for the first
+    ambiguous value wins, so results match a row-by-row ``dateparser`` import.
+    Returns ``None`` when no candidate parses any value.
+    """
+    sample = [v.strip() for v in values if v and v.strip()][:CSV_SAMPLE_SIZE]
+    if not sample:
+        return None
+
+    scores = {
+        fmt: sum(1 for v in sample if _strptime(v, fmt) is not None)
+        for fmt in _DATE_FORMATS
+    }
+    best_score = max(scores.values())
+    if not best_score:
+        return None
+    best = [fmt for fmt in _DATE_FORMATS if scores[fmt] == best_score]
+    if len(best) > 1:
+        for value in sample:
+            readings = {fmt: _strptime(value, fmt) for fmt in best}
+            if len({d for d in readings.values() if d is not None}) > 1:
+                expected = _dateparser_parse(value)
+                for fmt, parsed in readings.items():
+                    if parsed == expected:
+                        return fmt
+                break
+    return best[0]
+
+
+def parse_csv_date(value: str, date_format: str | None) -> datetime.date | None:
+    """Parse *value* with *date_format*, falling back to ``dateparser``."""
+    value = value.strip()
+    if not value:
+        return None
+    if date_format:
+        parsed = _strptime(value, date_format)
+        if parsed is not None:
+            return parsed
+    return _dateparser_parse(value)
+
+
+def detect_decimal_separator(values: Iterable[str]) -> str:
+    """Return the decimal separator (``"."`` or ``","``) used by the sample *values*.
+
+    A separator counts as decimal when it is the rightmost one and is followed
+    by one or two digits (``12,50``, ``1.200,50``, ``1,200.50``); the most
+    frequent wins and ``"."`` is the default.
+    """
+    votes = {".": 0, ",": 0}
+    for index, value in enumerate(values):
+        if index >= CSV_SAMPLE_SIZE:
+            break
+        match = _DECIMAL_PART.search(_AMOUNT_CHARS.sub("", value or ""))
+        if match:
+            votes[match.group(1)] += 1
+    return "," if votes[","] > votes["."] else "."
+
+
+def _legacy_amount(clean: str) -> str:
+    """Normalize an amount that does not follow the file's convention.
+
+    The rightmost separator is the decimal one when both are present;
+    a lone separator is always decimal.
+    """
+    if "." in clean and "," in clean:
+        if clean.rfind(",") > clean.rfind("."):
+            return clean.replace(".", "").replace(",", ".")
+        return clean.replace(",", "")
+    return clean.replace(",", ".")
+
+
+def parse_csv_amount(value: str, decimal_separator: str = ".") -> Decimal | None:
+    """Parse a CSV amount (``1200.50``, ``1.200,50``, ``-150 €``...) into a Decimal.
+
+    Values following the *decimal_separator* convention have their thousands
+    separators dropped; others go through the legacy per-value heuristic.
+    Returns ``None`` when the value is not a number.
+    """
+    clean = _AMOUNT_CHARS.sub("", value or "")
+    if _AMOUNT_PATTERNS[decimal_separator].match(clean):
+        thousands = "," if decimal_separator == "." else "."
+        normalized = clean.replace(thousands, "").replace(decimal_separator, ".")
+    else:
+        normalized = _legacy_amount(clean)
+    try:
+        return Decimal(normalized)
+    except InvalidOperation:
+        return None
+
+
+def build_import_fingerprint(
+    property_id: int,
+    entry_date: datetime.date,
+    signed_amount: Decimal,
+    description: str,
+) -> str:
+    """Return the hash identifying a bank statement line of a property.
+
+    The description is case-folded with its whitespace collapsed, so the same
+    line exported twice, even with a different layout, hashes identically.
+    """
+    normalized = " ".join((description or "").casefold().split())
+    key = "|".join(
+        (
+            str(property_id),
+            entry_date.isoformat(),
+            str(Decimal(signed_amount).quantize(Decimal("0.01"))),
+            normalized,
+        )
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
@@ -2,6 +2,7 @@
 
 import calendar
 import datetime
+import math
 from decimal import ROUND_HALF_UP, Decimal
 
 from property.utils.date_utils import add_months_safe, month_start
@@ -45,33 +46,21 @@ def calculate_monthly_payment(
     return monthly_pi, monthly_insurance, total_monthly
 
 
-def build_loan_amortization_balance(
+def build_loan_balance_series(
     *,
     original_amount: Decimal,
     interest_rate: Decimal | None,
     payment_sequence: list[Decimal],
-    months_elapsed: int,
+    months: int | None = None,
     disbursement_date: datetime.date | None = None,
     first_payment_date: datetime.date | None = None,
-) -> Decimal:
-    """Simulate real amortization and return the remaining balance after N months.
-
-    Works for both standard loans (uniform payment_sequence) and smoothed loans
-    (prêt lisseur, variable payment_sequence).
-
-    Args:
-        original_amount: Initial loan capital.
-        interest_rate: Annual interest rate in percent (e.g. Decimal("3.5")).
-        payment_sequence: Ordered list of monthly payment amounts.
-        months_elapsed: How many months have passed since loan start.
-        disbursement_date: Date the loan was disbursed. Used together with
-            first_payment_date to compute a prorated first-period interest.
-        first_payment_date: Date of the first bank debit. When provided alongside
-            disbursement_date, the first period's interest is calculated using the
-            actual number of days (actual/365) to match the bank's table.
+) -> list[Decimal]:
+    """Simulate real amortization and return the balance after each month.
 
-    Returns:
-        Remaining capital balance as a Decimal (≥ 0).
+    ``result[n]`` is the remaining balance after *n* payments, for n from 0 to
+    *months* (the whole payment_sequence by default); see
+    build_loan_amortization_balance for the meaning of the arguments.  Once the
+    loan is repaid the remaining entries are all zero.
     """
     annual_rate = Decimal("0")
     monthly_rate = Decimal("0")
@@ -85,8 +74,10 @@ def build_loan_amortization_balance(
         and first_payment_date != disbursement_date
     )
 
+    steps = len(payment_sequence) if months is None else months
     balance = original_amount
-    for i in range(min(months_elapsed, len(payment_sequence))):
+    balances = [balance]
+    for i in range(min(steps, len(payment_sequence))):
         if use_prorated_first and i == 0:
             days = Decimal((first_payment_date - disbursement_date).days)  # type: ignore[operator]
             days_in_month = Decimal(
@@ -106,9 +97,49 @@ def build_loan_amortization_balance(
             principal_amount = balance
         balance -= principal_amount
         if balance <= Decimal("0"):
-            return Decimal("0")
+            balances.extend([Decimal("0")] * (min(steps, len(payment_sequence)) - i))
+            return balances
+        balances.append(max(Decimal("0"), balance))
+
+    return balances
+
+
+def build_loan_amortization_balance(
+    *,
+    original_amount: Decimal,
+    interest_rate: Decimal | None,
+    payment_sequence: list[Decimal],
+    months_elapsed: int,
+    disbursement_date: datetime.date | None = None,
+    first_payment_date: datetime.date | None = None,
+) -> Decimal:
+    """Simulate real amortization and return the remaining balance after N months.
+
+    Works for both standard loans (uniform payment_sequence) and smoothed loans
+    (prêt lisseur, variable payment_sequence).
 
-    return max(Decimal("0"), balance)
+    Args:
+        original_amount: Initial loan capital.
+        interest_rate: Annual interest rate in percent (e.g. Decimal("3.5")).
+        payment_sequence: Ordered list of monthly payment amounts.
+        months_elapsed: How many months have passed since loan start.
+        disbursement_date: Date the loan was disbursed. Used together with
+            first_payment_date to compute a prorated first-period interest.
+        first_payment_date: Date of the first bank debit. When provided alongside
+            disbursement_date, the first period's interest is calculated using the
+            actual number of days (actual/365) to match the bank's table.
+
+    Returns:
+        Remaining capital balance as a Decimal (≥ 0).
+    """
+    return build_loan_balance_series(
+        original_amount=original_amount,
+        interest_rate=interest_rate,
+        payment_sequence=payment_sequence,
+        months=max(0, months_elapsed),
+        disbursement_date=disbursement_date,
+        first_payment_date=first_payment_date,
+    )[-1]
 
 
 def build_loan_monthly_maps(
@@ -228,6 +259,7 @@ def build_loan_monthly_maps(
 def build_loan_maps_from_loan_obj(
     loan,
     insurance_amount: Decimal,
+    until: datetime.date | None = None,
 ) -> tuple[
     dict[tuple[int, int], Decimal],
     dict[tuple[int, int], Decimal],
@@ -236,16 +268,21 @@ def build_loan_maps_from_loan_obj(
     """Build monthly maps for a PropertyLoan model object.
 
     Convenience wrapper around build_loan_monthly_maps that reads
-    the required fields from the loan object directly.
+    the required fields from the loan object directly.  When *until* is given,
+    the simulation stops at that month: earlier months are identical to the
+    full schedule since the amortization only ever moves forward.
     """
     monthly_payment_amount = (
         loan.monthly_payment.amount
         if loan.monthly_payment is not None
         else Decimal("0")
     )
+    end_date = loan.end_date
+    if until is not None and until < end_date:
+        end_date = until
     return build_loan_monthly_maps(
         start_date=loan.start_date,
-        end_date=loan.end_date,
+        end_date=end_date,
         original_amount=loan.original_amount.amount,
         monthly_payment=monthly_payment_amount,
         interest_rate=loan.interest_rate,
@@ -253,3 +290,82 @@ def build_loan_maps_from_loan_obj(
         disbursement_date=loan.start_date,
         first_payment_date=loan.first_payment_date,
     )
+
+
+def _estimate_payoff_step(
+    *,
+    original_amount: Decimal,
+    monthly_payment: Decimal,
+    interest_rate: Decimal | None,
+) -> float | None:
+    """Estimate the 0-based step at which a constant-payment loan is repaid.
+
+    Uses the closed-form annuity formula in floating point, so the result is
+    only accurate to a fraction of a month.  Returns None when the payment
+    never covers the interest (the balance never reaches zero).
+    """
+    payment = float(monthly_payment)
+    balance = float(original_amount)
+    if payment <= 0:
+        return None
+    rate = float(interest_rate or 0) / 100 / 12
+    if rate == 0:
+        return balance / payment - 1
+    if payment <= balance * rate:
+        return None
+    return -math.log(1 - balance * rate / payment) / math.log(1 + rate) - 1
+
+
+def build_loan_insurance_map_for_range(
+    loan,
+    insurance_amount: Decimal,
+    start_month: datetime.date,
+    end_month: datetime.date,
+) -> dict[tuple[int, int], Decimal]:
+    """Return the monthly insurance of a PropertyLoan for months in a range only.
+
+    Gives the same values as the insurance map of
+    build_loan_maps_from_loan_obj restricted to [start_month, end_month], but
+    without simulating the whole loan: insurance is due every month from the
+    first payment until repayment, and repayment is only simulated when the
+    closed-form estimate puts it close to (or before) the end of the range.
+    """
+    if not insurance_amount or loan.start_date is None or loan.end_date is None:
+        return {}
+
+    first_month = month_start(loan.first_payment_date or loan.start_date)
+    last_month = month_start(loan.end_date)
+    range_start = max(month_start(start_month), first_month)
+    range_end = min(month_start(end_month), last_month)
+    if range_start > range_end:
+        return {}
+
+    payoff_step = _estimate_payoff_step(
+        original_amount=loan.original_amount.amount,
+        monthly_payment=(
+            loan.monthly_payment.amount
+            if loan.monthly_payment is not None
+            else Decimal("0")
+        ),
+        interest_rate=loan.interest_rate,
+    )
+    range_end_step = (range_end.year - first_month.year) * 12 + (
+        range_end.month - first_month.month
+    )
+    # Two months of slack absorb rounding and a prorated first period.
+    if payoff_step is not None and payoff_step < range_end_step + 2:
+        _, _, insurance_map = build_loan_maps_from_loan_obj(
+            loan, insurance_amount, until=range_end
+        )
+        return {
+            key: value
+            for key, value in insurance_map.items()
+            if key >= (range_start.year, range_start.month)
+        }
+
+    result: dict[tuple[int, int], Decimal] = {}
+    current = range_start
+    while current <= range_end:
+        result[(current.year, current.month)] = insurance_amount
+        current = add_months_safe(current, 1)
+    return result
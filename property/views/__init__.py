@@ -2,6 +2,8 @@
 
 from property.views.api_views import (
     PropertyDashboardCardApiView,
+    PropertyDashboardCardsApiView,
+    PropertyTransactionsApiView,
     SCPIDashboardCardApiView,
 )
 from property.views.crud_views import (
@@ -38,15 +40,19 @@ from property.views.edit_views import (
 )
 from property.views.fiscal_views import (
     accounting_lmnp_reel,
+    close_lmnp_year,
     create_amortization_asset,
     delete_amortization_asset,
     edit_amortization_asset,
     initialize_amortization,
+    report_cell_entries,
     report_view,
 )
 from property.views.index_views import index
 
 property_dashboard_card_api = PropertyDashboardCardApiView.as_view()
+property_dashboard_cards_api = PropertyDashboardCardsApiView.as_view()
+property_transactions_api = PropertyTransactionsApiView.as_view()
 scpi_dashboard_card_api = SCPIDashboardCardApiView.as_view()
 
 # SCPI views
@@ -83,6 +89,8 @@ __all__ = [
     "delete_mandate",
     "toggle_property_favorite",
     "accounting_lmnp_reel",
+    "close_lmnp_year",
+    "report_cell_entries",
     "report_view",
     "initialize_amortization",
     "create_amortization_asset",
@@ -91,6 +99,8 @@ __all__ = [
     "csv_import",
     "csv_import_confirm",
     "property_dashboard_card_api",
+    "property_dashboard_cards_api",
+    "property_transactions_api",
     "scpi_dashboard_card_api",
     "property_panel_cashflow",
     "property_panel_projection",
@@ -4,13 +4,14 @@ import datetime
 
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views import View
 
 from property.models import Property
 from property.models.scpi import SCPI
-from property.services.cashflow import build_balance_sheet
-from property.utils import month_end, month_start
+from property.services.dashboard import build_property_cards
+from property.services.transactions import ORDERABLE_COLUMNS, query_transactions
 
 
 @method_decorator(login_required, name="dispatch")
@@ -18,69 +19,69 @@ class PropertyDashboardCardApiView(View):
     """Return all data needed to render a single property card on the dashboard."""
 
     def get(self, request, pk: int):
-        prop = Property.objects.filter(pk=pk, is_active=True).first()
-        if prop is None:
+        cards = build_property_cards(Property.objects.filter(pk=pk))
+        if not cards:
             return JsonResponse({"error": "Not found"}, status=404)
+        return JsonResponse(cards[0])
+
+
+@method_decorator(login_required, name="dispatch")
+class PropertyDashboardCardsApiView(View):
+    """Return the cards of every active property in a single response."""
+
+    def get(self, request):
+        return JsonResponse({"cards": build_property_cards()})
 
-        # Last calendar month date range
-        today = datetime.date.today()
-        first_of_this_month = today.replace(day=1)
-        last_month_end = first_of_this_month - datetime.timedelta(days=1)
-        last_month_start = last_month_end.replace(day=1)
-        date_from = month_start(last_month_start)
-        date_to = month_end(last_month_end)
-
-        # Cashflow for last month
-        cashflow = build_balance_sheet(prop, date_from, date_to)
-
-        # Latest loan end date
-        loans = list(prop.loans.all())
-        loan_end_date = None
-        if loans:
-            dates = [loan.end_date for loan in loans if loan.end_date]
-            if dates:
-                loan_end_date = max(dates).isoformat()
-
-        # Active lease
-        lease = prop.active_lease
-        lease_data = None
-        if lease:
-            lease_data = {
-                "rent_amount": float(lease.rent_amount.amount),
-                "charges_amount": float(lease.charges_amount.amount),
-                "total_rent": float(lease.total_rent().amount),
-                "currency": str(lease.rent_amount.currency),
-                "tenant_name": lease.name,
-            }
 
+@method_decorator(login_required, name="dispatch")
+class PropertyTransactionsApiView(View):
+    """Return one page of the ledger transactions table (DataTables server-side protocol).
+
+    Reads ``draw``, ``start``, ``length`` (``-1`` for all rows), ``search[value]``
+    and ``order[0][column]``/``order[0][dir]``, plus the ``kind``, ``category``,
+    ``date_from`` and ``date_to`` filters.
+    """
+
+    def get(self, request, pk: int):
+        prop = get_object_or_404(Property, pk=pk)
+        params = request.GET
+        try:
+            draw = int(params.get("draw", 0))
+            start = max(0, int(params.get("start", 0)))
+            length = int(params.get("length", 10))
+            order_index = int(params.get("order[0][column]", 0))
+            date_from = params.get("date_from") or None
+            date_to = params.get("date_to") or None
+            if date_from:
+                date_from = datetime.date.fromisoformat(date_from)
+            if date_to:
+                date_to = datetime.date.fromisoformat(date_to)
+        except ValueError:
+            return JsonResponse({"error": "Invalid parameters"}, status=400)
+
+        order_column = (
+            ORDERABLE_COLUMNS[order_index]
+            if 0 <= order_index < len(ORDERABLE_COLUMNS)
+            else "date"
+        )
+        result = query_transactions(
+            prop,
+            search=params.get("search[value]", ""),
+            kind=params.get("kind", ""),
+            category=params.get("category", ""),
+            date_from=date_from,
+            date_to=date_to,
+            order_column=order_column,
+            descending=params.get("order[0][dir]", "desc") != "asc",
+            start=start,
+            length=None if length < 0 else length,
+        )
         return JsonResponse(
             {
-                "pk": prop.pk,
-                "name": prop.name,
-                "address": prop.address or "",
-                "property_type": prop.property_type,
-                "property_type_display": dict(Property.PROPERTY_CHOICES).get(
-                    prop.property_type, prop.property_type
-                ),
-                "icon": prop.icon,
-                "currency": prop.currency,
-                "gross_value": float(prop.gross_value.amount),
-                "net_value": float(prop.net_value.amount),
-                "buying_value_gross": float(prop.buying_value_gross.amount),
-                "appreciation_percent": round(prop.appreciation_percent, 2),
-                "floor_area": float(prop.floor_area) if prop.floor_area else None,
-                "number_of_rooms": prop.number_of_rooms,
-                "loan_progress_percent": round(prop.loan_progress_percent, 1),
-                "total_remaining_loans": float(prop.total_remaining_loans.amount),
-                "loan_end_date": loan_end_date,
-                "cashflow_last_month": {
-                    "income": float(cashflow["total_income"]),
-                    "expenses": float(cashflow["total_expenses"]),
-                    "net": float(cashflow["net_cashflow"]),
-                    "occupancy_rate": float(cashflow["occupancy_rate"]),
-                },
-                "active_lease": lease_data,
-                "is_favorite": prop.is_favorite,
+                "draw": draw,
+                "recordsTotal": result["records_total"],
+                "recordsFiltered": result["records_filtered"],
+                "data": result["rows"],
             }
         )
 
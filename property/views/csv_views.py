@@ -4,21 +4,26 @@ import csv
 import io
 import logging
 
-import dateparser
 from django.contrib import messages
 from django.db import transaction
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.translation import gettext_lazy as _
-from moneyed import Money
 
 from property.forms import PropertyCSVImportForm
 from property.models import Property, PropertyLedgerEntry
+from property.services.ledger_import import (
+    DUPLICATES_FLAG,
+    DUPLICATES_SKIP,
+    build_categorization_matcher,
+    find_duplicate_rows,
+    parse_ledger_csv,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-_REQUIRED_COLUMNS = {"date", "amount", "category", "description"}
-_OPTIONAL_COLUMNS = {"notes", "reference_period"}
+_REQUIRED_COLUMNS = {"date", "amount", "description"}
+_OPTIONAL_COLUMNS = {"category", "third_party", "notes", "reference_period"}
 
 _SESSION_DATA_KEY = "property_csv_data"
 _SESSION_HEADER_KEY = "property_csv_header"
@@ -29,6 +34,36 @@ def _get_property_or_404(property_pk: int) -> Property:
     return get_object_or_404(Property, pk=property_pk)
 
 
+def _category_overrides(post) -> dict[tuple[str, str], str]:
+    """Return the categories chosen in the preview for the uncategorized rows."""
+    valid_categories = {c.value for c in PropertyLedgerEntry.ManagementCategory}
+    overrides = {}
+    index = 0
+    while f"mapping_label_{index}" in post:
+        category = post.get(f"mapping_category_{index}", "")
+        if category in valid_categories:
+            key = (
+                post[f"mapping_label_{index}"],
+                post.get(f"mapping_flow_{index}", ""),
+            )
+            overrides[key] = category
+        index += 1
+    return overrides
+
+
+def _with_category_choices(groups: list[dict]) -> list[dict]:
+    """Attach to each uncategorized group the categories allowed for its flow type."""
+    income_categories = PropertyLedgerEntry._INCOME_CATEGORIES
+    for group in groups:
+        is_income = group["flow_type"] == PropertyLedgerEntry.FlowType.INCOME
+        group["choices"] = [
+            (c.value, c.label)
+            for c in PropertyLedgerEntry.ManagementCategory
+            if (c in income_categories) == is_income
+        ]
+    return groups
+
+
 def csv_import(request, property_pk: int):
     """Step 1: upload the CSV file. Preview is shown before confirmation."""
     property_obj = _get_property_or_404(property_pk)
@@ -88,11 +123,25 @@ def csv_import(request, property_pk: int):
             request.session[_SESSION_HEADER_KEY] = header
             request.session[_SESSION_PROPERTY_KEY] = property_pk
 
+            parsed = parse_ledger_csv(
+                property_obj,
+                header,
+                rows,
+                matcher=build_categorization_matcher(property_obj),
+            )
+            duplicate_count = len(find_duplicate_rows(property_obj, parsed.entries))
             context = {
                 "property": property_obj,
                 "header": header,
                 "preview_rows": rows[:5],
                 "total_rows": len(rows),
+                "new_count": len(parsed.entries) - duplicate_count,
+                "duplicate_count": duplicate_count,
+                "invalid_count": len(parsed.errors),
+                "uncategorized_count": len(parsed.uncategorized),
+                "uncategorized_groups": _with_category_choices(
+                    parsed.uncategorized_groups()
+                ),
                 "valid_categories": [
                     (c.value, c.label) for c in PropertyLedgerEntry.ManagementCategory
                 ],
@@ -129,136 +178,44 @@ def csv_import_confirm(request, property_pk: int):
         messages.error(request, _("CSV import session expired. Please try again."))
         return redirect("property:csv_import", property_pk=property_pk)
 
-    valid_categories = {c.value for c in PropertyLedgerEntry.ManagementCategory}
-    income_categories = {c.value for c in PropertyLedgerEntry._INCOME_CATEGORIES}
+    duplicates_mode = request.POST.get("duplicates", DUPLICATES_SKIP)
+    parsed = parse_ledger_csv(
+        property_obj,
+        csv_header,
+        csv_data,
+        matcher=build_categorization_matcher(property_obj),
+        category_overrides=_category_overrides(request.POST),
+    )
+    error_rows = sorted(
+        parsed.errors
+        + [
+            (row.row_index, _("No category was chosen for this row."))
+            for row in parsed.uncategorized
+        ]
+    )
+    duplicate_rows = find_duplicate_rows(property_obj, parsed.entries)
+    new_entries = parsed.entries
+    if duplicates_mode != DUPLICATES_FLAG:
+        new_entries = [
+            (row_index, entry)
+            for row_index, entry in parsed.entries
+            if row_index not in duplicate_rows
+        ]
 
     imported_count = 0
-    error_rows = []
-
-    def _col(row, name):
-        idx = csv_header.index(name)
-        return row[idx].strip() if idx < len(row) else ""
-
-    with transaction.atomic():
-        for row_index, row in enumerate(csv_data, start=2):  # row 1 is header
-            try:
-                raw_date = _col(row, "date")
-                raw_amount = _col(row, "amount")
-                raw_category = _col(row, "category")
-                description = _col(row, "description")
-                notes = _col(row, "notes") if "notes" in csv_header else ""
-                raw_ref_period = (
-                    _col(row, "reference_period")
-                    if "reference_period" in csv_header
-                    else ""
-                )
-
-                # Parse date
-                parsed_date = dateparser.parse(raw_date)
-                if not parsed_date:
-                    error_rows.append(
-                        (row_index, str(_("Invalid date: %(val)s") % {"val": raw_date}))
-                    )
-                    continue
-
-                # Parse amount (supports both 1200.50 and European 1.200,50)
-                clean_amount = "".join(
-                    c for c in raw_amount if c.isdigit() or c in (".", ",", "-")
-                )
-                if "." in clean_amount and "," in clean_amount:
-                    # Determine which is the decimal separator by position
-                    if clean_amount.rfind(",") > clean_amount.rfind("."):
-                        # European: 1.200,50 → thousands=dot, decimal=comma
-                        clean_amount = clean_amount.replace(".", "").replace(",", ".")
-                    else:
-                        # US with comma thousands: 1,200.50 → remove commas
-                        clean_amount = clean_amount.replace(",", "")
-                elif "," in clean_amount:
-                    clean_amount = clean_amount.replace(",", ".")
-                try:
-                    amount_val = float(clean_amount)
-                except ValueError:
-                    error_rows.append(
-                        (
-                            row_index,
-                            str(_("Invalid amount: %(val)s") % {"val": raw_amount}),
-                        )
-                    )
-                    continue
-
-                if amount_val == 0:
-                    error_rows.append((row_index, str(_("Amount must not be zero."))))
-                    continue
-
-                # Derive flow_type from sign
-                flow_type = (
-                    PropertyLedgerEntry.FlowType.INCOME
-                    if amount_val > 0
-                    else PropertyLedgerEntry.FlowType.EXPENSE
-                )
-
-                # Validate category
-                if raw_category not in valid_categories:
-                    error_rows.append(
-                        (
-                            row_index,
-                            str(_("Unknown category: %(val)s") % {"val": raw_category}),
-                        )
-                    )
-                    continue
-
-                # Enforce category ↔ flow_type coherence
-                if (
-                    raw_category in income_categories
-                    and flow_type != PropertyLedgerEntry.FlowType.INCOME
-                ):
-                    error_rows.append(
-                        (
-                            row_index,
-                            str(
-                                _("Category %(cat)s requires a positive amount.")
-                                % {"cat": raw_category}
-                            ),
-                        )
-                    )
-                    continue
-                if (
-                    raw_category not in income_categories
-                    and flow_type != PropertyLedgerEntry.FlowType.EXPENSE
-                ):
-                    error_rows.append(
-                        (
-                            row_index,
-                            str(
-                                _("Category %(cat)s requires a negative amount.")
-                                % {"cat": raw_category}
-                            ),
-                        )
-                    )
-                    continue
-
-                # Optional reference_period
-                ref_period = None
-                if raw_ref_period:
-                    parsed_ref = dateparser.parse(raw_ref_period)
-                    if parsed_ref:
-                        ref_period = parsed_ref.date()
-
-                PropertyLedgerEntry.objects.create(
-                    property=property_obj,
-                    flow_type=flow_type,
-                    management_category=raw_category,
-                    amount=Money(abs(amount_val), property_obj.currency),
-                    entry_date=parsed_date.date(),
-                    description=description,
-                    notes=notes,
-                    reference_period=ref_period,
-                )
-                imported_count += 1
-
-            except Exception as exc:  # noqa: BLE001
-                _LOGGER.exception("CSV import error on row %d: %s", row_index, exc)
-                error_rows.append((row_index, str(exc)))
+    try:
+        with transaction.atomic():
+            PropertyLedgerEntry.objects.bulk_create(
+                [entry for _row_index, entry in new_entries], batch_size=500
+            )
+            # bulk_create() sends no signal: refresh the cached panels explicitly
+            Property.objects.filter(pk=property_obj.pk).bump_data_version()
+        imported_count = len(new_entries)
+    except Exception as exc:
+        _LOGGER.exception("CSV import error while saving the entries")
+        error_rows.extend((row_index, str(exc)) for row_index, _entry in new_entries)
+        error_rows.sort()
+        duplicate_rows = set()
 
     # Clean up session
     for key in (_SESSION_DATA_KEY, _SESSION_HEADER_KEY, _SESSION_PROPERTY_KEY):
@@ -270,6 +227,24 @@ def csv_import_confirm(request, property_pk: int):
             _("%(count)d entr%(plural)s imported successfully.")
             % {"count": imported_count, "plural": "ies" if imported_count > 1 else "y"},
         )
+    if duplicate_rows and duplicates_mode == DUPLICATES_FLAG:
+        messages.warning(
+            request,
+            _(
+                "%(count)d imported row(s) may duplicate existing entries: "
+                "rows %(rows)s."
+            )
+            % {
+                "count": len(duplicate_rows),
+                "rows": ", ".join(str(num) for num in sorted(duplicate_rows)),
+            },
+        )
+    elif duplicate_rows:
+        messages.info(
+            request,
+            _("%(count)d row(s) already imported were skipped.")
+            % {"count": len(duplicate_rows)},
+        )
     if error_rows:
         messages.warning(
             request,
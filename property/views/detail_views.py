@@ -24,13 +24,17 @@ from property.models import (
     Property,
     PropertyLedgerEntry,
     PropertyLoan,
-    PropertyLoanAmortizationEntry,
     PropertyValue,
 )
 from property.services.cashflow import build_balance_sheet
+from property.services.panel_cache import cached_panel_data
+from property.services.projection import (
+    ProjectionBaseline,
+    build_projection_baseline,
+    build_sensitivity_grid,
+    loan_costs_by_month,
+)
 from property.utils import (
-    add_years_safe,
-    build_loan_maps_from_loan_obj,
     build_loan_monthly_maps,
     iter_month_starts,
     month_end,
@@ -115,20 +119,22 @@ class PropertyDetailView(DetailView):
         except Exception:
             return default_rate
 
-    def _build_projection_data(self, property_obj: Property) -> list[dict]:
-        projection_years = list(range(1, 21))
+    def _build_projection_data(
+        self, property_obj: Property, baseline: ProjectionBaseline | None = None
+    ) -> list[dict]:
         growth_rate = self._get_growth_rate()
-        current_value = property_obj.get_value()
-        today = datetime.date.today()
+        if baseline is None:
+            baseline = build_projection_baseline(property_obj)
+        currency = str(property_obj.currency)
 
         projections = []
-        for years in projection_years:
-            as_of_date = add_years_safe(today, years)
-            projected_amount = current_value.amount * (
+        for index, as_of_date in enumerate(baseline.year_dates):
+            years = index + 1
+            projected_amount = baseline.current_value * (
                 (Decimal("1") + growth_rate) ** years
             )
-            projected_value = Money(projected_amount, str(current_value.currency))
-            projected_debt = property_obj.total_remaining_loans_at_date(as_of_date)
+            projected_value = Money(projected_amount, baseline.currency)
+            projected_debt = Money(baseline.debt[index], currency)
             projected_net = projected_value - projected_debt
 
             projections.append(
@@ -257,67 +263,7 @@ class PropertyDetailView(DetailView):
         dict[tuple[int, int], Decimal],
         dict[tuple[int, int], Decimal],
     ]:
-        loan_interest_by_month: dict[tuple[int, int], Decimal] = {}
-        loan_principal_by_month: dict[tuple[int, int], Decimal] = {}
-        loan_insurance_by_month: dict[tuple[int, int], Decimal] = {}
-
-        for loan in loans_qs:
-            insurance_amount = (
-                loan.insurance.amount if loan.insurance is not None else Decimal("0")
-            )
-
-            # When amortization entries exist, use them for interest and principal.
-            amort_entries = list(
-                PropertyLoanAmortizationEntry.objects.filter(loan=loan).order_by("date")
-            )
-            if amort_entries:
-                for entry in amort_entries:
-                    key = (entry.date.year, entry.date.month)
-                    loan_interest_by_month[key] = (
-                        loan_interest_by_month.get(key, Decimal("0"))
-                        + entry.interest.amount
-                    )
-                    loan_principal_by_month[key] = (
-                        loan_principal_by_month.get(key, Decimal("0"))
-                        + entry.capital.amount
-                    )
-                # Insurance is not in amortization entries; derive from loan params.
-                if (
-                    insurance_amount > Decimal("0")
-                    and loan.start_date
-                    and loan.end_date
-                ):
-                    _, _, insurance_map = build_loan_maps_from_loan_obj(
-                        loan, insurance_amount
-                    )
-                    for key, value in insurance_map.items():
-                        loan_insurance_by_month[key] = (
-                            loan_insurance_by_month.get(key, Decimal("0")) + value
-                        )
-                continue
-
-            # Fallback: compute from loan parameters when no amortization entries.
-            if loan.monthly_payment is None:
-                continue
-
-            interest_map, principal_map, insurance_map = build_loan_maps_from_loan_obj(
-                loan, insurance_amount
-            )
-
-            for key, value in interest_map.items():
-                loan_interest_by_month[key] = (
-                    loan_interest_by_month.get(key, Decimal("0")) + value
-                )
-            for key, value in principal_map.items():
-                loan_principal_by_month[key] = (
-                    loan_principal_by_month.get(key, Decimal("0")) + value
-                )
-            for key, value in insurance_map.items():
-                loan_insurance_by_month[key] = (
-                    loan_insurance_by_month.get(key, Decimal("0")) + value
-                )
-
-        return loan_interest_by_month, loan_principal_by_month, loan_insurance_by_month
+        return loan_costs_by_month(loans_qs)
 
     def _estimated_monthly_cashflow(self, property_obj: Property) -> Decimal:
         """Estimate monthly cashflow as the median of the last 12 months."""
@@ -474,48 +420,6 @@ class PropertyDetailView(DetailView):
             expense_by_type_series,
         )
 
-    def _build_transactions_json(self, property_obj: Property) -> list[dict]:
-        """Build all expanded transactions as a list of dicts for DataTables."""
-        entries_qs = (
-            PropertyLedgerEntry.objects.filter(property=property_obj)
-            .select_related("lease")
-            .prefetch_related("exceptions", "capitalized_as")
-        )
-        rows = []
-        for entry in entries_qs:
-            cat_label = entry.get_management_category_display()
-            lease_name = entry.lease.name if entry.lease else ""
-            descriptions = [entry.description] if entry.description else []
-            if entry.third_party:
-                descriptions.insert(0, entry.third_party)
-            if lease_name:
-                descriptions.append(lease_name)
-            base_description = " - ".join(descriptions)
-            is_capitalized = entry.capitalized_as.exists()  # ty: ignore[unresolved-attribute]
-            for occurrence in entry.generate_occurrences():
-                is_recurring = occurrence["is_recurring"]
-                rows.append(
-                    {
-                        "kind": entry.flow_type,
-                        "date": occurrence["date"].isoformat(),
-                        "category": str(cat_label),
-                        "amount": float(occurrence["amount"].amount),
-                        "description": occurrence.get("description_override")
-                        or base_description,
-                        "is_recurring": is_recurring,
-                        "is_capitalized": is_capitalized,
-                        "occurrence_date": occurrence["date"].isoformat()
-                        if is_recurring
-                        else None,
-                        "has_exception": occurrence.get("has_exception", False),
-                        "parent_id": entry.pk,
-                        "property_id": property_obj.pk,
-                    }
-                )
-        # Default sort: most recent first
-        rows.sort(key=lambda r: r["date"], reverse=True)
-        return rows
-
     def _build_loan_chart_data(self, property_obj: Property) -> dict:
         """Build per-loan monthly chart data for the loans panel chart.
 
@@ -724,12 +628,34 @@ class PropertyDetailView(DetailView):
             return []
         return [{"form": form} for form in loan_formset.forms]
 
+    def _build_summary(self, property_obj: Property) -> dict:
+        """Return the key figures shown at the top of the detail page."""
+        current_value = property_obj.get_value()
+        buying_value_gross = property_obj.buying_value_gross
+        return {
+            "current_raw_value": current_value,
+            "buying_value_gross": buying_value_gross,
+            "value_progression_pct": (
+                (
+                    (current_value.amount - buying_value_gross.amount)
+                    / buying_value_gross.amount
+                    * Decimal("100")
+                )
+                if buying_value_gross.amount
+                else None
+            ),
+            "current_net_value": property_obj.net_value,
+            "capital_repaid": property_obj.total_paid_loans,
+            "estimated_monthly_cashflow": Money(
+                self._estimated_monthly_cashflow(property_obj),
+                str(property_obj.buying_value.currency),
+            ),
+        }
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         property_obj = self.object
 
-        monthly_cashflow_amount = self._estimated_monthly_cashflow(property_obj)
-
         property_leases = Lease.objects.filter(property=property_obj).order_by(
             "-start_date"
         )
@@ -739,28 +665,13 @@ class PropertyDetailView(DetailView):
 
         loans_count = PropertyLoan.objects.filter(property=property_obj).count()
 
+        context.update(
+            cached_panel_data(
+                property_obj, "summary", lambda: self._build_summary(property_obj)
+            )
+        )
         context.update(
             {
-                "current_raw_value": property_obj.get_value(),
-                "buying_value_gross": property_obj.buying_value_gross,
-                "value_progression_pct": (
-                    (
-                        (
-                            property_obj.get_value().amount
-                            - property_obj.buying_value_gross.amount
-                        )
-                        / property_obj.buying_value_gross.amount
-                        * Decimal("100")
-                    )
-                    if property_obj.buying_value_gross.amount
-                    else None
-                ),
-                "current_net_value": property_obj.net_value,
-                "capital_repaid": property_obj.total_paid_loans,
-                "estimated_monthly_cashflow": Money(
-                    monthly_cashflow_amount,
-                    str(property_obj.buying_value.currency),
-                ),
                 "entry_form": PropertyLedgerEntryQuickCreateForm(
                     property_obj=property_obj,
                     initial={"entry_date": datetime.date.today()},
@@ -823,13 +734,8 @@ def property_panel_cashflow(request: HttpRequest, pk: int) -> HttpResponse:
         loan_insurance_series,
         total_expenses_series,
         expense_by_type_series,
-    ) = view._build_cashflow_series(prop)
-    transactions_data = view._build_transactions_json(prop)
-    entries = (
-        PropertyLedgerEntry.objects.filter(property=prop)
-        .select_related("lease")
-        .prefetch_related("exceptions", "capitalized_as")
-    )
+    ) = cached_panel_data(prop, "cashflow", lambda: view._build_cashflow_series(prop))
+    entries = PropertyLedgerEntry.objects.filter(property=prop).select_related("lease")
     entries_with_forms = [
         {
             "obj": entry,
@@ -839,7 +745,13 @@ def property_panel_cashflow(request: HttpRequest, pk: int) -> HttpResponse:
     ]
     context = {
         "property": prop,
-        "transactions_json": transactions_data,
+        "transaction_categories": sorted(
+            {
+                (entry.management_category, entry.get_management_category_display())
+                for entry in entries
+            },
+            key=lambda c: c[1].casefold(),
+        ),
         "cashflow_revenue_series": revenue_series,
         "cashflow_expense_series": expense_series,
         "cashflow_expense_by_type_series": expense_by_type_series,
@@ -867,16 +779,29 @@ def property_panel_projection(request: HttpRequest, pk: int) -> HttpResponse:
     prop = get_object_or_404(Property, pk=pk)
     view = _make_panel_view(prop, request)
     growth_rate = view._get_growth_rate()
-    projections = view._build_projection_data(prop)
+
+    def build():
+        baseline = build_projection_baseline(prop)
+        projections = view._build_projection_data(prop, baseline)
+        return (
+            projections,
+            view._build_chart_series(prop, projections),
+            build_sensitivity_grid(baseline),
+        )
+
     (
-        value_history_series,
-        debt_history_series,
-        net_history_series,
-        value_projection_series,
-        debt_projection_series,
-        net_projection_series,
-        projection_start_date,
-    ) = view._build_chart_series(prop, projections)
+        projections,
+        (
+            value_history_series,
+            debt_history_series,
+            net_history_series,
+            value_projection_series,
+            debt_projection_series,
+            net_projection_series,
+            projection_start_date,
+        ),
+        sensitivity,
+    ) = cached_panel_data(prop, "projection", build, params=[growth_rate])
     context = {
         "property": prop,
         "growth_rate": growth_rate,
@@ -889,6 +814,7 @@ def property_panel_projection(request: HttpRequest, pk: int) -> HttpResponse:
         "debt_projection_series": debt_projection_series,
         "net_projection_series": net_projection_series,
         "projection_start_date": projection_start_date,
+        "sensitivity": sensitivity,
         "property_values": PropertyValue.objects.filter(property=prop).order_by(
             "-valuation_date"
         ),
@@ -901,7 +827,14 @@ def property_panel_balance(request: HttpRequest, pk: int) -> HttpResponse:
     prop = get_object_or_404(Property, pk=pk)
     view = _make_panel_view(prop, request)
     context = {"property": prop}
-    context.update(view._build_balance_sheet_context(prop))
+    context.update(
+        cached_panel_data(
+            prop,
+            "balance",
+            lambda: view._build_balance_sheet_context(prop),
+            params=view._parse_balance_sheet_range(),
+        )
+    )
     return render(request, "property/detail_panel_balance.html", context)
 
 
@@ -916,8 +849,11 @@ def property_panel_loans(request: HttpRequest, pk: int) -> HttpResponse:
     """Return the Loans panel HTML fragment."""
     prop = get_object_or_404(Property, pk=pk)
     view = _make_panel_view(prop, request)
-    loans_with_totals = view._build_loans_context(prop)
-    loan_chart_data = view._build_loan_chart_data(prop)
+    loans_with_totals, loan_chart_data = cached_panel_data(
+        prop,
+        "loans",
+        lambda: (view._build_loans_context(prop), view._build_loan_chart_data(prop)),
+    )
     loan_formset = view._build_loan_formset(prop)
     loan_forms_ctx = view._build_loan_forms_ctx()
     context = {
@@ -243,6 +243,8 @@ def import_loan_amortization(
     with transaction.atomic():
         PropertyLoanAmortizationEntry.objects.filter(loan=loan).delete()
         PropertyLoanAmortizationEntry.objects.bulk_create(entries)
+        # bulk_create() sends no signal: refresh the cached panels explicitly
+        Property.objects.filter(pk=loan.property_id).bump_data_version()
 
     messages.success(request, _("%(n)d entries imported.") % {"n": len(entries)})
     return redirect(redirect_url)
@@ -300,6 +302,8 @@ def generate_loan_amortization(
     with transaction.atomic():
         PropertyLoanAmortizationEntry.objects.filter(loan=loan).delete()
         PropertyLoanAmortizationEntry.objects.bulk_create(entries)
+        # bulk_create() sends no signal: refresh the cached panels explicitly
+        Property.objects.filter(pk=loan.property_id).bump_data_version()
 
     messages.success(request, _("%(n)d entries generated.") % {"n": len(entries)})
     return redirect(redirect_url)
@@ -1,13 +1,15 @@
 """Fiscal / accounting views: amortization panel, initialization, accounting dashboard."""
 
-import csv
 import datetime
+from decimal import Decimal
 
 from django.contrib import messages
-from django.http import HttpRequest, HttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.http import require_POST
 
 from property.forms import (
     AmortizationAssetForm,  # noqa: F401
@@ -15,13 +17,24 @@ from property.forms import (
     PropertyReportFilterForm,
 )
 from property.models import AmortizationAsset, AmortizationSetup, Property
-from property.services.report import get_income_expense_report
+from property.services.lmnp_closing import close_fiscal_year
+from property.services.panel_cache import cached_panel_data
+from property.services.report import (
+    GRANULARITIES,
+    MONTH,
+    get_income_expense_report,
+    get_report_entries,
+    iter_report_export_rows,
+    period_end,
+    period_start,
+)
 from property.services.tax_lmnp import (
     get_accounting_data,
     get_amortization_schedule,
     get_amortization_table,
     get_lmnp_checklist,
 )
+from property.utils import iterate_in_thread, stream_csv, stream_xlsx
 
 # ─── Per-property amortization panel context helper ──────────────────────────
 
@@ -30,7 +43,14 @@ def get_amortization_context(property_obj: Property) -> dict:
     """Build the context dict for the amortization tab panel."""
     current_year = datetime.date.today().year
 
-    amortization_table = get_amortization_table(property_obj.pk, current_year)
+    amortization_table, schedule_data = cached_panel_data(
+        property_obj,
+        "amortization",
+        lambda: (
+            get_amortization_table(property_obj.pk, current_year),
+            get_amortization_schedule(property_obj.pk),
+        ),
+    )
 
     assets_qs = AmortizationAsset.objects.filter(property=property_obj)
 
@@ -39,8 +59,6 @@ def get_amortization_context(property_obj: Property) -> dict:
     except AmortizationSetup.DoesNotExist:
         amortization_setup = None
 
-    schedule_data = get_amortization_schedule(property_obj.pk)
-
     # Compute default acquisition fees for the init form
     from decimal import Decimal
 
@@ -233,6 +251,7 @@ def accounting_lmnp_reel(request: HttpRequest) -> HttpResponse:
 
     context = {
         "year": year,
+        "can_close_year": year < current_year,
         "year_range": year_range,
         "lmnp_properties": lmnp_properties,
         "accounting": accounting,
@@ -241,11 +260,42 @@ def accounting_lmnp_reel(request: HttpRequest) -> HttpResponse:
     return render(request, "property/accounting_lmnp_reel.html", context)
 
 
+@require_POST  # type: ignore
+def close_lmnp_year(request: HttpRequest) -> HttpResponse:
+    """Close a finished LMNP fiscal year for every active LMNP réel property."""
+    try:
+        year = int(request.POST.get("year", ""))
+    except ValueError:
+        messages.error(request, _("Invalid fiscal year."))
+        return redirect("property:lmnp_accounting")
+
+    redirect_url = reverse("property:lmnp_accounting") + f"?year={year}"
+    if year >= datetime.date.today().year:
+        messages.error(request, _("A fiscal year can only be closed once it is over."))
+        return redirect(redirect_url)
+
+    for property_obj in Property.objects.filter(
+        tax_regime=Property.TaxRegime.LMNP_REEL, is_active=True
+    ):
+        close_fiscal_year(property_obj.pk, year)
+    messages.success(request, _("Fiscal year %(year)s closed.") % {"year": year})
+    return redirect(redirect_url)
+
+
 # ─── Income & expenses report ─────────────────────────────────────────────────
 
+# format query parameter → (content type, streaming writer)
+REPORT_EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", stream_csv),
+    "xlsx": (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        stream_xlsx,
+    ),
+}
+
 
 def report_view(request: HttpRequest) -> HttpResponse:
-    """Income & expenses report: filter by properties, date range, export to CSV."""
+    """Income & expenses report: filter by properties, date range, export to CSV or XLSX."""
     today = datetime.date.today()
     default_start = datetime.date(today.year, 1, 1)
     default_end = datetime.date(today.year, 12, 31)
@@ -271,39 +321,69 @@ def report_view(request: HttpRequest) -> HttpResponse:
                 Property.objects.filter(is_active=True).values_list("pk", flat=True)
             )
 
-        report_data = get_income_expense_report(property_ids, start_date, end_date)
-
-        # CSV export
-        if request.GET.get("format") == "csv":
-            response = HttpResponse(content_type="text/csv; charset=utf-8")
-            filename = "income_expenses_report.csv"
+        # CSV / XLSX export, streamed while the entries are read
+        export_format = request.GET.get("format")
+        if export_format in REPORT_EXPORT_FORMATS:
+            content_type, writer = REPORT_EXPORT_FORMATS[export_format]
+            rows = iter_report_export_rows(property_ids, start_date, end_date)
+            content = writer(rows)
+            if isinstance(request, ASGIRequest):
+                content = iterate_in_thread(content)
+            response = StreamingHttpResponse(content, content_type=content_type)
+            filename = f"income_expenses_report.{export_format}"
             response["Content-Disposition"] = f'attachment; filename="{filename}"'
-            writer = csv.writer(response)
-            writer.writerow(
-                [
-                    "date",
-                    "property",
-                    "flow_type",
-                    "management_category",
-                    "amount",
-                    "description",
-                ]
-            )
-            for entry in report_data["entries"]:
-                writer.writerow(
-                    [
-                        entry.entry_date.isoformat(),
-                        entry.property.name,
-                        entry.flow_type,
-                        entry.management_category,
-                        entry.amount.amount,
-                        entry.description or "",
-                    ]
-                )
             return response
 
+        report_data = get_income_expense_report(
+            property_ids,
+            start_date,
+            end_date,
+            granularity=form.cleaned_data.get("granularity") or MONTH,
+        )
+
     context = {
         "form": form,
         "report": report_data,
     }
     return render(request, "property/report.html", context)
+
+
+def report_cell_entries(request: HttpRequest) -> HttpResponse:
+    """Return the entries of one cell of the report pivot, as an HTML fragment.
+
+    The cell is given by ``property``, ``category``, ``flow_type`` and the
+    first day of its column (``period``, with the report ``granularity``);
+    ``start_date`` / ``end_date``, blank for an open range, clip the column to
+    the report range.  Malformed parameters return a 400.
+    """
+    params = request.GET
+    granularity = params.get("granularity") or MONTH
+    start_date = params.get("start_date")
+    end_date = params.get("end_date")
+    try:
+        property_pk = int(params.get("property", ""))
+        first_day = datetime.date.fromisoformat(params.get("period", ""))
+        # Blank when the report range is open
+        start_date = datetime.date.fromisoformat(start_date) if start_date else None
+        end_date = datetime.date.fromisoformat(end_date) if end_date else None
+    except ValueError:
+        return HttpResponse(status=400)
+    if granularity not in GRANULARITIES:
+        return HttpResponse(status=400)
+    prop = get_object_or_404(Property, pk=property_pk)
+
+    cell_start = period_start(first_day, granularity)
+    cell_end = period_end(cell_start, granularity)
+    entries = get_report_entries(
+        [prop.pk],
+        max(cell_start, start_date) if start_date else cell_start,
+        min(cell_end, end_date) if end_date else cell_end,
+        management_category=request.GET.get("category", ""),
+        flow_type=request.GET.get("flow_type", ""),
+    )
+    context = {
+        "property": prop,
+        "entries": entries,
+        "total": sum((entry.amount.amount for entry in entries), Decimal("0")),
+    }
+    return render(request, "property/_report_cell_entries.html", context)
@@ -1,27 +1,27 @@
 """Property index view."""
 
 import datetime
-from decimal import Decimal
 
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 from moneyed import Money
 
-from property.models import Property, PropertyLoan
-from property.utils import iter_month_starts, month_start
+from property.models import Property
+from property.services.timeline import PropertyValueTimeline
+from property.utils import PropertyProgression, iter_month_starts, month_start
 
 
 def index(request: HttpRequest) -> HttpResponse:
     """Property index view."""
-    properties = Property.objects.order_by("is_active", "name")
+    properties = Property.objects.with_valuation().order_by("is_active", "name")
     property_list = []
 
     total_gross_value: Money | None = None
     total_net_value: Money | None = None
 
     for prop in properties:
-        gross_value = prop.gross_value
-        net_value = prop.net_value
+        gross_value = prop.get_value_from_annotations()
+        net_value = prop.net_value_from_annotations()
 
         if total_gross_value is None:
             total_gross_value = gross_value
@@ -33,11 +33,13 @@ def index(request: HttpRequest) -> HttpResponse:
         property_list.append(
             {
                 "model": prop,
-                "current_value": prop.get_value(),
+                "current_value": gross_value,
                 "gross_value": gross_value,
                 "net_value": net_value,
-                "loans_count": PropertyLoan.objects.filter(property=prop).count(),
-                "progression": prop.get_progression(),
+                "loans_count": prop.loans_count,
+                "progression": PropertyProgression(
+                    current_value=gross_value, old_value=prop.buying_value_gross
+                ),
             }
         )
 
@@ -56,43 +58,13 @@ def index(request: HttpRequest) -> HttpResponse:
             str(total_gross_value.currency) if total_gross_value is not None else None
         )
 
-        for current_date in iter_month_starts(
-            month_start(earliest_date), month_start(now)
-        ):
-            month_str = current_date.strftime("%b %Y")
-            properties_months.append(month_str)
-
-            month_properties = [
-                p for p in properties_active if p.buying_date <= current_date
-            ]
-
-            month_property_net_total = Decimal("0")
-            month_property_gross_total = Decimal("0")
-            for property_item in month_properties:
-                try:
-                    net_value = property_item.net_value_at_date(current_date)
-                    if net_value and (
-                        chart_currency is None
-                        or str(net_value.currency) == chart_currency
-                    ):
-                        month_property_net_total += net_value.amount
-
-                    gross_value = property_item.get_value(
-                        max_date=datetime.datetime.combine(
-                            current_date,
-                            datetime.time.max,
-                        )
-                    )
-                    if gross_value and (
-                        chart_currency is None
-                        or str(gross_value.currency) == chart_currency
-                    ):
-                        month_property_gross_total += gross_value.amount
-                except Exception:
-                    pass
-
-            properties_gross_evolution.append(float(month_property_gross_total))
-            properties_net_evolution.append(float(month_property_net_total))
+        chart_months = iter_month_starts(month_start(earliest_date), month_start(now))
+        properties_months = [month.strftime("%b %Y") for month in chart_months]
+        gross_series, net_series = PropertyValueTimeline(properties_active).series(
+            chart_months, currency=chart_currency
+        )
+        properties_gross_evolution = [float(value) for value in gross_series]
+        properties_net_evolution = [float(value) for value in net_series]
 
     context = {
         "properties": property_list,
@@ -17,6 +17,8 @@ from property.forms import (
     SCPISharePriceForm,
 )
 from property.models import SCPI, SCPIDividend, SCPIInvestment, SCPISharePrice
+from property.services.scpi_dividends import cached_dividend_analytics
+from property.services.scpi_timeline import SCPISeries, SCPIValueTimeline, month_grid
 
 # ─── Helpers ─────────────────────────────────────────────────────────────────
 
@@ -33,10 +35,31 @@ def _iter_months(start: datetime.date, end: datetime.date):
             month += 1
 
 
+def _series_chart_json(series: SCPISeries | None) -> str:
+    """Serialize a value series for the evolution charts (one point per month)."""
+    if series is None or not series.dates:
+        return json.dumps(None)
+    return json.dumps(
+        {
+            "months": [date.strftime("%Y-%m") for date in series.dates],
+            "invested": [float(value) for value in series.invested],
+            "value": [float(value) for value in series.estimated_value],
+            "resale": [float(value) for value in series.resale_value],
+            "yield": [float(value) for value in series.trailing_yield()],
+        }
+    )
+
+
 def _compute_fund_data(fund: SCPI, today: datetime.date) -> dict:
-    """Compute aggregate stats and chart data for a single SCPI fund."""
+    """Compute aggregate stats and chart data for a single SCPI fund.
+
+    Every valuation looks the share price up in the fund's price curve: one
+    query at most (none when the share prices are prefetched).
+    """
+    curve = fund.price_curve()
     investments = list(fund.investments.all())
-    dividends = list(fund.dividends.order_by("-payment_date"))
+    # Most recent first (default ordering), from the prefetch cache if any
+    dividends = list(fund.dividends.all())
 
     total_invested: Money | None = None
     total_resale: Money | None = None
@@ -45,7 +68,7 @@ def _compute_fund_data(fund: SCPI, today: datetime.date) -> dict:
 
     for inv in investments:
         invested = inv.get_total_invested()
-        resale = inv.get_estimated_resale_value(today)
+        resale = inv.get_estimated_resale_value(today, curve)
         if hasattr(invested, "currency"):
             currency = str(invested.currency)
 
@@ -68,10 +91,10 @@ def _compute_fund_data(fund: SCPI, today: datetime.date) -> dict:
         ):
             min_subscription_date = inv.subscription_date
 
-    # Total dividends (fund-level)
-    total_dividends = fund.get_total_dividends_received()
-    last_12mo_start = today - datetime.timedelta(days=365)
-    last_year_dividends = fund.get_dividends_received_in_period(last_12mo_start, today)
+    # Total dividends (fund-level), by year and allocated to the investments
+    analytics = cached_dividend_analytics(fund, today)
+    total_dividends = Money(analytics["total"], analytics["currency"])
+    last_year_dividends = Money(analytics["trailing_year"], analytics["currency"])
 
     # Capital gain
     capital_gain: Money | None = None
@@ -107,24 +130,16 @@ def _compute_fund_data(fund: SCPI, today: datetime.date) -> dict:
         if years > 0:
             growth_rentability = (gain_pct / years).quantize(Decimal("0.01"))
 
-    # Last 12 months growth (share price change over past year)
+    # ── Monthly series: value, resale value and trailing yield ─────────────────
+    dates = month_grid(min_subscription_date, today) if min_subscription_date else []
+    series = SCPIValueTimeline([fund]).fund_series(fund, dates)
+
+    # Last 12 months growth: resale value created over the past year
     last_12mo_growth_pct: Decimal = Decimal("0")
     if total_invested is not None and total_invested.amount > 0:
-        resale_12mo_ago: Money | None = None
-        date_12mo_ago = today - datetime.timedelta(days=365)
-        for inv in investments:
-            r = inv.get_estimated_resale_value(date_12mo_ago)
-            if resale_12mo_ago is None:
-                resale_12mo_ago = r
-            else:
-                resale_12mo_ago = Money(
-                    resale_12mo_ago.amount + r.amount, str(resale_12mo_ago.currency)
-                )
-        if resale_12mo_ago is not None and total_resale is not None:
-            last_12mo_gain = total_resale.amount - resale_12mo_ago.amount
-            last_12mo_growth_pct = (
-                last_12mo_gain / total_invested.amount * Decimal("100")
-            ).quantize(Decimal("0.01"))
+        last_12mo_growth_pct = (
+            series.growth(12) / total_invested.amount * Decimal("100")
+        ).quantize(Decimal("0.01"))
 
     # ── Monthly chart data ────────────────────────────────────────────────────
     # Line: cumulative invested per month since first acquisition
@@ -176,6 +191,7 @@ def _compute_fund_data(fund: SCPI, today: datetime.date) -> dict:
     return {
         "fund": fund,
         "investments": investments,
+        "price_curve": curve,
         "total_invested": total_invested,
         "total_resale": total_resale,
         "total_dividends": total_dividends,
@@ -190,7 +206,18 @@ def _compute_fund_data(fund: SCPI, today: datetime.date) -> dict:
         "chart_months": json.dumps(chart_months),
         "chart_invested_monthly": json.dumps(chart_invested_monthly),
         "chart_dividend_monthly": json.dumps(chart_dividend_monthly),
+        "chart_value_monthly": json.dumps(
+            [float(value) for value in series.estimated_value]
+        ),
+        "chart_resale_monthly": json.dumps(
+            [float(value) for value in series.resale_value]
+        ),
+        "chart_yield_monthly": json.dumps(
+            [float(value) for value in series.trailing_yield()]
+        ),
+        "series": series,
         "dividends_json": dividends_json,
+        "dividend_analytics": analytics,
     }
 
 
@@ -248,6 +275,22 @@ def scpi_list(request: HttpRequest) -> HttpResponse:
             global_capital_gain / global_total_invested.amount * Decimal("100")
         ).quantize(Decimal("0.01"))
 
+    # Portfolio series: the fund series summed on the grid of the oldest fund
+    # (each fund grid ends today, so it is a suffix of that grid)
+    portfolio_series: SCPISeries | None = None
+    if global_total_invested is not None:
+        portfolio_currency = str(global_total_invested.currency)
+        fund_series = [
+            d["series"]
+            for d in fund_data
+            if d["series"].dates and d["currency"] == portfolio_currency
+        ]
+        portfolio_series = SCPISeries.empty(
+            max((series.dates for series in fund_series), key=len, default=[])
+        )
+        for series in fund_series:
+            portfolio_series.add(series)
+
     global_net_rentability: Decimal = Decimal("0")
     funds_with_net_rentability = [d for d in fund_data if d["net_rentability"] > 0]
     if funds_with_net_rentability:
@@ -266,6 +309,7 @@ def scpi_list(request: HttpRequest) -> HttpResponse:
             "global_total_dividends": global_total_dividends,
             "global_gain_pct": global_gain_pct,
             "global_net_rentability": global_net_rentability,
+            "portfolio_chart": _series_chart_json(portfolio_series),
         },
     )
 
@@ -275,18 +319,28 @@ def scpi_list(request: HttpRequest) -> HttpResponse:
 
 def scpi_fund_detail(request: HttpRequest, scpi_pk: int) -> HttpResponse:
     """Detail view for a SCPI fund — all investments and profitability."""
-    scpi_obj = get_object_or_404(SCPI, pk=scpi_pk)
+    scpi_obj = get_object_or_404(
+        SCPI.objects.prefetch_related("share_prices", "investments", "dividends"),
+        pk=scpi_pk,
+    )
     today = datetime.date.today()
     data = _compute_fund_data(scpi_obj, today)
+    curve = data["price_curve"]
+    analytics = data["dividend_analytics"]
 
     investment_rows = []
     for inv in data["investments"]:
+        allocated = analytics["investments"].get(inv.pk)
         investment_rows.append(
             {
                 "obj": inv,
                 "total_invested": inv.get_total_invested(),
-                "estimated_resale": inv.get_estimated_resale_value(today),
-                "capital_gain": inv.get_capital_gain(today),
+                "estimated_resale": inv.get_estimated_resale_value(today, curve),
+                "capital_gain": inv.get_capital_gain(today, curve),
+                "dividends": Money(
+                    allocated["total"] if allocated else Decimal("0"),
+                    analytics["currency"],
+                ),
             }
         )
 
@@ -298,6 +352,7 @@ def scpi_fund_detail(request: HttpRequest, scpi_pk: int) -> HttpResponse:
             "scpi": scpi_obj,
             "today": today,
             "investment_rows": investment_rows,
+            "dividend_years": analytics["years"],
         },
     )
 
@@ -8,6 +8,10 @@ echo "Applying database migrations..."
 python manage.py migrate
 echo
 
+echo "Creating the cache table (database cache backend only)..."
+python manage.py createcachetable
+echo
+
 echo "Importing initial data..."
 python manage.py loaddata finance/fixtures/*.yaml
 echo
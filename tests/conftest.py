@@ -8,6 +8,7 @@ import pytest
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import UserManager
+from django.core.cache import cache
 from django.core.management import call_command
 from django.test import Client
 
@@ -47,6 +48,14 @@ def django_db_setup(django_db_setup, django_db_blocker):
             call_command("loaddata", os.path.join("finance", "fixtures", fixture_name))
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache, so cached figures never leak."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
 # Constants for test users
 ADMIN_USER = "admin"
 ADMIN_PASSWORD = "adminpassword"